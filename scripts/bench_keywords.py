@@ -0,0 +1,67 @@
+"""Benchmark keyword extraction on a novel-length text.
+
+Usage: python scripts/bench_keywords.py [novel.txt]
+
+Pass a plain-text novel (any Project Gutenberg download works); without one, a
+150k-word synthetic text with a Zipf-like vocabulary stands in.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+from pathlib import Path
+
+from docx2shelf import text_analysis
+from docx2shelf.ai_genre_detection import IntelligentKeywordExtractor
+from docx2shelf.text_analysis import DocumentAnalysis
+
+
+def build_novel(words: int = 150_000, seed: int = 1) -> str:
+    """Sentences of 5-30 words drawn from a 20k-word vocabulary with a few names."""
+    rng = random.Random(seed)
+    letters = "etaoinshrdlcumwfgypbvkjxqz"
+    vocabulary = [
+        "".join(rng.choice(letters[: 8 + n % 18]) for _ in range(3 + n % 9)) for n in range(20_000)
+    ]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    names = ["Elizabeth", "Darcy", "Bingley", "Netherfield", "London", "Pemberley"]
+    sentences = []
+    remaining = words
+    while remaining > 0:
+        length = rng.randint(5, 30)
+        chosen = rng.choices(vocabulary, weights, k=length)
+        chosen[rng.randrange(length)] = rng.choice(names)
+        sentences.append(" ".join(chosen).capitalize() + rng.choice([".", ".", "!", "?"]))
+        remaining -= length
+    return " ".join(sentences)
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        text = Path(sys.argv[1]).read_text(encoding="utf-8", errors="replace")
+    else:
+        text = build_novel()
+    extractor = IntelligentKeywordExtractor()
+    print(f"Text: {len(text.split())} words, NumPy: {text_analysis.NUMPY_AVAILABLE}")
+
+    start = time.perf_counter()
+    analysis = DocumentAnalysis(text)
+    tokens = len(analysis.tokens)
+    print(f"{'tokenize':>10}: {time.perf_counter() - start:.2f}s ({tokens} tokens)")
+
+    stages = [
+        ("frequency", lambda: extractor._extract_frequency_keywords(text, analysis)),
+        ("tfidf", lambda: extractor._extract_tfidf_keywords(text, analysis)),
+        ("entity", lambda: extractor._extract_entity_keywords(text, analysis)),
+        ("cluster", lambda: extractor._extract_cluster_keywords(text, analysis)),
+    ]
+    for label, run in stages:
+        start = time.perf_counter()
+        keywords = run()
+        print(f"{label:>10}: {time.perf_counter() - start:.2f}s ({len(keywords)} keywords)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark the HTML chapter splitters on a large synthetic document.
+
+Usage: python scripts/bench_splitting.py [size_mb]   (default 50)
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from docx2shelf.convert import (
+    split_html_by_heading,
+    split_html_by_pagebreak,
+    split_html_mixed,
+)
+
+_PARAGRAPH = "<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit.</p>\r\n"
+
+
+def build_document(size_mb: float) -> str:
+    """HTML with h1 chapters, h2 scenes and a page break every few scenes."""
+    chapter = (
+        '<h1 id="c">Chapter</h1>\r\n'
+        + "".join(
+            f"<h2>Scene {n}</h2>\r\n"
+            + _PARAGRAPH * 40
+            + ('<hr class="pagebreak" />' if n % 3 == 2 else "")
+            for n in range(6)
+        )
+        + "<!-- PAGEBREAK -->\r\n"
+    )
+    return chapter * max(1, int(size_mb * 1024 * 1024 / len(chapter)))
+
+
+def main() -> None:
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 50.0
+    html = build_document(size_mb)
+    print(f"Document: {len(html) / 1024 / 1024:.1f} MB")
+
+    runs = [
+        ("h1", lambda: split_html_by_heading(html, "h1")),
+        ("h2", lambda: split_html_by_heading(html, "h2")),
+        ("pagebreak", lambda: split_html_by_pagebreak(html)),
+        ("mixed h1,h2,pagebreak", lambda: split_html_mixed(html, "h1,h2,pagebreak")),
+    ]
+    for label, run in runs:
+        start = time.perf_counter()
+        chunks = run()
+        duration = max(1e-6, time.perf_counter() - start)
+        print(
+            f"{label:>22}: {len(chunks):>7} chunks in {duration:.2f}s "
+            f"({len(html) / duration / 1024 / 1024:.0f} MB/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark cold CLI startup: ``--help`` and ``build --dry-run`` in fresh interpreters.
+
+Usage: python scripts/bench_startup.py [runs]   (default 10)
+"""
+
+from __future__ import annotations
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+_W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_DOCUMENT = (
+    f'<w:document xmlns:w="{_W}"><w:body>'
+    '<w:p><w:pPr><w:pStyle w:val="Heading1"/></w:pPr><w:r><w:t>One</w:t></w:r></w:p>'
+    "<w:p><w:r><w:t>Hello.</w:t></w:r></w:p>"
+    "</w:body></w:document>"
+)
+
+
+def _time_runs(argv: list[str], runs: int, env: dict) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as home:
+            # A fresh home keeps the conversion cache cold as well
+            run_env = dict(env, HOME=home, USERPROFILE=home)
+            start = time.perf_counter()
+            result = subprocess.run(argv, capture_output=True, env=run_env)
+            timings.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            raise SystemExit(f"{' '.join(argv)} failed:\n{result.stderr.decode()}")
+    return timings
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    env = dict(os.environ, DOCX2SHELF_OFFLINE="1")
+
+    with tempfile.TemporaryDirectory() as work:
+        source = Path(work) / "book.docx"
+        with zipfile.ZipFile(source, "w") as docx:
+            docx.writestr("word/document.xml", _DOCUMENT)
+        cover = Path(work) / "cover.png"
+        cover.write_bytes(b"")
+
+        cli = [sys.executable, "-m", "docx2shelf"]
+        commands = {
+            "--help": cli + ["--help"],
+            "build --dry-run": cli
+            + ["build", "--input", str(source), "--cover", str(cover)]
+            + ["--title", "T", "--author", "A", "--dry-run", "--no-prompt"],
+        }
+        for label, argv in commands.items():
+            timings = _time_runs(argv, runs, env)
+            print(
+                f"{label:>16}: median {statistics.median(timings) * 1000:.0f}ms, "
+                f"min {min(timings) * 1000:.0f}ms over {runs} runs"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
 
 from .ai_integration import get_ai_manager
+from .text_analysis import DocumentAnalysis, analyze_document
 
 
 @dataclass
@@ -233,33 +234,40 @@ class AdvancedGenreDetector:
             "Young Adult": ["YAF000000", "YAF001000", "YAF002000"],
         }
 
-    def detect_genre(self, content: str, metadata: Dict[str, Any]) -> GenreDetectionResult:
+    def detect_genre(
+        self,
+        content: str,
+        metadata: Dict[str, Any],
+        analysis: Optional[DocumentAnalysis] = None,
+    ) -> GenreDetectionResult:
         """Perform comprehensive genre detection.
 
         Args:
             content: Document content
             metadata: Existing metadata
+            analysis: Shared analysis of ``content`` (created if not given)
 
         Returns:
             Complete genre detection result
         """
         print("🔍 Performing advanced genre detection...")
+        analysis = analysis or analyze_document(content)
 
         # Multiple detection methods
         results = []
 
         # 1. AI-powered detection
         if self.ai_manager.is_available():
-            ai_result = self._detect_with_ai(content, metadata)
+            ai_result = self._detect_with_ai(content, metadata, analysis)
             if ai_result:
                 results.append(("ai", ai_result))
 
         # 2. Advanced keyword analysis
-        keyword_result = self._detect_with_advanced_keywords(content)
+        keyword_result = self._detect_with_advanced_keywords(content, analysis)
         results.append(("keywords", keyword_result))
 
         # 3. Structural analysis
-        structure_result = self._detect_with_structure_analysis(content)
+        structure_result = self._detect_with_structure_analysis(content, analysis)
         results.append(("structure", structure_result))
 
         # 4. Metadata analysis
@@ -268,7 +276,7 @@ class AdvancedGenreDetector:
             results.append(("metadata", metadata_result))
 
         # Combine results
-        final_result = self._combine_detection_results(results, content)
+        final_result = self._combine_detection_results(results, content, analysis)
 
         print(
             f"✅ Genre detection complete. Primary: {final_result.primary_genre} ({final_result.confidence:.1%})"
@@ -276,19 +284,27 @@ class AdvancedGenreDetector:
 
         return final_result
 
-    def _detect_with_ai(self, content: str, metadata: Dict[str, Any]) -> Optional[Dict]:
+    def _detect_with_ai(
+        self,
+        content: str,
+        metadata: Dict[str, Any],
+        analysis: Optional[DocumentAnalysis] = None,
+    ) -> Optional[Dict]:
         """Use AI model for genre detection."""
         try:
-            ai_result = self.ai_manager.detect_genre(content, metadata)
+            ai_result = self.ai_manager.detect_genre(content, metadata, analysis)
             if ai_result.success:
                 return ai_result.data
         except Exception as e:
             self.logger.warning(f"AI genre detection failed: {e}")
         return None
 
-    def _detect_with_advanced_keywords(self, content: str) -> Dict:
+    def _detect_with_advanced_keywords(
+        self, content: str, analysis: Optional[DocumentAnalysis] = None
+    ) -> Dict:
         """Advanced keyword-based genre detection."""
-        content_lower = content.lower()
+        analysis = analysis or analyze_document(content)
+        content_lower = analysis.lower
         genre_scores = {}
 
         for genre, keywords_dict in self.genre_keywords.items():
@@ -324,7 +340,7 @@ class AdvancedGenreDetector:
 
             if total_score > 0:
                 # Normalize by content length
-                normalized_score = total_score / math.log(len(content.split()) + 1)
+                normalized_score = total_score / math.log(analysis.word_count + 1)
                 genre_scores[genre] = {
                     "score": normalized_score,
                     "evidence": evidence[:10],  # Top 10 overall
@@ -333,13 +349,16 @@ class AdvancedGenreDetector:
 
         return genre_scores
 
-    def _detect_with_structure_analysis(self, content: str) -> Dict:
+    def _detect_with_structure_analysis(
+        self, content: str, analysis: Optional[DocumentAnalysis] = None
+    ) -> Dict:
         """Analyze document structure for genre clues."""
+        analysis = analysis or analyze_document(content)
         structure_scores = {}
 
         # Analyze sentence and paragraph structure
-        sentences = re.split(r"[.!?]+", content)
-        paragraphs = content.split("\n\n")
+        sentences = analysis.sentences
+        paragraphs = analysis.paragraphs
 
         avg_sentence_length = sum(len(s.split()) for s in sentences) / max(1, len(sentences))
         avg_paragraph_length = sum(len(p.split()) for p in paragraphs) / max(1, len(paragraphs))
@@ -352,8 +371,8 @@ class AdvancedGenreDetector:
         action_words = ["ran", "jumped", "fought", "chased", "escaped", "attacked", "struck"]
         description_words = ["beautiful", "elegant", "peaceful", "serene", "gentle", "quiet"]
 
-        action_count = sum(content.lower().count(word) for word in action_words)
-        description_count = sum(content.lower().count(word) for word in description_words)
+        action_count = sum(analysis.lower.count(word) for word in action_words)
+        description_count = sum(analysis.lower.count(word) for word in description_words)
 
         # Genre scoring based on structure
         if dialogue_ratio > 0.3:  # High dialogue
@@ -404,9 +423,13 @@ class AdvancedGenreDetector:
         return metadata_scores if metadata_scores else None
 
     def _combine_detection_results(
-        self, results: List[Tuple[str, Dict]], content: str
+        self,
+        results: List[Tuple[str, Dict]],
+        content: str,
+        analysis: Optional[DocumentAnalysis] = None,
     ) -> GenreDetectionResult:
         """Combine results from different detection methods."""
+        analysis = analysis or analyze_document(content)
         combined_scores = defaultdict(lambda: {"total": 0, "methods": [], "evidence": []})
 
         # Weights for different methods
@@ -462,7 +485,7 @@ class AdvancedGenreDetector:
         primary_confidence = genre_scores[0].confidence if genre_scores else 0.3
 
         # Extract keywords
-        keywords = self._extract_genre_keywords(content, primary_genre)
+        keywords = self._extract_genre_keywords(content, primary_genre, analysis)
 
         # Generate BISAC suggestions
         bisac_suggestions = self.bisac_codes.get(primary_genre, [])
@@ -474,17 +497,20 @@ class AdvancedGenreDetector:
             keywords=keywords,
             bisac_suggestions=bisac_suggestions,
             content_analysis={
-                "word_count": len(content.split()),
+                "word_count": analysis.word_count,
                 "methods_used": [method for method, _ in results],
                 "total_genres_detected": len(genre_scores),
             },
         )
 
-    def _extract_genre_keywords(self, content: str, primary_genre: str) -> List[KeywordResult]:
+    def _extract_genre_keywords(
+        self, content: str, primary_genre: str, analysis: Optional[DocumentAnalysis] = None
+    ) -> List[KeywordResult]:
         """Extract relevant keywords for the detected genre."""
-        content_lower = content.lower()
-        words = re.findall(r"\b[a-zA-Z]{3,}\b", content_lower)
-        word_counts = Counter(words)
+        analysis = analysis or analyze_document(content)
+        content_lower = analysis.lower
+        words = analysis.tokens
+        word_counts = analysis.token_counts
 
         # Get genre-specific keywords
         genre_keywords = []
@@ -501,7 +527,9 @@ class AdvancedGenreDetector:
                             )
 
                             # Find context examples
-                            context_examples = self._find_keyword_contexts(content, keyword)
+                            context_examples = self._find_keyword_contexts(
+                                content, keyword, analysis=analysis
+                            )
 
                             genre_keywords.append(
                                 KeywordResult(
@@ -541,11 +569,15 @@ class AdvancedGenreDetector:
         return frequency_score * category_weight * length_bonus
 
     def _find_keyword_contexts(
-        self, content: str, keyword: str, context_length: int = 50
+        self,
+        content: str,
+        keyword: str,
+        context_length: int = 50,
+        analysis: Optional[DocumentAnalysis] = None,
     ) -> List[str]:
         """Find context examples for a keyword."""
         contexts = []
-        content_lower = content.lower()
+        content_lower = (analysis or analyze_document(content)).lower
         keyword_lower = keyword.lower()
 
         start = 0
@@ -579,35 +611,42 @@ class IntelligentKeywordExtractor:
         self.ai_manager = get_ai_manager()
         self.logger = logging.getLogger(__name__)
 
-    def extract_keywords(self, content: str, max_keywords: int = 20) -> List[KeywordResult]:
+    def extract_keywords(
+        self,
+        content: str,
+        max_keywords: int = 20,
+        analysis: Optional[DocumentAnalysis] = None,
+    ) -> List[KeywordResult]:
         """Extract intelligent keywords from content.
 
         Args:
             content: Document content
             max_keywords: Maximum number of keywords to return
+            analysis: Shared analysis of ``content`` (created if not given)
 
         Returns:
             List of extracted keywords with relevance scores
         """
         print("🔤 Extracting intelligent keywords...")
 
-        # Multiple extraction methods
+        # Multiple extraction methods over one tokenization
         results = []
+        analysis = analysis or analyze_document(content)
 
         # 1. Frequency-based extraction
-        freq_keywords = self._extract_frequency_keywords(content)
+        freq_keywords = self._extract_frequency_keywords(content, analysis)
         results.extend(freq_keywords)
 
         # 2. TF-IDF style extraction
-        tfidf_keywords = self._extract_tfidf_keywords(content)
+        tfidf_keywords = self._extract_tfidf_keywords(content, analysis)
         results.extend(tfidf_keywords)
 
         # 3. Named entity recognition (basic)
-        entity_keywords = self._extract_entity_keywords(content)
+        entity_keywords = self._extract_entity_keywords(content, analysis)
         results.extend(entity_keywords)
 
         # 4. Semantic clustering
-        cluster_keywords = self._extract_cluster_keywords(content)
+        cluster_keywords = self._extract_cluster_keywords(content, analysis)
         results.extend(cluster_keywords)
 
         # Combine and deduplicate
@@ -616,9 +655,11 @@ class IntelligentKeywordExtractor:
         print(f"✅ Extracted {len(final_keywords)} relevant keywords")
         return final_keywords
 
-    def _extract_frequency_keywords(self, content: str) -> List[KeywordResult]:
+    def _extract_frequency_keywords(
+        self, content: str, analysis: Optional[DocumentAnalysis] = None
+    ) -> List[KeywordResult]:
         """Extract keywords based on frequency analysis."""
-        words = re.findall(r"\b[a-zA-Z]{3,}\b", content.lower())
+        words = (analysis or analyze_document(content)).tokens
 
         # Filter stop words
         stop_words = {
@@ -702,11 +743,14 @@ class IntelligentKeywordExtractor:
 
         return keywords
 
-    def _extract_tfidf_keywords(self, content: str) -> List[KeywordResult]:
+    def _extract_tfidf_keywords(
+        self, content: str, analysis: Optional[DocumentAnalysis] = None
+    ) -> List[KeywordResult]:
         """Extract keywords using TF-IDF-like scoring."""
         # Simple TF-IDF implementation
-        sentences = re.split(r"[.!?]+", content)
-        words = re.findall(r"\b[a-zA-Z]{4,}\b", content.lower())
+        analysis = analysis or analyze_document(content)
+        sentences = analysis.lower_sentences
+        words = analysis.terms
 
         if not sentences or not words:
             return []
@@ -716,9 +760,8 @@ class IntelligentKeywordExtractor:
         total_words = len(words)
 
         # Calculate document frequency (sentence-level)
-        df = {}
-        for word in set(words):
-            df[word] = sum(1 for sentence in sentences if word in sentence.lower())
+        vocabulary = list(tf)
+        df = dict(zip(vocabulary, analysis.sentence_frequency(vocabulary)))
 
         # Calculate TF-IDF scores
         keywords = []
@@ -736,13 +779,15 @@ class IntelligentKeywordExtractor:
 
         return sorted(keywords, key=lambda x: x.relevance_score, reverse=True)[:20]
 
-    def _extract_entity_keywords(self, content: str) -> List[KeywordResult]:
+    def _extract_entity_keywords(
+        self, content: str, analysis: Optional[DocumentAnalysis] = None
+    ) -> List[KeywordResult]:
         """Extract named entities as keywords."""
         # Basic named entity recognition using patterns
         entities = []
 
         # Proper nouns (capitalized words not at sentence start)
-        proper_nouns = re.findall(r"(?<!\.)\s+([A-Z][a-z]{2,})", content)
+        proper_nouns = (analysis or analyze_document(content)).proper_noun_candidates
         proper_noun_counts = Counter(proper_nouns)
 
         for noun, count in proper_noun_counts.items():
@@ -773,15 +818,13 @@ class IntelligentKeywordExtractor:
 
         return entities
 
-    def _extract_cluster_keywords(self, content: str) -> List[KeywordResult]:
+    def _extract_cluster_keywords(
+        self, content: str, analysis: Optional[DocumentAnalysis] = None
+    ) -> List[KeywordResult]:
         """Extract keywords using semantic clustering."""
         # Simple clustering based on co-occurrence
-        sentences = re.split(r"[.!?]+", content)
-        words = []
-
-        for sentence in sentences:
-            sentence_words = re.findall(r"\b[a-zA-Z]{4,}\b", sentence.lower())
-            words.extend(sentence_words)
+        analysis = analysis or analyze_document(content)
+        words = analysis.terms
 
         if len(words) < 10:
             return []
@@ -790,8 +833,8 @@ class IntelligentKeywordExtractor:
         cooccurrence = defaultdict(lambda: defaultdict(int))
         word_counts = Counter(words)
 
-        for sentence in sentences:
-            sentence_words = list(set(re.findall(r"\b[a-zA-Z]{4,}\b", sentence.lower())))
+        for terms in analysis.sentence_terms:
+            sentence_words = list(set(terms))
             for i, word1 in enumerate(sentence_words):
                 for word2 in sentence_words[i + 1 :]:
                     cooccurrence[word1][word2] += 1
@@ -869,29 +912,37 @@ class IntelligentKeywordExtractor:
         return final_keywords[:max_keywords]
 
 
-def detect_genre_with_ai(content: str, metadata: Dict[str, Any] = None) -> GenreDetectionResult:
+def detect_genre_with_ai(
+    content: str,
+    metadata: Dict[str, Any] = None,
+    analysis: Optional[DocumentAnalysis] = None,
+) -> GenreDetectionResult:
     """Convenience function for genre detection.
 
     Args:
         content: Document content
         metadata: Optional metadata
+        analysis: Shared analysis of ``content`` (created if not given)
 
     Returns:
         Genre detection result
     """
     detector = AdvancedGenreDetector()
-    return detector.detect_genre(content, metadata or {})
+    return detector.detect_genre(content, metadata or {}, analysis)
 
 
-def extract_intelligent_keywords(content: str, max_keywords: int = 20) -> List[KeywordResult]:
+def extract_intelligent_keywords(
+    content: str, max_keywords: int = 20, analysis: Optional[DocumentAnalysis] = None
+) -> List[KeywordResult]:
     """Convenience function for keyword extraction.
 
     Args:
         content: Document content
         max_keywords: Maximum keywords to extract
+        analysis: Shared analysis of ``content`` (created if not given)
 
     Returns:
         List of extracted keywords
     """
     extractor = IntelligentKeywordExtractor()
-    return extractor.extract_keywords(content, max_keywords)
+    return extractor.extract_keywords(content, max_keywords, analysis)
@@ -38,6 +38,7 @@ try:
 except (ImportError, AttributeError):
     PILLOW_AVAILABLE = False
 
+from .text_analysis import DocumentAnalysis, analyze_document
 from .utils import prompt_bool
 
 
@@ -187,12 +188,18 @@ class MetadataEnhancer:
         self.model_manager = model_manager
         self.logger = logging.getLogger(__name__)
 
-    def enhance_metadata(self, content: str, existing_metadata: Dict[str, Any]) -> AIResult:
+    def enhance_metadata(
+        self,
+        content: str,
+        existing_metadata: Dict[str, Any],
+        analysis: Optional[DocumentAnalysis] = None,
+    ) -> AIResult:
         """Enhance metadata using AI analysis.
 
         Args:
             content: Document content for analysis
             existing_metadata: Current metadata
+            analysis: Shared analysis of ``content`` (created if not given)
 
         Returns:
             AIResult with enhanced metadata suggestions
@@ -219,7 +226,7 @@ class MetadataEnhancer:
 
         try:
             # Extract key information from content
-            enhanced = self._analyze_content_for_metadata(content, existing_metadata)
+            enhanced = self._analyze_content_for_metadata(content, existing_metadata, analysis)
 
             result_data = {
                 "title_suggestions": enhanced.get("title_suggestions", []),
@@ -253,11 +260,16 @@ class MetadataEnhancer:
                 processing_time=time.time() - start_time,
             )
 
-    def _analyze_content_for_metadata(self, content: str, existing_metadata: Dict) -> Dict:
+    def _analyze_content_for_metadata(
+        self,
+        content: str,
+        existing_metadata: Dict,
+        analysis: Optional[DocumentAnalysis] = None,
+    ) -> Dict:
         """Analyze content to extract metadata insights."""
         # Basic text analysis
-        words = content.split()
-        word_count = len(words)
+        analysis = analysis or analyze_document(content)
+        word_count = analysis.word_count
         estimated_reading_time = max(1, word_count // 250)  # ~250 words per minute
 
         # Extract potential titles from first paragraphs
@@ -266,16 +278,16 @@ class MetadataEnhancer:
         )
 
         # Generate description from content
-        description_suggestions = self._generate_description_suggestions(content)
+        description_suggestions = self._generate_description_suggestions(content, analysis)
 
         # Extract keywords
-        keyword_suggestions = self._extract_keywords(content)
+        keyword_suggestions = self._extract_keywords(content, analysis)
 
         # Basic genre detection
-        genre_suggestions = self._detect_genre_basic(content)
+        genre_suggestions = self._detect_genre_basic(content, analysis)
 
         # Estimate reading level
-        reading_level = self._estimate_reading_level(content)
+        reading_level = self._estimate_reading_level(content, analysis)
 
         return {
             "title_suggestions": title_suggestions,
@@ -319,10 +331,13 @@ class MetadataEnhancer:
 
         return suggestions[:5]  # Return top 5 suggestions
 
-    def _generate_description_suggestions(self, content: str) -> List[str]:
+    def _generate_description_suggestions(
+        self, content: str, analysis: Optional[DocumentAnalysis] = None
+    ) -> List[str]:
         """Generate description suggestions from content."""
         # Extract first few sentences as potential description
-        sentences = re.split(r"[.!?]+", content)
+        analysis = analysis or analyze_document(content)
+        sentences = analysis.sentences
         clean_sentences = [s.strip() for s in sentences if s.strip() and len(s.strip()) > 20]
 
         suggestions = []
@@ -339,16 +354,18 @@ class MetadataEnhancer:
                     suggestions.append(two_sentences)
 
             # First paragraph summary
-            first_paragraph = content.split("\n\n")[0] if "\n\n" in content else content[:500]
+            first_paragraph = analysis.paragraphs[0] if "\n\n" in content else content[:500]
             if len(first_paragraph) <= 400 and first_paragraph not in suggestions:
                 suggestions.append(first_paragraph)
 
         return suggestions[:3]
 
-    def _extract_keywords(self, content: str) -> List[str]:
+    def _extract_keywords(
+        self, content: str, analysis: Optional[DocumentAnalysis] = None
+    ) -> List[str]:
         """Extract relevant keywords from content."""
         # Simple keyword extraction using frequency and relevance
-        words = re.findall(r"\b[a-zA-Z]{3,}\b", content.lower())
+        words = (analysis or analyze_document(content)).tokens
 
         # Filter out common words
         stop_words = {
@@ -434,7 +451,9 @@ class MetadataEnhancer:
         sorted_words = sorted(word_counts.items(), key=lambda x: x[1], reverse=True)
         return [word for word, count in sorted_words[:20] if count > 2]
 
-    def _detect_genre_basic(self, content: str) -> List[str]:
+    def _detect_genre_basic(
+        self, content: str, analysis: Optional[DocumentAnalysis] = None
+    ) -> List[str]:
         """Basic genre detection using keyword patterns."""
         genre_keywords = {
             "fantasy": [
@@ -518,7 +537,7 @@ class MetadataEnhancer:
             ],
         }
 
-        content_lower = content.lower()
+        content_lower = (analysis or analyze_document(content)).lower
         genre_scores = {}
 
         for genre, keywords in genre_keywords.items():
@@ -530,29 +549,17 @@ class MetadataEnhancer:
         sorted_genres = sorted(genre_scores.items(), key=lambda x: x[1], reverse=True)
         return [genre.replace("_", " ").title() for genre, score in sorted_genres[:3]]
 
-    def _estimate_reading_level(self, content: str) -> str:
+    def _estimate_reading_level(
+        self, content: str, analysis: Optional[DocumentAnalysis] = None
+    ) -> str:
         """Estimate reading level using basic text metrics."""
-        sentences = re.split(r"[.!?]+", content)
-        sentences = [s.strip() for s in sentences if s.strip()]
-
-        if not sentences:
+        analysis = analysis or analyze_document(content)
+        if analysis.sentence_count == 0 or analysis.word_count == 0:
             return "unknown"
 
         # Calculate averages
-        total_words = 0
-        total_syllables = 0
-
-        for sentence in sentences:
-            words = sentence.split()
-            total_words += len(words)
-            for word in words:
-                total_syllables += self._count_syllables(word)
-
-        if len(sentences) == 0 or total_words == 0:
-            return "unknown"
-
-        avg_sentence_length = total_words / len(sentences)
-        avg_syllables_per_word = total_syllables / total_words
+        avg_sentence_length = analysis.word_count / analysis.sentence_count
+        avg_syllables_per_word = analysis.syllable_count / analysis.word_count
 
         # Simple reading level estimation
         if avg_sentence_length < 15 and avg_syllables_per_word < 1.5:
@@ -564,29 +571,6 @@ class MetadataEnhancer:
         else:
             return "college"
 
-    def _count_syllables(self, word: str) -> int:
-        """Estimate syllable count for a word."""
-        word = word.lower().strip()
-        if not word:
-            return 0
-
-        # Simple syllable counting heuristic
-        vowels = "aeiouy"
-        syllable_count = 0
-        prev_was_vowel = False
-
-        for char in word:
-            is_vowel = char in vowels
-            if is_vowel and not prev_was_vowel:
-                syllable_count += 1
-            prev_was_vowel = is_vowel
-
-        # Handle silent e
-        if word.endswith("e") and syllable_count > 1:
-            syllable_count -= 1
-
-        return max(1, syllable_count)
-
 
 class GenreDetector:
     """Advanced genre detection using AI models."""
@@ -595,12 +579,18 @@ class GenreDetector:
         self.model_manager = model_manager
         self.logger = logging.getLogger(__name__)
 
-    def detect_genre(self, content: str, metadata: Dict[str, Any]) -> AIResult:
+    def detect_genre(
+        self,
+        content: str,
+        metadata: Dict[str, Any],
+        analysis: Optional[DocumentAnalysis] = None,
+    ) -> AIResult:
         """Detect genre using AI analysis.
 
         Args:
             content: Document content
             metadata: Existing metadata
+            analysis: Shared analysis of ``content`` (created if not given)
 
         Returns:
             AIResult with genre detection results
@@ -631,7 +621,7 @@ class GenreDetector:
 
             if not ai_result["success"]:
                 # Fallback to rule-based detection
-                ai_result = self._detect_with_rules(content)
+                ai_result = self._detect_with_rules(content, analysis)
 
             # Save to cache
             self.model_manager.save_to_cache(cache_key, ai_result)
@@ -697,8 +687,9 @@ class GenreDetector:
 
         return {"success": False, "reason": "model_error"}
 
-    def _detect_with_rules(self, content: str) -> Dict:
+    def _detect_with_rules(self, content: str, analysis: Optional[DocumentAnalysis] = None) -> Dict:
         """Fallback rule-based genre detection."""
+        analysis = analysis or analyze_document(content)
         # Enhanced rule-based detection
         genre_patterns = {
             "fantasy": {
@@ -823,7 +814,7 @@ class GenreDetector:
             },
         }
 
-        content_lower = content.lower()
+        content_lower = analysis.lower
         genre_scores = {}
 
         for genre, pattern in genre_patterns.items():
@@ -851,7 +842,7 @@ class GenreDetector:
         primary_score = sorted_genres[0][1]
 
         # Calculate confidence based on score relative to content length
-        max_possible_score = len(content.split()) * 0.1  # Rough estimate
+        max_possible_score = analysis.word_count * 0.1  # Rough estimate
         confidence = min(0.9, primary_score / max_possible_score)
 
         secondary_genres = [genre for genre, score in sorted_genres[1:3]]
@@ -1103,19 +1094,29 @@ class AIIntegrationManager:
             "caching": self.config.cache_enabled,
         }
 
-    def enhance_metadata(self, content: str, metadata: Dict[str, Any]) -> AIResult:
+    def enhance_metadata(
+        self,
+        content: str,
+        metadata: Dict[str, Any],
+        analysis: Optional[DocumentAnalysis] = None,
+    ) -> AIResult:
         """Enhance metadata using AI."""
         if not self.config.enabled:
             return AIResult(success=False, data={}, error_message="AI features disabled")
 
-        return self.metadata_enhancer.enhance_metadata(content, metadata)
+        return self.metadata_enhancer.enhance_metadata(content, metadata, analysis)
 
-    def detect_genre(self, content: str, metadata: Dict[str, Any]) -> AIResult:
+    def detect_genre(
+        self,
+        content: str,
+        metadata: Dict[str, Any],
+        analysis: Optional[DocumentAnalysis] = None,
+    ) -> AIResult:
         """Detect genre using AI."""
         if not self.config.enabled:
             return AIResult(success=False, data={}, error_message="AI features disabled")
 
-        return self.genre_detector.detect_genre(content, metadata)
+        return self.genre_detector.detect_genre(content, metadata, analysis)
 
     def generate_alt_text(self, image_path: Path, context: str = "") -> AIResult:
         """Generate alt-text for images."""
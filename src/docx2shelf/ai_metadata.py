@@ -8,12 +8,12 @@ using AI analysis of document content.
 from __future__ import annotations
 
 import logging
-import re
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Set
 
 from .ai_integration import get_ai_manager
 from .metadata import EpubMetadata
+from .text_analysis import DocumentAnalysis, analyze_document
 from .utils import prompt_select
 
 
@@ -68,7 +68,11 @@ class AIMetadataEnhancer:
         self.logger = logging.getLogger(__name__)
 
     def enhance_metadata(
-        self, content: str, original_metadata: EpubMetadata, interactive: bool = False
+        self,
+        content: str,
+        original_metadata: EpubMetadata,
+        interactive: bool = False,
+        analysis: Optional[DocumentAnalysis] = None,
     ) -> EnhancedMetadata:
         """Enhance metadata using AI analysis.
 
@@ -76,6 +80,7 @@ class AIMetadataEnhancer:
             content: Document content for analysis
             original_metadata: Original metadata
             interactive: Whether to prompt user for selections
+            analysis: Shared analysis of ``content`` (created if not given)
 
         Returns:
             Enhanced metadata with suggestions
@@ -83,15 +88,16 @@ class AIMetadataEnhancer:
         print("🤖 Analyzing content for metadata enhancement...")
 
         enhanced = EnhancedMetadata(original=original_metadata)
+        analysis = analysis or analyze_document(content)
 
         if not self.ai_manager.is_available():
             print("⚠️  AI features not available - using basic analysis")
-            return self._enhance_basic(content, enhanced)
+            return self._enhance_basic(content, enhanced, analysis)
 
         try:
             # Get AI analysis
             ai_result = self.ai_manager.enhance_metadata(
-                content, self._metadata_to_dict(original_metadata)
+                content, self._metadata_to_dict(original_metadata), analysis
             )
 
             if ai_result.success:
@@ -106,11 +112,11 @@ class AIMetadataEnhancer:
                 print(f"✅ Metadata enhanced with {len(enhanced.suggestions)} suggestions")
             else:
                 print(f"⚠️  AI analysis failed: {ai_result.error_message}")
-                enhanced = self._enhance_basic(content, enhanced)
+                enhanced = self._enhance_basic(content, enhanced, analysis)
 
         except Exception as e:
             self.logger.error(f"Metadata enhancement error: {e}")
-            enhanced = self._enhance_basic(content, enhanced)
+            enhanced = self._enhance_basic(content, enhanced, analysis)
 
         return enhanced
 
@@ -287,13 +293,18 @@ class AIMetadataEnhancer:
         if auto_applied > 0:
             print(f"📊 Auto-applied {auto_applied} high-confidence suggestions")
 
-    def _enhance_basic(self, content: str, enhanced: EnhancedMetadata) -> EnhancedMetadata:
+    def _enhance_basic(
+        self,
+        content: str,
+        enhanced: EnhancedMetadata,
+        analysis: Optional[DocumentAnalysis] = None,
+    ) -> EnhancedMetadata:
         """Basic metadata enhancement without AI."""
         print("📊 Performing basic content analysis...")
+        analysis = analysis or analyze_document(content)
 
         # Basic statistics
-        words = content.split()
-        word_count = len(words)
+        word_count = analysis.word_count
         estimated_reading_time = max(1, word_count // 250)
 
         # Add basic suggestions
@@ -318,7 +329,7 @@ class AIMetadataEnhancer:
         )
 
         # Basic keyword extraction
-        keywords = self._extract_basic_keywords(content)
+        keywords = self._extract_basic_keywords(content, analysis)
         if keywords:
             enhanced.suggestions.append(
                 MetadataSuggestion(
@@ -331,7 +342,7 @@ class AIMetadataEnhancer:
             )
 
         # Basic genre detection
-        genres = self._detect_basic_genre(content)
+        genres = self._detect_basic_genre(content, analysis)
         for genre in genres[:2]:  # Top 2 genres
             enhanced.suggestions.append(
                 MetadataSuggestion(
@@ -345,10 +356,12 @@ class AIMetadataEnhancer:
 
         return enhanced
 
-    def _extract_basic_keywords(self, content: str) -> List[str]:
+    def _extract_basic_keywords(
+        self, content: str, analysis: Optional[DocumentAnalysis] = None
+    ) -> List[str]:
         """Basic keyword extraction using frequency analysis."""
         # Simple word frequency analysis
-        words = re.findall(r"\b[a-zA-Z]{4,}\b", content.lower())
+        words = (analysis or analyze_document(content)).terms
 
         # Common stop words to filter out
         stop_words = {
@@ -409,7 +422,9 @@ class AIMetadataEnhancer:
 
         return keywords[:20]
 
-    def _detect_basic_genre(self, content: str) -> List[str]:
+    def _detect_basic_genre(
+        self, content: str, analysis: Optional[DocumentAnalysis] = None
+    ) -> List[str]:
         """Basic genre detection using keyword patterns."""
         genre_keywords = {
             "Fantasy": ["magic", "wizard", "dragon", "spell", "enchanted", "kingdom", "quest"],
@@ -422,7 +437,7 @@ class AIMetadataEnhancer:
             "Literary Fiction": ["life", "character", "society", "human", "emotion", "family"],
         }
 
-        content_lower = content.lower()
+        content_lower = (analysis or analyze_document(content)).lower
         genre_scores = {}
 
         for genre, keywords in genre_keywords.items():
@@ -490,7 +505,10 @@ class AIMetadataEnhancer:
 
 
 def enhance_metadata_with_ai(
-    content: str, metadata: EpubMetadata, interactive: bool = False
+    content: str,
+    metadata: EpubMetadata,
+    interactive: bool = False,
+    analysis: Optional[DocumentAnalysis] = None,
 ) -> EnhancedMetadata:
     """Convenience function to enhance metadata with AI.
 
@@ -498,12 +516,13 @@ def enhance_metadata_with_ai(
         content: Document content
         metadata: Original metadata
         interactive: Whether to use interactive mode
+        analysis: Shared analysis of ``content`` (created if not given)
 
     Returns:
         Enhanced metadata with AI suggestions
     """
     enhancer = AIMetadataEnhancer()
-    return enhancer.enhance_metadata(content, metadata, interactive)
+    return enhancer.enhance_metadata(content, metadata, interactive, analysis)
 
 
 def suggest_metadata_improvements(content: str, metadata: EpubMetadata) -> List[MetadataSuggestion]:
@@ -1,8 +1,25 @@
 from __future__ import annotations
 
+import tempfile
 from pathlib import Path
-
-from .accessibility import process_accessibility_features
+from typing import TYPE_CHECKING, Optional
+
+from .accessibility import (
+    add_alt_text_to_html,
+    check_image_alt_text,
+    detect_document_language,
+    generate_accessibility_metadata,
+    prompt_for_alt_text,
+)
+from .chapter_pipeline import (
+    AriaLandmarkPass,
+    ChapterPipeline,
+    FigurePass,
+    HeadingIdPass,
+    LanguagePass,
+    ReadingOrderPass,
+    SanitizePass,
+)
 from .content_security import ContentSanitizer
 from .epub_chapters import process_chapters
 from .epub_css import setup_book_css
@@ -20,93 +37,79 @@ from .epub_pages import (
 )
 from .epub_resources import process_and_add_fonts, process_and_add_images
 from .figures import FigureConfig, FigureProcessor
-from .language import add_language_attributes_to_html
 from .metadata import BuildOptions, EpubMetadata
 from .path_utils import safe_filename, write_text_safe
-from .tools import epubcheck_cmd
+
+if TYPE_CHECKING:
+    from .incremental import IncrementalBuild
+
+
+def _report_chapter_pipeline(pipeline: ChapterPipeline, performance_monitor) -> None:
+    """Record the per-stage chapter pipeline timings."""
+    from .json_logger import get_json_logger
+
+    for stage, seconds in pipeline.timings.items():
+        performance_monitor.add_phase_time(f"chapter_pipeline.{stage}", seconds)
+
+    json_logger = get_json_logger()
+    if json_logger:
+        json_logger.log_conversion_phase("chapter_pipeline", pipeline.timing_report())
 
 
 def _run_epubcheck_validation(epub_path: Path, quiet: bool = False) -> None:
-    """Run EPUBCheck validation with enhanced reporting."""
-    try:
-        import subprocess
+    """Run EPUBCheck validation with enhanced reporting.
 
-        cmd = epubcheck_cmd()
-        if not cmd:
-            if not quiet:
-                print(
-                    "[EPUBCHECK] EPUBCheck: Not available (install via 'docx2shelf tools install epubcheck')"
-                )
-            return
+    Goes through ``validation.EPUBValidator``, which caches the EPUBCheck run
+    by EPUB content, so the build's later validation report reuses it.
+    """
+    from .validation import EPUBValidator
 
+    validator = EPUBValidator(timeout=60)
+    if not validator.epubcheck_available:
         if not quiet:
-            print("[EPUBCHECK] Running EPUBCheck validation...")
-
-        # Run EPUBCheck with JSON output if supported
-        proc = subprocess.run(cmd + [str(epub_path)], capture_output=True, text=True, timeout=60)
-
-        output = (proc.stdout or "") + "\n" + (proc.stderr or "")
-
-        # Parse output for issues. EPUBCheck emits diagnostic lines that begin
-        # with one of: ERROR(...), WARNING(...), INFO(...), or FATAL(...).
-        # A naive substring match catches summary lines like "No errors or
-        # warnings detected." and "Messages: 0 fatals / 0 errors / ..." as
-        # errors. Match only the structured diagnostic prefix.
-        import re as _re
-
-        errors: list[str] = []
-        warnings: list[str] = []
-        info_messages: list[str] = []
-        diag_re = _re.compile(r"^\s*(ERROR|WARNING|INFO|FATAL|USAGE)\(")
-
-        for line in output.splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            m = diag_re.match(line)
-            if not m:
-                continue
-            kind = m.group(1).upper()
-            if kind in ("ERROR", "FATAL"):
-                errors.append(line)
-            elif kind == "WARNING":
-                warnings.append(line)
-            elif kind == "INFO":
-                info_messages.append(line)
-
-        # Generate summary
-        if not quiet:
-            if errors or warnings:
-                print(f"[EPUBCHECK] EPUBCheck: {len(errors)} error(s), {len(warnings)} warning(s)")
-
-                # Show first few critical issues
-                critical_issues = errors[:3] + warnings[:3]
-                if critical_issues:
-                    print("   Top issues:")
-                    for issue in critical_issues:
-                        # Clean up the issue message
-                        clean_issue = issue.replace("ERROR", "").replace("WARNING", "").strip()
-                        if clean_issue:
-                            print(f"   • {clean_issue}")
-
-                if len(errors) > 3 or len(warnings) > 3:
-                    print(f"   ... and {max(0, len(errors) - 3 + len(warnings) - 3)} more issues")
-
-                # Suggest actionable fixes
-                if errors:
-                    print("   💡 Fix errors for better reader compatibility")
-                if warnings and not errors:
-                    print("   💡 Address warnings for optimal EPUB quality")
-
-            else:
-                print("[EPUBCHECK] EPUBCheck: [SUCCESS] No issues found")
-
-    except subprocess.TimeoutExpired:
-        if not quiet:
-            print("[EPUBCHECK] EPUBCheck: Timeout (file may be too large)")
-    except Exception as e:
-        if not quiet:
-            print(f"[EPUBCHECK] EPUBCheck: Error during validation ({e})")
+            print(
+                "[EPUBCHECK] EPUBCheck: Not available (install via 'docx2shelf tools install epubcheck')"
+            )
+        return
+
+    if not quiet:
+        print("[EPUBCHECK] Running EPUBCheck validation...")
+
+    result = validator.validate(epub_path, custom_checks=False)
+    if quiet:
+        return
+
+    if any(issue.rule == "epubcheck_timeout" for issue in result.errors):
+        print("[EPUBCHECK] EPUBCheck: Timeout (file may be too large)")
+        return
+    failures = [issue for issue in result.errors if issue.rule == "epubcheck_error"]
+    if failures:
+        print(f"[EPUBCHECK] EPUBCheck: Error during validation ({failures[0].message})")
+        return
+
+    errors, warnings = result.errors, result.warnings
+    if errors or warnings:
+        print(f"[EPUBCHECK] EPUBCheck: {len(errors)} error(s), {len(warnings)} warning(s)")
+
+        # Show first few critical issues
+        critical_issues = errors[:3] + warnings[:3]
+        if critical_issues:
+            print("   Top issues:")
+            for issue in critical_issues:
+                location = f"{issue.location}: " if issue.location else ""
+                print(f"   • {location}{issue.message}")
+
+        if len(errors) > 3 or len(warnings) > 3:
+            print(f"   ... and {max(0, len(errors) - 3 + len(warnings) - 3)} more issues")
+
+        # Suggest actionable fixes
+        if errors:
+            print("   💡 Fix errors for better reader compatibility")
+        if warnings and not errors:
+            print("   💡 Address warnings for optimal EPUB quality")
+
+    else:
+        print("[EPUBCHECK] EPUBCheck: [SUCCESS] No issues found")
 
 
 def plan_build(
@@ -141,8 +144,56 @@ def assemble_epub(
     output_path: Path,
     styles_css: str = "",
     performance_monitor=None,
+    incremental: Optional[IncrementalBuild] = None,
+) -> None:
+    """Assemble the EPUB with ebooklib and write to output_path.
+
+    With ``incremental`` (watch mode) unchanged chapters, images and archive
+    entries are reused from the previous build of the same book.
+    """
+    if incremental is not None:
+        _assemble_epub(
+            meta,
+            opts,
+            html_chunks,
+            resources,
+            output_path,
+            styles_css,
+            performance_monitor,
+            work_dir=incremental.work_dir,
+            incremental=incremental,
+        )
+    elif opts.epub_writer == "streaming":
+        # Processed images are copied from disk when the archive is written,
+        # so they need a directory that lives until then
+        with tempfile.TemporaryDirectory(prefix="docx2shelf_epub_") as work_dir:
+            _assemble_epub(
+                meta,
+                opts,
+                html_chunks,
+                resources,
+                output_path,
+                styles_css,
+                performance_monitor,
+                work_dir=Path(work_dir),
+            )
+    else:
+        _assemble_epub(
+            meta, opts, html_chunks, resources, output_path, styles_css, performance_monitor
+        )
+
+
+def _assemble_epub(
+    meta: EpubMetadata,
+    opts: BuildOptions,
+    html_chunks: list[str],
+    resources: list[Path],
+    output_path: Path,
+    styles_css: str,
+    performance_monitor,
+    work_dir: Optional[Path] = None,
+    incremental: Optional[IncrementalBuild] = None,
 ) -> None:
-    """Assemble the EPUB with ebooklib and write to output_path."""
     from .performance import PerformanceMonitor
 
     # Initialize performance monitoring if not provided
@@ -175,8 +226,10 @@ def assemble_epub(
 
     # Process and add resources (images) to EPUB
     with performance_monitor.phase_timer("resource_processing"):
-        if resources:
-            process_and_add_images(book, resources, opts)
+        if resources and incremental is not None:
+            incremental.add_resources(book, resources, opts)
+        elif resources:
+            process_and_add_images(book, resources, opts, work_dir=work_dir)
 
     # Initialize figure processor for semantic markup
     figure_config = FigureConfig(
@@ -190,66 +243,68 @@ def assemble_epub(
     # Process accessibility features
     if not opts.quiet:
         print("🔍 Processing EPUB Accessibility features...")
-
-    html_chunks, accessibility_meta = process_accessibility_features(
-        html_chunks, meta, interactive=not opts.quiet, quiet=opts.quiet
-    )
+        # Prompting needs every image that lacks alt text up front, so this
+        # interactive step stays outside the per-chapter pipeline
+        alt_text_map = prompt_for_alt_text(check_image_alt_text(html_chunks))
+        if alt_text_map:
+            html_chunks = add_alt_text_to_html(html_chunks, alt_text_map)
+            print(f"✅ Added alt text to {len(alt_text_map)} images")
 
     # Add accessibility metadata to EPUB
-    for key, value in accessibility_meta.items():
+    for key, value in generate_accessibility_metadata().items():
         book.add_metadata(None, "meta", value, {"property": key})
 
-    # Content security: sanitize HTML to remove dangerous scripts and elements
-    if not opts.quiet:
-        print("🔒 Applying content security sanitization...")
-
-    sanitizer = ContentSanitizer(strict_mode=True)
-    sanitized_chunks = []
-    security_warnings = []
-
-    for i, chunk in enumerate(html_chunks):
-        try:
-            sanitized_chunk = sanitizer.sanitize_html(chunk)
-            sanitized_chunks.append(sanitized_chunk)
-
-            # Check if anything was sanitized
-            report = sanitizer.get_sanitization_report()
-            if report["removed_elements"] or report["modified_attributes"]:
-                security_warnings.append(
-                    f"Chapter {i+1}: Removed {len(report['removed_elements'])} dangerous elements, "
-                    f"modified {len(report['modified_attributes'])} attributes"
-                )
-        except Exception as e:
-            if not opts.quiet:
-                print(f"Warning: Error sanitizing chunk {i+1}: {e}")
-            sanitized_chunks.append(chunk)  # Use original if sanitization fails
-
-    html_chunks = sanitized_chunks
-
-    # Report security sanitization results
-    if security_warnings and not opts.quiet:
-        print(
-            f"🛡️  Content security applied: {len(security_warnings)} chunks had dangerous content removed"
-        )
-        for warning in security_warnings[:3]:  # Show first 3 warnings
-            print(f"   {warning}")
-        if len(security_warnings) > 3:
-            print(f"   ... and {len(security_warnings) - 3} more")
-
-    # Add language-specific attributes to HTML
+    # Accessibility, content security, language and figure/heading passes all
+    # run over a single parse of each chapter
     language_code = meta.language or "en"
-    html_chunks = add_language_attributes_to_html(html_chunks, language_code)
-
-    if not opts.quiet:
-        print(f"🌐 Applied language settings for: {language_code}")
-        if opts.vertical_writing:
-            print("📝 Vertical writing mode enabled")
+    reading_order = ReadingOrderPass()
+    sanitize = SanitizePass(ContentSanitizer(strict_mode=True))
+    pipeline = ChapterPipeline(
+        [
+            AriaLandmarkPass(),
+            reading_order,
+            sanitize,
+            LanguagePass(detect_document_language(html_chunks, meta), language_code),
+            FigurePass(figure_processor),
+            HeadingIdPass(opts.toc_depth),
+        ],
+        memo=incremental.chapter_memo if incremental is not None else None,
+    )
 
     # Process chapters with heading IDs and navigation data
     with performance_monitor.phase_timer("chapter_processing"):
         chapters, chapter_links, chapter_sub_links = process_chapters(
-            book, html_chunks, meta, opts, style_item, figure_processor
+            book,
+            html_chunks,
+            meta,
+            opts,
+            style_item,
+            figure_processor,
+            pipeline=pipeline,
+            workers=opts.chapter_workers,
         )
+    _report_chapter_pipeline(pipeline, performance_monitor)
+
+    if not opts.quiet:
+        if reading_order.issues:
+            print("⚠️  Reading order issues found:")
+            for issue in reading_order.issues:
+                print(f"   {issue}")
+
+        # Report security sanitization results
+        security_warnings = sanitize.warnings
+        if security_warnings:
+            print(
+                f"🛡️  Content security applied: {len(security_warnings)} chunks had dangerous content removed"
+            )
+            for warning in security_warnings[:3]:  # Show first 3 warnings
+                print(f"   {warning}")
+            if len(security_warnings) > 3:
+                print(f"   ... and {len(security_warnings) - 3} more")
+
+        print(f"🌐 Applied language settings for: {language_code}")
+        if opts.vertical_writing:
+            print("📝 Vertical writing mode enabled")
 
     # Determine where the main reading content starts
     start_reading_link = determine_reader_start_link(chapter_links, opts)
@@ -282,17 +337,25 @@ def assemble_epub(
 
     # Write EPUB
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    epub.write_epub(str(output_path), book)
+    with performance_monitor.phase_timer("epub_writing"):
+        if incremental is not None:
+            incremental.write(output_path, book, chapters_reused=pipeline.reused)
+        elif opts.epub_writer == "streaming":
+            from .epub_writer import write_epub_streaming
+
+            write_epub_streaming(output_path, book)
+        else:
+            epub.write_epub(str(output_path), book)
 
     # Inspect output (dump sources)
     if opts.inspect:
         folder = output_path.with_suffix("")
         folder = folder.parent / (folder.name + ".src")
         folder.mkdir(parents=True, exist_ok=True)
-        # Save HTML chunks for debugging with safe path handling
-        for i, chunk in enumerate(html_chunks, start=1):
-            safe_chunk_path = folder / safe_filename(f"chap_{i:03d}.xhtml")
-            write_text_safe(safe_chunk_path, chunk)
+        # Save transformed chapter bodies for debugging with safe path handling
+        for chap in chapters:
+            safe_chunk_path = folder / safe_filename(Path(chap.file_name).name)
+            write_text_safe(safe_chunk_path, chap.content.decode("utf-8"))
 
         meta_content = "\n".join(
             [
@@ -304,6 +367,6 @@ def assemble_epub(
         )
         write_text_safe(folder / "meta.txt", meta_content)
 
-    # EPUBCheck validation (default enabled)
-    if opts.epubcheck:
+    # EPUBCheck validation (default enabled); patched watch rebuilds skip it
+    if opts.epubcheck and not (incremental is not None and incremental.patched):
         _run_epubcheck_validation(output_path, opts.quiet)
@@ -2,9 +2,13 @@ from __future__ import annotations
 
 import argparse
 import concurrent.futures
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from .epubcheck_daemon import exported_daemon, shared_daemon
+from .pandoc_pool import shared_pool
+
 
 def find_docx_files(directory: Path, pattern: str = "*.docx") -> List[Path]:
     """Find DOCX files in directory matching pattern."""
@@ -113,51 +117,70 @@ def run_batch_mode(
     successful = 0
     failed = 0
 
-    if parallel and len(docx_files) > 1:
-        # Parallel processing
-        if not quiet:
-            print(f"🔄 Processing {len(docx_files)} files in parallel...")
-
+    parallel = parallel and len(docx_files) > 1
+    if parallel:
         max_workers = max_workers or min(len(docx_files), 4)
 
-        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
-            future_to_file = {
-                executor.submit(process_single_file, args): args["input"] for args in file_args
-            }
+    # One warm Pandoc pool and one EPUBCheck JVM for the whole batch; worker
+    # processes attach to them through the environment instead of spawning
+    # pandoc and java per file. Sequential batches convert one file at a time
+    # in this process, so they start no pool.
+    pool_context = shared_pool(max_workers=max_workers) if parallel else nullcontext()
+    base = base_args or argparse.Namespace()
+    use_daemon = (
+        getattr(base, "epubcheck", "on") == "on" and getattr(base, "epubcheck_daemon", "on") == "on"
+    )
+    with (
+        pool_context as pandoc_pool,
+        pandoc_pool.exported() if pandoc_pool is not None else nullcontext(),
+        shared_daemon(use_daemon) as epubcheck_daemon,
+        exported_daemon(epubcheck_daemon),
+    ):
+        if parallel:
+            # Parallel processing
+            if not quiet:
+                print(f"🔄 Processing {len(docx_files)} files in parallel...")
+
+            with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+                future_to_file = {
+                    executor.submit(process_single_file, args): args["input"] for args in file_args
+                }
+
+                for future in concurrent.futures.as_completed(future_to_file):
+                    result = future.result()
+                    results.append(result)
+
+                    if result["success"]:
+                        successful += 1
+                        if not quiet:
+                            print(
+                                f"✅ {Path(result['input']).name} -> {Path(result['output']).name}"
+                            )
+                    else:
+                        failed += 1
+                        if not quiet:
+                            print(f"❌ {Path(result['input']).name}: {result['error']}")
+
+        else:
+            # Sequential processing
+            if not quiet:
+                print(f"🔄 Processing {len(docx_files)} files sequentially...")
 
-            for future in concurrent.futures.as_completed(future_to_file):
-                result = future.result()
+            for i, args_dict in enumerate(file_args, 1):
+                if not quiet:
+                    print(f"📖 Processing {i}/{len(docx_files)}: {Path(args_dict['input']).name}")
+
+                result = process_single_file(args_dict)
                 results.append(result)
 
                 if result["success"]:
                     successful += 1
                     if not quiet:
-                        print(f"✅ {Path(result['input']).name} -> {Path(result['output']).name}")
+                        print(f"✅ Completed: {Path(result['output']).name}")
                 else:
                     failed += 1
                     if not quiet:
-                        print(f"❌ {Path(result['input']).name}: {result['error']}")
-
-    else:
-        # Sequential processing
-        if not quiet:
-            print(f"🔄 Processing {len(docx_files)} files sequentially...")
-
-        for i, args_dict in enumerate(file_args, 1):
-            if not quiet:
-                print(f"📖 Processing {i}/{len(docx_files)}: {Path(args_dict['input']).name}")
-
-            result = process_single_file(args_dict)
-            results.append(result)
-
-            if result["success"]:
-                successful += 1
-                if not quiet:
-                    print(f"✅ Completed: {Path(result['output']).name}")
-            else:
-                failed += 1
-                if not quiet:
-                    print(f"❌ Failed: {result['error']}")
+                        print(f"❌ Failed: {result['error']}")
 
     # Generate summary
     summary = {
@@ -0,0 +1,188 @@
+"""
+Shared SQLite access layer for Docx2Shelf's local databases.
+
+Opening a fresh ``sqlite3.connect()`` for every lookup, from several worker
+threads, with the default rollback journal leads to ``database is locked``
+stalls. ``CacheDatabase`` instead keeps one connection per thread per database
+file in WAL mode (readers never block the writer), reuses each connection's
+prepared-statement cache, and can defer writes so a whole build commits once.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Statements cached per connection; the hot cache queries are a handful of
+# fixed SQL strings, so this is generous.
+_STATEMENT_CACHE_SIZE = 256
+
+_registry: Dict[Tuple[str, int], "CacheDatabase"] = {}
+_registry_lock = threading.Lock()
+
+
+class CacheDatabase:
+    """Per-thread pooled SQLite connections for one database file.
+
+    Use ``connection()`` as a context manager for reads and immediate writes
+    (the transaction commits on exit, as with a plain sqlite3 connection).
+    Use ``write()`` for writes that may be deferred: inside a ``batched()``
+    block they are queued and committed in one transaction when the outermost
+    block exits. Batches belong to the thread that opened them; writes from
+    other threads are not queued behind them. Queued rows are not visible to
+    reads until they are committed; call ``flush()`` first when that matters.
+    """
+
+    def __init__(self, db_path: Path, detect_types: int = 0, busy_timeout: float = 30.0):
+        self.db_path = Path(db_path)
+        self.detect_types = detect_types
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._connections: Dict[int, Tuple[threading.Thread, sqlite3.Connection]] = {}
+        self._lock = threading.Lock()
+        # Kept apart from ``_local`` so close_all() does not drop open batches
+        self._batches = threading.local()
+
+    @classmethod
+    def shared(cls, db_path: Path, detect_types: int = 0) -> "CacheDatabase":
+        """Return the process-wide instance for a database file."""
+        key = (str(Path(db_path).resolve()), detect_types)
+        with _registry_lock:
+            db = _registry.get(key)
+            if db is not None and not db.db_path.exists():
+                # The file was deleted (e.g. cache wiped); pooled connections
+                # would keep writing to the unlinked inode
+                db.close_all()
+                db = None
+            if db is None:
+                db = _registry[key] = cls(db_path, detect_types=detect_types)
+            return db
+
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+        return conn
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout,
+            detect_types=self.detect_types,
+            cached_statements=_STATEMENT_CACHE_SIZE,
+            # Only ever used by its owning thread; close_all() runs after
+            # that thread is done with it.
+            check_same_thread=False,
+        )
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        except sqlite3.DatabaseError:
+            # WAL is unavailable on some network filesystems; the busy timeout
+            # still applies in rollback-journal mode.
+            pass
+
+        current = threading.current_thread()
+        with self._lock:
+            # Threads from finished executors never come back; drop their connections
+            for ident, (thread, stale) in list(self._connections.items()):
+                if not thread.is_alive():
+                    stale.close()
+                    del self._connections[ident]
+            self._connections[current.ident] = (current, conn)
+        return conn
+
+    def _batch(self) -> threading.local:
+        """Return this thread's batch state (nesting depth and queued writes)."""
+        batch = self._batches
+        if not hasattr(batch, "depth"):
+            batch.depth = 0
+            batch.pending = []
+        return batch
+
+    @contextmanager
+    def batched(self) -> Iterator["CacheDatabase"]:
+        """Defer this thread's ``write()`` calls and commit them together on exit.
+
+        Blocks nest; only the outermost one flushes. Queued writes are
+        discarded if the block raises.
+        """
+        batch = self._batch()
+        batch.depth += 1
+        ok = False
+        try:
+            yield self
+            ok = True
+        finally:
+            batch.depth -= 1
+            if batch.depth == 0:
+                pending, batch.pending = batch.pending, []
+                if ok and pending:
+                    self._execute(pending)
+
+    def write(self, sql: str, params: Sequence[Any] = ()) -> None:
+        """Execute a write now, or queue it while this thread has a batch open."""
+        batch = self._batch()
+        if batch.depth:
+            batch.pending.append((sql, tuple(params)))
+            return
+        self._execute([(sql, params)])
+
+    def write_many(self, sql: str, rows: Sequence[Sequence[Any]]) -> None:
+        """Execute or queue the same statement for many parameter rows."""
+        batch = self._batch()
+        if batch.depth:
+            batch.pending.extend((sql, tuple(row)) for row in rows)
+            return
+        self._execute([(sql, row) for row in rows])
+
+    def flush(self) -> None:
+        """Commit this thread's queued writes without closing its batch."""
+        batch = self._batch()
+        pending, batch.pending = batch.pending, []
+        if pending:
+            self._execute(pending)
+
+    @property
+    def pending_writes(self) -> int:
+        """Number of writes queued by the calling thread."""
+        return len(self._batch().pending)
+
+    def _execute(self, statements: List[Tuple[str, Sequence[Any]]]) -> None:
+        conn = self.connection()
+        with conn:
+            # Group consecutive runs of the same statement into executemany
+            run_sql: Optional[str] = None
+            run_rows: List[Sequence[Any]] = []
+            for sql, params in statements:
+                if sql != run_sql and run_rows:
+                    conn.executemany(run_sql, run_rows)
+                    run_rows = []
+                run_sql = sql
+                run_rows.append(params)
+            if run_rows:
+                conn.executemany(run_sql, run_rows)
+
+    def close_all(self) -> None:
+        """Flush this thread's pending writes and close every pooled connection."""
+        self.flush()
+        with self._lock:
+            connections = [conn for _, conn in self._connections.values()]
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+
+def close_shared_databases() -> None:
+    """Close all process-wide database instances (used by tests and shutdown)."""
+    with _registry_lock:
+        databases = list(_registry.values())
+        _registry.clear()
+    for db in databases:
+        db.close_all()
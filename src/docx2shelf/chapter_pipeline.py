@@ -0,0 +1,590 @@
+"""Fused per-chapter transform pipeline.
+
+Chapters used to go through a chain of independent full-text rewrites
+(accessibility fixes, sanitization, language attributes, figure markup and
+heading ids), each rescanning or reparsing the whole chapter. A
+``ChapterPipeline`` parses a chapter once, walks the tree once to hand every
+registered pass the nodes it asked for, and serializes once. Time spent in
+each pass is accumulated so builds can report where chapter processing goes.
+
+Processing is split into a per-chapter map (``transform``), which only
+touches the chapter and its context and can run in worker processes, and a
+cheap ``reduce`` run in the parent in reading order, where passes fold
+chapter results into book-wide state such as figure numbers. Running the
+map serially or in parallel gives byte-identical chapters.
+
+Because the map step depends only on the chapter, its context and the pass
+configuration, a pipeline given a ``memo`` dict reuses the transform of any
+chapter it has seen before (watch-mode rebuilds keep one memo per book).
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import logging
+import os
+import pickle
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+from bs4 import BeautifulSoup, CData, Comment, Tag
+
+from .content_security import ContentSanitizer
+from .figures import FigureProcessor
+from .language import get_language_config
+
+logger = logging.getLogger(__name__)
+
+# Pseudo tag names a pass can ask for in ``ChapterPass.tags``
+ALL_TAGS = "*"
+COMMENTS = "#comment"
+
+HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+
+# With no explicit worker count, only books at least this large are worth
+# the cost of starting worker processes.
+PARALLEL_MIN_CHAPTERS = 16
+PARALLEL_MIN_BYTES = 1024 * 1024
+
+
+@dataclass
+class ChapterContext:
+    """Inputs a pass may read and outputs it may fill in for one chapter."""
+
+    number: int  # 1-based chapter number, used for file names and ids
+    chunk_index: int  # 0-based index of the source HTML chunk
+    title: str
+    chapter_id: str
+    manual: bool = False  # chapter comes from user-defined chapter starts
+    h1_id: str = ""
+    headings: list[tuple[str, str, int]] = field(default_factory=list)
+    # Per-pass results handed from transform (maybe in a worker) to reduce
+    notes: dict[str, Any] = field(default_factory=dict)
+
+
+class ChapterPass:
+    """One stage of the chapter pipeline.
+
+    ``tags`` names the elements the pass wants to visit; ``ALL_TAGS`` selects
+    every element and ``COMMENTS`` selects comments and CDATA sections. For
+    each chapter the pipeline calls ``begin``, then ``visit`` for every
+    requested node still attached to the tree (in document order), then
+    ``finish``. These may run in a worker process on a copy of the pass, so
+    anything the build needs afterwards goes into ``ctx.notes`` and is picked
+    up by ``reduce``, which runs in the calling process in chapter order.
+    """
+
+    name = "pass"
+    tags: tuple[str, ...] = ()
+
+    def begin(self, soup: BeautifulSoup, ctx: ChapterContext) -> None:
+        pass
+
+    def visit(self, node: Any, ctx: ChapterContext) -> None:
+        pass
+
+    def finish(self, soup: BeautifulSoup, ctx: ChapterContext) -> None:
+        pass
+
+    def reduce(self, html: str, ctx: ChapterContext) -> str:
+        return html
+
+    def signature(self) -> tuple:
+        """Configuration that changes what ``transform`` produces (part of memo keys)."""
+        return ()
+
+
+class ChapterPipeline:
+    """Runs registered passes over a single parse of each chapter."""
+
+    def __init__(
+        self,
+        passes: Iterable[ChapterPass] = (),
+        memo: Optional[dict[str, tuple[str, ChapterContext]]] = None,
+    ):
+        self.passes: list[ChapterPass] = []
+        self.timings: dict[str, float] = {"parse": 0.0, "walk": 0.0, "serialize": 0.0}
+        self.chapters = 0
+        self.workers = 1
+        # Transform results by memo_key(); only keys used by the last run_all are kept
+        self.memo = memo
+        self.reused = 0
+        for chapter_pass in passes:
+            self.register(chapter_pass)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Worker processes never consult the memo; don't ship it to them
+        state = self.__dict__.copy()
+        state["memo"] = None
+        return state
+
+    def register(self, chapter_pass: ChapterPass) -> ChapterPass:
+        """Append a pass; passes run in registration order."""
+        self.passes.append(chapter_pass)
+        self.timings.setdefault(chapter_pass.name, 0.0)
+        return chapter_pass
+
+    def run(self, html: str, ctx: ChapterContext) -> str:
+        """Transform and reduce one chapter and return the serialized result."""
+        return self.reduce(self.transform(html, ctx), ctx)
+
+    def run_all(
+        self, jobs: list[tuple[str, ChapterContext]], workers: Optional[int] = None
+    ) -> list[tuple[str, ChapterContext]]:
+        """Run many chapters, transforming them in worker processes when worthwhile.
+
+        Args:
+            jobs: (html, context) pairs in reading order
+            workers: Process count; None picks one per CPU for large books
+                and stays in-process for small ones
+
+        Returns:
+            (html, context) pairs in the same order. Contexts may be copies
+            of the ones passed in.
+        """
+        if self.memo is None:
+            transformed = self._transform_all(jobs, workers)
+        else:
+            transformed = self._transform_memoized(jobs, workers)
+        return [(self.reduce(html, ctx), ctx) for html, ctx in transformed]
+
+    def _transform_all(
+        self, jobs: list[tuple[str, ChapterContext]], workers: Optional[int]
+    ) -> list[tuple[str, ChapterContext]]:
+        self.workers = choose_workers(len(jobs), sum(len(html) for html, _ in jobs), workers)
+        if self.workers > 1:
+            results = map_in_processes(
+                self.workers,
+                _init_worker,
+                self,
+                _transform_in_worker,
+                [html for html, _ in jobs],
+                [ctx for _, ctx in jobs],
+                label="chapter processing",
+            )
+            if results is not None:
+                transformed = []
+                for html, ctx, timings in results:
+                    for stage, seconds in timings.items():
+                        self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+                    transformed.append((html, ctx))
+                return transformed
+            self.workers = 1
+        return [(self.transform(html, ctx), ctx) for html, ctx in jobs]
+
+    def _transform_memoized(
+        self, jobs: list[tuple[str, ChapterContext]], workers: Optional[int]
+    ) -> list[tuple[str, ChapterContext]]:
+        signature = self.signature()
+        keys = [self.memo_key(html, ctx, signature) for html, ctx in jobs]
+        missing = [i for i, key in enumerate(keys) if key not in self.memo]
+        fresh = self._transform_all([jobs[i] for i in missing], workers) if missing else []
+
+        memo = {key: self.memo[key] for key in keys if key in self.memo}
+        for i, (html, ctx) in zip(missing, fresh):
+            # reduce() consumes ctx.notes, so the memo keeps its own copy
+            memo[keys[i]] = (html, copy.deepcopy(ctx))
+        self.memo.clear()
+        self.memo.update(memo)
+        self.reused += len(jobs) - len(missing)
+
+        results = []
+        for key in keys:
+            html, ctx = self.memo[key]
+            results.append((html, copy.deepcopy(ctx)))
+        return results
+
+    def signature(self) -> str:
+        """Configuration of every registered pass, in order."""
+        return repr([(p.name, p.signature()) for p in self.passes])
+
+    @staticmethod
+    def memo_key(html: str, ctx: ChapterContext, signature: str) -> str:
+        """Hash of everything a chapter's transform depends on."""
+        digest = hashlib.sha256(signature.encode("utf-8"))
+        identity = (ctx.number, ctx.chunk_index, ctx.title, ctx.chapter_id, ctx.manual)
+        digest.update(repr(identity).encode("utf-8"))
+        digest.update(html.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def transform(self, html: str, ctx: ChapterContext) -> str:
+        """Per-chapter map step: parse, run every pass, serialize."""
+        clock = time.perf_counter
+        started = clock()
+        soup = BeautifulSoup(html, "html.parser")
+        parsed = clock()
+        buckets = self._collect(soup)
+        self.timings["parse"] += parsed - started
+        self.timings["walk"] += clock() - parsed
+
+        for chapter_pass, nodes in zip(self.passes, buckets):
+            started = clock()
+            chapter_pass.begin(soup, ctx)
+            for node in nodes:
+                # Earlier passes may have removed or unwrapped the node
+                if node.parent is not None:
+                    chapter_pass.visit(node, ctx)
+            chapter_pass.finish(soup, ctx)
+            self.timings[chapter_pass.name] += clock() - started
+
+        started = clock()
+        html = str(soup)
+        self.timings["serialize"] += clock() - started
+        return html
+
+    def reduce(self, html: str, ctx: ChapterContext) -> str:
+        """Sequential step: let each pass fold the chapter into book-wide state."""
+        clock = time.perf_counter
+        for chapter_pass in self.passes:
+            started = clock()
+            html = chapter_pass.reduce(html, ctx)
+            self.timings[chapter_pass.name] += clock() - started
+        self.chapters += 1
+        return html
+
+    def _collect(self, soup: BeautifulSoup) -> list[list[Any]]:
+        """Walk the tree once and sort nodes into one bucket per pass."""
+        buckets: list[list[Any]] = [[] for _ in self.passes]
+        by_tag: dict[str, list[list[Any]]] = {}
+        for chapter_pass, bucket in zip(self.passes, buckets):
+            for tag in chapter_pass.tags:
+                by_tag.setdefault(tag, []).append(bucket)
+        if not by_tag:
+            return buckets
+
+        every = by_tag.pop(ALL_TAGS, [])
+        comments = by_tag.pop(COMMENTS, [])
+        for node in soup.descendants:
+            if isinstance(node, Tag):
+                for bucket in every:
+                    bucket.append(node)
+                for bucket in by_tag.get(node.name, ()):
+                    bucket.append(node)
+            elif comments and isinstance(node, (Comment, CData)):
+                for bucket in comments:
+                    bucket.append(node)
+        return buckets
+
+    def timing_report(self) -> dict[str, Any]:
+        """Seconds spent per stage across all chapters run so far.
+
+        With worker processes the stage times are summed over workers, so
+        they can exceed the wall-clock time of the chapter phase.
+        """
+        return {
+            "chapters": self.chapters,
+            "workers": self.workers,
+            "reused": self.reused,
+            "stages": {name: round(seconds, 6) for name, seconds in self.timings.items()},
+        }
+
+
+def choose_workers(jobs: int, total_size: int, workers: Optional[int]) -> int:
+    """Number of worker processes for ``jobs`` chapters of ``total_size`` characters.
+
+    With ``workers`` None, books below ``PARALLEL_MIN_CHAPTERS`` chapters or
+    ``PARALLEL_MIN_BYTES`` stay in-process and larger ones get one worker
+    per CPU. Frozen builds always stay in-process.
+    """
+    from .performance import process_pools_available
+
+    if not process_pools_available():
+        return 1
+    if workers is None:
+        if jobs < PARALLEL_MIN_CHAPTERS or total_size < PARALLEL_MIN_BYTES:
+            return 1
+        workers = min(os.cpu_count() or 1, 32)
+    return max(1, min(workers, jobs))
+
+
+def map_in_processes(
+    workers: int,
+    initializer: Callable[[Any], None],
+    state: Any,
+    fn: Callable[..., Any],
+    *iterables: Sequence[Any],
+    label: str = "processing",
+) -> Optional[list[Any]]:
+    """Map ``fn`` over ``iterables`` in worker processes, keeping input order.
+
+    Each worker runs ``initializer(state)`` first. Returns None, after
+    logging why, when worker processes cannot be used here; the caller then
+    does the same work serially.
+    """
+    chunksize = max(1, len(iterables[0]) // (workers * 4))
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=initializer, initargs=(state,)
+        ) as pool:
+            return list(pool.map(fn, *iterables, chunksize=chunksize))
+    except (OSError, BrokenProcessPool, pickle.PicklingError) as e:
+        logger.warning(f"Parallel {label} failed ({e}); running serially")
+        return None
+
+
+# Pipeline copy installed in each worker process by _init_worker
+_worker_pipeline: Optional[ChapterPipeline] = None
+
+
+def _init_worker(pipeline: ChapterPipeline) -> None:
+    global _worker_pipeline
+    _worker_pipeline = pipeline
+
+
+def _transform_in_worker(
+    html: str, ctx: ChapterContext
+) -> tuple[str, ChapterContext, dict[str, float]]:
+    pipeline = _worker_pipeline
+    before = dict(pipeline.timings)
+    html = pipeline.transform(html, ctx)
+    timings = {stage: pipeline.timings[stage] - before[stage] for stage in before}
+    return html, ctx, timings
+
+
+def _has_attr(node: Tag, suffix: str) -> bool:
+    """True if any attribute name ends with ``suffix`` (e.g. lang, xml:lang)."""
+    return any(attr.lower().endswith(suffix) for attr in node.attrs)
+
+
+def _heading_title(heading: Tag) -> str:
+    return re.sub(r"<[^>]+>", "", heading.decode_contents())
+
+
+class AriaLandmarkPass(ChapterPass):
+    """Mark the first chunk's body as the main landmark and label heading levels."""
+
+    name = "aria_landmarks"
+    tags = ("body",) + HEADING_TAGS
+
+    def visit(self, node: Tag, ctx: ChapterContext) -> None:
+        if node.name == "body":
+            if ctx.chunk_index == 0 and not _has_attr(node, "role"):
+                node["role"] = "main"
+        elif not _has_attr(node, "aria-level"):
+            node["aria-level"] = node.name[1]
+
+
+class ReadingOrderPass(ChapterPass):
+    """Collect heading hierarchy skips (e.g. h1 followed by h3)."""
+
+    name = "reading_order"
+    tags = HEADING_TAGS
+
+    def __init__(self) -> None:
+        # dict keeps first-seen order; a chunk can back more than one chapter
+        self._issues: dict[str, None] = {}
+        self._previous = 0
+
+    @property
+    def issues(self) -> list[str]:
+        return list(self._issues)
+
+    def begin(self, soup: BeautifulSoup, ctx: ChapterContext) -> None:
+        self._previous = 0
+        ctx.notes[self.name] = []
+
+    def visit(self, node: Tag, ctx: ChapterContext) -> None:
+        level = int(node.name[1])
+        if self._previous and level > self._previous + 1:
+            ctx.notes[self.name].append(
+                f"Chunk {ctx.chunk_index}: Heading hierarchy skip "
+                f"from h{self._previous} to h{level}"
+            )
+        self._previous = level
+
+    def reduce(self, html: str, ctx: ChapterContext) -> str:
+        for issue in ctx.notes.pop(self.name, ()):
+            self._issues.setdefault(issue)
+        return html
+
+
+class SanitizePass(ChapterPass):
+    """Remove scripts, event handlers and unsafe URLs (see ContentSanitizer)."""
+
+    name = "sanitize"
+    tags = (ALL_TAGS, COMMENTS)
+
+    def __init__(self, sanitizer: Optional[ContentSanitizer] = None) -> None:
+        self.sanitizer = sanitizer or ContentSanitizer(strict_mode=True)
+        self.warnings: list[str] = []
+
+    def begin(self, soup: BeautifulSoup, ctx: ChapterContext) -> None:
+        self.sanitizer.reset_report()
+
+    def visit(self, node: Any, ctx: ChapterContext) -> None:
+        self.sanitizer.sanitize_node(node)
+
+    def finish(self, soup: BeautifulSoup, ctx: ChapterContext) -> None:
+        report = self.sanitizer.get_sanitization_report()
+        if report["removed_elements"] or report["modified_attributes"]:
+            ctx.notes[self.name] = (
+                f"Chapter {ctx.number}: Removed {len(report['removed_elements'])} "
+                f"dangerous elements, modified {len(report['modified_attributes'])} attributes"
+            )
+
+    def reduce(self, html: str, ctx: ChapterContext) -> str:
+        warning = ctx.notes.pop(self.name, None)
+        if warning:
+            self.warnings.append(warning)
+        return html
+
+    def signature(self) -> tuple:
+        return (self.sanitizer.strict_mode,)
+
+
+class LanguagePass(ChapterPass):
+    """Add the html lang attribute and, for right-to-left languages, body dir.
+
+    As with the string helpers, nothing is added when the chapter already
+    declares a language or direction anywhere.
+    """
+
+    name = "language"
+    tags = (ALL_TAGS,)
+
+    def __init__(self, language: str, direction_language: Optional[str] = None) -> None:
+        self.language = language
+        config = get_language_config(direction_language or language or "en")
+        self.rtl = config["direction"] == "rtl"
+
+    def signature(self) -> tuple:
+        return (self.language, self.rtl)
+
+    def begin(self, soup: BeautifulSoup, ctx: ChapterContext) -> None:
+        self._html: list[Tag] = []
+        self._body: list[Tag] = []
+        self._has_lang = False
+        self._has_dir = False
+
+    def visit(self, node: Tag, ctx: ChapterContext) -> None:
+        if node.attrs:
+            self._has_lang = self._has_lang or _has_attr(node, "lang")
+            self._has_dir = self._has_dir or _has_attr(node, "dir")
+        if node.name == "html":
+            self._html.append(node)
+        elif node.name == "body":
+            self._body.append(node)
+
+    def finish(self, soup: BeautifulSoup, ctx: ChapterContext) -> None:
+        if self.language and not self._has_lang:
+            for node in self._html:
+                node["lang"] = self.language
+        if self.rtl and not self._has_dir:
+            for node in self._body:
+                node["dir"] = "rtl"
+
+
+class FigurePass(ChapterPass):
+    """Wrap images and tables in numbered <figure> markup.
+
+    Chapters are marked up with placeholder numbers; ``reduce`` hands them to
+    the book's FigureProcessor in reading order, which assigns the global
+    figure and table numbers.
+    """
+
+    name = "figures"
+    tags = ("img", "table")
+
+    def __init__(self, figure_processor: FigureProcessor) -> None:
+        self.figure_processor = figure_processor
+
+    def begin(self, soup: BeautifulSoup, ctx: ChapterContext) -> None:
+        self._images: list[Tag] = []
+        self._tables: list[Tag] = []
+
+    def visit(self, node: Tag, ctx: ChapterContext) -> None:
+        (self._images if node.name == "img" else self._tables).append(node)
+
+    def finish(self, soup: BeautifulSoup, ctx: ChapterContext) -> None:
+        if not (self._images or self._tables):
+            return
+        chapter_figures = FigureProcessor(self.figure_processor.config, deferred_numbering=True)
+        chapter_figures.process_soup(
+            soup, ctx.title, ctx.chapter_id, images=self._images, tables=self._tables
+        )
+        ctx.notes[self.name] = (chapter_figures.figures, chapter_figures.tables)
+
+    def reduce(self, html: str, ctx: ChapterContext) -> str:
+        if self.name not in ctx.notes:
+            return html
+        figures, tables = ctx.notes.pop(self.name)
+        return self.figure_processor.merge_deferred(html, figures, tables)
+
+    def signature(self) -> tuple:
+        return (repr(self.figure_processor.config),)
+
+
+class HeadingIdPass(ChapterPass):
+    """Give headings stable ids and collect ToC entries into the context.
+
+    Produces the same ids as ``inject_heading_ids`` and, for manual chapters,
+    ``inject_manual_chapter_ids`` in epub_chapters.
+    """
+
+    name = "heading_ids"
+    tags = HEADING_TAGS
+
+    def __init__(self, toc_depth: int = 2) -> None:
+        self.toc_depth = toc_depth
+
+    def signature(self) -> tuple:
+        return (self.toc_depth,)
+
+    def begin(self, soup: BeautifulSoup, ctx: ChapterContext) -> None:
+        self._headings: dict[int, list[Tag]] = {level: [] for level in range(1, 7)}
+        self._in_order: list[tuple[int, Tag]] = []
+
+    def visit(self, node: Tag, ctx: ChapterContext) -> None:
+        level = int(node.name[1])
+        self._headings[level].append(node)
+        self._in_order.append((level, node))
+
+    def finish(self, soup: BeautifulSoup, ctx: ChapterContext) -> None:
+        if ctx.manual:
+            self._manual_ids(soup, ctx)
+        else:
+            self._hierarchical_ids(ctx)
+
+    def _hierarchical_ids(self, ctx: ChapterContext) -> None:
+        h1_id = f"ch{ctx.number:03d}"
+        h1s = self._headings[1]
+        if h1s and not h1s[0].get("id"):
+            h1s[0]["id"] = h1_id
+
+        max_level = min(self.toc_depth, 6)
+        totals = {level: len(self._headings[level]) for level in range(2, max_level + 1)}
+        for level in range(2, max_level + 1):
+            # Parent levels are numbered by their total count, as the string
+            # version always did, so existing links keep working
+            prefix = [h1_id] + [f"s{totals[parent]:02d}" for parent in range(2, level)]
+            for position, heading in enumerate(self._headings[level], start=1):
+                if not heading.get("id"):
+                    heading["id"] = "-".join(prefix + [f"s{position:02d}"])
+
+        # ToC entries in document order
+        ctx.headings.extend(
+            (_heading_title(heading), heading["id"], level)
+            for level, heading in self._in_order
+            if 2 <= level <= max_level
+        )
+        ctx.h1_id = next((h["id"] for h in h1s if h.get("id")), h1_id)
+
+    def _manual_ids(self, soup: BeautifulSoup, ctx: ChapterContext) -> None:
+        h1_id = f"ch{ctx.number:03d}"
+        for position, heading in enumerate(self._headings[2], start=1):
+            if not heading.get("id"):
+                heading["id"] = f"{h1_id}-s{position:02d}"
+            ctx.headings.append((_heading_title(heading), heading["id"], 2))
+
+        h1s = self._headings[1]
+        if not h1s:
+            # Chapter anchor for manual starts that have no h1
+            soup.insert(0, soup.new_tag("div", id=h1_id))
+        elif not h1s[0].get("id"):
+            h1s[0]["id"] = h1_id
+        ctx.h1_id = h1_id
@@ -1,41 +1,8 @@
 from __future__ import annotations
 
-import argparse
 import sys
-from pathlib import Path
-from typing import Optional
-
-from .accessibility_audit import audit_epub_accessibility
-from .ai_accessibility import generate_image_alt_texts
-from .ai_genre_detection import detect_genre_with_ai
-from .ai_integration import AIConfig, get_ai_manager
-from .ai_metadata import enhance_metadata_with_ai
-from .content_validation import validate_content_quality
-from .error_handler import handle_error
-from .formats import check_format_dependencies, convert_epub
-from .metadata import BuildOptions, EpubMetadata, build_output_filename, parse_date
-from .path_utils import ensure_unicode_path, is_safe_path, normalize_path, safe_filename
-from .preview import run_live_preview
-from .publishing_checklists import format_checklist_report, get_checker, run_all_checklists
-from .quality_scoring import analyze_epub_quality
-from .tools import (
-    epubcheck_cmd,
-    install_epubcheck,
-    install_pandoc,
-    pandoc_path,
-    tools_dir,
-    uninstall_all_tools,
-    uninstall_epubcheck,
-    uninstall_pandoc,
-)
-from .update import check_for_updates
-from .utils import (
-    parse_kv_file,
-    prompt,
-    prompt_bool,
-    prompt_select,
-    sanitize_filename,
-)
+from typing import Any, Optional
+
 from .version import get_version_info
 
 
@@ -48,52 +15,54 @@ def get_version_string() -> str:
 # Import modular argument parser
 from .cli_args import _arg_parser
 
-# Import modular command handlers
-from .cli_handlers import (
-    _prompt_missing,
-    read_document_content,
-    run_ai_command,
-    run_batch_mode,
-    run_build,
-    run_checklist,
-    run_connectors,
-    run_convert,
-    run_doctor,
-    run_docx,
-    run_enterprise,
-    run_init_metadata,
-    run_list_profiles,
-    run_list_themes,
-    run_plugins,
-    run_preview_themes,
-    run_quality_assessment,
-    run_theme_editor,
-    run_tools,
-    run_update,
-    run_validate,
-    run_wizard,
-    save_metadata_to_file,
-)
-
-
-
-
-
-
-
-
-
-
-
+# Subcommand -> handler in cli_handlers. Handlers are imported on dispatch,
+# so startup (including ``--help`` and batch subprocesses) does not load
+# optional heavy dependencies such as torch, transformers or OpenCV.
+_COMMANDS = {
+    "build": "run_build",
+    "docx": "run_docx",
+    "init-metadata": "run_init_metadata",
+    "wizard": "run_wizard",
+    "theme-editor": "run_theme_editor",
+    "list-themes": "run_list_themes",
+    "preview-themes": "run_preview_themes",
+    "list-profiles": "run_list_profiles",
+    "batch": "run_batch_mode",
+    "tools": "run_tools",
+    "cache": "run_cache",
+    "plugins": "run_plugins",
+    "connectors": "run_connectors",
+    "ai": "run_ai_command",
+    "update": "run_update",
+    "doctor": "run_doctor",
+    "checklist": "run_checklist",
+    "quality": "run_quality_assessment",
+    "validate": "run_validate",
+    "convert": "run_convert",
+    "enterprise": "run_enterprise",
+}
 
 
+def __getattr__(name: str) -> Any:
+    # Handlers used to be imported here; keep ``from .cli import run_build`` working
+    from . import cli_handlers
 
+    try:
+        return getattr(cli_handlers, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
 
 
+def _handler(command: str):
+    from . import cli_handlers
 
+    return getattr(cli_handlers, _COMMANDS[command])
 
 
+def _check_for_updates() -> None:
+    from .update import check_for_updates
 
+    check_for_updates()
 
 
 def main(argv: Optional[list[str]] = None) -> int:
@@ -112,7 +81,7 @@ def main(argv: Optional[list[str]] = None) -> int:
     if not offline_mode and not (argv and "update" in argv[0]):
         import threading
 
-        update_thread = threading.Thread(target=check_for_updates, daemon=True)
+        update_thread = threading.Thread(target=_check_for_updates, daemon=True)
         update_thread.start()
 
     if not argv:
@@ -125,6 +94,8 @@ def main(argv: Optional[list[str]] = None) -> int:
     args = parser.parse_args(argv)
 
     if args.command == "build":
+        from .cli_handlers import _prompt_missing, run_build
+
         args = _prompt_missing(args)
         if getattr(args, "offline", False):
             from .cli_handlers.watch import offline_preflight
@@ -137,34 +108,8 @@ def main(argv: Optional[list[str]] = None) -> int:
 
             return run_build_watch(args, run_build)
         return run_build(args)
-    if args.command == "docx":
-        return run_docx(args)
-    if args.command == "init-metadata":
-        return run_init_metadata(args)
-    if args.command == "wizard":
-        return run_wizard(args)
-    if args.command == "theme-editor":
-        return run_theme_editor(args)
-    if args.command == "list-themes":
-        return run_list_themes(args)
-    if args.command == "preview-themes":
-        return run_preview_themes(args)
-    if args.command == "list-profiles":
-        return run_list_profiles(args)
-    if args.command == "batch":
-        return run_batch_mode(args)
-    if args.command == "tools":
-        return run_tools(args)
-    if args.command == "plugins":
-        return run_plugins(args)
-    if args.command == "connectors":
-        return run_connectors(args)
-    if args.command == "ai":
-        return run_ai_command(args)
-    if args.command == "update":
-        return run_update(args)
-    if args.command == "doctor":
-        return run_doctor(args)
+    if args.command in _COMMANDS:
+        return _handler(args.command)(args)
     if args.command == "interactive":
         from .interactive_cli import run_interactive_cli
 
@@ -174,16 +119,6 @@ def main(argv: Optional[list[str]] = None) -> int:
         from .gui.modern_app import main as run_modern_gui
 
         return run_modern_gui()
-    if args.command == "checklist":
-        return run_checklist(args)
-    if args.command == "quality":
-        return run_quality_assessment(args)
-    if args.command == "validate":
-        return run_validate(args)
-    if args.command == "convert":
-        return run_convert(args)
-    if args.command == "enterprise":
-        return run_enterprise(args)
 
     parser.print_help()
     return 1
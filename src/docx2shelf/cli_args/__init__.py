@@ -2,6 +2,7 @@
 
 This package splits the monolithic _arg_parser() function into focused modules:
 - build.py: Build command arguments
+- cache.py: Cache maintenance arguments
 - tools.py: Tools management arguments
 - ai.py: AI command arguments
 - enterprise.py: Enterprise command arguments
@@ -16,6 +17,7 @@ import argparse
 
 from .ai import add_ai_parser
 from .build import add_build_parser
+from .cache import add_cache_parser
 from .connectors import add_connectors_parser
 from .docx import add_docx_parser
 from .misc import add_misc_parsers
@@ -50,6 +52,7 @@ def _arg_parser() -> argparse.ArgumentParser:
     add_build_parser(sub)
     add_docx_parser(sub)
     add_tools_parser(sub)
+    add_cache_parser(sub)
     add_plugins_parser(sub)
     add_connectors_parser(sub)
     add_ai_parser(sub)
@@ -91,6 +91,11 @@ def add_build_parser(subparsers: argparse._SubParsersAction) -> None:
         default="webp",
         help="Convert images to modern format",
     )
+    b.add_argument(
+        "--image-workers",
+        type=int,
+        help="Number of images to optimize concurrently (default: one per CPU core)",
+    )
     b.add_argument(
         "--enhanced-images",
         action="store_true",
@@ -115,6 +120,11 @@ def add_build_parser(subparsers: argparse._SubParsersAction) -> None:
         type=str,
         help="Comma-separated list of chapter start text patterns for manual TOC mode",
     )
+    b.add_argument(
+        "--chapter-workers",
+        type=int,
+        help="Processes used to transform chapters (default: one per CPU core for large books)",
+    )
     b.add_argument(
         "--reader-start-chapter",
         type=str,
@@ -124,6 +134,13 @@ def add_build_parser(subparsers: argparse._SubParsersAction) -> None:
     b.add_argument("--css", type=str, help="Path to extra CSS to merge (optional)")
     b.add_argument("--page-numbers", choices=["on", "off"], default="off")
     b.add_argument("--epub-version", type=str, default="3")
+    b.add_argument(
+        "--epub-writer",
+        choices=["ebooklib", "streaming"],
+        default="ebooklib",
+        help="Archive writer: ebooklib, or streaming (copies images from disk, "
+        "reproducible timestamps)",
+    )
     b.add_argument(
         "--epub2-compat",
         action="store_true",
@@ -193,6 +210,14 @@ def add_build_parser(subparsers: argparse._SubParsersAction) -> None:
         default="on",
         help="Validate with EPUBCheck if available",
     )
+    b.add_argument(
+        "--epubcheck-daemon",
+        dest="epubcheck_daemon",
+        choices=["on", "off"],
+        default="on",
+        help="In watch mode, keep one EPUBCheck JVM warm between rebuilds "
+        "(needs the EPUBCheck jar and Java 11+)",
+    )
     b.add_argument(
         "--no-prompt",
         action="store_true",
@@ -223,6 +248,14 @@ def add_build_parser(subparsers: argparse._SubParsersAction) -> None:
         default=2.0,
         help="Seconds between watch polls (default: 2.0)",
     )
+    b.add_argument(
+        "--watch-incremental",
+        dest="watch_incremental",
+        choices=["on", "off"],
+        default="on",
+        help="In watch mode, rebuild only changed chapters and patch the previous EPUB "
+        "(EPUBCheck runs on the initial build only)",
+    )
     b.add_argument(
         "--offline",
         action="store_true",
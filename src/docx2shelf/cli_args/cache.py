@@ -0,0 +1,41 @@
+"""Cache command argument parser.
+
+This module defines the argument parser for the 'cache' subcommand, which
+inspects and maintains the local conversion and image cache (~/.docx2shelf/cache).
+"""
+
+from __future__ import annotations
+
+import argparse
+
+
+def add_cache_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Add cache subcommand and its arguments to the main parser.
+
+    Args:
+        subparsers: The subparsers object from argparse to add this command to.
+    """
+    c = subparsers.add_parser("cache", help="Inspect and maintain the conversion cache")
+    c.add_argument("--cache-dir", help="Cache directory (default: ~/.docx2shelf/cache)")
+    c_sub = c.add_subparsers(dest="cache_cmd", required=True)
+
+    # Stats subcommand
+    cs = c_sub.add_parser("stats", help="Show entry counts, stored bytes and hit ratios")
+    cs.add_argument("--json", action="store_true", help="Print statistics as JSON")
+
+    # Prune subcommand
+    cp = c_sub.add_parser("prune", help="Evict least recently used entries over the byte budget")
+    cp.add_argument(
+        "--max-bytes",
+        type=int,
+        help="Byte budget to prune to (default: cache_max_bytes from settings)",
+    )
+    cp.add_argument(
+        "--max-age-days",
+        type=int,
+        help="Also remove entries not used for this many days",
+    )
+
+    # Verify subcommand
+    cv = c_sub.add_parser("verify", help="Check cached payloads and image files for damage")
+    cv.add_argument("--repair", action="store_true", help="Drop broken entries")
@@ -80,6 +80,14 @@ def add_misc_parsers(subparsers: argparse._SubParsersAction) -> None:
     batch.add_argument("--epub-version", type=str, default="3")
     batch.add_argument("--image-format", choices=["original", "webp", "avif"], default="webp")
     batch.add_argument("--epubcheck", choices=["on", "off"], default="on")
+    batch.add_argument(
+        "--epubcheck-daemon",
+        dest="epubcheck_daemon",
+        choices=["on", "off"],
+        default="on",
+        help="Validate every book with one warm EPUBCheck JVM "
+        "(needs the EPUBCheck jar and Java 11+)",
+    )
 
     # Update subcommand
     subparsers.add_parser("update", help="Update docx2shelf to the latest version")
@@ -1,38 +1,107 @@
-"""CLI command handlers - extracted from cli.py for modularity."""
+"""CLI command handlers - extracted from cli.py for modularity.
+
+Handlers are imported on first access, so starting the CLI only loads the
+handler module of the command that runs.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .ai import run_ai_alt_text, run_ai_command, run_ai_config, run_ai_genre, run_ai_metadata
+    from .batch import run_batch_mode, run_wizard
+    from .build import run_build
+    from .cache import run_cache
+    from .conversion import run_convert, run_init_metadata
+    from .docx import run_docx
+    from .enterprise import (
+        run_enterprise,
+        run_enterprise_api,
+        run_enterprise_batch,
+        run_enterprise_config,
+        run_enterprise_jobs,
+        run_enterprise_reports,
+        run_enterprise_users,
+        run_enterprise_webhooks,
+    )
+    from .plugins import run_connectors, run_plugins
+    from .profiles import run_list_profiles
+    from .prompts import _prompt_missing
+    from .quality import run_checklist, run_doctor, run_quality_assessment
+    from .themes import run_list_themes, run_preview_themes, run_theme_editor
+    from .tools import run_tools, run_update, run_validate
+    from .utils import (
+        apply_metadata_dict,
+        print_checklist,
+        print_metadata_summary,
+        read_document_content,
+        run_preview_mode,
+        save_metadata_to_file,
+    )
+
+# Exported name -> handler module it lives in
+_HANDLER_MODULES = {
+    "run_ai_alt_text": "ai",
+    "run_ai_command": "ai",
+    "run_ai_config": "ai",
+    "run_ai_genre": "ai",
+    "run_ai_metadata": "ai",
+    "run_batch_mode": "batch",
+    "run_wizard": "batch",
+    "run_build": "build",
+    "run_cache": "cache",
+    "run_convert": "conversion",
+    "run_init_metadata": "conversion",
+    "run_docx": "docx",
+    "run_enterprise": "enterprise",
+    "run_enterprise_api": "enterprise",
+    "run_enterprise_batch": "enterprise",
+    "run_enterprise_config": "enterprise",
+    "run_enterprise_jobs": "enterprise",
+    "run_enterprise_reports": "enterprise",
+    "run_enterprise_users": "enterprise",
+    "run_enterprise_webhooks": "enterprise",
+    "run_connectors": "plugins",
+    "run_plugins": "plugins",
+    "run_list_profiles": "profiles",
+    "_prompt_missing": "prompts",
+    "run_checklist": "quality",
+    "run_doctor": "quality",
+    "run_quality_assessment": "quality",
+    "run_list_themes": "themes",
+    "run_preview_themes": "themes",
+    "run_theme_editor": "themes",
+    "run_tools": "tools",
+    "run_update": "tools",
+    "run_validate": "tools",
+    "apply_metadata_dict": "utils",
+    "print_checklist": "utils",
+    "print_metadata_summary": "utils",
+    "read_document_content": "utils",
+    "run_preview_mode": "utils",
+    "save_metadata_to_file": "utils",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _HANDLER_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_HANDLER_MODULES))
 
-from .ai import run_ai_alt_text, run_ai_command, run_ai_config, run_ai_genre, run_ai_metadata
-from .batch import run_batch_mode, run_wizard
-from .build import run_build
-from .conversion import run_convert, run_init_metadata
-from .docx import run_docx
-from .enterprise import (
-    run_enterprise,
-    run_enterprise_api,
-    run_enterprise_batch,
-    run_enterprise_config,
-    run_enterprise_jobs,
-    run_enterprise_reports,
-    run_enterprise_users,
-    run_enterprise_webhooks,
-)
-from .plugins import run_connectors, run_plugins
-from .profiles import run_list_profiles
-from .prompts import _prompt_missing
-from .quality import run_checklist, run_doctor, run_quality_assessment
-from .themes import run_list_themes, run_preview_themes, run_theme_editor
-from .tools import run_tools, run_update, run_validate
-from .utils import (
-    apply_metadata_dict,
-    print_checklist,
-    print_metadata_summary,
-    read_document_content,
-    run_preview_mode,
-    save_metadata_to_file,
-)
 
 __all__ = [
     "run_batch_mode",
     "run_build",
+    "run_cache",
     "run_convert",
     "run_docx",
     "run_enterprise",
@@ -8,6 +8,8 @@ from __future__ import annotations
 
 import argparse
 import sys
+from collections import deque
+from contextlib import nullcontext
 from pathlib import Path
 
 
@@ -30,12 +32,15 @@ def run_build(args: argparse.Namespace) -> int:
     """
     from ..assemble import assemble_epub, plan_build
     from ..convert import (
+        conversion_cached,
         convert_file_to_html,
+        pandoc_options_for,
         split_html_by_heading,
         split_html_by_heading_level,
         split_html_by_pagebreak,
         split_html_mixed,
     )
+    from ..pandoc_pool import shared_pool
     from ..performance import PerformanceMonitor
     from ..metadata import (
         EpubMetadata,
@@ -54,11 +59,18 @@ def run_build(args: argparse.Namespace) -> int:
     )
     from ..utils import sanitize_filename
     from ..error_handler import handle_error
-    from ..tools import pandoc_path, install_pandoc, epubcheck_cmd, install_epubcheck
+    from ..tools import (
+        pandoc_path,
+        install_pandoc,
+        epubcheck_cmd,
+        install_epubcheck,
+        get_pandoc_status,
+    )
     from ..prompts import prompt_bool
     from ..ai_integration import get_ai_manager
     from ..ai_metadata import enhance_metadata_with_ai
     from ..ai_genre_detection import detect_genre_with_ai
+    from ..text_analysis import analyze_document
     from .utils import (
         apply_metadata_dict,
         print_checklist,
@@ -167,8 +179,21 @@ def run_build(args: argparse.Namespace) -> int:
             print(f"Error: No supported files found in directory: {input_path}", file=sys.stderr)
             return 2
 
-        with build_monitor.phase_timer("batch_conversion"):
+        # Multi-file inputs convert on warm Pandoc workers, a few files ahead;
+        # files the conversion cache already holds are not sent to Pandoc
+        uncached: deque[Path] = deque()
+        if len(files_to_process) > 1 and get_pandoc_status()["overall_available"]:
+            uncached.extend(f for f in files_to_process if not conversion_cached(f))
+        pool_context = shared_pool() if len(uncached) > 1 else nullcontext()
+
+        with build_monitor.phase_timer("batch_conversion"), pool_context as pandoc_pool:
             for file in files_to_process:
+                if pandoc_pool is not None:
+                    for upcoming in uncached:
+                        if not pandoc_pool.prefetch(upcoming, **pandoc_options_for(upcoming)):
+                            break
+                    if uncached and uncached[0] == file:
+                        uncached.popleft()
                 print(f" - Processing {file.name}...")
                 try:
                     with build_monitor.phase_timer(f"convert_{file.name}"):
@@ -246,12 +271,18 @@ def run_build(args: argparse.Namespace) -> int:
                 # Read document content for AI analysis
                 content = read_document_content(input_path)
                 if content:
+                    # Tokenized once, shared by metadata enhancement and genre detection
+                    analysis = analyze_document(content)
+
                     # AI metadata enhancement
                     if getattr(args, "ai_enhance", False):
                         if not getattr(args, "quiet", False):
                             print("[AI] Enhancing metadata with AI...")
                         enhanced = enhance_metadata_with_ai(
-                            content, meta, interactive=getattr(args, "ai_interactive", False)
+                            content,
+                            meta,
+                            interactive=getattr(args, "ai_interactive", False),
+                            analysis=analysis,
                         )
                         meta = enhanced.original
                         if not getattr(args, "quiet", False) and enhanced.applied_suggestions:
@@ -270,6 +301,7 @@ def run_build(args: argparse.Namespace) -> int:
                                 "author": meta.author,
                                 "description": meta.description or "",
                             },
+                            analysis=analysis,
                         )
                         if genre_result.genres and not hasattr(meta, "genre"):
                             meta.genre = genre_result.genres[0].genre
@@ -342,6 +374,7 @@ def run_build(args: argparse.Namespace) -> int:
         image_max_height=args.image_max_height,
         image_format=args.image_format,
         enhanced_images=getattr(args, "enhanced_images", False),
+        image_workers=getattr(args, "image_workers", None),
         vertical_writing=args.vertical_writing,
         epub2_compat=args.epub2_compat,
         hyphenate=args.hyphenate == "on",
@@ -350,11 +383,13 @@ def run_build(args: argparse.Namespace) -> int:
         chapter_start_mode=getattr(args, "chapter_start_mode", "auto"),
         chapter_starts=chapter_starts,
         mixed_split_pattern=getattr(args, "mixed_split_pattern", None),
+        chapter_workers=getattr(args, "chapter_workers", None),
         reader_start_chapter=getattr(args, "reader_start_chapter", None),
         page_list=args.page_list == "on",
         extra_css=css_path,
         page_numbers=args.page_numbers == "on",
         epub_version=str(args.epub_version),
+        epub_writer=getattr(args, "epub_writer", "ebooklib"),
         cover_scale=args.cover_scale,
         dedication_txt=dedication_path,
         ack_txt=ack_path,
@@ -523,14 +558,25 @@ def run_build(args: argparse.Namespace) -> int:
     # Combine all styles CSS
     combined_styles_css = "\n".join(all_styles_css)
 
+    # Watch mode keeps incremental state between rebuilds of the same book
+    incremental = getattr(args, "_incremental", None)
+
     # Final assembly phase with performance monitoring
     with build_monitor.phase_timer("epub_assembly"):
         assemble_epub(
-            meta, opts, html_chunks, resources, output, combined_styles_css, build_monitor
+            meta,
+            opts,
+            html_chunks,
+            resources,
+            output,
+            combined_styles_css,
+            build_monitor,
+            incremental=incremental,
         )
 
-    # EPUB validation phase
-    if getattr(args, "epubcheck", "on") == "on" and output.exists():
+    # EPUB validation phase (patched watch rebuilds are validated on the initial build only)
+    patched = incremental is not None and incremental.patched
+    if getattr(args, "epubcheck", "on") == "on" and output.exists() and not patched:
         from ..validation import print_validation_report, validate_epub
 
         if not getattr(args, "quiet", False):
@@ -0,0 +1,95 @@
+"""Cache maintenance command handlers."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+
+def _format_bytes(size: int) -> str:
+    value = float(size)
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024 or unit == "GB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{size} B"
+
+
+def _format_ratio(ratio) -> str:
+    return "n/a" if ratio is None else f"{ratio:.1%}"
+
+
+def run_cache(args: argparse.Namespace) -> int:
+    """Run cache stats, prune or verify."""
+    from ..performance import BuildCache
+    from ..settings import get_settings
+
+    advanced = get_settings().advanced_settings
+    cache_dir = Path(args.cache_dir) if args.cache_dir else Path.home() / ".docx2shelf" / "cache"
+    cache = BuildCache(cache_dir, max_bytes=advanced.cache_max_bytes)
+
+    if args.cache_cmd == "stats":
+        stats = cache.stats()
+        if args.json:
+            print(json.dumps(stats, indent=2))
+            return 0
+
+        print(f"Cache directory: {cache_dir}")
+        print(
+            f"Conversions: {stats['conversions']} "
+            f"({stats['chunks']} unique chunks, {_format_bytes(stats['chunk_bytes'])} stored, "
+            f"{_format_bytes(stats['chunk_raw_bytes'])} uncompressed)"
+        )
+        print(f"Images: {stats['images']} ({_format_bytes(stats['image_bytes'])})")
+        print(f"Font subsets: {stats['fonts']} ({_format_bytes(stats['font_bytes'])})")
+        print(f"Build results: {stats['builds']}")
+        budget = stats["max_bytes"]
+        print(
+            f"Total: {_format_bytes(stats['stored_bytes'])} of "
+            f"{_format_bytes(budget) if budget is not None else 'unlimited'} budget "
+            f"(database files {_format_bytes(stats['database_bytes'])})"
+        )
+        print(
+            f"Conversion hit ratio: {_format_ratio(stats['conversion_hit_ratio'])} "
+            f"({stats['conversion_hits']} hits, {stats['conversion_misses']} misses)"
+        )
+        print(
+            f"Image hit ratio: {_format_ratio(stats['image_hit_ratio'])} "
+            f"({stats['image_hits']} hits, {stats['image_misses']} misses)"
+        )
+        print(
+            f"Font subset hit ratio: {_format_ratio(stats['font_hit_ratio'])} "
+            f"({stats['font_hits']} hits, {stats['font_misses']} misses)"
+        )
+        return 0
+
+    if args.cache_cmd == "prune":
+        if args.max_age_days is not None:
+            cache.cleanup_old_cache(max_age_days=args.max_age_days)
+        result = cache.prune(max_bytes=args.max_bytes, sweep_image_dirs=True)
+        print(
+            f"Evicted {result['conversions']} conversions, {result['images']} images "
+            f"and {result['fonts']} font subsets, "
+            f"swept {result['orphan_files']} orphaned image files, "
+            f"freed {_format_bytes(result['bytes_freed'])}"
+        )
+        print(f"Cache now holds {_format_bytes(cache.stored_bytes())}")
+        return 0
+
+    if args.cache_cmd == "verify":
+        problems = cache.verify(repair=args.repair)
+        found = sum(len(items) for items in problems.values())
+        for category, items in problems.items():
+            if items:
+                print(f"{category.replace('_', ' ').capitalize()}: {len(items)}")
+        if not found:
+            print("Cache OK")
+            return 0
+        if args.repair:
+            print(f"Removed {found} broken entries")
+            return 0
+        print("Run 'docx2shelf cache verify --repair' to drop broken entries")
+        return 1
+
+    return 1
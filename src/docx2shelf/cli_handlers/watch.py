@@ -13,6 +13,8 @@ import sys
 import time
 from pathlib import Path
 
+from ..epubcheck_daemon import shared_daemon
+
 
 def offline_preflight(args: argparse.Namespace) -> int:
     """Return 0 if offline build can proceed, non-zero error code otherwise.
@@ -97,33 +99,57 @@ def run_build_watch(args: argparse.Namespace, run_build_fn) -> int:
     if hasattr(signal, "SIGTERM"):
         signal.signal(signal.SIGTERM, _stop)
 
-    last_snap = _snapshot(targets)
-    last_rc = run_build_fn(args)
-    print(f"watch: initial build rc={last_rc}", flush=True)
-
-    while not stopped:
-        time.sleep(interval)
-        if stopped:
-            break
-        snap = _snapshot(targets)
-        if snap != last_snap:
-            changed = sorted(set(snap) ^ set(last_snap)) or [
-                p for p in snap if last_snap.get(p) != snap[p]
-            ]
-            print(
-                f"watch: change detected ({len(changed)} file(s)); rebuilding...",
-                flush=True,
-            )
-            last_snap = snap
-            try:
-                last_rc = run_build_fn(args)
-            except Exception as exc:
-                print(
-                    f"watch: build raised {type(exc).__name__}: {exc}",
-                    file=sys.stderr,
-                    flush=True,
-                )
-                last_rc = 1
-            print(f"watch: rebuild rc={last_rc}", flush=True)
+    # Chapters, images and archive entries an edit did not touch are reused
+    incremental = None
+    if getattr(args, "watch_incremental", "on") == "on":
+        from ..incremental import IncrementalBuild
+
+        incremental = IncrementalBuild()
+        args._incremental = incremental
+
+    use_daemon = (
+        getattr(args, "epubcheck", "on") == "on" and getattr(args, "epubcheck_daemon", "on") == "on"
+    )
+
+    def _summary(rc: int) -> str:
+        if incremental is None or rc != 0:
+            return f"rc={rc}"
+        return f"rc={rc} ({incremental.describe()})"
+
+    # One warm EPUBCheck JVM validates every full rebuild of the session
+    with shared_daemon(use_daemon):
+        try:
+            last_snap = _snapshot(targets)
+            last_rc = run_build_fn(args)
+            print(f"watch: initial build {_summary(last_rc)}", flush=True)
+
+            while not stopped:
+                time.sleep(interval)
+                if stopped:
+                    break
+                snap = _snapshot(targets)
+                if snap != last_snap:
+                    changed = sorted(set(snap) ^ set(last_snap)) or [
+                        p for p in snap if last_snap.get(p) != snap[p]
+                    ]
+                    print(
+                        f"watch: change detected ({len(changed)} file(s)); rebuilding...",
+                        flush=True,
+                    )
+                    last_snap = snap
+                    try:
+                        last_rc = run_build_fn(args)
+                    except Exception as exc:
+                        print(
+                            f"watch: build raised {type(exc).__name__}: {exc}",
+                            file=sys.stderr,
+                            flush=True,
+                        )
+                        last_rc = 1
+                    print(f"watch: rebuild {_summary(last_rc)}", flush=True)
+        finally:
+            if incremental is not None:
+                args._incremental = None
+                incremental.close()
 
     return last_rc
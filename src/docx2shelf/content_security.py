@@ -16,6 +16,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Union
 from urllib.parse import urlparse
 
+from bs4 import CData, Comment, PageElement, Tag
+
 from .path_utils import is_safe_path, normalize_path
 
 # Dangerous HTML tags that should be removed
@@ -104,6 +106,57 @@ DANGEROUS_HTML_ATTRS = {
     "mocha:",
 }
 
+# Precompiled forms of the string rules above for sanitize_node()
+_EVENT_ATTRS = {attr for attr in DANGEROUS_HTML_ATTRS if not attr.endswith(":")}
+_UNSAFE_SCHEMES = sorted(attr for attr in DANGEROUS_HTML_ATTRS if attr.endswith(":"))
+_UNSAFE_SCHEME_RE = re.compile(
+    "|".join(rf"{re.escape(scheme)}[^\"'\s>]*" for scheme in _UNSAFE_SCHEMES), re.IGNORECASE
+)
+_SCRIPT_URL_RE = re.compile(
+    r"(?:javascript|vbscript)\s*:[^\"'\s>]*|data\s*:[^,]*javascript[^\"'\s>]*", re.IGNORECASE
+)
+_SAFE_URL_SCHEMES = {"http", "https", "mailto", "ftp", "ftps", "#", ""}
+# Attributes holding a URL; sanitize_node() clears them whole rather than
+# cutting out the unsafe part, which can splice a new scheme together
+_URL_ATTRS = {"href", "src", "xlink:href", "action", "formaction", "poster", "background"}
+# Browsers drop these anywhere in a URL and strip C0 controls and spaces
+# around it, so "java&#9;script:" is still a javascript: link
+_URL_IGNORED_RE = re.compile(r"[\t\r\n]")
+_URL_STRIPPED = "".join(chr(c) for c in range(0x21))
+
+
+def _alternation(names) -> str:
+    # Longest first so that e.g. "frameset" is tried before "frame"
+    return "|".join(re.escape(name) for name in sorted(names, key=lambda n: (-len(n), n)))
+
+
+# The sanitize_html() policy, compiled once. Each stage is a single scan with
+# one combined matcher instead of one re.sub per tag or attribute; stages stay
+# separate because each one sees the output of the previous one.
+_SCRIPT_BLOCK_RE = re.compile(
+    r"<script\b[^<]*(?:(?!<\/script>)<[^<]*)*<\/script>", re.IGNORECASE | re.DOTALL
+)
+_SCRIPT_SCHEME_RE = re.compile(r"(?:javascript|vbscript)\s*:[^\"'\s>]*", re.IGNORECASE)
+_DATA_SCRIPT_RE = re.compile(r"data\s*:[^,]*javascript[^\"'\s>]*", re.IGNORECASE)
+_DANGEROUS_ATTR_RE = re.compile(
+    rf"\s(?P<event>{_alternation(_EVENT_ATTRS)})\s*=\s*[\"'](?P<value>[^\"']*)[\"']"
+    rf"|(?P<scheme>{_alternation(_UNSAFE_SCHEMES)})[^\"'\s>]*",
+    re.IGNORECASE,
+)
+_SCHEME_RULES = [
+    (scheme, re.compile(rf"{re.escape(scheme)}[^\"'\s>]*", re.IGNORECASE))
+    for scheme in _UNSAFE_SCHEMES
+]
+_DANGEROUS_TAG_RE = re.compile(
+    rf"<(?P<open>{_alternation(DANGEROUS_HTML_TAGS)})\b[^>]*>"
+    rf"|</(?P<close>{_alternation(DANGEROUS_HTML_TAGS)})>",
+    re.IGNORECASE,
+)
+_URL_ATTR_RE = re.compile(r"(href|src)\s*=\s*([\"\'])([^\"\']*)\2", re.IGNORECASE)
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_CDATA_RE = re.compile(r"<!\[CDATA\[.*?\]\]>", re.DOTALL)
+_STRAY_LT_RE = re.compile(r"<(?!/?\w+[^>]*>)")
+
 # Dangerous SVG elements that should be removed
 DANGEROUS_SVG_ELEMENTS = {
     "script",
@@ -292,56 +345,48 @@ class ContentSanitizer:
 
     def _remove_script_content(self, content: str) -> str:
         """Remove script tags and their content."""
-        # Remove script tags (case insensitive)
-        script_pattern = r"<script\b[^<]*(?:(?!<\/script>)<[^<]*)*<\/script>"
-        content = re.sub(script_pattern, "", content, flags=re.IGNORECASE | re.DOTALL)
+        content = _SCRIPT_BLOCK_RE.sub("", content)
 
-        # Remove javascript: URLs
-        content = re.sub(r'javascript\s*:[^"\'\s>]*', "", content, flags=re.IGNORECASE)
-
-        # Remove vbscript: URLs
-        content = re.sub(r'vbscript\s*:[^"\'\s>]*', "", content, flags=re.IGNORECASE)
+        # Remove javascript: and vbscript: URLs
+        content = _SCRIPT_SCHEME_RE.sub("", content)
 
         # Remove data: URLs with javascript
-        content = re.sub(r'data\s*:[^,]*javascript[^"\'\s>]*', "", content, flags=re.IGNORECASE)
-
-        return content
+        return _DATA_SCRIPT_RE.sub("", content)
 
     def _remove_dangerous_attributes(self, content: str) -> str:
         """Remove dangerous HTML attributes."""
-        for attr in DANGEROUS_HTML_ATTRS:
-            if attr.endswith(":"):
-                # Handle URL schemes
-                pattern = rf'{re.escape(attr)}[^"\'\s>]*'
-            else:
-                # Handle event attributes
-                pattern = rf'\s{re.escape(attr)}\s*=\s*["\'][^"\']*["\']'
 
-            old_content = content
-            content = re.sub(pattern, "", content, flags=re.IGNORECASE)
+        def remove(match):
+            event = match.group("event")
+            if event:
+                # Schemes inside the handler are reported too, as they were
+                # when each scheme rule ran over the document first
+                self._record_schemes(match.group("value"))
+                self.modified_attributes.append(event.lower())
+            else:
+                self._record_schemes(match.group(0))
+            return ""
 
-            if old_content != content:
-                self.modified_attributes.append(attr)
+        return _DANGEROUS_ATTR_RE.sub(remove, content)
 
-        return content
+    def _record_schemes(self, text: str) -> None:
+        """Record the unsafe schemes that the per-scheme rules would strip from text."""
+        lowered = text.lower()
+        if not any(scheme in lowered for scheme in _UNSAFE_SCHEMES):
+            return
+        for scheme, pattern in _SCHEME_RULES:
+            text, count = pattern.subn("", text)
+            if count:
+                self.modified_attributes.append(scheme)
 
     def _remove_dangerous_tags(self, content: str) -> str:
         """Remove dangerous HTML tags."""
-        for tag in DANGEROUS_HTML_TAGS:
-            # Remove opening and closing tags
-            pattern_open = rf"<{re.escape(tag)}\b[^>]*>"
-            pattern_close = rf"</{re.escape(tag)}>"
-            pattern_self_close = rf"<{re.escape(tag)}\b[^>]*/>"
 
-            old_content = content
-            content = re.sub(pattern_open, "", content, flags=re.IGNORECASE)
-            content = re.sub(pattern_close, "", content, flags=re.IGNORECASE)
-            content = re.sub(pattern_self_close, "", content, flags=re.IGNORECASE)
+        def remove(match):
+            self.removed_elements.append((match.group("open") or match.group("close")).lower())
+            return ""
 
-            if old_content != content:
-                self.removed_elements.append(tag)
-
-        return content
+        return _DANGEROUS_TAG_RE.sub(remove, content)
 
     def _sanitize_urls(self, content: str) -> str:
         """Sanitize URLs in href and src attributes."""
@@ -357,8 +402,7 @@ class ContentSanitizer:
                 scheme = parsed.scheme.lower()
 
                 # Allow only safe schemes
-                safe_schemes = {"http", "https", "mailto", "ftp", "ftps", "#", ""}
-                if scheme not in safe_schemes:
+                if scheme not in _SAFE_URL_SCHEMES:
                     self.modified_attributes.append(f"{attr_name}={url}")
                     return f"{attr_name}={quote_char}{quote_char}"
 
@@ -368,25 +412,17 @@ class ContentSanitizer:
                 self.modified_attributes.append(f"{attr_name}={url}")
                 return f"{attr_name}={quote_char}{quote_char}"
 
-        # Match href and src attributes
-        url_pattern = r"(href|src)\s*=\s*([\"\'])([^\"\']*)\2"
-        content = re.sub(url_pattern, sanitize_url_match, content, flags=re.IGNORECASE)
-
-        return content
+        return _URL_ATTR_RE.sub(sanitize_url_match, content)
 
     def _clean_malformed_html(self, content: str) -> str:
         """Clean up malformed HTML."""
-        # Remove comments that might contain scripts
-        content = re.sub(r"<!--.*?-->", "", content, flags=re.DOTALL)
-
-        # Remove CDATA sections that might contain scripts
-        content = re.sub(r"<!\[CDATA\[.*?\]\]>", "", content, flags=re.DOTALL)
+        # Remove comments and CDATA sections that might contain scripts
+        content = _COMMENT_RE.sub("", content)
+        content = _CDATA_RE.sub("", content)
 
         # Escape any remaining < or > that aren't part of valid tags
         # This is a simple approach - more sophisticated parsing might be needed
-        content = re.sub(r"<(?!/?\w+[^>]*>)", "&lt;", content)
-
-        return content
+        return _STRAY_LT_RE.sub("&lt;", content)
 
     def _sanitize_svg_element(self, element: ET.Element) -> None:
         """Recursively sanitize an SVG element."""
@@ -454,6 +490,74 @@ class ContentSanitizer:
 
         return svg_content
 
+    def sanitize_node(self, node: PageElement) -> None:
+        """
+        Sanitize one node of a parsed BeautifulSoup tree in place.
+
+        Tree counterpart of ``sanitize_html`` for callers that already hold a
+        parsed chapter: scripts, comments and CDATA are dropped, other dangerous
+        tags are unwrapped (their content is kept) and event handlers are
+        removed. URL attributes (``href``, ``src``, ``xlink:href`` and the like)
+        whose scheme is not allowlisted are emptied; unsafe schemes are cut out
+        of other attributes. Findings accumulate in the report until
+        ``reset_report`` is called.
+
+        Args:
+            node: Tag, Comment or CData node from the parsed tree
+        """
+        if not isinstance(node, Tag):
+            if isinstance(node, (Comment, CData)):
+                node.extract()
+            return
+
+        name = node.name.lower()
+        if name == "script":
+            node.decompose()
+            self.removed_elements.append(name)
+            return
+        if name in DANGEROUS_HTML_TAGS:
+            node.unwrap()
+            self.removed_elements.append(name)
+            return
+
+        for attr in list(node.attrs):
+            attr_lower = attr.lower()
+            if attr_lower in _EVENT_ATTRS:
+                del node.attrs[attr]
+                self.modified_attributes.append(attr_lower)
+                continue
+
+            value = node.attrs[attr]
+            if not isinstance(value, str):
+                continue  # multi-valued attributes such as class
+
+            if attr_lower in _URL_ATTRS or attr_lower.endswith(("href", "src")):
+                if not self._is_safe_url(value):
+                    self.modified_attributes.append(f"{attr_lower}={value}")
+                    node.attrs[attr] = ""
+                continue
+
+            cleaned = _UNSAFE_SCHEME_RE.sub("", _SCRIPT_URL_RE.sub("", value))
+            if cleaned != value:
+                self.modified_attributes.append(attr_lower)
+                node.attrs[attr] = cleaned
+
+    @staticmethod
+    def _is_safe_url(value: str) -> bool:
+        """True if a URL attribute value, as a browser reads it, uses an allowed scheme."""
+        url = _URL_IGNORED_RE.sub("", value).strip(_URL_STRIPPED)
+        if _SCRIPT_URL_RE.search(url) or _UNSAFE_SCHEME_RE.search(url):
+            return False
+        try:
+            return urlparse(url).scheme.lower() in _SAFE_URL_SCHEMES
+        except ValueError:
+            return False
+
+    def reset_report(self) -> None:
+        """Clear the findings collected by ``sanitize_node``."""
+        self.removed_elements.clear()
+        self.modified_attributes.clear()
+
     def get_sanitization_report(self) -> Dict[str, List[str]]:
         """Get a report of what was sanitized."""
         return {
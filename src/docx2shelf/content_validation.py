@@ -3,18 +3,39 @@ Content Validation Engine for Docx2Shelf.
 
 Provides comprehensive content quality checks including grammar, style,
 formatting, and readability analysis with actionable recommendations.
+
+Validation is split into a per-chapter map (``validate_chapter``), which
+runs the checks confined to one chapter and records the counts the rest
+need, and a ``merge_chapters`` reduce that combines chapter results into
+book statistics and runs the checks spanning chapters (overused words,
+readability, consistency and heading hierarchy). ``validate_book`` runs the
+map in worker processes for large books; a validator given a ``memo`` dict
+only revalidates chapters that changed since its last run (watch-mode
+sessions keep one memo per book).
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import re
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from .chapter_pipeline import choose_workers, map_in_processes
+from .text_analysis import DocumentAnalysis, analyze_document
 
 logger = logging.getLogger(__name__)
 
+_HEADING_TEXT_RE = re.compile(r"<h[1-6][^>]*>(.*?)</h[1-6]>", re.IGNORECASE | re.DOTALL)
+_HEADING_LEVEL_RE = re.compile(r"<h([1-6])")
+_DATE_PATTERNS = (
+    r"\b\d{1,2}/\d{1,2}/\d{4}\b",  # MM/DD/YYYY
+    r"\b\d{1,2}-\d{1,2}-\d{4}\b",  # MM-DD-YYYY
+    r"\b\d{4}-\d{1,2}-\d{1,2}\b",  # YYYY-MM-DD
+)
+
 
 class ValidationCategory(Enum):
     """Content validation categories."""
@@ -82,10 +103,34 @@ class ValidationReport:
     auto_fixable_count: int = 0
 
 
+@dataclass
+class ChapterValidation:
+    """Map-step result for one chapter.
+
+    Holds the issues found in the chapter alone and the counts the reduce
+    step folds into book statistics and checks spanning chapters.
+    """
+
+    file_path: str
+    issues: List[ValidationIssue] = field(default_factory=list)
+    word_count: int = 0
+    sentence_count: int = 0
+    paragraph_count: int = 0
+    syllable_count: int = 0
+    vocabulary: Set[str] = field(default_factory=set)
+    style_word_counts: Dict[str, int] = field(default_factory=dict)
+    heading_cases: List[str] = field(default_factory=list)  # "title" or "sentence"
+    date_formats: Set[str] = field(default_factory=set)
+    heading_levels: List[int] = field(default_factory=list)
+
+
+_CATEGORY_ORDER = {category: i for i, category in enumerate(ValidationCategory)}
+
+
 class ContentValidator:
     """Comprehensive content validation engine."""
 
-    def __init__(self):
+    def __init__(self, memo: Optional[Dict[str, ChapterValidation]] = None):
         self.common_words = {
             "the",
             "be",
@@ -118,26 +163,88 @@ class ContentValidator:
         self.style_patterns = self._initialize_style_patterns()
         self.formatting_patterns = self._initialize_formatting_patterns()
 
-    def validate_content(self, content: str, file_path: str = "") -> ValidationReport:
-        """Validate content and return comprehensive report."""
+        # Chapter results by path and content, reused by validate_book
+        self.memo = memo
+        self.reused = 0
+        self.workers = 1
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Worker processes never consult the memo; don't ship it to them
+        state = self.__dict__.copy()
+        state["memo"] = None
+        return state
+
+    def validate_content(
+        self, content: str, file_path: str = "", analysis: Optional[DocumentAnalysis] = None
+    ) -> ValidationReport:
+        """Validate content and return comprehensive report.
+
+        ``analysis`` is the shared analysis of ``content``; it is created if not given.
+        """
+        chapter = self.validate_chapter(content, file_path, analysis)
+        return self.merge_chapters([chapter], file_path)
+
+    def validate_book(
+        self,
+        chapters: Sequence[Tuple[str, str]],
+        file_path: str = "",
+        workers: Optional[int] = None,
+    ) -> ValidationReport:
+        """Validate a book chapter by chapter and merge the results.
+
+        Args:
+            chapters: (file path, content) pairs in reading order
+            file_path: Path reported for issues that concern the whole book
+            workers: Process count; None picks one per CPU for large books
+                and stays in-process for small ones
+
+        Returns:
+            One report for the book; chapter issues carry their chapter's path
+        """
+        if self.memo is None:
+            results = self._validate_chapters(chapters, workers)
+        else:
+            results = self._validate_memoized(chapters, workers)
+        return self.merge_chapters(results, file_path)
+
+    def validate_chapter(
+        self, content: str, file_path: str = "", analysis: Optional[DocumentAnalysis] = None
+    ) -> ChapterValidation:
+        """Per-chapter map step: run the checks confined to one chapter."""
         report = ValidationReport(file_path=file_path)
+        analysis = analysis or analyze_document(content)
+        chapter = ChapterValidation(file_path=file_path, issues=report.issues)
 
-        # Extract text content from HTML/XHTML
-        text_content = self._extract_text(content)
-
-        # Extract raw text preserving original spacing for grammar checks
-        raw_text = self._extract_text_raw(content)
+        # Text content from HTML/XHTML, and raw text preserving original
+        # spacing for grammar checks
+        text_content = analysis.plain_text
+        if text_content:
+            self._count_text(analysis.plain(), chapter)
 
-        # Calculate content statistics
-        report.stats = self._calculate_stats(text_content)
-
-        # Run validation checks
-        self._check_grammar(content, raw_text, report)
+        self._check_grammar(content, analysis.raw_text, report)
         self._check_style(content, text_content, report)
         self._check_formatting(content, report)
-        self._check_readability(text_content, report)
-        self._check_consistency(content, text_content, report)
-        self._check_structure(content, report)
+        self._collect_consistency(content, text_content, chapter)
+        self._check_paragraph_structure(content, report)
+        chapter.heading_levels = [int(h) for h in _HEADING_LEVEL_RE.findall(content)]
+        return chapter
+
+    def merge_chapters(
+        self, chapters: Sequence[ChapterValidation], file_path: str = ""
+    ) -> ValidationReport:
+        """Reduce step: combine chapter results and run the checks spanning chapters."""
+        report = ValidationReport(file_path=file_path)
+        for chapter in chapters:
+            report.issues.extend(chapter.issues)
+        report.stats = self._combine_stats(chapters)
+
+        self._check_overused_words(chapters, report)
+        self._check_readability(report)
+        self._check_consistency(chapters, report)
+        self._check_heading_hierarchy(chapters, report)
+
+        # Issues by category, chapters in reading order within each
+        report.issues.sort(key=lambda issue: _CATEGORY_ORDER[issue.category])
 
         # Count issues by severity
         report.error_count = len(
@@ -153,57 +260,82 @@ class ContentValidator:
 
         return report
 
-    def _extract_text(self, content: str) -> str:
-        """Extract plain text from HTML/XHTML content."""
-        # Remove HTML tags
-        text = re.sub(r"<[^>]+>", " ", content)
-
-        # Decode HTML entities
-        text = text.replace("&amp;", "&")
-        text = text.replace("&lt;", "<")
-        text = text.replace("&gt;", ">")
-        text = text.replace("&quot;", '"')
-        text = text.replace("&#39;", "'")
-        text = text.replace("&nbsp;", " ")
-
-        # Clean up whitespace
-        text = re.sub(r"\s+", " ", text).strip()
-
-        return text
-
-    def _extract_text_raw(self, content: str) -> str:
-        """Extract plain text from HTML/XHTML content preserving original spacing."""
-        # Remove HTML tags but preserve whitespace
-        text = re.sub(r"<[^>]+>", "", content)
-
-        # Decode HTML entities
-        text = text.replace("&amp;", "&")
-        text = text.replace("&lt;", "<")
-        text = text.replace("&gt;", ">")
-        text = text.replace("&quot;", '"')
-        text = text.replace("&#39;", "'")
-        text = text.replace("&nbsp;", " ")
-
-        return text.strip()
-
-    def _calculate_stats(self, text: str) -> ContentStats:
+    @staticmethod
+    def memo_key(file_path: str, content: str) -> str:
+        """Hash of what a chapter's validation depends on."""
+        digest = hashlib.sha256(file_path.encode("utf-8", "surrogatepass"))
+        digest.update(b"\0")
+        digest.update(content.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def _validate_chapters(
+        self, chapters: Sequence[Tuple[str, str]], workers: Optional[int]
+    ) -> List[ChapterValidation]:
+        total_size = sum(len(content) for _, content in chapters)
+        self.workers = choose_workers(len(chapters), total_size, workers)
+        if self.workers > 1:
+            results = map_in_processes(
+                self.workers,
+                _init_worker,
+                self,
+                _validate_in_worker,
+                [content for _, content in chapters],
+                [path for path, _ in chapters],
+                label="content validation",
+            )
+            if results is not None:
+                return results
+            self.workers = 1
+        return [self.validate_chapter(content, path) for path, content in chapters]
+
+    def _validate_memoized(
+        self, chapters: Sequence[Tuple[str, str]], workers: Optional[int]
+    ) -> List[ChapterValidation]:
+        keys = [self.memo_key(path, content) for path, content in chapters]
+        missing = [i for i, key in enumerate(keys) if key not in self.memo]
+        fresh = self._validate_chapters([chapters[i] for i in missing], workers) if missing else []
+
+        memo = {key: self.memo[key] for key in keys if key in self.memo}
+        for i, chapter in zip(missing, fresh):
+            memo[keys[i]] = chapter
+        self.memo.clear()
+        self.memo.update(memo)
+        self.reused += len(chapters) - len(missing)
+        return [self.memo[key] for key in keys]
+
+    def _calculate_stats(
+        self, text: str, analysis: Optional[DocumentAnalysis] = None
+    ) -> ContentStats:
         """Calculate comprehensive content statistics."""
-        stats = ContentStats()
-
         if not text:
-            return stats
+            return ContentStats()
+        chapter = ChapterValidation(file_path="")
+        self._count_text(analysis or analyze_document(text), chapter)
+        return self._combine_stats([chapter])
+
+    def _count_text(self, analysis: DocumentAnalysis, chapter: ChapterValidation):
+        """Record the counts of a chapter's plain text that statistics are built from."""
+        chapter.word_count = analysis.word_count
+        chapter.sentence_count = analysis.sentence_count
+        chapter.paragraph_count = sum(1 for p in analysis.paragraphs if p.strip())
+        chapter.syllable_count = analysis.syllable_count
+        chapter.vocabulary = set(analysis.normalized_words)
+
+        # Candidates for the overused words check
+        word_counts: Dict[str, int] = {}
+        for word in analysis.normalized_words:
+            if len(word) > 4 and word not in self.common_words:
+                word_counts[word] = word_counts.get(word, 0) + 1
+        chapter.style_word_counts = word_counts
+
+    def _combine_stats(self, chapters: Sequence[ChapterValidation]) -> ContentStats:
+        """Calculate comprehensive content statistics from chapter counts."""
+        stats = ContentStats()
 
         # Basic counts
-        words = text.split()
-        stats.word_count = len(words)
-
-        sentences = re.split(r"[.!?]+", text)
-        sentences = [s.strip() for s in sentences if s.strip()]
-        stats.sentence_count = len(sentences)
-
-        paragraphs = text.split("\n\n")
-        paragraphs = [p.strip() for p in paragraphs if p.strip()]
-        stats.paragraph_count = len(paragraphs)
+        stats.word_count = sum(chapter.word_count for chapter in chapters)
+        stats.sentence_count = sum(chapter.sentence_count for chapter in chapters)
+        stats.paragraph_count = sum(chapter.paragraph_count for chapter in chapters)
 
         # Average calculations
         if stats.sentence_count > 0:
@@ -213,12 +345,12 @@ class ContentValidator:
             stats.avg_sentences_per_paragraph = stats.sentence_count / stats.paragraph_count
 
         # Readability scores
-        stats.flesch_reading_ease = self._calculate_flesch_reading_ease(text, stats)
-        stats.flesch_kincaid_grade = self._calculate_flesch_kincaid_grade(text, stats)
+        syllable_count = sum(chapter.syllable_count for chapter in chapters)
+        stats.flesch_reading_ease = self._calculate_flesch_reading_ease(stats, syllable_count)
+        stats.flesch_kincaid_grade = self._calculate_flesch_kincaid_grade(stats, syllable_count)
 
         # Vocabulary analysis
-        unique_words = set(word.lower().strip('.,!?;:"()[]{}') for word in words)
-        stats.unique_words = len(unique_words)
+        stats.unique_words = len(set().union(*(chapter.vocabulary for chapter in chapters)))
 
         if stats.word_count > 0:
             stats.vocabulary_diversity = stats.unique_words / stats.word_count
@@ -372,16 +504,17 @@ class ContentValidator:
                     )
                 )
 
-        # Overused words
-        words = text.lower().split()
-        word_counts = {}
-        for word in words:
-            clean_word = word.strip('.,!?;:"()[]{}')
-            if len(clean_word) > 4 and clean_word not in self.common_words:
-                word_counts[clean_word] = word_counts.get(clean_word, 0) + 1
+    def _check_overused_words(
+        self, chapters: Sequence[ChapterValidation], report: ValidationReport
+    ):
+        """Check for words making up more than 1% of the book."""
+        word_counts: Dict[str, int] = {}
+        for chapter in chapters:
+            for word, count in chapter.style_word_counts.items():
+                word_counts[word] = word_counts.get(word, 0) + count
 
         for word, count in word_counts.items():
-            if count > len(words) / 100:  # More than 1% of total words
+            if count > report.stats.word_count / 100:  # More than 1% of total words
                 report.issues.append(
                     ValidationIssue(
                         ValidationCategory.STYLE,
@@ -455,7 +588,7 @@ class ContentValidator:
                 )
             )
 
-    def _check_readability(self, text: str, report: ValidationReport):
+    def _check_readability(self, report: ValidationReport):
         """Check readability metrics and provide suggestions."""
 
         if report.stats.avg_words_per_sentence > 25:
@@ -509,52 +642,44 @@ class ContentValidator:
                 )
             )
 
-    def _check_consistency(self, content: str, text: str, report: ValidationReport):
+    def _collect_consistency(self, content: str, text: str, chapter: ChapterValidation):
+        """Record the heading capitalization and date formats a chapter uses."""
+        for heading in _HEADING_TEXT_RE.findall(content):
+            heading_text = re.sub(r"<[^>]+>", "", heading).strip()
+            if heading_text:
+                words = heading_text.split()
+                if len(words) > 1:
+                    # Check if it's title case (most words capitalized)
+                    capitalized_words = sum(1 for word in words if word[0].isupper())
+                    if capitalized_words > len(words) / 2:
+                        chapter.heading_cases.append("title")
+                    else:
+                        chapter.heading_cases.append("sentence")
+
+        for pattern in _DATE_PATTERNS:
+            if re.search(pattern, text):
+                chapter.date_formats.add(pattern)
+
+    def _check_consistency(self, chapters: Sequence[ChapterValidation], report: ValidationReport):
         """Check for consistency issues."""
 
         # Inconsistent capitalization in headings
-        headings = re.findall(r"<h[1-6][^>]*>(.*?)</h[1-6]>", content, re.IGNORECASE | re.DOTALL)
-        if len(headings) > 1:
-            title_case_count = 0
-            sentence_case_count = 0
-
-            for heading in headings:
-                heading_text = re.sub(r"<[^>]+>", "", heading).strip()
-                if heading_text:
-                    words = heading_text.split()
-                    if len(words) > 1:
-                        # Check if it's title case (most words capitalized)
-                        capitalized_words = sum(1 for word in words if word[0].isupper())
-                        if capitalized_words > len(words) / 2:
-                            title_case_count += 1
-                        else:
-                            sentence_case_count += 1
-
-            if title_case_count > 0 and sentence_case_count > 0:
-                report.issues.append(
-                    ValidationIssue(
-                        ValidationCategory.CONSISTENCY,
-                        ValidationSeverity.WARNING,
-                        "Inconsistent heading capitalization",
-                        "Mix of title case and sentence case in headings",
-                        "Use consistent capitalization style for all headings",
-                        file_path=report.file_path,
-                        confidence=0.8,
-                    )
+        heading_cases = {case for chapter in chapters for case in chapter.heading_cases}
+        if len(heading_cases) > 1:
+            report.issues.append(
+                ValidationIssue(
+                    ValidationCategory.CONSISTENCY,
+                    ValidationSeverity.WARNING,
+                    "Inconsistent heading capitalization",
+                    "Mix of title case and sentence case in headings",
+                    "Use consistent capitalization style for all headings",
+                    file_path=report.file_path,
+                    confidence=0.8,
                 )
+            )
 
         # Date format consistency
-        date_patterns = [
-            r"\b\d{1,2}/\d{1,2}/\d{4}\b",  # MM/DD/YYYY
-            r"\b\d{1,2}-\d{1,2}-\d{4}\b",  # MM-DD-YYYY
-            r"\b\d{4}-\d{1,2}-\d{1,2}\b",  # YYYY-MM-DD
-        ]
-
-        found_patterns = set()
-        for pattern in date_patterns:
-            if re.search(pattern, text):
-                found_patterns.add(pattern)
-
+        found_patterns = set().union(*(chapter.date_formats for chapter in chapters))
         if len(found_patterns) > 1:
             report.issues.append(
                 ValidationIssue(
@@ -568,10 +693,8 @@ class ContentValidator:
                 )
             )
 
-    def _check_structure(self, content: str, report: ValidationReport):
-        """Check document structure issues."""
-
-        # Check for proper paragraph structure
+    def _check_paragraph_structure(self, content: str, report: ValidationReport):
+        """Check that a chapter's text is wrapped in paragraphs."""
         p_tags = content.count("<p>")
         if p_tags == 0 and len(content) > 1000:
             report.issues.append(
@@ -586,67 +709,41 @@ class ContentValidator:
                 )
             )
 
-        # Check heading hierarchy
-        headings = re.findall(r"<h([1-6])", content)
-        if headings:
-            heading_levels = [int(h) for h in headings]
-
-            # Check for skipped levels
-            for i in range(1, len(heading_levels)):
-                if heading_levels[i] - heading_levels[i - 1] > 1:
-                    report.issues.append(
-                        ValidationIssue(
-                            ValidationCategory.STRUCTURE,
-                            ValidationSeverity.WARNING,
-                            "Skipped heading level",
-                            f"Heading jumps from h{heading_levels[i-1]} to h{heading_levels[i]}",
-                            "Use sequential heading levels (h1, h2, h3...)",
-                            file_path=report.file_path,
-                            confidence=0.85,
-                        )
+    def _check_heading_hierarchy(
+        self, chapters: Sequence[ChapterValidation], report: ValidationReport
+    ):
+        """Check for skipped heading levels, across chapter boundaries too."""
+        headings = [(level, chapter) for chapter in chapters for level in chapter.heading_levels]
+        for (previous, _), (level, chapter) in zip(headings, headings[1:]):
+            if level - previous > 1:
+                report.issues.append(
+                    ValidationIssue(
+                        ValidationCategory.STRUCTURE,
+                        ValidationSeverity.WARNING,
+                        "Skipped heading level",
+                        f"Heading jumps from h{previous} to h{level}",
+                        "Use sequential heading levels (h1, h2, h3...)",
+                        file_path=chapter.file_path,
+                        confidence=0.85,
                     )
-                    break
+                )
+                break
 
-    def _calculate_flesch_reading_ease(self, text: str, stats: ContentStats) -> float:
+    def _calculate_flesch_reading_ease(self, stats: ContentStats, syllable_count: int) -> float:
         """Calculate Flesch Reading Ease score."""
         if stats.sentence_count == 0 or stats.word_count == 0:
             return 0.0
 
-        # Count syllables (simplified approximation)
-        syllable_count = 0
-        words = text.split()
-        for word in words:
-            clean_word = re.sub(r"[^a-zA-Z]", "", word.lower())
-            if clean_word:
-                # Simple syllable counting heuristic
-                vowel_groups = re.findall(r"[aeiouy]+", clean_word)
-                syllables = len(vowel_groups)
-                if clean_word.endswith("e") and syllables > 1:
-                    syllables -= 1
-                syllable_count += max(1, syllables)
-
         avg_sentence_length = stats.word_count / stats.sentence_count
         avg_syllables_per_word = syllable_count / stats.word_count
 
         return 206.835 - (1.015 * avg_sentence_length) - (84.6 * avg_syllables_per_word)
 
-    def _calculate_flesch_kincaid_grade(self, text: str, stats: ContentStats) -> float:
+    def _calculate_flesch_kincaid_grade(self, stats: ContentStats, syllable_count: int) -> float:
         """Calculate Flesch-Kincaid Grade Level."""
         if stats.sentence_count == 0 or stats.word_count == 0:
             return 0.0
 
-        # Count syllables (same as above)
-        syllable_count = 0
-        words = text.split()
-        for word in words:
-            clean_word = re.sub(r"[^a-zA-Z]", "", word.lower())
-            if clean_word:
-                vowel_groups = re.findall(r"[aeiouy]+", clean_word)
-                syllables = len(vowel_groups)
-                if clean_word.endswith("e") and syllables > 1:
-                    syllables -= 1
-                syllable_count += max(1, syllables)
-
         avg_sentence_length = stats.word_count / stats.sentence_count
         avg_syllables_per_word = syllable_count / stats.word_count
 
@@ -669,7 +766,36 @@ class ContentValidator:
         }
 
 
-def validate_content_quality(content: str, file_path: str = "") -> ValidationReport:
+def validate_content_quality(
+    content: str, file_path: str = "", analysis: Optional[DocumentAnalysis] = None
+) -> ValidationReport:
     """Convenience function to validate content quality."""
     validator = ContentValidator()
-    return validator.validate_content(content, file_path)
+    return validator.validate_content(content, file_path, analysis)
+
+
+def validate_book_quality(
+    chapters: Sequence[Tuple[str, str]], file_path: str = "", workers: Optional[int] = None
+) -> ValidationReport:
+    """Convenience function to validate the content quality of a whole book.
+
+    Args:
+        chapters: (file path, content) pairs in reading order
+        file_path: Path reported for issues that concern the whole book
+        workers: Process count; None decides by book size
+    """
+    validator = ContentValidator()
+    return validator.validate_book(chapters, file_path, workers)
+
+
+# Validator copy installed in each worker process by _init_worker
+_worker_validator: Optional[ContentValidator] = None
+
+
+def _init_worker(validator: ContentValidator) -> None:
+    global _worker_validator
+    _worker_validator = validator
+
+
+def _validate_in_worker(content: str, file_path: str) -> ChapterValidation:
+    return _worker_validator.validate_chapter(content, file_path)
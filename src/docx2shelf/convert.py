@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import functools
 import json
 import re
 import sys
+from html import escape
 from pathlib import Path
 
 from .path_utils import get_safe_temp_path
@@ -15,6 +17,62 @@ IMG_NS = {
 }
 
 
+# Boundary kinds the splitters understand; headings open a new chunk and
+# page break markers are dropped
+SPLIT_BOUNDARIES = ("h1", "h2", "h3", "h4", "h5", "h6", "pagebreak")
+
+_PAGEBREAK_PATTERNS = (
+    r"hr[^>]*class=\"[^\"]*pagebreak[^\"]*\"[^>]*/?>",
+    r"!--\s*PAGEBREAK\s*-->",
+    r"[^>]*style=\"[^\"]*page-break-(?:before|after)\s*:\s*always[^\"]*\"[^>]*>",
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _boundary_pattern(kinds: tuple[str, ...]) -> re.Pattern[str]:
+    """One regex matching every boundary of the given kinds.
+
+    All alternatives share the leading ``<`` so the scan can skip straight
+    from tag to tag. Headings come first, so a heading styled with a page
+    break is kept as the start of the next chunk.
+    """
+    alternatives = []
+    levels = [kind for kind in kinds if kind != "pagebreak"]
+    if levels:
+        tags = "|".join(map(re.escape, levels))
+        alternatives.append(rf"(?P<heading>{tags})[^>]*>.*?</(?P=heading)>")
+    if "pagebreak" in kinds:
+        alternatives.extend(_PAGEBREAK_PATTERNS)
+    return re.compile(rf"<(?:{'|'.join(alternatives)})", re.IGNORECASE | re.DOTALL)
+
+
+def _split_at_boundaries(s: str, kinds) -> list[str]:
+    """Slice ``s`` at every boundary of ``kinds`` found in a single scan.
+
+    Returns the raw pieces, including empty ones; a single piece means no
+    boundary was found.
+    """
+    pattern = _boundary_pattern(tuple(sorted(set(kinds))))
+    pieces: list[str] = []
+    start = 0
+    for match in pattern.finditer(s):
+        pieces.append(s[start : match.start()])
+        # Keep the heading with the following content; drop break markers
+        start = match.start() if match.lastgroup == "heading" else match.end()
+    pieces.append(s[start:])
+    return pieces
+
+
+def split_html_at_boundaries(html: str, kinds) -> list[str]:
+    """Split HTML at any of several boundary kinds in one pass.
+
+    ``kinds`` is an iterable of ``SPLIT_BOUNDARIES`` entries. Every chunk is
+    wrapped in a single ``<section>``; whitespace-only chunks are dropped.
+    """
+    s = html.replace("\r\n", "\n")
+    return [f"<section>{c}</section>" for c in _split_at_boundaries(s, kinds) if c.strip()]
+
+
 def split_html_by_heading(html: str, level: str) -> list[str]:
     """Split a single HTML string into chunks at <h1> or <h2> boundaries.
 
@@ -24,50 +82,16 @@ def split_html_by_heading(html: str, level: str) -> list[str]:
     # Normalize newlines to avoid regex surprises
     s = html.replace("\r\n", "\n")
     # Split but keep the heading with the following content
-    pattern = re.compile(rf"(<{tag}[^>]*>.*?</{tag}>)", re.IGNORECASE | re.DOTALL)
-    parts = pattern.split(s)
-    if len(parts) <= 1:
+    pieces = _split_at_boundaries(s, [tag])
+    if len(pieces) <= 1:
         return [s]
-    chunks: list[str] = []
-    current: list[str] = []
-    for i, part in enumerate(parts):
-        if i % 2 == 1:  # this is a heading
-            if current:
-                chunks.append("".join(current))
-                current = []
-            current.append(part)
-        else:
-            current.append(part)
-    if current:
-        chunks.append("".join(current))
     # Wrap chunks into section tags for cleanliness
-    return [f"<section>{c}</section>" for c in chunks if c.strip()]
+    return [f"<section>{c}</section>" for c in pieces if c.strip()]
 
 
 def split_html_by_heading_level(html: str, level: str) -> list[str]:
     """Split HTML by a specific heading level (h3, h4, h5, h6)."""
-    if level not in ["h3", "h4", "h5", "h6"]:
-        return split_html_by_heading(html, level)
-
-    tag = level.lower()
-    s = html.replace("\r\n", "\n")
-    pattern = re.compile(rf"(<{tag}[^>]*>.*?</{tag}>)", re.IGNORECASE | re.DOTALL)
-    parts = pattern.split(s)
-    if len(parts) <= 1:
-        return [s]
-    chunks: list[str] = []
-    current: list[str] = []
-    for i, part in enumerate(parts):
-        if i % 2 == 1:  # this is a heading
-            if current:
-                chunks.append("".join(current))
-                current = []
-            current.append(part)
-        else:
-            current.append(part)
-    if current:
-        chunks.append("".join(current))
-    return [f"<section>{c}</section>" for c in chunks if c.strip()]
+    return split_html_by_heading(html, level)
 
 
 def split_html_mixed(html: str, mixed_pattern: str) -> list[str]:
@@ -76,6 +100,9 @@ def split_html_mixed(html: str, mixed_pattern: str) -> list[str]:
     Pattern examples:
     - 'h1,pagebreak' - Split at h1 OR pagebreak
     - 'h1:main,pagebreak:appendix' - Split at h1 for main content, pagebreak for appendix
+
+    All strategies are matched in a single scan, so each chunk is wrapped in
+    exactly one ``<section>``.
     """
     if not mixed_pattern:
         return split_html_by_heading(html, "h1")
@@ -91,24 +118,14 @@ def split_html_mixed(html: str, mixed_pattern: str) -> list[str]:
             strategies.append((part, None))
 
     # For now, implement simple OR logic - split at any of the specified points
-    html_sections = [html]
-
-    for strategy, section_type in strategies:
-        new_sections = []
-        for section in html_sections:
-            if strategy == "pagebreak":
-                parts = split_html_by_pagebreak(section)
-            elif strategy in ["h1", "h2", "h3", "h4", "h5", "h6"]:
-                if strategy in ["h1", "h2"]:
-                    parts = split_html_by_heading(section, strategy)
-                else:
-                    parts = split_html_by_heading_level(section, strategy)
-            else:
-                parts = [section]
-            new_sections.extend(parts)
-        html_sections = new_sections
-
-    return html_sections
+    kinds = {strategy for strategy, _section_type in strategies if strategy in SPLIT_BOUNDARIES}
+    if not kinds:
+        return [html]
+    s = html.replace("\r\n", "\n")
+    pieces = _split_at_boundaries(s, kinds)
+    if len(pieces) <= 1 and "pagebreak" not in kinds:
+        return [s]  # as split_html_by_heading does
+    return [f"<section>{c}</section>" for c in pieces if c.strip()]
 
 
 def split_html_by_pagebreak(html: str) -> list[str]:
@@ -117,19 +134,53 @@ def split_html_by_pagebreak(html: str) -> list[str]:
     Looks for <hr class="pagebreak">, elements with style containing
     page-break-(before|after): always, or explicit <!-- PAGEBREAK --> comments.
     """
-    s = html.replace("\r\n", "\n")
-    # Insert a sentinel at break points
-    patterns = [
-        r"<hr[^>]*class=\"[^\"]*pagebreak[^\"]*\"[^>]*/?>",
-        r"<[^>]*style=\"[^\"]*page-break-(before|after)\s*:\s*always[^\"]*\"[^>]*>",
-        r"<!--\s*PAGEBREAK\s*-->",
-    ]
-    sentinel = "\n<!--__SPLIT__-->\n"
-    for pat in patterns:
-        s = re.sub(pat, sentinel, s, flags=re.IGNORECASE)
-    parts = s.split(sentinel)
-    chunks = [p for p in parts if p.strip()]
-    return [f"<section>{c}</section>" for c in chunks]
+    return split_html_at_boundaries(html, ["pagebreak"])
+
+
+# Pandoc input format per source suffix (None lets Pandoc infer it)
+_PANDOC_INPUT_FORMATS = {
+    ".docx": None,
+    ".md": "markdown",
+    ".txt": "plain",
+    ".html": "html",
+    ".htm": "html",
+}
+
+
+def pandoc_options_for(input_path: Path) -> dict:
+    """Keyword arguments ``convert_file_to_html`` passes to Pandoc for a file.
+
+    Shared with callers that prefetch conversions through ``PandocPool`` so the
+    prefetched job matches the one the build asks for.
+    """
+    return {
+        "to": "html",
+        "format": _PANDOC_INPUT_FORMATS.get(input_path.suffix.lower()),
+        "extra_args": ["--wrap=none"],
+    }
+
+
+def pandoc_convert_file(
+    source: Path,
+    to: str = "html",
+    format: str | None = None,
+    extra_args: list[str] | None = None,
+) -> str:
+    """Run one Pandoc conversion, through the shared ``PandocPool`` when active.
+
+    Batch and directory builds open a ``pandoc_pool.shared_pool()`` so files are
+    converted by warm workers; everywhere else this is a plain
+    ``pypandoc.convert_file`` call.
+    """
+    from .pandoc_pool import active_pool
+
+    pool = active_pool()
+    if pool is not None:
+        return pool.convert_file(source, to=to, format=format, extra_args=extra_args)
+
+    import pypandoc  # type: ignore
+
+    return pypandoc.convert_file(str(source), to=to, format=format, extra_args=extra_args or [])
 
 
 def convert_file_to_html(
@@ -142,7 +193,7 @@ def convert_file_to_html(
     - For .docx, try Pandoc first, then fall back to python-docx.
     - Uses performance optimizations for large files.
     """
-    from .performance import BuildCache, ParallelImageProcessor, PerformanceMonitor
+    from .performance import ParallelImageProcessor, PerformanceMonitor, default_build_cache
     from .plugins import load_default_plugins, plugin_manager
 
     # Initialize context if not provided
@@ -154,8 +205,7 @@ def convert_file_to_html(
     monitor.start_monitoring()
 
     # Check for build cache
-    cache_dir = Path.home() / ".docx2shelf" / "cache"
-    cache = BuildCache(cache_dir)
+    cache = default_build_cache()
 
     # Initialize image processor
     image_processor = ParallelImageProcessor()
@@ -190,16 +240,7 @@ def convert_file_to_html(
             raise RuntimeError(error_msg.strip())
 
         try:
-            import pypandoc  # type: ignore
-
-            if suffix in (".html", ".htm"):
-                file_format = "html"
-            else:
-                file_format = "markdown" if suffix == ".md" else "plain"
-
-            html = pypandoc.convert_file(
-                str(actual_input_path), to="html", format=file_format, extra_args=["--wrap=none"]
-            )
+            html = pandoc_convert_file(actual_input_path, **pandoc_options_for(actual_input_path))
             # Apply post-convert hooks
             processed_html = plugin_manager.execute_post_convert_hooks(html, context)
             # For now, we don't split these files, return as a single chunk
@@ -215,21 +256,32 @@ def convert_file_to_html(
 
     elif suffix == ".docx":
         # Check cache first
-        cache_key = cache.generate_cache_key(actual_input_path)
+        cache_key = cache.generate_cache_key(
+            actual_input_path, _conversion_cache_options(actual_input_path)
+        )
         cached_result = cache.get_cached_conversion(cache_key)
 
         if cached_result:
             monitor.add_phase_time("cache_hit", 0.0)
             chunks, resources, styles = cached_result
         else:
-            # Use performance-optimized conversion
-            with monitor.phase_timer("docx_conversion"):
-                chunks, resources, styles = docx_to_html_optimized(
-                    actual_input_path, cache, image_processor, monitor
+            # Image and conversion cache writes from this build commit together
+            with cache.db.batched():
+                # Use performance-optimized conversion
+                with monitor.phase_timer("docx_conversion"):
+                    chunks, resources, styles = docx_to_html_optimized(
+                        actual_input_path, cache, image_processor, monitor
+                    )
+
+                # Cache the result
+                cache.cache_conversion(
+                    cache_key, (chunks, resources, styles), source_path=actual_input_path
                 )
 
-            # Cache the result
-            cache.cache_conversion(cache_key, (chunks, resources, styles))
+            from .settings import get_settings
+
+            if get_settings().advanced_settings.cache_auto_prune:
+                cache.prune()
 
         # Apply post-convert hooks to each chunk with parallel processing
         with monitor.phase_timer("post_processing"):
@@ -303,9 +355,13 @@ def _process_tracked_changes(run_element) -> tuple[str, bool]:
     return "", True  # No tracked changes found
 
 
-def _process_comments(run_element, document) -> str:
+def _process_comments(run_element, note_index) -> str:
     """Process comment references in a run element.
 
+    Args:
+        run_element: The ``w:r`` element to inspect
+        note_index: ``ooxml_stream.NoteIndex`` built once for the document
+
     Returns:
         HTML string with comment markers
     """
@@ -326,24 +382,10 @@ def _process_comments(run_element, document) -> str:
     comment_html = []
     for ref in comment_refs:
         comment_id = ref.get("{http://schemas.openxmlformats.org/wordprocessingml/2006/main}id")
-        if comment_id:
-            try:
-                # Try to extract comment text if comments part exists
-                if hasattr(document.part, "comments_part") and document.part.comments_part:
-                    comment_nodes = document.part.comments_part._element.xpath(
-                        f'.//w:comment[@w:id="{comment_id}"]//w:t',
-                        namespaces={
-                            "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
-                        },
-                    )
-                    comment_text = " ".join(node.text or "" for node in comment_nodes).strip()
-                    if comment_text:
-                        comment_html.append(
-                            f'<span class="comment" title="{comment_text}">💬</span>'
-                        )
-            except Exception:
-                # Fallback to just marking comment presence
-                comment_html.append('<span class="comment">💬</span>')
+        comment = note_index.get("comment", comment_id)
+        if comment and comment.text:
+            title = escape(comment.text)
+            comment_html.append(f'<span class="comment" title="{title}">💬</span>')
 
     return "".join(comment_html)
 
@@ -483,6 +525,47 @@ def _process_text_box_or_shape(element, tempdir: Path, rasterize_fallback: bool
             return '<div class="shape">[Shape or text box]</div>'
 
 
+def _conversion_cache_options(docx_path: Path) -> dict:
+    """Collect the inputs besides the DOCX itself that shape a cached conversion.
+
+    Covers the Pandoc version and arguments plus the content of any user
+    styles.json overrides that _load_style_mapping would merge in.
+    """
+    import hashlib
+
+    from .tools import get_pandoc_status
+
+    status = get_pandoc_status()
+    pandoc = status["pandoc_binary"]
+    style_overrides = {}
+    for styles_path in {docx_path.parent / "styles.json", Path.cwd() / "styles.json"}:
+        if styles_path.is_file():
+            style_overrides[str(styles_path)] = hashlib.sha256(styles_path.read_bytes()).hexdigest()
+
+    return {
+        "pandoc": pandoc["version"] if pandoc["available"] else None,
+        "pandoc_options": pandoc_options_for(docx_path),
+        "styles": style_overrides,
+    }
+
+
+def conversion_cached(input_path: Path) -> bool:
+    """Check whether ``convert_file_to_html`` would find ``input_path`` in the build cache.
+
+    Lets callers skip work a cache hit would throw away, such as converting
+    the file with Pandoc ahead of time. Pre-convert plugin hooks are not run.
+    """
+    if input_path.suffix.lower() != ".docx":
+        return False
+
+    from .performance import default_build_cache
+
+    cache = default_build_cache()
+    return cache.has_cached_conversion(
+        cache.generate_cache_key(input_path, _conversion_cache_options(input_path))
+    )
+
+
 def _load_style_mapping(docx_path: Path) -> dict:
     """Load style mapping from default styles.json and optional user override.
 
@@ -593,12 +676,6 @@ def docx_to_html_optimized(
 
     Uses streaming reading, parallel image processing, and performance monitoring.
     """
-    from .performance import MemoryOptimizer
-
-    # MemoryOptimizer exposes only @staticmethod helpers; there's no
-    # instance-level monitoring/cleanup lifecycle to drive here.
-    optimizer = MemoryOptimizer()
-
     try:
         # Try Pandoc first (fastest for most documents)
         with monitor.phase_timer("pandoc_conversion"):
@@ -609,11 +686,7 @@ def docx_to_html_optimized(
 
             if status["overall_available"]:
                 try:
-                    import pypandoc  # type: ignore
-
-                    html = pypandoc.convert_file(
-                        str(docx_path), to="html", extra_args=["--wrap=none"]
-                    )
+                    html = pandoc_convert_file(docx_path, **pandoc_options_for(docx_path))
                     chunks = split_html_by_heading(html, level="h1")
 
                     # Extract and process images in parallel
@@ -642,119 +715,50 @@ def docx_to_html_optimized(
                     "Using fallback DOCX conversion - install Pandoc for better results"
                 )
 
-        # Fallback to streaming python-docx reader for large files
+        # Fallback to the streaming OOXML engine
         with monitor.phase_timer("streaming_conversion"):
-            return _docx_to_html_streaming(docx_path, image_processor, monitor, optimizer)
+            return _docx_to_html_streaming(docx_path, monitor)
 
     finally:
-        # MemoryOptimizer has no cleanup() lifecycle method.
-        pass
+        monitor.record_memory_usage()
 
 
-def _docx_to_html_streaming(
-    docx_path: Path, image_processor, monitor, optimizer
-) -> tuple[list[str], list[Path], str]:
-    """Convert DOCX to HTML using streaming approach for large documents."""
+def _docx_to_html_streaming(docx_path: Path, monitor) -> tuple[list[str], list[Path], str]:
+    """Convert DOCX to HTML using streaming approach for large documents.
 
+    Bytes read from ``word/document.xml`` by ``StreamingDocxReader`` are fed
+    straight into the incremental parser of ``OOXMLStreamConverter``, which
+    yields one section at a time; the whole XML is never held in memory.
+    """
+    from .ooxml_stream import OOXMLStreamConverter
     from .performance import StreamingDocxReader
 
-    # Use streaming reader to minimize memory usage
-    with StreamingDocxReader(docx_path, chunk_size=512 * 1024) as reader:  # 512KB chunks
-        # Process document XML in chunks
-        chunks = []
-        current_chunk = []
-        resources = []
+    with monitor.phase_timer("style_loading"):
+        styles_data = _load_style_mapping(docx_path)
+        styles_css = extract_styles_css(styles_data)
 
-        # Extract embedded images in parallel
-        with monitor.phase_timer("image_extraction"):
-            try:
-                image_data = reader.get_embedded_images()
-                resources = image_processor.process_image_data(image_data)
-            except Exception as e:
-                monitor.add_warning(f"Image extraction failed: {e}")
-
-        # Stream and parse document XML
-        with monitor.phase_timer("xml_streaming"):
-            full_xml = ""
-            for xml_chunk in reader.stream_document_xml():
-                full_xml += xml_chunk
-                # Trigger garbage collection periodically for large documents
-                if len(full_xml) > 5 * 1024 * 1024:  # 5MB
-                    optimizer.trigger_gc()
-
-        # Parse and convert to HTML
+    converter = OOXMLStreamConverter(docx_path, styles_data)
+    chunks: list[str] = []
+
+    with StreamingDocxReader(docx_path, chunk_size=512 * 1024) as reader:  # 512KB chunks
         with monitor.phase_timer("html_conversion"):
             try:
-                # Use the existing python-docx fallback but with optimized parsing
-                chunks, _, styles = _parse_docx_xml_optimized(full_xml, docx_path, monitor)
+                for section in converter.iter_sections(reader.iter_document_xml_bytes()):
+                    chunks.append(section)
+                    # Sample per chapter so the open phases report a real peak
+                    monitor.record_memory_usage()
             except Exception as e:
                 monitor.add_warning(f"XML parsing failed: {e}")
                 # Ultra-minimal fallback
-                chunks = ["<section><p>Document content could not be parsed</p></section>"]
-                styles = ""
-
-        return chunks, resources, styles
-
-
-def _parse_docx_xml_optimized(
-    xml_content: str, docx_path: Path, monitor
-) -> tuple[list[str], list[Path], str]:
-    """Parse DOCX XML with memory and performance optimizations."""
-    import xml.etree.ElementTree as ET
-    from xml.etree.ElementTree import ParseError
-
-    try:
-        # Parse XML with optimized settings
-        root = ET.fromstring(xml_content)
-
-        # Use the existing docx_to_html logic but with streaming optimizations
-        # For now, fall back to the existing implementation but monitor performance
-        with monitor.phase_timer("legacy_conversion"):
-            chunks, resources, styles = _fallback_docx_conversion(docx_path)
-
-        return chunks, resources, styles
-
-    except ParseError as e:
-        monitor.add_warning(f"XML parsing error: {e}")
-        return ["<section><p>Error parsing document XML</p></section>"], [], ""
-
-
-def _fallback_docx_conversion(docx_path: Path) -> tuple[list[str], list[Path], str]:
-    """Fallback conversion using existing logic."""
-    # Use the existing docx_to_html function logic as fallback
-    try:
-        from docx import Document  # type: ignore
-
-        doc = Document(docx_path)
-        chunks = []
-        current_chunk = []
-        resources = []
-
-        # Simple paragraph-by-paragraph conversion
-        for para in doc.paragraphs:
-            if para.style.name.startswith("Heading"):
-                if current_chunk:
-                    chunks.append(f"<section>{''.join(current_chunk)}</section>")
-                    current_chunk = []
-                level = 1 if "Heading 1" in para.style.name else 2
-                current_chunk.append(f"<h{level}>{para.text}</h{level}>")
-            else:
-                current_chunk.append(f"<p>{para.text}</p>")
-
-        if current_chunk:
-            chunks.append(f"<section>{''.join(current_chunk)}</section>")
-
-        if not chunks:
-            chunks = ["<section><p>No content found</p></section>"]
-
-        # Load styles
-        styles_data = _load_style_mapping(docx_path)
-        styles_css = extract_styles_css(styles_data)
-
-        return chunks, resources, styles_css
+                return (
+                    ["<section><p>Document content could not be parsed</p></section>"],
+                    [],
+                    styles_css,
+                )
 
-    except Exception:
-        return ["<section><p>Error processing document</p></section>"], [], ""
+    # Images referenced by the HTML, copied out of the zip as they were reached
+    monitor.increment_counter("images_processed", len(converter.resources))
+    return chunks, list(converter.resources), styles_css
 
 
 def docx_to_html(docx_path: Path) -> tuple[list[str], list[Path], str]:
@@ -762,7 +766,8 @@ def docx_to_html(docx_path: Path) -> tuple[list[str], list[Path], str]:
 
     Strategy:
     1) Try Pandoc via pypandoc for rich conversion.
-    2) Fallback to a lightweight python-docx paragraph/headings extraction.
+    2) Fall back to the single-pass streaming OOXML engine (``ooxml_stream``).
+    3) Last resort: a lightweight python-docx paragraph/headings extraction.
     """
     # Load style mapping with user override support
     styles_data = _load_style_mapping(docx_path)
@@ -777,9 +782,7 @@ def docx_to_html(docx_path: Path) -> tuple[list[str], list[Path], str]:
 
     if status["overall_available"]:
         try:
-            import pypandoc  # type: ignore
-
-            html = pypandoc.convert_file(str(docx_path), to="html", extra_args=["--wrap=none"])
+            html = pandoc_convert_file(docx_path, **pandoc_options_for(docx_path))
             # Split at h1 by default; caller can later decide via CLI how to split
             chunks = split_html_by_heading(html, level="h1")
             # Load styles for potential CSS injection even with Pandoc
@@ -797,7 +800,15 @@ def docx_to_html(docx_path: Path) -> tuple[list[str], list[Path], str]:
             print(f"  - {status['pypandoc_library']['message']}")
         print("  - Run 'docx2shelf doctor' for detailed diagnostics")
 
-    # 2) python-docx fallback
+    # 2) Single-pass streaming OOXML engine (no python-docx required)
+    try:
+        from .ooxml_stream import OOXMLStreamConverter
+
+        return OOXMLStreamConverter(docx_path, styles_data).convert()
+    except Exception as e:
+        print(f"Warning: Streaming DOCX conversion failed ({e}), trying python-docx")
+
+    # 3) python-docx fallback
     try:
         from docx import Document  # type: ignore
         from docx.oxml.ns import qn  # type: ignore
@@ -806,7 +817,11 @@ def docx_to_html(docx_path: Path) -> tuple[list[str], list[Path], str]:
             "No converter found. Install pypandoc (Pandoc recommended) or python-docx."
         ) from e
 
+    from .ooxml_stream import NoteIndex
+
     document = Document(str(docx_path))
+    # Footnote, endnote and comment bodies resolved once per document
+    note_index = NoteIndex.from_docx(docx_path)
     parts: list[str] = []
 
     # Temp dir for extracted images
@@ -958,7 +973,7 @@ def docx_to_html(docx_path: Path) -> tuple[list[str], list[Path], str]:
                 continue
 
             # Process comments
-            comment_html = _process_comments(run.element, document)
+            comment_html = _process_comments(run.element, note_index)
 
             txt = run.text or ""
             if tracked_text:
@@ -1019,38 +1034,9 @@ def docx_to_html(docx_path: Path) -> tuple[list[str], list[Path], str]:
                 ref_id = ref.get("{http://schemas.openxmlformats.org/wordprocessingml/2006/main}id")
                 sup = f'<sup id="fnref{note_idx}"><a href="#fn{note_idx}">{note_idx}</a></sup>'
                 run_html.append(sup)
-                # Retrieve note text if possible
-                note_text = None
-                try:
-                    if (
-                        "footnote" in ref.tag
-                        and hasattr(document.part, "footnotes_part")
-                        and document.part.footnotes_part is not None
-                    ):
-                        # type: ignore[attr-defined]
-                        nodes = document.part.footnotes_part._element.xpath(
-                            f'.//w:footnote[@w:id="{ref_id}"]//w:t',
-                            namespaces={
-                                "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
-                            },
-                        )
-                        note_text = "".join(n.text or "" for n in nodes).strip()
-                    elif (
-                        "endnote" in ref.tag
-                        and hasattr(document.part, "endnotes_part")
-                        and document.part.endnotes_part is not None
-                    ):
-                        nodes = document.part.endnotes_part._element.xpath(
-                            f'.//w:endnote[@w:id="{ref_id}"]//w:t',
-                            namespaces={
-                                "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
-                            },
-                        )
-                        note_text = "".join(n.text or "" for n in nodes).strip()
-                except Exception:
-                    note_text = None
-                if not note_text:
-                    note_text = "(note)"
+                kind = "footnote" if "footnote" in ref.tag else "endnote"
+                note = note_index.get(kind, ref_id)
+                note_text = note.html if note and note.html else "(note)"
                 current_notes.append(
                     f'<li id="fn{note_idx}"><p>{note_text} <a href="#fnref{note_idx}">↩</a></p></li>'
                 )
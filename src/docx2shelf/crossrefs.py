@@ -16,12 +16,18 @@ Features:
 
 from __future__ import annotations
 
+import bisect
 import hashlib
 import re
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Dict, List, Optional, Set, Tuple
 
+_HEADING_RE = re.compile(r"<(h[1-6])([^>]*?)>(.*?)</\1>", re.IGNORECASE | re.DOTALL)
+_ID_ATTR_RE = re.compile(r'(?<![\w-])id\s*=\s*["\']([^"\']*)["\']', re.IGNORECASE)
+# Opening tags of the elements chunk rewriting touches: headings and links
+_OPEN_TAG_RE = re.compile(r"<(?:h[1-6]|a)\b[^>]*>", re.IGNORECASE)
+
 
 class CrossRefType(Enum):
     """Types of cross-references supported."""
@@ -122,6 +128,12 @@ class CrossRefProcessor:
         self.targets: Dict[str, AnchorTarget] = {}
         self.references: List[CrossReference] = []
         self.id_registry: Set[str] = set()
+        # chunk index -> {offset of the opening tag: (tag, attrs, target)}
+        self._chunk_headings: Dict[int, Dict[int, Tuple[str, str, AnchorTarget]]] = {}
+        # chunk index -> {offset of the <a> tag: reference}
+        self._chunk_links: Dict[int, Dict[int, CrossReference]] = {}
+        self._by_original_id: Dict[str, AnchorTarget] = {}
+        self._title_index: Optional[_TitleIndex] = None
         self._stats = {
             "targets_found": 0,
             "references_found": 0,
@@ -177,9 +189,9 @@ class CrossRefProcessor:
     def _extract_heading_targets(self, chunk: str, filename: str, chunk_idx: int) -> None:
         """Extract heading elements as targets."""
 
-        heading_pattern = r"<(h[1-6])([^>]*?)>(.*?)</\1>"
+        headings = self._chunk_headings.setdefault(chunk_idx, {})
 
-        for match in re.finditer(heading_pattern, chunk, re.IGNORECASE | re.DOTALL):
+        for match in _HEADING_RE.finditer(chunk):
             tag = match.group(1).lower()
             attrs = match.group(2)
             content = match.group(3)
@@ -191,8 +203,8 @@ class CrossRefProcessor:
                 continue
 
             # Extract existing ID if present
-            id_match = re.search(r'id\s*=\s*["\']([^"\']+)["\']', attrs)
-            original_id = id_match.group(1) if id_match else None
+            id_match = _ID_ATTR_RE.search(attrs)
+            original_id = id_match.group(1) if id_match and id_match.group(1) else None
 
             # Generate stable ID
             stable_id = self._generate_stable_id(clean_title, CrossRefType.HEADING, original_id)
@@ -210,6 +222,7 @@ class CrossRefProcessor:
             )
 
             self.targets[stable_id] = target
+            headings[match.start()] = (match.group(1), attrs, target)
 
     def _extract_figure_targets(self, chunk: str, filename: str, chunk_idx: int) -> None:
         """Extract figure elements as targets."""
@@ -324,6 +337,7 @@ class CrossRefProcessor:
         ref_number = 1
 
         for chunk_idx, (chunk, filename) in enumerate(zip(html_chunks, chunk_files)):
+            links = self._chunk_links.setdefault(chunk_idx, {})
             for pattern in ref_patterns:
                 for match in re.finditer(pattern, chunk, re.IGNORECASE | re.DOTALL):
                     if pattern.startswith(r"<a"):  # Hyperlink pattern
@@ -349,6 +363,8 @@ class CrossRefProcessor:
 
                     self.references.append(ref)
                     ref_number += 1
+                    if pattern.startswith(r"<a"):
+                        links[match.start()] = ref
 
         self._stats["references_found"] = len(self.references)
 
@@ -357,6 +373,13 @@ class CrossRefProcessor:
 
         broken_refs = 0
 
+        # Index targets once instead of scanning them for every reference
+        self._by_original_id = {}
+        for target in self.targets.values():
+            if target.original_id is not None:
+                self._by_original_id.setdefault(target.original_id, target)
+        self._title_index = _TitleIndex(list(self.targets.values()))
+
         for ref in self.references:
             # Try to find target by various methods
             target = self._find_target_for_reference(ref)
@@ -385,75 +408,44 @@ class CrossRefProcessor:
             return self.targets[ref.target_id]
 
         # Try to match by original ID
-        for target in self.targets.values():
-            if target.original_id == ref.target_id:
-                return target
+        if ref.target_id in self._by_original_id:
+            return self._by_original_id[ref.target_id]
 
         # Try to match by content
-        ref_text_lower = ref.ref_text.lower()
-        for target in self.targets.values():
-            if target.title.lower() in ref_text_lower or ref_text_lower in target.title.lower():
-                return target
-
-        return None
+        if self._title_index is None:
+            self._title_index = _TitleIndex(list(self.targets.values()))
+        return self._title_index.find(ref.ref_text)
 
     def _update_html_with_anchors_and_links(self, html_chunks: List[str]) -> List[str]:
         """Update HTML with stable anchor IDs and resolved cross-reference links."""
 
-        updated_chunks = []
-
-        for chunk_idx, chunk in enumerate(html_chunks):
-            updated_chunk = chunk
-
-            # Add IDs to target elements
-            updated_chunk = self._add_target_ids(updated_chunk)
-
-            # Update cross-reference links
-            updated_chunk = self._update_reference_links(updated_chunk)
-
-            updated_chunks.append(updated_chunk)
-
-        return updated_chunks
+        return [self._rewrite_chunk(chunk, idx) for idx, chunk in enumerate(html_chunks)]
 
-    def _add_target_ids(self, chunk: str) -> str:
-        """Add stable IDs to target elements."""
+    def _rewrite_chunk(self, chunk: str, chunk_idx: int) -> str:
+        """Add target IDs and resolved links to one chunk in a single pass.
 
-        # Find targets in this chunk and add IDs
-        for target in self.targets.values():
-            if target.ref_type == CrossRefType.HEADING:
-                # Update heading tags
-                pattern = rf"<(h{target.level})([^>]*?)>({re.escape(target.title)})</\1>"
-
-                def add_id(match):
-                    tag = match.group(1)
-                    attrs = match.group(2)
-                    content = match.group(3)
-
-                    # Add or update ID
-                    if "id=" in attrs:
-                        attrs = re.sub(r'id\s*=\s*["\'][^"\']*["\']', f'id="{target.id}"', attrs)
-                    else:
-                        attrs += f' id="{target.id}"'
-
-                    return f"<{tag}{attrs}>{content}</{tag}>"
-
-                chunk = re.sub(pattern, add_id, chunk, flags=re.IGNORECASE)
-
-        return chunk
+        Headings and links were indexed by offset when they were extracted,
+        so only their opening tags are replaced.
+        """
+        edits: Dict[int, str] = {}
 
-    def _update_reference_links(self, chunk: str) -> str:
-        """Update cross-reference links with resolved hrefs."""
+        # Add IDs to target elements
+        for position, (tag, attrs, target) in self._chunk_headings.get(chunk_idx, {}).items():
+            new_id = f'id="{target.id}"'
+            if _ID_ATTR_RE.search(attrs):
+                attrs = _ID_ATTR_RE.sub(lambda _match: new_id, attrs, count=1)
+            else:
+                attrs += f" {new_id}"
+            edits[position] = f"<{tag}{attrs}>"
 
-        for ref in self.references:
+        # Update cross-reference links
+        for position, ref in self._chunk_links.get(chunk_idx, {}).items():
             if not ref.is_broken and ref.href:
-                # Find and update the reference link
-                pattern = (
-                    rf'<a[^>]*?href\s*=\s*["\']#?{re.escape(ref.target_id)}["\'][^>]*?>(.*?)</a>'
-                )
-                replacement = f'<a href="{ref.href}" class="cross-ref">\\1</a>'
-                chunk = re.sub(pattern, replacement, chunk, flags=re.IGNORECASE)
+                edits[position] = f'<a href="{ref.href}" class="cross-ref">'
 
-        return chunk
+        if not edits:
+            return chunk
+        return _OPEN_TAG_RE.sub(lambda match: edits.get(match.start(), match.group(0)), chunk)
 
     def _generate_stable_id(
         self, content: str, ref_type: CrossRefType, original_id: Optional[str] = None
@@ -555,6 +547,68 @@ class CrossRefProcessor:
         return manifest
 
 
+class _TitleIndex:
+    """Finds the first target whose title contains, or is contained in, a text.
+
+    Titles containing the text are found with one search over all titles
+    joined in target order; titles contained in the text with a character
+    trie walked from each offset of the text.
+    """
+
+    _SEPARATOR = "\x00"
+
+    def __init__(self, targets: List[AnchorTarget]):
+        self.targets = targets
+        titles = [target.title.lower() for target in targets]
+        self._joined = self._SEPARATOR.join(titles)
+        self._offsets: List[int] = []
+        offset = 0
+        for title in titles:
+            self._offsets.append(offset)
+            offset += len(title) + len(self._SEPARATOR)
+
+        # Nested dicts keyed by character; None marks the first target with that title
+        self._trie: Dict[Optional[str], dict] = {}
+        for order, title in enumerate(titles):
+            node = self._trie
+            for char in title:
+                node = node.setdefault(char, {})
+            node.setdefault(None, order)
+        self._cache: Dict[str, Optional[AnchorTarget]] = {}
+
+    def find(self, text: str) -> Optional[AnchorTarget]:
+        text = text.lower()
+        if text not in self._cache:
+            order = self._first_match(text)
+            self._cache[text] = self.targets[order] if order is not None else None
+        return self._cache[text]
+
+    def _first_match(self, text: str) -> Optional[int]:
+        best = len(self.targets)
+        if not best:
+            return None
+
+        # Titles contained in the text
+        for start in range(len(text)):
+            node = self._trie
+            for char in text[start:]:
+                node = node.get(char)
+                if node is None:
+                    break
+                if None in node and node[None] < best:
+                    best = node[None]
+        if None in self._trie:  # an empty title is contained in any text
+            best = min(best, self._trie[None])
+
+        # Titles containing the text; only those before the best match can win
+        end = self._offsets[best] if best < len(self.targets) else len(self._joined)
+        position = self._joined.find(text, 0, end)
+        if position != -1:
+            best = bisect.bisect_right(self._offsets, position) - 1
+
+        return best if best < len(self.targets) else None
+
+
 def create_default_crossref_config() -> CrossRefConfig:
     """Create default cross-reference configuration."""
     return CrossRefConfig()
@@ -25,6 +25,10 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from .cache_db import CacheDatabase
+from .epubcheck_daemon import shared_daemon
+from .pandoc_pool import shared_pool
+
 try:
     import yaml
 except ImportError:
@@ -92,6 +96,7 @@ class EnterpriseConfig:
     api_port: int = 8080
     api_host: str = "localhost"
     log_level: str = "INFO"
+    epubcheck_daemon: bool = True
     storage_directory: Optional[str] = None
     database_url: Optional[str] = None
 
@@ -247,10 +252,16 @@ class BatchProcessor:
             output_dir = Path(job.output_directory)
             output_dir.mkdir(parents=True, exist_ok=True)
 
-            if job.processing_mode == "books":
-                self._process_book_folders(job, input_items, output_dir)
-            else:
-                self._process_individual_files(job, input_items, output_dir)
+            # Concurrent jobs share one warm Pandoc pool sized to the job limit
+            # and one warm EPUBCheck JVM
+            with (
+                shared_pool(max_workers=self.config.max_concurrent_jobs),
+                shared_daemon(self.config.epubcheck_daemon),
+            ):
+                if job.processing_mode == "books":
+                    self._process_book_folders(job, input_items, output_dir)
+                else:
+                    self._process_individual_files(job, input_items, output_dir)
 
             # Mark job as completed
             if job.status != "cancelled":
@@ -745,6 +756,8 @@ class UserManager:
 
     def __init__(self, database_path: Optional[Path] = None):
         self.db_path = database_path or self._get_default_db_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = CacheDatabase.shared(self.db_path)
         self._init_database()
 
     def _get_default_db_path(self) -> Path:
@@ -758,9 +771,7 @@ class UserManager:
 
     def _init_database(self) -> None:
         """Initialize the users database."""
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS users (
@@ -839,7 +850,7 @@ class UserManager:
             api_key=self._generate_api_key(),
         )
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             try:
                 self._insert_user(conn, user)
                 return user
@@ -862,7 +873,7 @@ class UserManager:
 
     def get_user(self, user_id: str) -> Optional[User]:
         """Get a user by ID."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             cursor = conn.execute("SELECT * FROM users WHERE id = ?", (user_id,))
             row = cursor.fetchone()
 
@@ -882,7 +893,7 @@ class UserManager:
 
     def get_user_by_api_key(self, api_key: str) -> Optional[User]:
         """Get a user by API key."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             cursor = conn.execute(
                 "SELECT * FROM users WHERE api_key = ? AND active = 1", (api_key,)
             )
@@ -904,7 +915,7 @@ class UserManager:
 
     def list_users(self, active_only: bool = True) -> List[User]:
         """List all users."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             query = "SELECT * FROM users"
             params = []
 
@@ -952,13 +963,13 @@ class UserManager:
         params.append(user_id)
         query = f"UPDATE users SET {', '.join(updates)} WHERE id = ?"
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             cursor = conn.execute(query, params)
             return cursor.rowcount > 0
 
     def delete_user(self, user_id: str) -> bool:
         """Delete a user (soft delete by deactivating)."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             cursor = conn.execute("UPDATE users SET active = 0 WHERE id = ?", (user_id,))
             return cursor.rowcount > 0
 
@@ -21,6 +21,8 @@ from typing import Any, Dict, List, Optional
 
 import requests
 
+from .cache_db import CacheDatabase
+
 
 @dataclass
 class ConversionJob:
@@ -88,6 +90,9 @@ class DatabaseManager:
     def __init__(self, db_path: Path):
         self.db_path = db_path
         self.connection_lock = Lock()
+        self.db = CacheDatabase.shared(
+            db_path, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
+        )
         self._init_database()
 
     def _init_database(self):
@@ -158,10 +163,8 @@ class DatabaseManager:
             )
 
     def _get_connection(self):
-        """Get database connection."""
-        return sqlite3.connect(
-            self.db_path, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
-        )
+        """Get this thread's pooled database connection."""
+        return self.db.connection()
 
     def create_conversion_job(self, job: ConversionJob) -> str:
         """Create a new conversion job."""
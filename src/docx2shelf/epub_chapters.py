@@ -3,17 +3,77 @@
 This module handles all chapter-related processing including:
 - Chapter start detection (manual and automatic modes)
 - Heading ID injection for navigation
-- Figure and table processing within chapters
+- Running each chapter through the ChapterPipeline (figures, tables, ids)
 - ToC link generation
 """
 
 from __future__ import annotations
 
+import bisect
 import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
 
+from .chapter_pipeline import ChapterContext, ChapterPipeline, FigurePass, HeadingIdPass
 from .figures import FigureProcessor
 from .metadata import BuildOptions, EpubMetadata
 
+_REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+_CHUNK_SEPARATOR = "\x00"  # keeps literal matches from spanning two chunks
+
+
+def _trie_pattern(words) -> str:
+    """Regex source matching any of ``words``, preferring the longest.
+
+    Words sharing a prefix share a branch, so the engine only tries the
+    alternatives that can still match at each position.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: dict) -> str:
+        branches = [re.escape(char) + render(child) for char, child in node.items() if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # Greedy optional: a longer word is tried before the one ending here
+        return f"(?:{body})?" if "" in node else body
+
+    return render(trie)
+
+
+def _first_literal_chunks(text_chunks: list[str], forms: set[str]) -> dict[str, int]:
+    """Index of the first chunk containing each lowercase literal, in one scan."""
+    found: dict[str, int] = {}
+    if "" in forms and text_chunks:
+        found[""] = 0
+    words = {form for form in forms if form}
+    if not words or not text_chunks:
+        return found
+
+    corpus = _CHUNK_SEPARATOR.join(text.lower() for text in text_chunks)
+    starts = [0]
+    for text in text_chunks[:-1]:
+        starts.append(starts[-1] + len(text.lower()) + len(_CHUNK_SEPARATOR))
+    # Every word starting where a longer one matched is one of its prefixes
+    prefixes = {
+        word: [word[:i] for i in range(1, len(word) + 1) if word[:i] in words] for word in words
+    }
+
+    finder = re.compile(f"(?=({_trie_pattern(words)}))")
+    for match in finder.finditer(corpus):
+        chunk_index = bisect.bisect_right(starts, match.start()) - 1
+        for word in prefixes[match.group(1)]:
+            found.setdefault(word, chunk_index)
+        if len(found) == len(forms):
+            break
+    return found
+
 
 def find_chapter_starts(
     html_chunks: list[str], chapter_starts: list[str]
@@ -24,6 +84,11 @@ def find_chapter_starts(
     returns their locations. Falls back to generic chapter titles if
     patterns are not found.
 
+    The chunks' text is indexed once: every pattern is matched as a
+    case-insensitive literal in a single pass over the joined text, and
+    only patterns containing regex syntax are compiled and searched, in
+    the chunks before their first literal match.
+
     Args:
         html_chunks: List of HTML content chunks
         chapter_starts: List of text patterns or regexes to find
@@ -35,30 +100,38 @@ def find_chapter_starts(
 
     # Pre-process HTML chunks to text-only content (performance optimization)
     text_chunks = [re.sub(r"<[^>]+>", "", chunk) for chunk in html_chunks]
+    literal_chunks = _first_literal_chunks(
+        text_chunks, {pattern.lower() for pattern in chapter_starts}
+    )
 
+    compiled: dict[str, Optional[re.Pattern[str]]] = {}
     for pattern in chapter_starts:
-        pattern_found = False
-        # Try to find this pattern in any chunk
-        for i, text_content in enumerate(text_chunks):
-            # Try both exact match and regex-style matching
-            if pattern.lower() in text_content.lower():
-                found_chapters.append((pattern.strip(), i))
-                pattern_found = True
-                break
-
-            # Try as a regex pattern (single execution with better validation)
-            try:
-                match = re.search(pattern, text_content, re.IGNORECASE)
+        literal_chunk = literal_chunks.get(pattern.lower())
+        match_found = None
+
+        # Plain ASCII text matches as a regex where it matches as a literal
+        if not pattern.isascii() or _REGEX_METACHARACTERS.intersection(pattern):
+            if pattern not in compiled:
+                try:
+                    compiled[pattern] = re.compile(pattern, re.IGNORECASE)
+                except re.error:
+                    compiled[pattern] = None  # Invalid regex, skip
+            regex = compiled[pattern]
+            # The literal match wins in its own chunk, so only earlier chunks matter
+            last = len(text_chunks) if literal_chunk is None else literal_chunk
+            for i in range(last) if regex is not None else ():
+                match = regex.search(text_chunks[i])
                 if match and match.group(0).strip():  # Ensure meaningful match
-                    title = match.group(0).strip()
-                    found_chapters.append((title, i))
-                    pattern_found = True
+                    match_found = (match.group(0).strip(), i)
                     break
-            except re.error:
-                pass  # Invalid regex, skip
 
-        # If pattern not found, create a generic chapter name
-        if not pattern_found:
+        if match_found is None and literal_chunk is not None:
+            match_found = (pattern.strip(), literal_chunk)
+
+        if match_found is not None:
+            found_chapters.append(match_found)
+        else:
+            # If pattern not found, create a generic chapter name
             # Ensure we don't exceed available chunks or create invalid indices
             chunk_idx = min(len(found_chapters), len(html_chunks) - 1)
             if chunk_idx >= 0 and chunk_idx < len(html_chunks):  # Ensure valid index
@@ -67,6 +140,63 @@ def find_chapter_starts(
     return found_chapters
 
 
+_HEADING_RE = re.compile(r"<(h[1-6])([^>]*)>(.*?)</\1>", re.IGNORECASE | re.DOTALL)
+_ID_ATTR_RE = re.compile(r"(?<![\w-])id\s*=\s*[\"']([^\"']+)[\"']", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+@dataclass(frozen=True)
+class HeadingMatch:
+    """A heading element found by ``scan_headings``."""
+
+    level: int
+    start: int  # offset of the opening "<"
+    end: int  # offset just past the closing tag
+    attrs_end: int  # offset of the opening tag's ">", where an id is inserted
+    attrs: str
+    inner: str
+    id: str  # existing id attribute, or ""
+
+    @property
+    def title(self) -> str:
+        """Heading text with inline markup removed."""
+        return _TAG_RE.sub("", self.inner)
+
+
+def scan_headings(html: str) -> list[HeadingMatch]:
+    """Find every h1-h6 element in document order with a single regex scan."""
+    headings = []
+    for match in _HEADING_RE.finditer(html):
+        attrs = match.group(2)
+        id_match = _ID_ATTR_RE.search(attrs)
+        headings.append(
+            HeadingMatch(
+                level=int(match.group(1)[1]),
+                start=match.start(),
+                end=match.end(),
+                attrs_end=match.end(2),
+                attrs=attrs,
+                inner=match.group(3),
+                id=id_match.group(1) if id_match else "",
+            )
+        )
+    return headings
+
+
+def _insert_ids(html: str, new_ids: list[tuple[int, str]]) -> str:
+    """Insert ``id`` attributes at the given offsets (ascending) in one copy."""
+    if not new_ids:
+        return html
+    parts = []
+    last = 0
+    for offset, hid in new_ids:
+        parts.append(html[last:offset])
+        parts.append(f' id="{hid}"')
+        last = offset
+    parts.append(html[last:])
+    return "".join(parts)
+
+
 def inject_heading_ids(
     html: str, chap_idx: int, toc_depth: int = 2
 ) -> tuple[str, str, list[tuple[str, str, int]]]:
@@ -74,7 +204,7 @@ def inject_heading_ids(
 
     Ensures the first h1 has an ID and assigns hierarchical IDs to all
     headings up to the specified depth. Returns the modified HTML along
-    with heading information for ToC generation.
+    with heading information for ToC generation, in document order.
 
     Args:
         html: HTML content for a chapter
@@ -84,72 +214,38 @@ def inject_heading_ids(
     Returns:
         tuple: (modified_html, h1_id, [(title, id, level), ...])
     """
-    h1_id = f"ch{chap_idx:03d}"
+    default_id = f"ch{chap_idx:03d}"
+    h1_id = None
+    headings = scan_headings(html)
+    max_level = min(toc_depth, 6)
 
-    # Add id to first h1 if missing
-    def h1_repl(match):
-        tag_open = match.group(1)
-        inside = match.group(2)
-        if re.search(r"\bid=\"[^\"]+\"", tag_open):
-            # keep existing attributes and id
-            return f"<h1{tag_open}>{inside}</h1>"
-        # inject id preserving other attributes
-        return f'<h1{tag_open} id="{h1_id}">{inside}</h1>'
+    # Parent levels are numbered by their total count, as the per-level
+    # substitutions always did, so existing links keep working
+    totals = Counter(heading.level for heading in headings)
+    positions = Counter()
 
-    pattern_h1 = r"<h1([^>]*)>(.*?)</h1>"
-    html_result = re.sub(pattern_h1, h1_repl, html, count=1, flags=re.IGNORECASE | re.DOTALL)
-
-    # Collect all headings from h2 to h{toc_depth} and assign IDs
+    new_ids = []
     all_headings = []
-    heading_counters = {}  # Track counters for each level
-
-    for level in range(2, min(toc_depth + 1, 7)):  # h2 to h6, limited by toc_depth
-        heading_counters[level] = 0
-
-        def make_heading_repl(heading_level):
-            def heading_repl(match):
-                nonlocal heading_counters
-                heading_counters[heading_level] += 1
-                tag_open = match.group(1)
-                inside = match.group(2)
-
-                if re.search(r"\bid=\"[^\"]+\"", tag_open):
-                    return f"<h{heading_level}{tag_open}>{inside}</h{heading_level}>"
-
-                # Generate hierarchical ID
-                id_parts = [h1_id]
-                for level_num in range(2, heading_level + 1):
-                    id_parts.append(f"s{heading_counters.get(level_num, 0):02d}")
-                hid = "-".join(id_parts)
-
-                return f'<h{heading_level}{tag_open} id="{hid}">{inside}</h{heading_level}>'
-
-            return heading_repl
-
-        pattern = rf"<h{level}([^>]*?)>(.*?)</h{level}>"
-        html_result = re.sub(
-            pattern, make_heading_repl(level), html_result, flags=re.IGNORECASE | re.DOTALL
-        )
-
-    # Extract all headings with their IDs and levels for ToC
-    for level in range(2, min(toc_depth + 1, 7)):
-        pattern = rf"<h{level}[^>]*?>(.*?)</h{level}>"
-        titles = re.findall(pattern, html_result, flags=re.IGNORECASE | re.DOTALL)
-
-        pattern_ids = rf"<h{level}[^>]*?id=\"([^\"]+)\"[^>]*?>"
-        ids = re.findall(pattern_ids, html_result, flags=re.IGNORECASE)
-
-        for i, title in enumerate(titles):
-            if i < len(ids):
-                clean_title = re.sub(r"<[^>]+>", "", title)
-                all_headings.append((clean_title, ids[i], level))
-
-    # Determine h1 id actually present
-    m = re.search(r"<h1[^>]*id=\"([^\"]+)\"[^>]*>", html_result, flags=re.IGNORECASE)
-    if m:
-        h1_id = m.group(1)
-
-    return html_result, h1_id, all_headings
+    for heading in headings:
+        hid = heading.id
+        if heading.level == 1:
+            if h1_id is None:
+                if not hid:
+                    hid = default_id
+                    new_ids.append((heading.attrs_end, hid))
+                h1_id = hid
+            continue
+        if heading.level > max_level:
+            continue
+
+        positions[heading.level] += 1
+        if not hid:
+            parents = [f"s{totals[parent]:02d}" for parent in range(2, heading.level)]
+            hid = "-".join([default_id, *parents, f"s{positions[heading.level]:02d}"])
+            new_ids.append((heading.attrs_end, hid))
+        all_headings.append((heading.title, hid, heading.level))
+
+    return _insert_ids(html, new_ids), h1_id or default_id, all_headings
 
 
 def inject_manual_chapter_ids(
@@ -171,52 +267,28 @@ def inject_manual_chapter_ids(
     # Create a unique ID for this chapter
     h1_id = f"ch{chap_idx:03d}"
 
-    # Look for existing h1/h2 headings to preserve them
+    new_ids = []
     h2_items = []
-
-    # Ensure h2 have ids; collect titles + ids
-    sec_idx = 0
-
-    def h2_repl(match):
-        nonlocal sec_idx
-        sec_idx += 1
-        tag_open = match.group(1)
-        inside = match.group(2)
-        if re.search(r"\bid=\"[^\"]+\"", tag_open):
-            return f"<h2{tag_open}>{inside}</h2>"
-        hid = f"{h1_id}-s{sec_idx:02d}"
-        return f'<h2{tag_open} id="{hid}">{inside}</h2>'
-
-    html_with_h2_ids = re.sub(
-        r"<h2([^>]*)>(.*?)</h2>", h2_repl, html, flags=re.IGNORECASE | re.DOTALL
-    )
-
-    # Extract h2 titles and IDs for TOC
-    titles = re.findall(r"<h2[^>]*>(.*?)</h2>", html_with_h2_ids, flags=re.IGNORECASE | re.DOTALL)
-    ids = re.findall(r"<h2[^>]*id=\"([^\"]+)\"[^>]*>", html_with_h2_ids, flags=re.IGNORECASE)
-    h2_items = [(re.sub(r"<[^>]+>", "", t), ids[i]) for i, t in enumerate(titles) if i < len(ids)]
-
-    # Add chapter anchor at the beginning if no h1 exists
-    if not re.search(r"<h1[^>]*>", html_with_h2_ids, re.IGNORECASE):
-        html_with_h2_ids = f'<div id="{h1_id}"></div>' + html_with_h2_ids
-    else:
-        # Add ID to existing h1
-        def h1_repl(match):
-            tag_open = match.group(1)
-            inside = match.group(2)
-            if re.search(r"\bid=\"[^\"]+\"", tag_open):
-                return f"<h1{tag_open}>{inside}</h1>"
-            return f'<h1{tag_open} id="{h1_id}">{inside}</h1>'
-
-        html_with_h2_ids = re.sub(
-            r"<h1([^>]*)>(.*?)</h1>",
-            h1_repl,
-            html_with_h2_ids,
-            count=1,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
-
-    return html_with_h2_ids, h1_id, h2_items
+    has_h1 = False
+    for heading in scan_headings(html):
+        if heading.level == 1:
+            # Add ID to the first existing h1
+            if not has_h1 and not heading.id:
+                new_ids.append((heading.attrs_end, h1_id))
+            has_h1 = True
+        elif heading.level == 2:
+            # Ensure h2 have ids; collect titles + ids
+            hid = heading.id or f"{h1_id}-s{len(h2_items) + 1:02d}"
+            if not heading.id:
+                new_ids.append((heading.attrs_end, hid))
+            h2_items.append((heading.title, hid))
+
+    html_with_ids = _insert_ids(html, new_ids)
+    if not has_h1:
+        # Add chapter anchor at the beginning if no h1 exists
+        html_with_ids = f'<div id="{h1_id}"></div>' + html_with_ids
+
+    return html_with_ids, h1_id, h2_items
 
 
 def process_chapters(
@@ -226,12 +298,18 @@ def process_chapters(
     opts: BuildOptions,
     style_item,
     figure_processor: FigureProcessor,
+    pipeline: Optional[ChapterPipeline] = None,
+    workers: Optional[int] = None,
 ) -> tuple[list, list, list]:
     """Process all HTML chunks into EPUB chapters with navigation data.
 
-    Handles both manual and automatic chapter detection modes. Processes
-    figures/tables, injects heading IDs, creates EPUB items, and generates
-    navigation links for ToC.
+    Handles both manual and automatic chapter detection modes. Each chapter
+    goes through ``pipeline`` (parsed and serialized once); the default
+    pipeline processes figures/tables and injects heading IDs. Chapters are
+    transformed in worker processes when ``workers`` allows it, then figure
+    numbers are assigned in reading order, so the output does not depend on
+    the worker count. The chapter items are created and navigation links for
+    the ToC are generated from the headings the pipeline collected.
 
     Args:
         book: EpubBook instance from ebooklib
@@ -240,6 +318,10 @@ def process_chapters(
         opts: BuildOptions with chapter_start_mode and chapter_starts
         style_item: CSS item to link to chapters
         figure_processor: FigureProcessor for semantic markup
+        pipeline: Optional ChapterPipeline to run instead of the default one;
+            it should end with a HeadingIdPass so ToC data is collected
+        workers: Processes for the per-chapter transform (1 = in-process,
+            None = one per CPU for large books)
 
     Returns:
         tuple: (chapters, chapter_links, chapter_sub_links)
@@ -255,84 +337,60 @@ def process_chapters(
     # Import the HTML item creator from epub_pages
     from .epub_pages import create_html_item, link_chapter_stylesheet
 
-    chapters = []
-    chapter_links = []
-    chapter_sub_links = []
+    if pipeline is None:
+        pipeline = ChapterPipeline([FigurePass(figure_processor), HeadingIdPass(opts.toc_depth)])
 
-    # Determine chapter processing mode
+    # Work out (chunk, context) for every chapter before transforming any
+    planned: list[ChapterContext] = []
     if opts.chapter_start_mode in ("manual", "mixed") and opts.chapter_starts:
         # Manual mode: use user-defined chapter starts
         manual_chapters = find_chapter_starts(html_chunks, opts.chapter_starts)
-
         for chap_num, (chapter_title, chunk_idx) in enumerate(manual_chapters, start=1):
             if chunk_idx < len(html_chunks):
-                chunk = html_chunks[chunk_idx]
-
-                # Process figures and tables for semantic markup
-                chunk_with_figures = figure_processor.process_content(
-                    chunk, chapter_title=chapter_title, chapter_id=f"chap_{chap_num:03d}"
-                )
-
-                chunk2, h1_id, subs = inject_manual_chapter_ids(
-                    chunk_with_figures, chap_num, chapter_title
+                planned.append(
+                    ChapterContext(
+                        number=chap_num,
+                        chunk_index=chunk_idx,
+                        title=chapter_title,
+                        chapter_id=f"chap_{chap_num:03d}",
+                        manual=True,
+                    )
                 )
-                chap_fn = f"text/chap_{chap_num:03d}.xhtml"
-                chap = create_html_item(chapter_title, chap_fn, chunk2, meta.language)
-                link_chapter_stylesheet(chap, style_item)
-                book.add_item(chap)
-                chapters.append(chap)
-                # Build links for TOC using custom title
-                chap_link = epub.Link(chap_fn + f"#{h1_id}", chapter_title, f"chap{chap_num:03d}")
-                chapter_links.append(chap_link)
-                sub_links = []
-                if opts.toc_depth > 1:  # Include subheadings in manual mode too
-                    for idx, (title, hid) in enumerate(subs):
-                        sub_links.append(
-                            epub.Link(chap_fn + f"#{hid}", title, f"chap{chap_num:03d}-{idx+1:02d}")
-                        )
-                chapter_sub_links.append(sub_links)
-
         # Add remaining chunks as additional chapters if there are more chunks than defined chapters
-        for i in range(len(manual_chapters), len(html_chunks)):
-            chunk = html_chunks[i]
-            chap_num = i + 1
-            chunk2, h1_id, subs = inject_heading_ids(chunk, chap_num, opts.toc_depth)
-            chap_fn = f"text/chap_{chap_num:03d}.xhtml"
-            chap = create_html_item(f"Chapter {chap_num}", chap_fn, chunk2, meta.language)
-            link_chapter_stylesheet(chap, style_item)
-            book.add_item(chap)
-            chapters.append(chap)
-            chap_link = epub.Link(
-                chap_fn + f"#{h1_id}", f"Chapter {chap_num}", f"chap{chap_num:03d}"
-            )
-            chapter_links.append(chap_link)
-            sub_links = []
-            for idx, (title, hid, level) in enumerate(subs):
-                sub_links.append(
-                    epub.Link(chap_fn + f"#{hid}", title, f"chap{chap_num:03d}-{idx+1:02d}")
-                )
-            chapter_sub_links.append(sub_links)
-
+        first_extra = len(manual_chapters)
     else:
         # Auto mode (default): scan headings as before
-        for i, chunk in enumerate(html_chunks, start=1):
-            # Process figures and tables for semantic markup
-            chunk_with_figures = figure_processor.process_content(
-                chunk, chapter_title=f"Chapter {i}", chapter_id=f"chap_{i:03d}"
+        first_extra = 0
+
+    for i in range(first_extra, len(html_chunks)):
+        planned.append(
+            ChapterContext(
+                number=i + 1,
+                chunk_index=i,
+                title=f"Chapter {i + 1}",
+                chapter_id=f"chap_{i + 1:03d}",
             )
+        )
+
+    chapters = []
+    chapter_links = []
+    chapter_sub_links = []
 
-            chunk2, h1_id, subs = inject_heading_ids(chunk_with_figures, i, opts.toc_depth)
-            chap_fn = f"text/chap_{i:03d}.xhtml"
-            chap = create_html_item(f"Chapter {i}", chap_fn, chunk2, meta.language)
-            link_chapter_stylesheet(chap, style_item)
-            book.add_item(chap)
-            chapters.append(chap)
-            # Build links for TOC
-            chap_link = epub.Link(chap_fn + f"#{h1_id}", f"Chapter {i}", f"chap{i:03d}")
-            chapter_links.append(chap_link)
-            sub_links = []
-            for idx, (title, hid, level) in enumerate(subs):
-                sub_links.append(epub.Link(chap_fn + f"#{hid}", title, f"chap{i:03d}-{idx+1:02d}"))
-            chapter_sub_links.append(sub_links)
+    jobs = [(html_chunks[ctx.chunk_index], ctx) for ctx in planned]
+    for content, ctx in pipeline.run_all(jobs, workers=workers):
+        prefix = f"chap{ctx.number:03d}"
+        chap_fn = f"text/chap_{ctx.number:03d}.xhtml"
+        chap = create_html_item(ctx.title, chap_fn, content, meta.language)
+        link_chapter_stylesheet(chap, style_item)
+        book.add_item(chap)
+        chapters.append(chap)
+
+        # Build links for TOC
+        chapter_links.append(epub.Link(chap_fn + f"#{ctx.h1_id}", ctx.title, prefix))
+        sub_links = []
+        if not ctx.manual or opts.toc_depth > 1:  # Include subheadings in manual mode too
+            for idx, (title, hid, _level) in enumerate(ctx.headings):
+                sub_links.append(epub.Link(chap_fn + f"#{hid}", title, f"{prefix}-{idx+1:02d}"))
+        chapter_sub_links.append(sub_links)
 
     return chapters, chapter_links, chapter_sub_links
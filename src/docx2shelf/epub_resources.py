@@ -8,8 +8,11 @@ This module handles processing and embedding of resources in EPUB files:
 
 from __future__ import annotations
 
+import sqlite3
 import tempfile
+from contextlib import nullcontext
 from pathlib import Path
+from typing import Optional
 
 from .content_security import validate_resource_path
 from .fonts import process_embedded_fonts, warn_about_font_licensing
@@ -17,7 +20,23 @@ from .images import get_media_type_for_image, process_images
 from .metadata import BuildOptions
 
 
-def process_and_add_images(book, resources: list[Path], opts: BuildOptions) -> None:
+def _resource_item(path: Path, uid: str, file_name: str, media_type: str, work_dir):
+    """Create a manifest item; file-backed when the book is written by the streaming writer."""
+    if work_dir is not None:
+        from .epub_writer import FileItem
+
+        return FileItem(path, uid=uid, file_name=file_name, media_type=media_type)
+
+    from ebooklib import epub  # type: ignore
+
+    return epub.EpubItem(
+        uid=uid, file_name=file_name, media_type=media_type, content=path.read_bytes()
+    )
+
+
+def process_and_add_images(
+    book, resources: list[Path], opts: BuildOptions, work_dir: Optional[Path] = None
+) -> list:
     """Process and add images to EPUB book with security validation and optimization.
 
     This function:
@@ -31,12 +50,18 @@ def process_and_add_images(book, resources: list[Path], opts: BuildOptions) -> N
         book: EpubBook instance from ebooklib
         resources: List of resource file paths (images and other media)
         opts: BuildOptions with image processing settings
+        work_dir: Directory that outlives the EPUB write. When given, processed
+            images are kept there and added as file-backed items that the
+            streaming writer copies straight from disk.
+
+    Returns:
+        The manifest items that were added
     """
     if not resources:
-        return
+        return []
 
     try:
-        from ebooklib import epub  # type: ignore
+        from ebooklib import epub  # type: ignore  # noqa: F401
     except Exception as e:
         raise RuntimeError("ebooklib is required to assemble EPUB. Install 'ebooklib'.") from e
 
@@ -61,9 +86,10 @@ def process_and_add_images(book, resources: list[Path], opts: BuildOptions) -> N
 
     # Use only safe resources
     resources = safe_resources
+    added = []
 
     # Process images with optimization
-    with tempfile.TemporaryDirectory() as temp_dir:
+    with nullcontext(work_dir) if work_dir else tempfile.TemporaryDirectory() as temp_dir:
         temp_path = Path(temp_dir)
 
         # Filter image files
@@ -86,18 +112,20 @@ def process_and_add_images(book, resources: list[Path], opts: BuildOptions) -> N
                 modern_format=modern_format,
                 quiet=opts.quiet,
                 enhanced_processing=opts.enhanced_images,
+                max_workers=opts.image_workers,
             )
 
             # Add processed images to EPUB
             for img_path in processed_images:
                 mt = get_media_type_for_image(img_path)
-                item = epub.EpubItem(
+                item = _resource_item(
+                    img_path,
                     uid=f"img_{img_path.stem}",
                     file_name=f"images/{img_path.name}",
                     media_type=mt,
-                    content=img_path.read_bytes(),
+                    work_dir=work_dir,
                 )
-                book.add_item(item)
+                added.append(book.add_item(item))
 
         # Handle non-image resources
         for res in resources:
@@ -113,13 +141,26 @@ def process_and_add_images(book, resources: list[Path], opts: BuildOptions) -> N
                 ".tif",
             }:
                 # Keep non-image resources as-is
-                item = epub.EpubItem(
+                item = _resource_item(
+                    res,
                     uid=f"res_{res.stem}",
                     file_name=f"images/{res.name}",
                     media_type="application/octet-stream",
-                    content=res.read_bytes(),
+                    work_dir=work_dir,
                 )
-                book.add_item(item)
+                added.append(book.add_item(item))
+
+    return added
+
+
+def _font_cache():
+    """The build cache for font subsets, or None when it cannot be opened."""
+    try:
+        from .performance import default_build_cache
+
+        return default_build_cache()
+    except (ImportError, OSError, sqlite3.Error):
+        return None
 
 
 def process_and_add_fonts(book, opts: BuildOptions, html_content: str) -> None:
@@ -148,22 +189,19 @@ def process_and_add_fonts(book, opts: BuildOptions, html_content: str) -> None:
     with tempfile.TemporaryDirectory() as temp_dir:
         temp_path = Path(temp_dir)
 
-        # Collect all HTML content for character analysis
-        html_chunks = []
-        for item in book.items:
-            if (
-                hasattr(item, "content")
-                and hasattr(item, "file_name")
-                and item.file_name.endswith(".xhtml")
-            ):
-                if isinstance(item.content, bytes):
-                    html_chunks.append(item.content.decode("utf-8"))
-                else:
-                    html_chunks.append(str(item.content))
-
-        # Process and subset fonts
+        # Character analysis streams over the XHTML items without decoding
+        # and joining them up front
+        html_chunks = (
+            item.content if isinstance(item.content, bytes) else str(item.content)
+            for item in book.items
+            if hasattr(item, "content")
+            and hasattr(item, "file_name")
+            and item.file_name.endswith(".xhtml")
+        )
+
+        # Process and subset fonts, reusing subsets from earlier builds
         processed_fonts = process_embedded_fonts(
-            opts.embed_fonts_dir, html_chunks, temp_path, opts.quiet
+            opts.embed_fonts_dir, html_chunks, temp_path, opts.quiet, cache=_font_cache()
         )
 
         # Add processed fonts to EPUB
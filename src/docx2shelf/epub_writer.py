@@ -0,0 +1,170 @@
+"""Streaming, reproducible EPUB writer.
+
+Opt-in alternative to ``ebooklib.epub.write_epub`` (``--epub-writer streaming``):
+- Resources added as ``FileItem`` stay on disk and are copied into the archive
+  in fixed-size blocks instead of being held in memory as item content
+- Already-compressed media (JPEG, PNG, WebP, GIF, WOFF) is stored rather than
+  deflated a second time
+- Every entry carries the same timestamp and the OPF ``dcterms:modified`` date
+  is pinned, so identical inputs produce byte-identical archives
+
+The OPF, NCX and navigation documents are still generated by ebooklib, so the
+package contents match what ``write_epub`` would produce.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Union
+
+from ebooklib import epub  # type: ignore
+
+# Used when SOURCE_DATE_EPOCH is not set; the earliest date a zip entry can hold
+DEFAULT_TIMESTAMP = datetime(1980, 1, 1, tzinfo=timezone.utc)
+
+# Media types whose payload is already compressed
+STORED_MEDIA_TYPES = frozenset(
+    {
+        "image/jpeg",
+        "image/png",
+        "image/webp",
+        "image/gif",
+        "image/avif",
+        "font/woff",
+        "font/woff2",
+        "application/font-woff",
+        "audio/mpeg",
+        "audio/mp4",
+        "video/mp4",
+    }
+)
+
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class FileItem(epub.EpubItem):
+    """Manifest item whose content is read from disk only when it is written."""
+
+    def __init__(
+        self,
+        source_path: Union[str, Path],
+        uid: str,
+        file_name: str,
+        media_type: str,
+    ):
+        super().__init__(uid=uid, file_name=file_name, media_type=media_type)
+        self.source_path = Path(source_path)
+
+    def get_content(self, default=None) -> bytes:
+        return self.source_path.read_bytes()
+
+
+def build_timestamp() -> datetime:
+    """Timestamp for archive entries: SOURCE_DATE_EPOCH when set, else 1980-01-01 UTC."""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        try:
+            return max(datetime.fromtimestamp(int(epoch), tz=timezone.utc), DEFAULT_TIMESTAMP)
+        except (ValueError, OverflowError, OSError):
+            pass
+    return DEFAULT_TIMESTAMP
+
+
+class _ArchiveOutput:
+    """Writes zip entries with fixed metadata; stands in for ebooklib's ZipFile."""
+
+    def __init__(self, archive: zipfile.ZipFile, timestamp: datetime):
+        self.archive = archive
+        self.date_time = timestamp.astimezone(timezone.utc).timetuple()[:6]
+
+    def _info(self, name: str, compress_type: int, size: int = 0) -> zipfile.ZipInfo:
+        info = zipfile.ZipInfo(name, date_time=self.date_time)
+        info.compress_type = compress_type
+        info.create_system = 3  # Unix, regardless of the build host
+        info.external_attr = 0o644 << 16
+        info.file_size = size
+        return info
+
+    def writestr(self, name: str, data, compress_type: int = zipfile.ZIP_DEFLATED) -> None:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self.archive.writestr(self._info(name, compress_type, len(data)), data)
+
+    def write_file(self, name: str, path: Path, compress_type: int) -> None:
+        info = self._info(name, compress_type, path.stat().st_size)
+        with open(path, "rb") as src, self.archive.open(info, "w") as dst:
+            shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+
+    def copy_entry(self, source: zipfile.ZipFile, name: str) -> None:
+        """Copy an entry from another archive, keeping its compression method."""
+        original = source.getinfo(name)
+        info = self._info(name, original.compress_type, original.file_size)
+        with source.open(original) as src, self.archive.open(info, "w") as dst:
+            shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+
+
+class StreamingEpubWriter(epub.EpubWriter):
+    """``EpubWriter`` that streams file-backed items and writes a reproducible zip."""
+
+    def __init__(self, name, book, options=None, timestamp: Optional[datetime] = None):
+        self.timestamp = timestamp or build_timestamp()
+        super().__init__(name, book, {"mtime": self.timestamp, **(options or {})})
+
+    def write(self) -> None:
+        with zipfile.ZipFile(self.file_name, "w", zipfile.ZIP_DEFLATED) as archive:
+            self.out = _ArchiveOutput(archive, self.timestamp)
+            # The mimetype entry must come first and be stored uncompressed
+            self.out.writestr("mimetype", "application/epub+zip", zipfile.ZIP_STORED)
+            self._write_container()
+            self._write_opf()
+            self._write_items()
+
+    def _write_items(self) -> None:
+        for item in self.book.get_items():
+            name = item.file_name
+            if isinstance(item, (epub.EpubNcx, epub.EpubNav)) or item.manifest:
+                name = f"{self.book.FOLDER_NAME}/{name}"
+            self._write_item(name, item)
+
+    def _write_item(self, name: str, item) -> None:
+        compress_type = _compression_for(item)
+        if isinstance(item, FileItem):
+            self.out.write_file(name, item.source_path, compress_type)
+        elif isinstance(item, epub.EpubNcx):
+            self.out.writestr(name, self._get_ncx(), compress_type)
+        elif isinstance(item, epub.EpubNav):
+            self.out.writestr(name, self._get_nav(item), compress_type)
+        else:
+            self.out.writestr(name, item.get_content(), compress_type)
+
+
+def _compression_for(item) -> int:
+    if (item.media_type or "").lower() in STORED_MEDIA_TYPES:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def write_epub_streaming(
+    output_path: Union[str, Path],
+    book,
+    options: Optional[dict] = None,
+    timestamp: Optional[datetime] = None,
+) -> None:
+    """
+    Write an EpubBook with the streaming writer.
+
+    Unlike ``epub.write_epub`` this raises on I/O errors instead of returning False.
+
+    Args:
+        output_path: Destination .epub path
+        book: EpubBook instance from ebooklib
+        options: ebooklib writer options
+        timestamp: Fixed timestamp for entries and dcterms:modified (default: build_timestamp())
+    """
+    writer = StreamingEpubWriter(str(output_path), book, options, timestamp)
+    writer.process()
+    writer.write()
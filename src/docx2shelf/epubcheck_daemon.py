@@ -0,0 +1,433 @@
+"""
+Warm EPUBCheck validator shared by batch, watch and enterprise sessions.
+
+Running ``java -jar epubcheck.jar book.epub`` pays for JVM startup and for
+loading EPUBCheck's classes and schemas on every book, which is most of the
+time a small book takes to validate. ``EpubCheckDaemon`` starts one JVM per
+session that listens on a loopback socket and runs EPUBCheck in-process for
+each request, so that cost is paid once. Every connection is served on its
+own thread, so batch workers sharing the daemon validate concurrently instead
+of queueing behind each other's books.
+
+The daemon is a single-file Java program run with the installed
+``epubcheck.jar`` on its classpath (Java 11+). It is only available when
+EPUBCheck is installed as a jar; a wrapper script on PATH is run per book as
+before. Requests carry a random token so other local users cannot drive it.
+The JVM's stdin stays open for the daemon's lifetime and the JVM exits on EOF,
+so it does not outlive a parent that is killed before it can shut it down.
+
+Protocol, one request per connection: the client sends the token and the
+absolute EPUB path as two lines and reads the reply until EOF. An empty path
+is a ping answered with ``ok``. Otherwise the reply is EPUBCheck's exit
+status on the first line followed by its JSON report, or ``error <detail>``.
+
+Usage::
+
+    with shared_daemon() as daemon, exported_daemon(daemon):
+        ...  # validation.validate_epub() picks the daemon up via active_daemon()
+
+Child processes started inside ``exported_daemon()`` attach to the same JVM
+through ``DOCX2SHELF_EPUBCHECK_DAEMON``.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import secrets
+import socket
+import subprocess
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# "<port>:<token>" of the daemon inherited by child processes of a session
+DAEMON_ENV = "DOCX2SHELF_EPUBCHECK_DAEMON"
+
+_STARTUP_TIMEOUT = 60.0
+
+_DAEMON_SOURCE = """\
+import java.io.*;
+import java.net.*;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.*;
+import java.util.concurrent.*;
+
+public class EpubCheckDaemon {
+    public static void main(String[] args) throws Exception {
+        BufferedReader stdin = new BufferedReader(
+            new InputStreamReader(System.in, StandardCharsets.UTF_8));
+        String token = stdin.readLine();
+        // The parent holds our stdin open for as long as it needs us, so EOF
+        // means it exited or was killed without shutting us down: exit too
+        Thread parentWatch = new Thread(() -> {
+            try {
+                while (stdin.read() != -1) {
+                    // Ignore anything after the token
+                }
+            } catch (IOException e) {
+                // Treat a broken pipe like EOF
+            }
+            System.exit(0);
+        });
+        parentWatch.setDaemon(true);
+        parentWatch.start();
+        try (ServerSocket server = new ServerSocket(0, 50, InetAddress.getLoopbackAddress())) {
+            System.out.println(server.getLocalPort());
+            System.out.flush();
+            PrintStream discard = new PrintStream(OutputStream.nullOutputStream());
+            System.setOut(discard);
+            System.setErr(discard);
+            ExecutorService workers = Executors.newCachedThreadPool();
+            while (true) {
+                try {
+                    Socket client = server.accept();
+                    workers.execute(() -> serve(client, token));
+                } catch (IOException e) {
+                    // Accept failed; keep serving
+                }
+            }
+        }
+    }
+
+    private static void serve(Socket client, String token) {
+        try (client) {
+            handle(client, token);
+        } catch (IOException e) {
+            // Client went away; keep serving
+        }
+    }
+
+    private static void handle(Socket client, String token) throws IOException {
+        BufferedReader in = new BufferedReader(
+            new InputStreamReader(client.getInputStream(), StandardCharsets.UTF_8));
+        OutputStream out = client.getOutputStream();
+        if (!token.equals(in.readLine())) {
+            return;
+        }
+        String epub = in.readLine();
+        if (epub == null || epub.isEmpty()) {
+            out.write("ok\\n".getBytes(StandardCharsets.UTF_8));
+            return;
+        }
+        Path report = Files.createTempFile("epubcheck", ".json");
+        try {
+            int status = new com.adobe.epubcheck.tool.EpubChecker().run(
+                new String[] {epub, "--quiet", "--json", report.toString()});
+            out.write((status + "\\n").getBytes(StandardCharsets.UTF_8));
+            out.write(Files.readAllBytes(report));
+        } catch (Throwable t) {
+            out.write(("error " + t + "\\n").getBytes(StandardCharsets.UTF_8));
+        } finally {
+            Files.deleteIfExists(report);
+        }
+    }
+}
+"""
+
+
+class EpubCheckDaemonError(RuntimeError):
+    """The daemon could not be started or did not answer a request."""
+
+
+def _epubcheck_jar() -> Optional[Tuple[str, Path]]:
+    """Return (java, jar) when EPUBCheck is installed as a runnable jar."""
+    from .tools import epubcheck_cmd
+
+    cmd = epubcheck_cmd()
+    if cmd and len(cmd) == 3 and cmd[1] == "-jar":
+        return cmd[0], Path(cmd[2])
+    return None
+
+
+def daemon_supported() -> bool:
+    """Whether a daemon can be started for the installed EPUBCheck."""
+    return _epubcheck_jar() is not None
+
+
+class EpubCheckDaemon:
+    """One warm EPUBCheck JVM, started by us or attached to by endpoint.
+
+    Args:
+        endpoint: ``"<port>:<token>"`` of a running daemon to attach to
+            instead of starting one (used by child processes of a session).
+        timeout: Seconds to wait for one validation.
+    """
+
+    def __init__(self, endpoint: Optional[str] = None, timeout: float = 120.0):
+        self.timeout = timeout
+        self.port: Optional[int] = None
+        self.token: Optional[str] = None
+        self.checks = 0
+        self.restarts = 0
+        self._process: Optional[subprocess.Popen] = None
+        self._source_dir: Optional[tempfile.TemporaryDirectory] = None
+        self._lock = threading.Lock()
+        if endpoint:
+            port, _, token = endpoint.partition(":")
+            self.port = int(port)
+            self.token = token
+
+    @property
+    def owned(self) -> bool:
+        return self._process is not None
+
+    @property
+    def endpoint(self) -> Optional[str]:
+        if self.port is None:
+            return None
+        return f"{self.port}:{self.token}"
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> EpubCheckDaemon:
+        """Start the JVM unless already running or attached; idempotent."""
+        if self.port is not None:
+            return self
+
+        located = _epubcheck_jar()
+        if located is None:
+            raise EpubCheckDaemonError("EPUBCheck is not installed as a jar")
+        java, jar = located
+
+        self._source_dir = tempfile.TemporaryDirectory(prefix="docx2shelf_epubcheck_")
+        source = Path(self._source_dir.name) / "EpubCheckDaemon.java"
+        source.write_text(_DAEMON_SOURCE, encoding="utf-8")
+
+        token = secrets.token_hex(16)
+        try:
+            process = subprocess.Popen(
+                [java, "-cp", str(jar), str(source)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+        except OSError as e:
+            self._cleanup_source()
+            raise EpubCheckDaemonError(f"Could not start EPUBCheck daemon: {e}") from e
+
+        port_line = self._handshake(process, token)
+        if not port_line.strip().isdigit():
+            self._stop_process(process)
+            self._cleanup_source()
+            raise EpubCheckDaemonError("EPUBCheck daemon did not start (Java 11+ is required)")
+
+        self._process = process
+        self.port = int(port_line)
+        self.token = token
+        return self
+
+    def _handshake(self, process: subprocess.Popen, token: str) -> str:
+        lines: list[str] = []
+
+        def read_port() -> None:
+            try:
+                process.stdin.write(token + "\n")
+                process.stdin.flush()
+                lines.append(process.stdout.readline())
+            except OSError:
+                pass
+
+        # readline() has no timeout, so wait for it on a helper thread
+        reader = threading.Thread(target=read_port, daemon=True)
+        reader.start()
+        reader.join(_STARTUP_TIMEOUT)
+        return lines[0] if lines else ""
+
+    def shutdown(self) -> None:
+        """Stop the JVM if we own it and forget the endpoint."""
+        if self._process is not None:
+            self._stop_process(self._process)
+            self._process = None
+        self._cleanup_source()
+        self.port = None
+        self.token = None
+
+    def __enter__(self) -> EpubCheckDaemon:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+
+    @staticmethod
+    def _stop_process(process: subprocess.Popen) -> None:
+        # EOF on stdin lets the JVM exit on its own; terminate is the fallback
+        if process.stdin is not None:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+        if process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        if process.stdout is not None:
+            process.stdout.close()
+
+    def _cleanup_source(self) -> None:
+        if self._source_dir is not None:
+            self._source_dir.cleanup()
+            self._source_dir = None
+
+    def _restart(self) -> None:
+        """Replace a dead owned JVM."""
+        self.shutdown()
+        self.start()
+        self.restarts += 1
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    def _request(self, path: str, timeout: float) -> bytes:
+        if self.port is None:
+            raise EpubCheckDaemonError("EPUBCheck daemon is not running")
+        with socket.create_connection(("127.0.0.1", self.port), timeout=timeout) as sock:
+            sock.sendall(f"{self.token}\n{path}\n".encode("utf-8"))
+            sock.shutdown(socket.SHUT_WR)
+            chunks = []
+            while True:
+                data = sock.recv(65536)
+                if not data:
+                    break
+                chunks.append(data)
+        return b"".join(chunks)
+
+    def ping(self, timeout: float = 2.0) -> bool:
+        try:
+            return self._request("", timeout).strip() == b"ok"
+        except (OSError, EpubCheckDaemonError):
+            return False
+
+    def check(self, epub_path: Path) -> Tuple[int, Dict[str, Any]]:
+        """Validate one EPUB; returns EPUBCheck's exit status and JSON report.
+
+        Raises:
+            EpubCheckDaemonError: If the daemon is unreachable or EPUBCheck
+                failed without producing a report.
+        """
+        path = str(Path(epub_path).resolve())
+        if "\n" in path:
+            raise EpubCheckDaemonError("EPUB path contains a newline")
+
+        with self._lock:
+            if self._process is not None and self._process.poll() is not None:
+                self._restart()
+
+        try:
+            reply = self._request(path, self.timeout)
+        except OSError as e:
+            raise EpubCheckDaemonError(f"EPUBCheck daemon did not answer: {e}") from e
+
+        status, _, report = reply.partition(b"\n")
+        if not status.strip().lstrip(b"-").isdigit():
+            detail = status.decode("utf-8", "replace").strip() or "connection closed"
+            raise EpubCheckDaemonError(f"EPUBCheck daemon failed: {detail}")
+        try:
+            parsed = json.loads(report.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise EpubCheckDaemonError(f"EPUBCheck daemon sent an unreadable report: {e}") from e
+
+        with self._lock:
+            self.checks += 1
+        return int(status), parsed
+
+
+# ----------------------------------------------------------------------
+# Process-wide shared daemon
+# ----------------------------------------------------------------------
+
+_shared_lock = threading.Lock()
+_shared_daemon: Optional[EpubCheckDaemon] = None
+_shared_refs = 0
+_attached_daemon: Optional[EpubCheckDaemon] = None
+
+
+@contextmanager
+def shared_daemon(enabled: bool = True) -> Iterator[Optional[EpubCheckDaemon]]:
+    """Use the process-wide daemon, starting it on first entry.
+
+    Yields None (and validation runs EPUBCheck per book) when ``enabled`` is
+    false or no daemon can be started. Nested users share one daemon, which
+    is stopped when the last user leaves.
+    """
+    global _shared_daemon, _shared_refs
+
+    if not enabled or not daemon_supported():
+        yield None
+        return
+
+    with _shared_lock:
+        if _shared_daemon is None:
+            try:
+                _shared_daemon = EpubCheckDaemon().start()
+            except EpubCheckDaemonError:
+                pass
+        daemon = _shared_daemon
+        if daemon is not None:
+            _shared_refs += 1
+
+    if daemon is None:
+        yield None
+        return
+
+    try:
+        yield daemon
+    finally:
+        with _shared_lock:
+            _shared_refs -= 1
+            if _shared_refs == 0:
+                _shared_daemon = None
+                daemon.shutdown()
+
+
+@contextmanager
+def exported_daemon(daemon: Optional[EpubCheckDaemon]) -> Iterator[None]:
+    """Advertise the daemon to child processes started inside the block."""
+    if daemon is None or daemon.endpoint is None:
+        yield
+        return
+
+    previous = os.environ.get(DAEMON_ENV)
+    os.environ[DAEMON_ENV] = daemon.endpoint
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop(DAEMON_ENV, None)
+        else:
+            os.environ[DAEMON_ENV] = previous
+
+
+def active_daemon() -> Optional[EpubCheckDaemon]:
+    """Return the daemon validation should use, if any.
+
+    This is the ``shared_daemon()`` in effect, or one attached to the daemon a
+    parent process exported through ``DOCX2SHELF_EPUBCHECK_DAEMON``.
+    """
+    global _attached_daemon
+
+    if _shared_daemon is not None:
+        return _shared_daemon
+
+    endpoint = os.environ.get(DAEMON_ENV, "")
+    if not endpoint:
+        return None
+
+    with _shared_lock:
+        if _attached_daemon is None or _attached_daemon.endpoint != endpoint:
+            try:
+                _attached_daemon = EpubCheckDaemon(endpoint=endpoint)
+            except ValueError:
+                return None
+            atexit.register(_attached_daemon.shutdown)
+        return _attached_daemon
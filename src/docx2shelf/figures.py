@@ -9,13 +9,23 @@ from __future__ import annotations
 
 import logging
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from html import escape
 from typing import List, Optional, Tuple
 
 from bs4 import BeautifulSoup, Tag
 
 logger = logging.getLogger(__name__)
 
+# Placeholder numbers used with deferred_numbering: private-use delimiters
+# around a kind letter (F/T = figure/table number, f/t = auto caption) and
+# the chapter-local counter.
+_DEFERRED_RE = re.compile("\ue000([FTft])(\\d+)\ue001")
+
+
+def _deferred(kind: str, number: int) -> str:
+    return f"\ue000{kind}{number}\ue001"
+
 
 @dataclass
 class FigureConfig:
@@ -47,8 +57,15 @@ class FigureInfo:
 class FigureProcessor:
     """Processes figures and tables in EPUB content."""
 
-    def __init__(self, config: Optional[FigureConfig] = None):
+    def __init__(self, config: Optional[FigureConfig] = None, deferred_numbering: bool = False):
+        """
+        Args:
+            config: Configuration for figure processing
+            deferred_numbering: Emit placeholder numbers so chapters can be
+                processed independently and numbered later by merge_deferred()
+        """
         self.config = config or FigureConfig()
+        self.deferred_numbering = deferred_numbering
         self.figures: List[FigureInfo] = []
         self.tables: List[FigureInfo] = []
         self.figure_counter = 0
@@ -59,18 +76,91 @@ class FigureProcessor:
     ) -> str:
         """Process HTML content to wrap images and tables in semantic markup."""
         soup = BeautifulSoup(html_content, "html.parser")
+        self.process_soup(soup, chapter_title, chapter_id)
+        return str(soup)
 
-        # Process images
-        self._process_images(soup, chapter_title, chapter_id)
-
-        # Process tables
-        self._process_tables(soup, chapter_title, chapter_id)
+    def process_soup(
+        self,
+        soup: BeautifulSoup,
+        chapter_title: str = "",
+        chapter_id: str = "",
+        images: Optional[List[Tag]] = None,
+        tables: Optional[List[Tag]] = None,
+    ) -> None:
+        """Wrap images and tables of an already parsed chapter in place.
+
+        ``images`` and ``tables`` may be passed when the caller has already
+        collected them in document order, to avoid searching the tree again.
+        """
+        self._process_images(soup, chapter_title, chapter_id, images)
+        self._process_tables(soup, chapter_title, chapter_id, tables)
+
+    def merge_deferred(
+        self, html_content: str, figures: List[FigureInfo], tables: List[FigureInfo]
+    ) -> str:
+        """Number a chapter processed with deferred_numbering and adopt its entries.
+
+        Merging chapters in reading order gives the same ids, captions and
+        lists as processing them one after another with this processor.
+
+        Args:
+            html_content: Serialized chapter containing placeholder numbers
+            figures: Figures recorded by the chapter's deferred processor
+            tables: Tables recorded by the chapter's deferred processor
+
+        Returns:
+            The chapter HTML with final numbers
+        """
+        figure_offset = self.figure_counter
+        table_offset = self.table_counter
+
+        def resolve(match: re.Match, for_html: bool) -> str:
+            kind = match.group(1)
+            number = int(match.group(2)) + (figure_offset if kind in "Ff" else table_offset)
+            if kind == "f":
+                caption = self.config.number_format.format(number=number)
+            elif kind == "t":
+                caption = f"Table {number}"
+            else:
+                return str(number)
+            return escape(caption, quote=False) if for_html else caption
 
-        return str(soup)
+        def resolve_text(text: str) -> str:
+            return _DEFERRED_RE.sub(lambda m: resolve(m, False), text)
 
-    def _process_images(self, soup: BeautifulSoup, chapter_title: str, chapter_id: str) -> None:
+        for info in figures:
+            self.figures.append(
+                replace(
+                    info,
+                    id=resolve_text(info.id),
+                    number=info.number + figure_offset,
+                    caption=resolve_text(info.caption),
+                )
+            )
+        for info in tables:
+            self.tables.append(
+                replace(
+                    info,
+                    id=resolve_text(info.id),
+                    number=info.number + table_offset,
+                    caption=resolve_text(info.caption),
+                )
+            )
+        self.figure_counter += len(figures)
+        self.table_counter += len(tables)
+
+        return _DEFERRED_RE.sub(lambda m: resolve(m, True), html_content)
+
+    def _process_images(
+        self,
+        soup: BeautifulSoup,
+        chapter_title: str,
+        chapter_id: str,
+        images: Optional[List[Tag]] = None,
+    ) -> None:
         """Convert img tags to semantic figure elements."""
-        images = soup.find_all("img")
+        if images is None:
+            images = soup.find_all("img")
 
         for img in images:
             # Skip if already wrapped in figure
@@ -79,12 +169,18 @@ class FigureProcessor:
 
             # Generate figure info
             self.figure_counter += 1
-            figure_id = f"figure-{self.figure_counter}"
+            if self.deferred_numbering:
+                figure_id = f"figure-{_deferred('F', self.figure_counter)}"
+            else:
+                figure_id = f"figure-{self.figure_counter}"
 
             # Extract or generate caption
             caption = self._extract_image_caption(img)
             if not caption and self.config.auto_number:
-                caption = self.config.number_format.format(number=self.figure_counter)
+                if self.deferred_numbering:
+                    caption = _deferred("f", self.figure_counter)
+                else:
+                    caption = self.config.number_format.format(number=self.figure_counter)
 
             # Create figure element
             figure = soup.new_tag("figure", **{"class": self.config.figure_class, "id": figure_id})
@@ -118,9 +214,16 @@ class FigureProcessor:
                 )
             )
 
-    def _process_tables(self, soup: BeautifulSoup, chapter_title: str, chapter_id: str) -> None:
+    def _process_tables(
+        self,
+        soup: BeautifulSoup,
+        chapter_title: str,
+        chapter_id: str,
+        tables: Optional[List[Tag]] = None,
+    ) -> None:
         """Wrap tables in semantic figure elements."""
-        tables = soup.find_all("table")
+        if tables is None:
+            tables = soup.find_all("table")
 
         for table in tables:
             # Skip if already wrapped in figure
@@ -129,12 +232,18 @@ class FigureProcessor:
 
             # Generate table info
             self.table_counter += 1
-            table_id = f"table-{self.table_counter}"
+            if self.deferred_numbering:
+                table_id = f"table-{_deferred('T', self.table_counter)}"
+            else:
+                table_id = f"table-{self.table_counter}"
 
             # Extract or generate caption
             caption = self._extract_table_caption(table)
             if not caption and self.config.auto_number:
-                caption = f"Table {self.table_counter}"
+                if self.deferred_numbering:
+                    caption = _deferred("t", self.table_counter)
+                else:
+                    caption = f"Table {self.table_counter}"
 
             # Create figure element (tables use figure too in HTML5)
             figure = soup.new_tag("figure", **{"class": "table-figure", "id": table_id})
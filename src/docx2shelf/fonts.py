@@ -1,9 +1,41 @@
+"""Embedded font subsetting.
+
+Subsets are cached in the build cache keyed on the font file hash, the
+character set and the subsetter options, so an unchanged book reuses last
+build's subsets. Fonts that miss the cache are subset concurrently in worker
+processes (fontTools is pure Python).
+"""
+
 from __future__ import annotations
 
+import hashlib
+import html
+import io
+import json
+import os
+import pickle
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import List, Set
+from typing import TYPE_CHECKING, Iterable, List, Optional, Set, Union
+
+if TYPE_CHECKING:
+    from .performance import BuildCache
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# Always kept in subsets, whether or not the text uses them
+_ESSENTIAL_CHARS = {" ", "\n", "\t", ".", ",", "!", "?", "-"}
+
+# fontTools subset.Options settings; part of the subset cache key
+SUBSET_OPTIONS = {
+    "layout_features": ["*"],  # Keep layout features
+    "name_IDs": ["*"],  # Keep name table
+    "notdef_outline": True,  # Keep .notdef glyph
+    "glyph_names": False,  # Remove glyph names to save space
+}
 
 
 def extract_text_from_html_chunks(html_chunks: List[str]) -> str:
@@ -33,17 +65,81 @@ def get_unique_characters(text: str) -> Set[str]:
     return set(text)
 
 
+def collect_characters(html_chunks: Iterable[Union[str, bytes]]) -> Set[str]:
+    """Get the set of characters used in the text of HTML chunks.
+
+    Unions each chunk's characters into one set as it goes instead of joining
+    the whole book into one string. Chunks may be bytes (UTF-8 XHTML items).
+    Entities are decoded and every whitespace character counts as a space,
+    as in ``get_unique_characters``.
+    """
+    characters: Set[str] = set()
+    for chunk in html_chunks:
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode("utf-8", "replace")
+        characters.update(html.unescape(_TAG_RE.sub(" ", chunk)))
+
+    whitespace = {char for char in characters if char.isspace()}
+    if whitespace:
+        characters -= whitespace
+        characters.add(" ")
+    return characters
+
+
+def _subset_text(characters: Set[str]) -> str:
+    return "".join(sorted(characters | _ESSENTIAL_CHARS))
+
+
+def subset_cache_key(font_data: bytes, characters: Set[str]) -> str:
+    """Cache key for a subset: font hash, character set hash and subsetter options."""
+    try:
+        from fontTools import version as fonttools_version
+    except ImportError:
+        fonttools_version = None
+
+    digest = hashlib.sha256()
+    digest.update(hashlib.sha256(font_data).digest())
+    text = _subset_text(characters).encode("utf-8", "surrogatepass")
+    digest.update(hashlib.sha256(text).digest())
+    options = {"options": SUBSET_OPTIONS, "fonttools": fonttools_version}
+    digest.update(json.dumps(options, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _subset_font_data(font_data: bytes, text: str) -> bytes:
+    """Subset font bytes to the glyphs for ``text`` (runs in worker processes)."""
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+
+    options = subset.Options()
+    for name, value in SUBSET_OPTIONS.items():
+        setattr(options, name, value)
+
+    subsetter = subset.Subsetter(options=options)
+    font = TTFont(io.BytesIO(font_data))
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+
+    output = io.BytesIO()
+    font.save(output)
+    return output.getvalue()
+
+
 def subset_font(
-    font_path: Path, characters: Set[str], output_path: Path, quiet: bool = False
+    font_path: Path,
+    characters: Set[str],
+    output_path: Path,
+    quiet: bool = False,
+    cache: Optional[BuildCache] = None,
 ) -> bool:
     """Subset a font file to include only the specified characters.
 
-    Uses fontTools library for font subsetting.
+    Uses fontTools library for font subsetting, reusing a subset from
+    ``cache`` when the font and character set are unchanged.
     Returns True if successful, False otherwise.
     """
     try:
-        from fontTools import subset
-        from fontTools.ttLib import TTFont
+        import fontTools  # noqa: F401
     except ImportError:
         if not quiet:
             print("Warning: fontTools not available. Font subsetting disabled.", file=sys.stderr)
@@ -51,66 +147,82 @@ def subset_font(
         return False
 
     try:
-        # Create character list for subsetting
-        char_list = list(characters)
-
-        # Add some essential characters if not present
-        essential_chars = {" ", "\n", "\t", ".", ",", "!", "?", "-"}
-        for char in essential_chars:
-            if char not in characters:
-                char_list.append(char)
-
-        # Create subsetter options
-        options = subset.Options()
-        options.layout_features = ["*"]  # Keep layout features
-        options.name_IDs = ["*"]  # Keep name table
-        options.notdef_outline = True  # Keep .notdef glyph
-        options.glyph_names = False  # Remove glyph names to save space
+        font_data = font_path.read_bytes()
+        key = subset_cache_key(font_data, characters)
+        data = cache.get_font_subset(key) if cache is not None else None
+        cached = data is not None
+        if data is None:
+            data = _subset_font_data(font_data, _subset_text(characters))
+            if cache is not None:
+                cache.cache_font_subset(key, font_path.name, data)
+
+        output_path.write_bytes(data)
+        if not quiet:
+            _report_subset(font_path.name, len(font_data), len(data), cached)
+        return True
 
-        # Create subsetter
-        subsetter = subset.Subsetter(options=options)
+    except Exception as e:
+        if not quiet:
+            print(f"Error subsetting font {font_path.name}: {e}", file=sys.stderr)
+        return False
 
-        # Load font
-        font = TTFont(str(font_path))
 
-        # Populate subsetter with characters
-        subsetter.populate(text="".join(char_list))
+def _report_subset(name: str, original_size: int, new_size: int, cached: bool) -> None:
+    reduction = ((original_size - new_size) / original_size) * 100 if original_size else 0.0
+    source = ", cached" if cached else ""
+    print(
+        f"Font subsetted: {name} ({original_size:,} → {new_size:,} bytes, "
+        f"{reduction:.1f}% reduction{source})"
+    )
 
-        # Subset the font
-        subsetter.subset(font)
 
-        # Save subsetted font
-        font.save(str(output_path))
+def _subset_fonts(jobs: List[tuple[bytes, str]], max_workers: Optional[int]) -> List[object]:
+    """Subset several fonts; each result is the subset bytes or the exception raised."""
 
-        if not quiet:
-            original_size = font_path.stat().st_size
-            new_size = output_path.stat().st_size
-            reduction = ((original_size - new_size) / original_size) * 100
-            print(
-                f"Font subsetted: {font_path.name} ({original_size:,} → {new_size:,} bytes, {reduction:.1f}% reduction)"
-            )
+    def run(font_data: bytes, text: str) -> object:
+        try:
+            return _subset_font_data(font_data, text)
+        except Exception as e:
+            return e
 
-        return True
+    from .performance import process_pools_available
 
-    except Exception as e:
-        if not quiet:
-            print(f"Error subsetting font {font_path.name}: {e}", file=sys.stderr)
-        return False
+    workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+    if workers > 1 and process_pools_available():
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_subset_font_data, *job) for job in jobs]
+                results: List[object] = []
+                for future in futures:
+                    error = future.exception()
+                    if isinstance(error, BrokenProcessPool):
+                        raise error
+                    results.append(error if error is not None else future.result())
+                return results
+        except (OSError, BrokenProcessPool, pickle.PicklingError):
+            pass  # No worker processes here; subset in this process
+    return [run(*job) for job in jobs]
 
 
 def process_embedded_fonts(
-    fonts_dir: Path, html_chunks: List[str], output_dir: Path, quiet: bool = False
+    fonts_dir: Path,
+    html_chunks: Iterable[Union[str, bytes]],
+    output_dir: Path,
+    quiet: bool = False,
+    cache: Optional[BuildCache] = None,
+    max_workers: Optional[int] = None,
 ) -> List[Path]:
     """Process and subset fonts based on actual text usage.
 
+    Subsets found in ``cache`` are reused; the rest are subset on up to
+    ``max_workers`` processes (default: one per font, capped at the CPU count).
+
     Returns list of processed font files.
     """
     if not fonts_dir.exists() or not fonts_dir.is_dir():
         return []
 
-    # Extract all text content
-    all_text = extract_text_from_html_chunks(html_chunks)
-    unique_chars = get_unique_characters(all_text)
+    unique_chars = collect_characters(html_chunks)
 
     if not quiet:
         print(f"Found {len(unique_chars)} unique characters in document")
@@ -129,7 +241,7 @@ def process_embedded_fonts(
 
     # Check for fontTools availability
     try:
-        import fontTools
+        import fontTools  # noqa: F401
     except ImportError:
         # Copy fonts without subsetting if fontTools is not available
         if not quiet:
@@ -148,12 +260,25 @@ def process_embedded_fonts(
 
         return processed_fonts
 
+    # Look every subsettable font up in the cache; subset the misses together
+    text = _subset_text(unique_chars)
+    subsets: dict[Path, tuple[bytes, str, Optional[bytes]]] = {}
+    for font_file in font_files:
+        if font_file.suffix.lower() in {".ttf", ".otf"}:
+            font_data = font_file.read_bytes()
+            key = subset_cache_key(font_data, unique_chars)
+            cached = cache.get_font_subset(key) if cache is not None else None
+            subsets[font_file] = (font_data, key, cached)
+
+    misses = [font_file for font_file, (_, _, cached) in subsets.items() if cached is None]
+    fresh = dict(zip(misses, _subset_fonts([(subsets[f][0], text) for f in misses], max_workers)))
+
     # Process fonts with subsetting
     processed_fonts = []
 
     for font_file in font_files:
         # Only subset TTF and OTF files
-        if font_file.suffix.lower() not in {".ttf", ".otf"}:
+        if font_file not in subsets:
             # Copy other formats as-is
             output_path = output_dir / font_file.name
             output_path.write_bytes(font_file.read_bytes())
@@ -167,13 +292,27 @@ def process_embedded_fonts(
         suffix = font_file.suffix
         output_path = output_dir / f"{stem}_subset{suffix}"
 
-        # Subset the font
-        if subset_font(font_file, unique_chars, output_path, quiet):
+        font_data, key, data = subsets[font_file]
+        cached = data is not None
+        if data is None:
+            result = fresh[font_file]
+            if isinstance(result, Exception):
+                if not quiet:
+                    print(f"Error subsetting font {font_file.name}: {result}", file=sys.stderr)
+            else:
+                data = result
+                if cache is not None:
+                    cache.cache_font_subset(key, font_file.name, data)
+
+        if data is not None:
+            output_path.write_bytes(data)
             processed_fonts.append(output_path)
+            if not quiet:
+                _report_subset(font_file.name, len(font_data), len(data), cached)
         else:
             # Fall back to copying original if subsetting fails
             fallback_path = output_dir / font_file.name
-            fallback_path.write_bytes(font_file.read_bytes())
+            fallback_path.write_bytes(font_data)
             processed_fonts.append(fallback_path)
             if not quiet:
                 print(f"Copied font (subsetting failed): {font_file.name}")
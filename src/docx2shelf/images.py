@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 
 def check_pillow_availability() -> bool:
@@ -166,6 +169,11 @@ def process_image(
     )
 
 
+def default_image_workers() -> int:
+    """Default worker count for the image stage (CPU count, capped at 32)."""
+    return min(os.cpu_count() or 1, 32)
+
+
 def process_images(
     images: List[Path],
     output_dir: Path,
@@ -175,9 +183,15 @@ def process_images(
     modern_format: Optional[str] = None,
     quiet: bool = False,
     enhanced_processing: bool = False,
+    max_workers: Optional[int] = None,
 ) -> List[Path]:
     """Process multiple images with optimization.
 
+    Images are processed concurrently on ``max_workers`` threads (Pillow
+    releases the GIL while decoding, resizing and encoding). Images whose
+    output names could collide are handled by the same worker in input order,
+    and results are returned in input order so the EPUB manifest is stable.
+
     Returns list of processed image paths.
     """
     if not images:
@@ -209,8 +223,21 @@ def process_images(
     elif not quiet:
         print("Processing images with resizing...")
 
-    for img_path in images:
-        if img_path.is_file():
+    files = [img_path for img_path in images if img_path.is_file()]
+    results: List[Optional[Path]] = [None] * len(files)
+    timings: List[Optional[Dict[str, Any]]] = [None] * len(files)
+
+    # Same stem means a possibly shared output name (e.g. a.png and a.jpg both
+    # becoming a.webp); keep those in one serial group so the outcome matches
+    # a serial run
+    groups: Dict[str, List[int]] = {}
+    for index, img_path in enumerate(files):
+        groups.setdefault(img_path.stem.lower(), []).append(index)
+
+    def run_group(indices: List[int]) -> None:
+        for index in indices:
+            img_path = files[index]
+            started = time.perf_counter()
             processed_path = process_image(
                 img_path,
                 output_dir,
@@ -221,9 +248,39 @@ def process_images(
                 quiet,
                 enhanced_processing,
             )
-            if processed_path:
-                processed_images.append(processed_path)
+            results[index] = processed_path
+            timings[index] = {
+                "image": img_path.name,
+                "output": processed_path.name if processed_path else None,
+                "seconds": round(time.perf_counter() - started, 4),
+                "input_bytes": img_path.stat().st_size,
+                "output_bytes": processed_path.stat().st_size if processed_path else None,
+            }
+
+    workers = max(1, min(max_workers or default_image_workers(), len(groups) or 1))
+    started = time.perf_counter()
+    if workers == 1:
+        for indices in groups.values():
+            run_group(indices)
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="docx2shelf-image") as ex:
+            # list() re-raises the first worker exception, as the serial loop would
+            list(ex.map(run_group, groups.values()))
+
+    from .json_logger import get_json_logger
+
+    json_logger = get_json_logger()
+    if json_logger:
+        json_logger.log_image_processing(
+            {
+                "mode": "enhanced" if enhanced_processing else "standard",
+                "workers": workers,
+                "wall_seconds": round(time.perf_counter() - started, 4),
+                "images": [timing for timing in timings if timing],
+            }
+        )
 
+    processed_images = [path for path in results if path]
     return processed_images
 
 
@@ -0,0 +1,196 @@
+"""Chapter-level incremental rebuilds for watch mode.
+
+A watch session keeps one ``IncrementalBuild`` per book. It carries the
+state that lets a rebuild redo only what an edit touched:
+- chapter transforms, memoized by the hash of the source chunk and the
+  pipeline configuration (see ``ChapterPipeline.memo``)
+- processed images, reused while the resource files and image options are
+  unchanged
+- a key per archive entry describing the inputs it was rendered from. The
+  rebuilt EPUB copies entries whose key is unchanged from the previous EPUB,
+  and renders only the changed chapters plus the OPF, NCX and nav.
+
+Rebuilds always write with the streaming writer, so archives are
+reproducible and media is stored rather than deflated again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Any, Optional
+
+from ebooklib import epub  # type: ignore
+
+from .epub_resources import process_and_add_images
+from .epub_writer import FileItem, StreamingEpubWriter
+from .metadata import BuildOptions
+
+
+def _digest(*parts: Any) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8", "surrogatepass")
+        elif not isinstance(part, bytes):
+            part = repr(part).encode("utf-8")
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def _file_key(path: Path) -> tuple:
+    stat = path.stat()
+    return (str(path), stat.st_size, stat.st_mtime_ns)
+
+
+def entry_key(item) -> Optional[str]:
+    """Key of the inputs an archive entry is rendered from; None if always rendered."""
+    if isinstance(item, (epub.EpubNcx, epub.EpubNav)):
+        return None  # cheap, and depends on the whole book
+    if isinstance(item, FileItem):
+        return _digest("file", _file_key(item.source_path))
+    if isinstance(item, epub.EpubHtml):
+        book = item.book
+        return _digest(
+            type(item).__name__,
+            item.content or b"",
+            item.title,
+            item.lang or book.language,
+            item.direction,
+            item.links,
+            item.metas,
+            getattr(item, "image_name", None),
+            book.get_template(item._template_name),
+            book.get_template("cover") if isinstance(item, epub.EpubCoverHtml) else None,
+        )
+    return _digest("bytes", item.get_content() or b"")
+
+
+class PatchingEpubWriter(StreamingEpubWriter):
+    """Streaming writer that copies unchanged entries from the previous archive."""
+
+    def __init__(
+        self,
+        name,
+        book,
+        previous: Optional[Path] = None,
+        previous_keys: Optional[dict[str, str]] = None,
+    ):
+        super().__init__(name, book)
+        self.previous = previous
+        self.previous_keys = previous_keys or {}
+        self.entry_keys: dict[str, str] = {}
+        self.rendered: list[str] = []
+        self.copied = 0
+        self._source: Optional[zipfile.ZipFile] = None
+
+    def write(self) -> None:
+        target = Path(self.file_name)
+        partial = target.with_name(f".{target.name}.partial")
+        self.file_name = str(partial)
+        try:
+            if self.previous is not None:
+                with zipfile.ZipFile(self.previous) as source:
+                    self._source = source
+                    super().write()
+            else:
+                super().write()
+            os.replace(partial, target)
+        finally:
+            self._source = None
+            self.file_name = str(target)
+            partial.unlink(missing_ok=True)
+
+    def _write_item(self, name: str, item) -> None:
+        key = entry_key(item)
+        if key is not None:
+            self.entry_keys[name] = key
+            if self._source is not None and self.previous_keys.get(name) == key:
+                try:
+                    self.out.copy_entry(self._source, name)
+                except KeyError:
+                    pass
+                else:
+                    self.copied += 1
+                    if isinstance(item, epub.EpubCoverHtml):
+                        # Rendering fills in .content, which the nav reads later
+                        item.get_content()
+                    return
+        self.rendered.append(name)
+        super()._write_item(name, item)
+
+
+class IncrementalBuild:
+    """State carried from one watch-mode build of a book to the next."""
+
+    def __init__(self) -> None:
+        self._work_dir = tempfile.TemporaryDirectory(prefix="docx2shelf_watch_")
+        self.work_dir = Path(self._work_dir.name)
+        self.chapter_memo: dict[str, Any] = {}
+        self.entry_keys: dict[str, str] = {}
+        self.builds = 0
+        self.patched = False
+        self.last_report: dict[str, Any] = {}
+        self._resources_key: Optional[str] = None
+        self._resource_items: list = []
+        self._output_key: Optional[tuple] = None
+
+    def add_resources(self, book, resources: list[Path], opts: BuildOptions) -> None:
+        """Add processed images to the book, processing them only when inputs changed."""
+        key = _digest(
+            [_file_key(path) for path in resources if path.exists()],
+            opts.image_quality,
+            opts.image_max_width,
+            opts.image_max_height,
+            opts.image_format,
+            opts.enhanced_images,
+        )
+        if key == self._resources_key:
+            for item in self._resource_items:
+                book.add_item(item)
+            return
+        self._resource_items = process_and_add_images(book, resources, opts, work_dir=self.work_dir)
+        self._resources_key = key
+
+    def write(self, output_path: Path, book, chapters_reused: Optional[int] = None) -> None:
+        """Write the book, patching the EPUB from the previous build when it is intact."""
+        previous = None
+        if self.entry_keys and output_path.exists():
+            # Only patch the archive this state wrote; a file replaced since
+            # then may not hold the entries our keys describe
+            if _file_key(output_path) == self._output_key:
+                previous = output_path
+
+        writer = PatchingEpubWriter(str(output_path), book, previous, self.entry_keys)
+        writer.process()
+        writer.write()
+
+        self.builds += 1
+        self.patched = previous is not None
+        self.entry_keys = writer.entry_keys
+        self._output_key = _file_key(output_path)
+        self.last_report = {
+            "patched": self.patched,
+            "rendered": writer.rendered,
+            "copied": writer.copied,
+            "chapters_reused": chapters_reused,
+        }
+
+    def describe(self) -> str:
+        """One-line summary of the last build for the watch log."""
+        if not self.last_report:
+            return "no build yet"
+        report = self.last_report
+        chapters = report["chapters_reused"]
+        reused = f"{chapters} chapter transform(s) reused, " if chapters is not None else ""
+        mode = "patched" if report["patched"] else "full write"
+        return (
+            f"{mode}: {reused}{len(report['rendered'])} entries rendered, {report['copied']} copied"
+        )
+
+    def close(self) -> None:
+        self._work_dir.cleanup()
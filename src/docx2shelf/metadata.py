@@ -72,16 +72,19 @@ class BuildOptions:
     image_max_height: int = 1600
     image_format: str = "webp"
     enhanced_images: bool = False
+    image_workers: Optional[int] = None  # None = one per CPU (capped)
     vertical_writing: bool = False
     epub2_compat: bool = False
     chapter_start_mode: str = "auto"  # auto|manual|mixed
     chapter_starts: Optional[List[str]] = None
     mixed_split_pattern: Optional[str] = None
+    chapter_workers: Optional[int] = None  # None = processes only for large books
     reader_start_chapter: Optional[str] = None
     page_list: bool = False
     extra_css: Optional[Path] = None
     page_numbers: bool = False
     epub_version: str = "3"
+    epub_writer: str = "ebooklib"  # ebooklib|streaming
     cover_scale: str = "contain"  # contain|cover
     dedication_txt: Optional[Path] = None
     ack_txt: Optional[Path] = None
@@ -17,9 +17,16 @@ Features:
 from __future__ import annotations
 
 import re
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from typing import Deque, Dict, List, Optional, Tuple
+
+# Note calls that may receive an id; the content must be plain text
+_CALL_TAG_RE = re.compile(
+    r'<(a|sup|span)([^>]*class\s*=\s*["\'][^"\']*note-?call[^"\']*["\'][^>]*)>([^<]*)</\1>',
+    re.IGNORECASE,
+)
 
 
 class NoteType(Enum):
@@ -172,7 +179,7 @@ class NotesProcessor:
         self._generate_back_references()
 
         # Step 4: Update HTML with proper note markup
-        updated_chunks = self._update_html_with_note_markup(html_chunks)
+        updated_chunks = self._update_html_with_note_markup(html_chunks, chunk_files)
 
         # Step 5: Generate consolidated notes page if needed
         consolidated_notes = None
@@ -287,17 +294,22 @@ class NotesProcessor:
     def _organize_notes_by_chapter(self, chunk_files: List[str], chapter_titles: List[str]) -> None:
         """Organize notes by chapter."""
 
+        # Group notes by the files that call them once instead of per chapter
+        notes_by_file: Dict[str, List[Note]] = defaultdict(list)
+        for note in self.notes.values():
+            for file_path in dict.fromkeys(call.file_path for call in note.calls):
+                notes_by_file[file_path].append(note)
+
         # Create chapter structures
         for filename, title in zip(chunk_files, chapter_titles):
             chapter_notes = ChapterNotes(chapter_title=title, chapter_file=filename)
 
             # Assign notes to chapters based on their calls
-            for note in self.notes.values():
-                if any(call.file_path == filename for call in note.calls):
-                    if note.type == NoteType.FOOTNOTE:
-                        chapter_notes.footnotes.append(note)
-                    elif note.type == NoteType.ENDNOTE:
-                        chapter_notes.endnotes.append(note)
+            for note in notes_by_file.get(filename, []):
+                if note.type == NoteType.FOOTNOTE:
+                    chapter_notes.footnotes.append(note)
+                elif note.type == NoteType.ENDNOTE:
+                    chapter_notes.endnotes.append(note)
 
             # Sort notes by number
             chapter_notes.footnotes.sort(key=lambda x: x.number)
@@ -338,7 +350,9 @@ class NotesProcessor:
 
         self._stats["back_refs_generated"] = back_refs_generated
 
-    def _update_html_with_note_markup(self, html_chunks: List[str]) -> List[str]:
+    def _update_html_with_note_markup(
+        self, html_chunks: List[str], chunk_files: List[str] | None = None
+    ) -> List[str]:
         """Update HTML with proper note markup and IDs."""
 
         updated_chunks = []
@@ -347,7 +361,8 @@ class NotesProcessor:
             updated_chunk = chunk
 
             # Add IDs to note calls if missing
-            updated_chunk = self._add_call_ids(updated_chunk)
+            filename = chunk_files[chunk_idx] if chunk_files else None
+            updated_chunk = self._add_call_ids(updated_chunk, filename)
 
             # Update note markup with proper semantic elements
             updated_chunk = self._enhance_note_markup(updated_chunk)
@@ -362,26 +377,46 @@ class NotesProcessor:
 
         return updated_chunks
 
-    def _add_call_ids(self, chunk: str) -> str:
-        """Add IDs to note calls for back-referencing."""
-
-        for call in self.calls.values():
-            # Find the call in this chunk and add ID if missing
-            pattern = rf'<(a|sup|span)[^>]*class\s*=\s*["\'][^"\']*note-?call[^"\']*["\'][^>]*>([^<]*{re.escape(call.call_text)}[^<]*)</\1>'
-
-            def add_call_id(match):
-                tag = match.group(1)
-                content = match.group(2)
-                attrs = match.group(0)[len(f"<{tag}") : match.group(0).find(">")]
+    def _add_call_ids(self, chunk: str, filename: str | None = None) -> str:
+        """Add IDs to note calls for back-referencing.
 
-                if "id=" not in attrs:
-                    attrs += f' id="{call.id}"'
-
-                return f"<{tag}{attrs}>{content}</{tag}>"
+        Calls are matched in a single scan of the chunk: a marker belongs to a
+        call whose text it contains, ignoring case ("[1]" for "1"), and one
+        whose text it equals is preferred. When the chunk's file is known, its
+        calls are handed out in document order so repeated markers ("1" in
+        every chapter) each get their own id.
+        """
 
-            chunk = re.sub(pattern, add_call_id, chunk, flags=re.IGNORECASE)
+        calls_by_text: Dict[str, Deque[str]] = defaultdict(deque)
+        for call in self.calls.values():
+            if filename is None or call.file_path == filename:
+                calls_by_text[call.call_text].append(call.id)
+
+        if not calls_by_text:
+            return chunk
+
+        def add_call_id(match):
+            tag, attrs, content = match.groups()
+            if "id=" in attrs:
+                return match.group(0)
+
+            pending = calls_by_text.get(content.strip())
+            if not pending:
+                folded = content.casefold()
+                pending = next(
+                    (
+                        ids
+                        for text, ids in calls_by_text.items()
+                        if ids and text.casefold() in folded
+                    ),
+                    None,
+                )
+                if not pending:
+                    return match.group(0)
+            call_id = pending[0] if filename is None else pending.popleft()
+            return f'<{tag}{attrs} id="{call_id}">{content}</{tag}>'
 
-        return chunk
+        return _CALL_TAG_RE.sub(add_call_id, chunk)
 
     def _enhance_note_markup(self, chunk: str) -> str:
         """Enhance note markup with proper semantic elements."""
@@ -0,0 +1,802 @@
+"""
+Single-pass streaming OOXML engine for DOCX to HTML conversion.
+
+Walks ``word/document.xml`` once with ``iterparse`` straight from the zip
+member and emits section HTML as soon as each body element closes. Memory is
+bounded by the largest single paragraph or table instead of the whole
+document, and python-docx is not required. Used by ``convert.docx_to_html``
+whenever Pandoc is unavailable.
+"""
+
+from __future__ import annotations
+
+import html
+import itertools
+import posixpath
+import re
+import shutil
+import xml.etree.ElementTree as ET
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Iterable, Iterator
+from zipfile import ZipFile
+
+from .convert import IMG_NS, _process_equation, _process_text_box_or_shape, extract_styles_css
+from .path_utils import get_safe_temp_path
+
+_W = "{%s}" % IMG_NS["w"]
+_R = "{%s}" % IMG_NS["r"]
+_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# Body-level elements
+_BODY = _W + "body"
+_P = _W + "p"
+_TBL = _W + "tbl"
+_SECT_PR = _W + "sectPr"
+
+# Paragraph-level elements
+_PPR = _W + "pPr"
+_PSTYLE = _W + "pStyle"
+_RUN = _W + "r"
+_HYPERLINK = _W + "hyperlink"
+# Containers whose runs belong to the paragraph text (accepted insertions included)
+_RUN_CONTAINERS = {
+    _W + "ins",
+    _W + "moveTo",
+    _W + "smartTag",
+    _W + "customXml",
+    _W + "fldSimple",
+    _W + "sdt",
+    _W + "sdtContent",
+}
+
+# Run-level elements
+_RPR = _W + "rPr"
+_RSTYLE = _W + "rStyle"
+_TEXT = _W + "t"
+_BR = _W + "br"
+_FOOTNOTE_REF = _W + "footnoteReference"
+_ENDNOTE_REF = _W + "endnoteReference"
+_COMMENT_REF = _W + "commentReference"
+_RUN_TEXT_EQUIVALENTS = {
+    _W + "tab": "\t",
+    _W + "ptab": "\t",
+    _W + "cr": "\n",
+    _W + "noBreakHyphen": "-",
+}
+_BLIP = "{%s}blip" % IMG_NS["a"]
+_DOC_PR = "{%s}docPr" % IMG_NS["wp"]
+
+# Table elements
+_TR = _W + "tr"
+_TC = _W + "tc"
+_TRPR = _W + "trPr"
+_TCPR = _W + "tcPr"
+
+_REL_TYPE_PREFIX = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/"
+
+# Word stores a handful of built-in style names in lowercase; mirror the UI names
+# python-docx reports so styles.json keys keep matching.
+_UI_STYLE_NAMES = {
+    "caption": "Caption",
+    "footer": "Footer",
+    "header": "Header",
+    **{f"heading {n}": f"Heading {n}" for n in range(1, 10)},
+}
+
+# Block size for reading document.xml out of the zip
+_READ_SIZE = 64 * 1024
+
+_IMAGE_ONLY_RE = re.compile(r"\s*<img[^>]+>\s*")
+
+
+def _is_on(value: str | None, default: bool) -> bool:
+    """Interpret an ST_OnOff attribute value."""
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "on")
+
+
+def _toggle(rpr: ET.Element | None, name: str) -> bool:
+    """Return whether a boolean run property like ``w:b`` is switched on."""
+    if rpr is None:
+        return False
+    el = rpr.find(_W + name)
+    return el is not None and _is_on(el.get(_W + "val"), True)
+
+
+def _run_text(run: ET.Element) -> str:
+    """Plain text of a single ``w:r`` element, translating tabs and breaks."""
+    parts: list[str] = []
+    for child in run:
+        tag = child.tag
+        if tag == _TEXT:
+            parts.append(child.text or "")
+        elif tag == _BR:
+            if child.get(_W + "type", "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag in _RUN_TEXT_EQUIVALENTS:
+            parts.append(_RUN_TEXT_EQUIVALENTS[tag])
+    return "".join(parts)
+
+
+def _member_name(target: str) -> str:
+    """Resolve a relationship target relative to ``word/document.xml``."""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join("word", target))
+
+
+def _read_relationships(zf: ZipFile) -> tuple[dict[str, tuple[str, bool]], dict[str, str]]:
+    """Return ``(rels, parts)`` for the main document part.
+
+    ``rels`` maps relationship id to ``(target, is_external)`` and ``parts`` maps
+    the short relationship type (``styles``, ``footnotes``, ...) to its target.
+    """
+    rels: dict[str, tuple[str, bool]] = {}
+    parts: dict[str, str] = {}
+    try:
+        rels_root = ET.fromstring(zf.read("word/_rels/document.xml.rels"))
+    except KeyError:
+        return rels, parts
+
+    for rel in rels_root.iterfind(_REL + "Relationship"):
+        rid = rel.get("Id")
+        target = rel.get("Target", "")
+        external = rel.get("TargetMode") == "External"
+        if rid:
+            rels[rid] = (target, external)
+        rel_type = rel.get("Type", "")
+        if rel_type.startswith(_REL_TYPE_PREFIX) and not external:
+            parts.setdefault(rel_type[len(_REL_TYPE_PREFIX) :], target)
+    return rels, parts
+
+
+def _format_direct(rpr: ET.Element | None, txt: str) -> str:
+    """Wrap already-escaped text in the HTML for its direct run formatting."""
+    if _toggle(rpr, "b"):
+        txt = f"<strong>{txt}</strong>"
+    if _toggle(rpr, "i"):
+        txt = f"<em>{txt}</em>"
+    if rpr is None:
+        return txt
+
+    underline = rpr.find(_W + "u")
+    if underline is not None and underline.get(_W + "val") not in (None, "none"):
+        txt = f"<u>{txt}</u>"
+    if _toggle(rpr, "strike"):
+        txt = f"<s>{txt}</s>"
+
+    vert_align = rpr.find(_W + "vertAlign")
+    position = vert_align.get(_W + "val") if vert_align is not None else None
+    if position == "superscript":
+        txt = f"<sup>{txt}</sup>"
+    elif position == "subscript":
+        txt = f"<sub>{txt}</sub>"
+
+    if _toggle(rpr, "smallCaps"):
+        txt = f'<span class="small-caps">{txt}</span>'
+    return txt
+
+
+@dataclass(frozen=True)
+class IndexedNote:
+    """A footnote, endnote or comment body resolved once from its part."""
+
+    text: str  # Plain text, whitespace-trimmed
+    html: str  # Escaped inline HTML with direct run formatting
+
+
+class NoteIndex:
+    """Id to note lookup for footnotes, endnotes and comments.
+
+    Each notes part is parsed exactly once, so resolving a reference is a
+    dictionary lookup instead of a search over the whole part.
+
+    Usage::
+
+        index = NoteIndex.from_docx(docx_path)
+        note = index.get("footnote", "3")
+        if note:
+            ...note.html...
+    """
+
+    KINDS = ("footnote", "endnote", "comment")
+    # Relationship type of the part holding each kind
+    _PART_TYPES = {"footnote": "footnotes", "endnote": "endnotes", "comment": "comments"}
+
+    def __init__(self):
+        self._entries: dict[str, dict[str, IndexedNote]] = {kind: {} for kind in self.KINDS}
+
+    @classmethod
+    def from_docx(cls, docx_path: Path) -> NoteIndex:
+        """Build the index straight from a DOCX package."""
+        with ZipFile(docx_path, "r") as zf:
+            _rels, parts = _read_relationships(zf)
+            return cls.from_package(zf, parts)
+
+    @classmethod
+    def from_package(cls, zf: ZipFile, parts: dict[str, str]) -> NoteIndex:
+        """Build the index from an open package and its part targets by type."""
+        index = cls()
+        for kind in cls.KINDS:
+            part_type = cls._PART_TYPES[kind]
+            try:
+                stream = zf.open(_member_name(parts.get(part_type, f"{part_type}.xml")))
+            except KeyError:
+                continue
+            with stream:
+                index.add_part(kind, stream)
+        return index
+
+    def add_part(self, kind: str, source: IO[bytes]) -> None:
+        """Index every ``w:footnote``/``w:endnote``/``w:comment`` in one pass."""
+        entries = self._entries[kind]
+        note_tag = _W + kind
+        for _event, el in ET.iterparse(source, events=("end",)):
+            if el.tag != note_tag:
+                continue
+            note_id = el.get(_W + "id")
+            if note_id is not None:
+                entries[note_id] = self._render_note(el)
+            el.clear()
+
+    def get(self, kind: str, note_id: str | None) -> IndexedNote | None:
+        if note_id is None:
+            return None
+        return self._entries[kind].get(note_id)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    @staticmethod
+    def _render_note(note: ET.Element) -> IndexedNote:
+        # (run properties, text) segments; paragraphs are joined with a space
+        segments: list[tuple[ET.Element | None, str]] = []
+        for p in note.iter(_P):
+            if segments:
+                segments.append((None, " "))
+            for run in p.iter(_RUN):
+                txt = _run_text(run)
+                if txt:
+                    segments.append((run.find(_RPR), txt))
+
+        # Trim the whitespace Word leaves after the reference mark
+        while segments and not segments[0][1].strip():
+            segments.pop(0)
+        while segments and not segments[-1][1].strip():
+            segments.pop()
+        if segments:
+            segments[0] = (segments[0][0], segments[0][1].lstrip())
+            segments[-1] = (segments[-1][0], segments[-1][1].rstrip())
+
+        text = "".join(txt for _rpr, txt in segments)
+        note_html = "".join(
+            _format_direct(rpr, html.escape(txt, quote=False)) for rpr, txt in segments
+        )
+        return IndexedNote(text=text, html=note_html)
+
+
+class _StyleTable:
+    """Style id to UI name lookup built once from ``word/styles.xml``."""
+
+    def __init__(self, styles_xml: bytes | None):
+        self._styles: dict[str, tuple[str, str | None]] = {}
+        self._defaults: dict[str, str | None] = {}
+
+        if styles_xml is None:
+            # Same defaults python-docx falls back to without a styles part
+            self._defaults = {"paragraph": "Normal", "character": "Default Paragraph Font"}
+            return
+
+        root = ET.fromstring(styles_xml)
+        for style in root.iterfind(_W + "style"):
+            style_type = style.get(_W + "type", "paragraph")
+            name_el = style.find(_W + "name")
+            name = name_el.get(_W + "val") if name_el is not None else None
+            if name is not None:
+                name = _UI_STYLE_NAMES.get(name, name)
+
+            style_id = style.get(_W + "styleId")
+            if style_id is not None and style_id not in self._styles:
+                self._styles[style_id] = (style_type, name)
+            # The spec calls for the last default in document order
+            if _is_on(style.get(_W + "default"), False):
+                self._defaults[style_type] = name
+
+    def name(self, style_id: str | None, style_type: str) -> str | None:
+        """Resolve a style id, falling back to the default style of that type."""
+        entry = self._styles.get(style_id) if style_id else None
+        if entry is None or entry[0] != style_type:
+            return self._defaults.get(style_type)
+        return entry[1]
+
+    def explicit_name(self, style_id: str | None, style_type: str) -> str | None:
+        """Resolve a style id without falling back to the default style."""
+        entry = self._styles.get(style_id) if style_id else None
+        if entry is None or entry[0] != style_type:
+            return None
+        return entry[1]
+
+
+class _SectionAssembler:
+    """Collects block HTML into ``<section>`` chunks split at ``h1`` boundaries."""
+
+    def __init__(self):
+        self.ready: deque[str] = deque()
+        self._buf: list[str] = []
+        self._notes: list[str] = []
+        self._list_type: str | None = None
+        self._list_items: list[str] = []
+        self.pending_img: str | None = None
+
+    def add_note(self, note_html: str) -> None:
+        self._notes.append(note_html)
+
+    def add_block(self, block_html: str) -> None:
+        self.flush_list()
+        self._buf.append(block_html)
+
+    def add_list_item(self, list_type: str, item_html: str) -> None:
+        if self._list_type and self._list_type != list_type:
+            self.flush_list()
+        if self._list_type is None:
+            self._list_type = list_type
+        self._list_items.append(item_html)
+
+    def flush_list(self) -> None:
+        if self._list_type and self._list_items:
+            self._buf.append(
+                f"<{self._list_type}>" + "".join(self._list_items) + f"</{self._list_type}>"
+            )
+        self._list_type = None
+        self._list_items = []
+
+    def flush_pending_image(self) -> None:
+        if self.pending_img:
+            self.add_block(f"<p>{self.pending_img}</p>")
+            self.pending_img = None
+
+    def flush_section(self) -> None:
+        self.flush_list()
+        if self._buf:
+            body = "".join(self._buf)
+            if self._notes:
+                body += (
+                    '<hr/><section class="footnotes"><ol>'
+                    + "".join(self._notes)
+                    + "</ol></section>"
+                )
+            self.ready.append("<section>" + body + "</section>")
+            self._buf = []
+        self._notes = []
+
+    def finish(self) -> None:
+        self.flush_pending_image()
+        self.flush_section()
+
+
+class OOXMLStreamConverter:
+    """Convert a DOCX file to section HTML in a single streaming pass.
+
+    Usage::
+
+        converter = OOXMLStreamConverter(docx_path, styles_data)
+        for section_html in converter.iter_sections():
+            ...
+        images = converter.resources
+
+    ``styles_data`` is the output of ``convert._load_style_mapping``.
+    """
+
+    def __init__(
+        self,
+        docx_path: Path,
+        styles_data: dict | None = None,
+        image_dir: Path | None = None,
+    ):
+        self.docx_path = Path(docx_path)
+        self.styles_data = styles_data or {}
+        self.paragraph_styles_map: dict[str, str] = self.styles_data.get("paragraph_styles", {})
+        self.image_dir = image_dir
+        self.resources: list[Path] = []
+
+        self._zip: ZipFile | None = None
+        self._rels: dict[str, tuple[str, bool]] = {}
+        self._styles = _StyleTable(None)
+        self._notes = NoteIndex()
+        self._images: dict[str, Path] = {}
+        self._note_idx = 0
+        self._assembler = _SectionAssembler()
+
+    def convert(self) -> tuple[list[str], list[Path], str]:
+        """Run the full conversion and return ``(chunks, resources, styles_css)``."""
+        chunks = list(self.iter_sections())
+        return chunks, list(self.resources), extract_styles_css(self.styles_data)
+
+    def iter_sections(self, xml_chunks: Iterable[bytes] | None = None) -> Iterator[str]:
+        """Yield ``<section>`` HTML chunks as the document body is parsed.
+
+        Args:
+            xml_chunks: Optional byte chunks of ``word/document.xml`` (for example
+                from ``StreamingDocxReader.iter_document_xml_bytes``). When omitted
+                the zip member is read directly.
+        """
+        self._note_idx = 0
+        self._images = {}
+        self.resources = []
+        self._assembler = _SectionAssembler()
+        emitted = False
+
+        with ZipFile(self.docx_path, "r") as zf:
+            self._zip = zf
+            try:
+                self._load_package_parts()
+                if xml_chunks is None:
+                    xml_chunks = self._iter_member_chunks("word/document.xml")
+
+                for element in self._iter_body_elements(xml_chunks):
+                    self._handle_body_element(element)
+                    element.clear()
+                    while self._assembler.ready:
+                        emitted = True
+                        yield self._assembler.ready.popleft()
+
+                self._assembler.finish()
+                while self._assembler.ready:
+                    emitted = True
+                    yield self._assembler.ready.popleft()
+            finally:
+                self._zip = None
+
+        if not emitted:
+            yield "<section><p>(Empty document)</p></section>"
+
+    # ------------------------------------------------------------------
+    # Package parts
+    # ------------------------------------------------------------------
+
+    def _load_package_parts(self) -> None:
+        """Read relationships, styles and notes once up front."""
+        self._rels, parts = _read_relationships(self._zip)
+        styles_xml = self._read_part(parts.get("styles", "styles.xml"))
+        self._styles = _StyleTable(styles_xml)
+        self._notes = NoteIndex.from_package(self._zip, parts)
+
+    def _read_part(self, target: str) -> bytes | None:
+        try:
+            return self._zip.read(_member_name(target))
+        except KeyError:
+            return None
+
+    # ------------------------------------------------------------------
+    # Document body
+    # ------------------------------------------------------------------
+
+    def _iter_member_chunks(self, member: str) -> Iterator[bytes]:
+        """Read a zip member in fixed-size blocks without decompressing it all."""
+        try:
+            stream = self._zip.open(member)
+        except KeyError:
+            raise ValueError(f"Invalid DOCX file: missing {member}") from None
+        with stream:
+            while True:
+                data = stream.read(_READ_SIZE)
+                if not data:
+                    break
+                yield data
+
+    def _iter_body_elements(self, xml_chunks: Iterable[bytes]) -> Iterator[ET.Element]:
+        """Feed byte chunks to an incremental parser and yield each completed
+        direct child of ``w:body``, detaching it once handled."""
+        parser = ET.XMLPullParser(events=("start", "end"))
+        depth = 0
+        body: ET.Element | None = None
+        body_depth = -1
+
+        for data in itertools.chain(xml_chunks, (None,)):
+            if data is None:
+                parser.close()
+            else:
+                parser.feed(data)
+
+            for event, el in parser.read_events():
+                if event == "start":
+                    depth += 1
+                    if el.tag == _BODY and body is None:
+                        body = el
+                        body_depth = depth
+                    continue
+
+                if body is not None and depth == body_depth + 1:
+                    yield el
+                    # Detach so the tree never holds more than one body element
+                    body.remove(el)
+                depth -= 1
+
+    def _handle_body_element(self, element: ET.Element) -> None:
+        tag = element.tag
+        if tag == _P:
+            self._handle_paragraph(element)
+            return
+        if tag == _SECT_PR:
+            return
+
+        if tag == _TBL:
+            block = self._render_table(element)
+        else:
+            lowered = tag.lower()
+            if "textbox" in lowered or "shape" in lowered:
+                block = _process_text_box_or_shape(element, self._ensure_image_dir())
+            elif "math" in lowered or "equation" in lowered:
+                block = _process_equation(element)
+            else:
+                return
+
+        self._assembler.flush_pending_image()
+        self._assembler.add_block(block)
+
+    def _handle_paragraph(self, p: ET.Element) -> None:
+        asm = self._assembler
+
+        style_id = None
+        ppr = p.find(_PPR)
+        if ppr is not None:
+            pstyle = ppr.find(_PSTYLE)
+            if pstyle is not None:
+                style_id = pstyle.get(_W + "val")
+
+        style_name = self._styles.name(style_id, "paragraph")
+        style = (style_name or "").lower()
+        # Ordered lists are only recognisable from the style name without numbering.xml
+        is_num = "number" in style
+
+        run_html: list[str] = []
+        self._render_inline(p, run_html)
+        content = "".join(run_html).strip()
+
+        if not content and not asm.pending_img:
+            return
+
+        # Image-only paragraph followed by a caption becomes a figure
+        if "caption" in style and asm.pending_img:
+            asm.add_block(f"<figure>{asm.pending_img}<figcaption>{content}</figcaption></figure>")
+            asm.pending_img = None
+            return
+
+        if _IMAGE_ONLY_RE.fullmatch(content):
+            asm.flush_pending_image()
+            asm.pending_img = content
+            return
+
+        if asm.pending_img:
+            asm.flush_pending_image()
+
+        mapped_tag = self.paragraph_styles_map.get(style_name, "p")
+        tag_parts = mapped_tag.split(' class="')
+        base_tag = tag_parts[0]
+        css_class = tag_parts[1].rstrip('"') if len(tag_parts) > 1 else None
+        opening_tag = f'<{base_tag} class="{css_class}">' if css_class else f"<{base_tag}>"
+        closing_tag = f"</{base_tag}>"
+
+        if base_tag == "h1":
+            asm.flush_section()
+            asm.add_block(f"{opening_tag}{content}{closing_tag}")
+        elif base_tag == "li":
+            asm.add_list_item("ol" if is_num else "ul", f"<li>{content}</li>")
+        elif base_tag == "blockquote":
+            asm.add_block(f"{opening_tag}<p>{content}</p>{closing_tag}")
+        else:
+            asm.add_block(f"{opening_tag}{content}{closing_tag}")
+
+    def _render_inline(self, container: ET.Element, out: list[str]) -> None:
+        """Render the runs of a paragraph or inline container in document order."""
+        for child in container:
+            tag = child.tag
+            if tag == _RUN:
+                self._render_run(child, out)
+            elif tag == _HYPERLINK:
+                inner: list[str] = []
+                self._render_inline(child, inner)
+                if not inner:
+                    continue
+                href = self._hyperlink_href(child)
+                if href:
+                    out.append(f'<a href="{html.escape(href)}">{"".join(inner)}</a>')
+                else:
+                    out.extend(inner)
+            elif tag in _RUN_CONTAINERS:
+                self._render_inline(child, out)
+            # w:del / w:moveFrom (rejected or moved-away text), bookmarks, proofing
+            # marks and other non-content children are skipped
+
+    def _hyperlink_href(self, link: ET.Element) -> str | None:
+        rid = link.get(_R + "id")
+        if rid and rid in self._rels:
+            return self._rels[rid][0]
+        anchor = link.get(_W + "anchor")
+        return f"#{anchor}" if anchor else None
+
+    def _render_run(self, run: ET.Element, out: list[str]) -> None:
+        """Render one ``w:r`` with a single walk over its children."""
+        rpr: ET.Element | None = None
+        text_parts: list[str] = []
+        blips: list[str] = []
+        alt: str | None = None
+        note_refs: list[tuple[str, str | None]] = []
+        endnote_refs: list[tuple[str, str | None]] = []
+        comment_ids: list[str] = []
+        page_break = False
+
+        for child in run:
+            tag = child.tag
+            if tag == _TEXT:
+                text_parts.append(child.text or "")
+            elif tag == _BR:
+                br_type = child.get(_W + "type", "textWrapping")
+                if br_type == "page":
+                    page_break = True
+                elif br_type == "textWrapping":
+                    text_parts.append("\n")
+            elif tag in _RUN_TEXT_EQUIVALENTS:
+                text_parts.append(_RUN_TEXT_EQUIVALENTS[tag])
+            elif tag == _RPR:
+                rpr = child
+            elif tag == _FOOTNOTE_REF:
+                note_refs.append(("footnote", child.get(_W + "id")))
+            elif tag == _ENDNOTE_REF:
+                endnote_refs.append(("endnote", child.get(_W + "id")))
+            elif tag == _COMMENT_REF:
+                comment_id = child.get(_W + "id")
+                if comment_id:
+                    comment_ids.append(comment_id)
+            else:
+                # Drawings, VML pictures and AlternateContent wrappers
+                for el in child.iter():
+                    if el.tag == _BLIP:
+                        rid = el.get(_R + "embed")
+                        if rid:
+                            blips.append(rid)
+                    elif el.tag == _DOC_PR and alt is None:
+                        alt = el.get("descr") or el.get("title") or ""
+
+        for rid in blips:
+            filename = self._extract_image(rid)
+            if filename:
+                alt_text = html.escape(alt or "")
+                out.append(f'<img src="images/{filename}" alt="{alt_text}" />')
+
+        if page_break:
+            # Pagebreak sentinel, split later by split_html_by_pagebreak
+            out.append("<!-- PAGEBREAK -->")
+
+        for kind, ref_id in note_refs + endnote_refs:
+            self._note_idx += 1
+            idx = self._note_idx
+            out.append(f'<sup id="fnref{idx}"><a href="#fn{idx}">{idx}</a></sup>')
+            note = self._notes.get(kind, ref_id)
+            note_html = note.html if note and note.html else "(note)"
+            self._assembler.add_note(
+                f'<li id="fn{idx}"><p>{note_html} <a href="#fnref{idx}">↩</a></p></li>'
+            )
+
+        txt = "".join(text_parts)
+        if not txt:
+            return
+
+        formatted = self._format_run(rpr, html.escape(txt, quote=False))
+        for comment_id in comment_ids:
+            comment = self._notes.get("comment", comment_id)
+            if comment and comment.text:
+                formatted += f'<span class="comment" title="{html.escape(comment.text)}">💬</span>'
+        out.append(formatted)
+
+    def _format_run(self, rpr: ET.Element | None, txt: str) -> str:
+        """Apply direct run formatting and explicit character styles."""
+        txt = _format_direct(rpr, txt)
+        if rpr is None:
+            return txt
+
+        rstyle = rpr.find(_RSTYLE)
+        style_name = None
+        if rstyle is not None:
+            style_name = self._styles.explicit_name(rstyle.get(_W + "val"), "character")
+        if style_name:
+            style_name = style_name.lower().replace(" ", "-")
+            # Map common Word styles to semantic HTML
+            if "code" in style_name or "monospace" in style_name:
+                txt = f"<code>{txt}</code>"
+            elif "emphasis" in style_name or "stress" in style_name:
+                txt = f"<em>{txt}</em>"
+            elif "strong" in style_name or "intense" in style_name:
+                txt = f"<strong>{txt}</strong>"
+            elif style_name not in ("normal", "default"):
+                txt = f'<span class="style-{style_name}">{txt}</span>'
+
+        return txt
+
+    # ------------------------------------------------------------------
+    # Tables and images
+    # ------------------------------------------------------------------
+
+    def _render_table(self, tbl: ET.Element) -> str:
+        """Render a table, repeating merged cells once per layout-grid column."""
+        html_parts = ["<table>"]
+        # grid column -> cell paragraphs HTML of the cell that starts a vertical merge
+        above: dict[int, str] = {}
+
+        for tr in tbl.iterfind(_TR):
+            html_parts.append("<tr>")
+            grid_col = 0
+            trpr = tr.find(_TRPR)
+            if trpr is not None:
+                grid_before = trpr.find(_W + "gridBefore")
+                if grid_before is not None:
+                    grid_col = int(grid_before.get(_W + "val", "0"))
+
+            current: dict[int, str] = {}
+            for tc in tr.iterfind(_TC):
+                span = 1
+                v_merge = None
+                tcpr = tc.find(_TCPR)
+                if tcpr is not None:
+                    grid_span = tcpr.find(_W + "gridSpan")
+                    if grid_span is not None:
+                        span = int(grid_span.get(_W + "val", "1"))
+                    merge = tcpr.find(_W + "vMerge")
+                    if merge is not None:
+                        v_merge = merge.get(_W + "val", "continue")
+
+                if v_merge == "continue" and grid_col in above:
+                    cell_html = above[grid_col]
+                else:
+                    cell_content = []
+                    for paragraph in tc.iterfind(_P):
+                        # Same run rendering as body paragraphs: formatting,
+                        # links, images and note references are kept
+                        run_html: list[str] = []
+                        self._render_inline(paragraph, run_html)
+                        p_html = "".join(run_html).strip()
+                        if p_html:
+                            cell_content.append(f"<p>{p_html}</p>")
+                    cell_html = "".join(cell_content) if cell_content else "<p></p>"
+
+                for _ in range(span):
+                    current[grid_col] = cell_html
+                    html_parts.append(f"<td>{cell_html}</td>")
+                    grid_col += 1
+            above = current
+            html_parts.append("</tr>")
+
+        html_parts.append("</table>")
+        return "".join(html_parts)
+
+    def _ensure_image_dir(self) -> Path:
+        if self.image_dir is None:
+            self.image_dir = get_safe_temp_path("docx2shelf_pandoc")
+        self.image_dir.mkdir(parents=True, exist_ok=True)
+        return self.image_dir
+
+    def _extract_image(self, rid: str) -> str | None:
+        """Copy an embedded image to the image directory once; return its filename."""
+        rel = self._rels.get(rid)
+        if rel is None or rel[1]:
+            return None
+
+        member = _member_name(rel[0])
+        filename = posixpath.basename(member)
+        if filename in self._images:
+            return filename
+
+        try:
+            source = self._zip.open(member)
+        except KeyError:
+            return None
+
+        out = self._ensure_image_dir() / filename
+        with source, open(out, "wb") as dest:
+            shutil.copyfileobj(source, dest)
+        self._images[filename] = out
+        self.resources.append(out)
+        return filename
@@ -0,0 +1,607 @@
+"""
+Pooled Pandoc executor shared by batch and multi-file builds.
+
+Every ``pypandoc.convert_file`` call spawns a fresh ``pandoc`` process and pays
+for process startup plus Haskell RTS initialisation. For batch runs and
+directory inputs that fixed cost is paid once per file. ``PandocPool`` keeps
+it out of the per-file path:
+
+- When the Pandoc binary supports ``pandoc server`` (Pandoc 3+), N warm server
+  processes are started once and conversions are posted to them over HTTP.
+- Otherwise conversions run through ``pypandoc`` on a bounded worker pool, so
+  several files still convert concurrently.
+
+Submissions block once ``max_pending`` jobs are queued (backpressure). Server
+workers are pinged before reuse when they have been idle longer than
+``health_interval`` and are restarted when they stop answering.
+
+Usage::
+
+    with shared_pool(max_workers=4) as pool:
+        for i, path in enumerate(files):
+            # Keep the queue full with upcoming files, without blocking
+            for upcoming in files[i:]:
+                if not pool.prefetch(upcoming, extra_args=["--wrap=none"]):
+                    break
+            html = pool.convert_file(path, extra_args=["--wrap=none"])
+
+``convert.pandoc_convert_file`` routes through ``active_pool()``, so any code
+running inside ``shared_pool()`` picks the pool up without changes. Pools in
+server mode can also be exported to child processes (``exported()``), which
+attach to the same warm servers instead of starting their own.
+"""
+
+from __future__ import annotations
+
+import atexit
+import base64
+import json
+import os
+import socket
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from queue import Queue
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Comma-separated server URLs inherited by child processes of a batch run
+SERVERS_ENV = "DOCX2SHELF_PANDOC_SERVERS"
+
+_FORMATS_BY_SUFFIX = {
+    ".docx": "docx",
+    ".md": "markdown",
+    ".markdown": "markdown",
+    ".html": "html",
+    ".htm": "html",
+    ".odt": "odt",
+    ".epub": "epub",
+}
+# Input formats pandoc server expects base64-encoded
+_BINARY_FORMATS = {"docx", "odt", "epub", "pptx", "xlsx", "docx+styles"}
+
+_STARTUP_TIMEOUT = 15.0
+
+
+class _UnsupportedByServer(Exception):
+    """Raised for jobs that have to run through the pypandoc subprocess path."""
+
+
+@dataclass
+class PoolStats:
+    """Counters describing the work a pool has done."""
+
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    server_requests: int = 0
+    subprocess_requests: int = 0
+    prefetch_hits: int = 0
+    restarts: int = 0
+    health_checks: int = 0
+    max_queue_depth: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+@dataclass
+class _PandocServer:
+    """One ``pandoc server`` endpoint and the process behind it, if we own it."""
+
+    url: str
+    process: Optional[subprocess.Popen] = None
+    last_ok: float = 0.0
+    healthy: bool = True
+    port: Optional[int] = field(default=None, repr=False)
+
+    @property
+    def owned(self) -> bool:
+        return self.process is not None
+
+    def is_running(self) -> bool:
+        return self.process is None or self.process.poll() is None
+
+    def ping(self, timeout: float = 2.0) -> bool:
+        try:
+            with urllib.request.urlopen(self.url + "/version", timeout=timeout) as resp:
+                ok = resp.status == 200
+        except (OSError, urllib.error.URLError):
+            ok = False
+        self.healthy = ok
+        if ok:
+            self.last_ok = time.monotonic()
+        return ok
+
+    def post(self, payload: Dict[str, Any], timeout: float) -> str:
+        request = urllib.request.Request(
+            self.url + "/",
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json", "Accept": "application/json"},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as resp:
+                body = json.loads(resp.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            # The server answered, so it is healthy; the document is the problem
+            self.last_ok = time.monotonic()
+            detail = e.read().decode("utf-8", "replace").strip()
+            raise RuntimeError(f"Pandoc server rejected conversion: {detail or e}") from None
+
+        self.last_ok = time.monotonic()
+        self.healthy = True
+        output = body.get("output", "")
+        if body.get("base64"):
+            output = base64.b64decode(output).decode("utf-8")
+        return output
+
+    def stop(self) -> None:
+        if self.process is None:
+            return
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _run_pypandoc(source: Path, to: str, format: Optional[str], extra_args: Sequence[str]) -> str:
+    """Convert through pypandoc, spawning one ``pandoc`` process."""
+    import pypandoc  # type: ignore
+
+    return pypandoc.convert_file(str(source), to=to, format=format, extra_args=list(extra_args))
+
+
+def _server_options(extra_args: Sequence[str]) -> Dict[str, Any]:
+    """Translate the command-line options we use into pandoc server fields."""
+    options: Dict[str, Any] = {}
+    for arg in extra_args:
+        name, _, value = arg.partition("=")
+        if name == "--wrap" and value:
+            options["wrap"] = value
+        elif name == "--columns" and value.isdigit():
+            options["columns"] = int(value)
+        elif name == "--standalone":
+            options["standalone"] = True
+        else:
+            raise _UnsupportedByServer(arg)
+    return options
+
+
+class PandocPool:
+    """Bounded, health-checked pool of Pandoc workers.
+
+    Args:
+        max_workers: Concurrent conversions (and warm servers in server mode).
+        max_pending: Jobs allowed in flight before ``submit`` blocks.
+        mode: ``"auto"`` (server when supported), ``"server"`` or ``"subprocess"``.
+        endpoints: URLs of already running servers to attach to instead of
+            starting our own (used by child processes of a batch run).
+        timeout: Per-conversion timeout in seconds.
+        health_interval: Idle seconds after which a server is pinged before use.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        mode: str = "auto",
+        endpoints: Optional[Sequence[str]] = None,
+        timeout: float = 300.0,
+        health_interval: float = 30.0,
+    ):
+        if mode not in ("auto", "server", "subprocess"):
+            raise ValueError(f"Unknown pandoc pool mode: {mode}")
+
+        self.max_workers = max(1, max_workers or min(4, os.cpu_count() or 1))
+        self.max_pending = max(self.max_workers, max_pending or self.max_workers * 2)
+        self.requested_mode = mode
+        self.mode: Optional[str] = None
+        self.timeout = timeout
+        self.health_interval = health_interval
+        self.stats = PoolStats()
+
+        self._endpoints = list(endpoints or [])
+        self._servers: List[_PandocServer] = []
+        self._idle: Queue[_PandocServer] = Queue()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._pending = 0
+        # Held across check, dispatch and store so concurrent callers never
+        # dispatch one job twice; separate from _lock, which _dispatch takes
+        self._prefetch_lock = threading.Lock()
+        self._prefetched: Dict[Tuple, Future] = {}
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> PandocPool:
+        """Start the workers; idempotent."""
+        if self.mode is not None:
+            return self
+
+        if self._endpoints:
+            self._servers = [_PandocServer(url=url.rstrip("/")) for url in self._endpoints]
+            self.mode = "server"
+        elif self.requested_mode != "subprocess":
+            self._servers = self._start_servers()
+            if self._servers:
+                self.mode = "server"
+            elif self.requested_mode == "server":
+                raise RuntimeError("Pandoc binary does not support 'pandoc server' mode")
+
+        if self.mode is None:
+            self.mode = "subprocess"
+
+        for server in self._servers:
+            self._idle.put(server)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="pandoc-pool"
+        )
+        return self
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work, drain the queue and stop owned servers."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+        for server in self._servers:
+            server.stop()
+        self._servers = []
+        self._idle = Queue()
+        with self._prefetch_lock:
+            self._prefetched.clear()
+        self.mode = None
+
+    def __enter__(self) -> PandocPool:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+
+    def _start_servers(self) -> List[_PandocServer]:
+        from .tools import pandoc_path
+
+        binary = pandoc_path()
+        if binary is None:
+            return []
+
+        first = self._spawn_server(binary)
+        if first is None:
+            # Pandoc < 3 or built without server support
+            return []
+        servers = [first]
+        for _ in range(self.max_workers - 1):
+            server = self._spawn_server(binary)
+            if server is not None:
+                servers.append(server)
+        return servers
+
+    def _spawn_server(self, binary: Path) -> Optional[_PandocServer]:
+        port = _free_port()
+        cmd = [str(binary), "server", "--port", str(port), "--timeout", str(int(self.timeout))]
+        try:
+            process = subprocess.Popen(
+                cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL
+            )
+        except OSError:
+            return None
+
+        server = _PandocServer(url=f"http://127.0.0.1:{port}", process=process, port=port)
+        deadline = time.monotonic() + _STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                return None
+            if server.ping(timeout=0.5):
+                return server
+            time.sleep(0.05)
+        server.stop()
+        return None
+
+    def _restart(self, server: _PandocServer) -> bool:
+        """Replace a dead owned server process in place."""
+        from .tools import pandoc_path
+
+        binary = pandoc_path()
+        server.stop()
+        replacement = self._spawn_server(binary) if binary else None
+        if replacement is None:
+            server.healthy = False
+            return False
+        server.url = replacement.url
+        server.process = replacement.process
+        server.port = replacement.port
+        server.last_ok = replacement.last_ok
+        server.healthy = True
+        with self._lock:
+            self.stats.restarts += 1
+        return True
+
+    # ------------------------------------------------------------------
+    # Environment sharing
+    # ------------------------------------------------------------------
+
+    @property
+    def endpoints(self) -> List[str]:
+        return [server.url for server in self._servers]
+
+    @contextmanager
+    def exported(self) -> Iterator[None]:
+        """Advertise our servers to child processes started inside the block."""
+        if self.mode != "server" or not self._servers:
+            yield
+            return
+
+        previous = os.environ.get(SERVERS_ENV)
+        os.environ[SERVERS_ENV] = ",".join(self.endpoints)
+        try:
+            yield
+        finally:
+            if previous is None:
+                os.environ.pop(SERVERS_ENV, None)
+            else:
+                os.environ[SERVERS_ENV] = previous
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        source: Path,
+        to: str = "html",
+        format: Optional[str] = None,
+        extra_args: Optional[Sequence[str]] = None,
+    ) -> Future:
+        """Queue a conversion, blocking while ``max_pending`` jobs are in flight."""
+        self._slots.acquire()
+        return self._dispatch(Path(source), to, format, tuple(extra_args or ()))
+
+    def convert_file(
+        self,
+        source: Path,
+        to: str = "html",
+        format: Optional[str] = None,
+        extra_args: Optional[Sequence[str]] = None,
+    ) -> str:
+        """Convert one file, reusing a prefetched result when there is one."""
+        source = Path(source)
+        args = tuple(extra_args or ())
+        key = self._job_key(source, to, format, args)
+        with self._prefetch_lock:
+            future = self._prefetched.pop(key, None)
+        if future is not None:
+            with self._lock:
+                self.stats.prefetch_hits += 1
+        else:
+            future = self.submit(source, to=to, format=format, extra_args=args)
+        return future.result()
+
+    def prefetch(
+        self,
+        source: Path,
+        to: str = "html",
+        format: Optional[str] = None,
+        extra_args: Optional[Sequence[str]] = None,
+    ) -> bool:
+        """Start converting a file ahead of ``convert_file`` if there is room.
+
+        Never blocks: returns False when the queue is full so callers can keep a
+        sliding window of work in flight without buffering a whole batch.
+        """
+        source = Path(source)
+        args = tuple(extra_args or ())
+        key = self._job_key(source, to, format, args)
+        with self._prefetch_lock:
+            if key in self._prefetched:
+                return True
+            if not self._slots.acquire(blocking=False):
+                return False
+            self._prefetched[key] = self._dispatch(source, to, format, args)
+        return True
+
+    def _job_key(
+        self, source: Path, to: str, format: Optional[str], extra_args: Tuple[str, ...]
+    ) -> Tuple:
+        try:
+            mtime = source.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        return (str(source.resolve()), mtime, to, format, extra_args)
+
+    def _dispatch(
+        self, source: Path, to: str, format: Optional[str], extra_args: Tuple[str, ...]
+    ) -> Future:
+        if self.mode is None:
+            self.start()
+
+        with self._lock:
+            self.stats.submitted += 1
+            self._pending += 1
+            self.stats.max_queue_depth = max(self.stats.max_queue_depth, self._pending)
+
+        try:
+            future = self._executor.submit(self._run_job, source, to, format, extra_args)
+        except BaseException:
+            self._job_done(None)
+            raise
+        future.add_done_callback(self._job_done)
+        return future
+
+    def _job_done(self, future: Optional[Future]) -> None:
+        with self._lock:
+            self._pending -= 1
+            if future is not None:
+                if future.exception() is None:
+                    self.stats.completed += 1
+                else:
+                    self.stats.failed += 1
+        self._slots.release()
+
+    def _run_job(
+        self, source: Path, to: str, format: Optional[str], extra_args: Tuple[str, ...]
+    ) -> str:
+        if self.mode == "server":
+            try:
+                return self._run_on_server(source, to, format, extra_args)
+            except _UnsupportedByServer:
+                pass
+
+        with self._lock:
+            self.stats.subprocess_requests += 1
+        return _run_pypandoc(source, to, format, extra_args)
+
+    def _run_on_server(
+        self, source: Path, to: str, format: Optional[str], extra_args: Tuple[str, ...]
+    ) -> str:
+        input_format = format or _FORMATS_BY_SUFFIX.get(source.suffix.lower())
+        if input_format is None:
+            raise _UnsupportedByServer(source.suffix)
+
+        payload: Dict[str, Any] = {"from": input_format, "to": to}
+        payload.update(_server_options(extra_args))
+        data = source.read_bytes()
+        if input_format.split("+")[0] in _BINARY_FORMATS:
+            payload["text"] = base64.b64encode(data).decode("ascii")
+        else:
+            payload["text"] = data.decode("utf-8")
+
+        server = self._idle.get()
+        try:
+            for _attempt in range(2):
+                if not self._ensure_healthy(server):
+                    break
+                try:
+                    output = server.post(payload, timeout=self.timeout)
+                except (OSError, urllib.error.URLError):
+                    # Connection refused/reset or timed out: health-check and retry once
+                    server.healthy = False
+                    continue
+                with self._lock:
+                    self.stats.server_requests += 1
+                return output
+        finally:
+            self._idle.put(server)
+
+        # Server unusable (attached endpoint gone or restart failed)
+        raise _UnsupportedByServer(server.url)
+
+    def _ensure_healthy(self, server: _PandocServer) -> bool:
+        if not server.is_running():
+            return self._restart(server)
+        stale = time.monotonic() - server.last_ok > self.health_interval
+        if server.healthy and not stale:
+            return True
+
+        with self._lock:
+            self.stats.health_checks += 1
+        if server.ping():
+            return True
+        return server.owned and self._restart(server)
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def health_check(self) -> Dict[str, Any]:
+        """Ping every idle server, restarting dead ones, and report pool state."""
+        workers = []
+        checked: List[_PandocServer] = []
+        # Only idle servers are checked; busy ones prove their health by answering
+        while not self._idle.empty():
+            checked.append(self._idle.get())
+        try:
+            for server in checked:
+                with self._lock:
+                    self.stats.health_checks += 1
+                healthy = server.ping() or (server.owned and self._restart(server))
+                workers.append({"url": server.url, "healthy": healthy, "owned": server.owned})
+        finally:
+            for server in checked:
+                self._idle.put(server)
+
+        with self._lock:
+            pending = self._pending
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": pending,
+            "workers": workers,
+            "healthy": all(w["healthy"] for w in workers),
+        }
+
+
+# ----------------------------------------------------------------------
+# Process-wide shared pool
+# ----------------------------------------------------------------------
+
+_shared_lock = threading.Lock()
+_shared_pool: Optional[PandocPool] = None
+_shared_refs = 0
+_attached_pool: Optional[PandocPool] = None
+
+
+@contextmanager
+def shared_pool(max_workers: Optional[int] = None, **kwargs) -> Iterator[PandocPool]:
+    """Use the process-wide pool, starting it on first entry.
+
+    Nested and concurrent users share one pool; it is shut down when the last
+    user leaves. Arguments only apply when the pool is created.
+    """
+    global _shared_pool, _shared_refs
+
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = PandocPool(max_workers=max_workers, **kwargs).start()
+        _shared_refs += 1
+        pool = _shared_pool
+
+    try:
+        yield pool
+    finally:
+        with _shared_lock:
+            _shared_refs -= 1
+            if _shared_refs == 0:
+                _shared_pool = None
+                pool.shutdown()
+
+
+def active_pool() -> Optional[PandocPool]:
+    """Return the pool conversions should use, if any.
+
+    This is the ``shared_pool()`` in effect, or a pool attached to the servers a
+    parent process exported through ``DOCX2SHELF_PANDOC_SERVERS``.
+    """
+    global _attached_pool
+
+    if _shared_pool is not None:
+        return _shared_pool
+
+    endpoints = [url for url in os.environ.get(SERVERS_ENV, "").split(",") if url]
+    if not endpoints:
+        return None
+
+    with _shared_lock:
+        if _attached_pool is None or _attached_pool.endpoints != endpoints:
+            if _attached_pool is not None:
+                _attached_pool.shutdown()
+            _attached_pool = PandocPool(max_workers=len(endpoints), endpoints=endpoints).start()
+            atexit.register(_attached_pool.shutdown)
+        return _attached_pool
@@ -8,6 +8,7 @@ to reduce memory usage and improve conversion speed for large documents.
 
 from __future__ import annotations
 
+import codecs
 import cProfile
 import hashlib
 import io
@@ -15,14 +16,24 @@ import json
 import multiprocessing
 import pstats
 import sqlite3
+import sys
 import tempfile
 import time
 import tracemalloc
+import zlib
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Optional, Tuple
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple
 from zipfile import ZipFile
 
 import psutil
@@ -32,7 +43,34 @@ try:
 except ImportError:  # Pillow is optional; image-processing paths gate on this.
     Image = None  # type: ignore[assignment]
 
+try:
+    import zstandard
+except ImportError:  # Optional; cached conversions fall back to zlib.
+    zstandard = None  # type: ignore[assignment]
+
+from .cache_db import CacheDatabase
 from .metadata import BuildOptions
+from .version import __version__
+
+# Bump when converter output changes without a release version bump, so cached
+# conversions produced by the old code are never served.
+CONVERSION_CACHE_VERSION = "2"
+
+# Read size for streaming content hashes
+_HASH_READ_SIZE = 1024 * 1024
+
+# Temp directories that ParallelImageProcessor writes processed images into
+_IMAGE_DIR_PREFIX = "docx2shelf_images_"
+
+
+def process_pools_available() -> bool:
+    """Whether work may be farmed out to worker processes.
+
+    Frozen executables (PyInstaller and similar) cannot start multiprocessing
+    workers unless every entry point calls ``multiprocessing.freeze_support()``
+    first, so callers keep the work in-process there instead.
+    """
+    return not getattr(sys, "frozen", False)
 
 
 @dataclass
@@ -84,21 +122,40 @@ class StreamingDocxReader:
         if self._zip_file:
             self._zip_file.close()
 
-    def stream_document_xml(self) -> Generator[str, None, None]:
-        """Stream the main document XML in chunks."""
+    def iter_document_xml_bytes(self) -> Generator[bytes, None, None]:
+        """Stream the raw bytes of the main document XML in chunks.
+
+        Suitable for feeding an incremental XML parser directly; nothing beyond
+        one chunk is held in memory.
+        """
         if not self._zip_file:
             raise RuntimeError("StreamingDocxReader not opened")
 
         try:
-            with self._zip_file.open("word/document.xml") as doc_file:
-                while True:
-                    chunk = doc_file.read(self.chunk_size)
-                    if not chunk:
-                        break
-                    yield chunk.decode("utf-8", errors="replace")
+            doc_file = self._zip_file.open("word/document.xml")
         except KeyError:
             raise ValueError("Invalid DOCX file: missing document.xml")
 
+        with doc_file:
+            while True:
+                chunk = doc_file.read(self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def stream_document_xml(self) -> Generator[str, None, None]:
+        """Stream the main document XML in decoded text chunks."""
+        # Incremental decoding keeps multi-byte characters split across chunk
+        # boundaries intact.
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        for chunk in self.iter_document_xml_bytes():
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
     def get_embedded_images(self) -> List[Tuple[str, bytes]]:
         """Extract embedded images without loading full document into memory."""
         if not self._zip_file:
@@ -161,20 +218,25 @@ class StreamingDocxReader:
 class BuildCache:
     """Incremental build cache to avoid rebuilding unchanged content."""
 
-    def __init__(self, cache_dir: Path):
+    def __init__(self, cache_dir: Path, max_bytes: Optional[int] = None):
         """Initialize build cache.
 
         Args:
             cache_dir: Directory to store cache database
+            max_bytes: Byte budget for cached conversions and images; prune()
+                evicts least recently used entries beyond it (None = unbounded)
         """
         self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.db_path = cache_dir / "build_cache.db"
+        self.db = CacheDatabase.shared(self.db_path)
+        self._hash_memo: Dict[Tuple[str, int, int], str] = {}
         self._init_database()
 
     def _init_database(self):
         """Initialize SQLite cache database."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS build_cache (
@@ -189,6 +251,45 @@ class BuildCache:
             """
             )
 
+            # Content-addressed conversion store: one row per conversion and
+            # deduplicated, compressed chunk payloads shared between conversions
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS conversion_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    source_path TEXT NOT NULL,
+                    resources TEXT NOT NULL,
+                    styles_hash TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    last_accessed REAL NOT NULL
+                )
+            """
+            )
+
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS conversion_chunks (
+                    cache_key TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    chunk_hash TEXT NOT NULL,
+                    PRIMARY KEY (cache_key, position)
+                )
+            """
+            )
+
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS content_chunks (
+                    chunk_hash TEXT PRIMARY KEY,
+                    codec TEXT NOT NULL,
+                    payload BLOB NOT NULL,
+                    raw_size INTEGER NOT NULL,
+                    stored_size INTEGER NOT NULL
+                )
+            """
+            )
+
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS image_cache (
@@ -202,16 +303,76 @@ class BuildCache:
             """
             )
 
+            # Subsetted embedded fonts by (font hash, character set, subsetter options)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS font_subset_cache (
+                    subset_key TEXT PRIMARY KEY,
+                    font_name TEXT NOT NULL,
+                    codec TEXT NOT NULL,
+                    payload BLOB NOT NULL,
+                    file_size INTEGER NOT NULL,
+                    last_accessed REAL NOT NULL
+                )
+            """
+            )
+
+            # Hit/miss counters for `docx2shelf cache stats`
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_stats (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """
+            )
+
+            # Indexes for LRU eviction and orphaned-chunk collection
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_conversion_chunks_hash "
+                "ON conversion_chunks(chunk_hash)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_conversion_cache_accessed "
+                "ON conversion_cache(last_accessed)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_image_cache_accessed ON image_cache(last_accessed)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_image_cache_path ON image_cache(processed_path)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_font_subset_cache_accessed "
+                "ON font_subset_cache(last_accessed)"
+            )
+
     def get_file_hash(self, file_path: Path) -> str:
-        """Calculate SHA-256 hash of file efficiently."""
-        hash_sha256 = hashlib.sha256()
+        """Calculate SHA-256 hash of file efficiently.
 
-        with open(file_path, "rb") as f:
-            # Read in chunks to handle large files
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
+        Streams the file through a reused 1MB buffer. Results are memoized per
+        (path, mtime, size) for the lifetime of the cache object, so repeated
+        lookups during one build hash each input once.
+        """
+        stat = file_path.stat()
+        memo_key = (str(file_path), stat.st_mtime_ns, stat.st_size)
+        cached = self._hash_memo.get(memo_key)
+        if cached is not None:
+            return cached
 
-        return hash_sha256.hexdigest()
+        hash_sha256 = hashlib.sha256()
+        buffer = bytearray(_HASH_READ_SIZE)
+        view = memoryview(buffer)
+        with open(file_path, "rb", buffering=0) as f:
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                hash_sha256.update(view[:n])
+
+        digest = hash_sha256.hexdigest()
+        self._hash_memo[memo_key] = digest
+        return digest
 
     def get_options_hash(self, options: BuildOptions) -> str:
         """Calculate hash of build options."""
@@ -238,22 +399,20 @@ class BuildCache:
         input_hash = self.get_file_hash(input_path)
         options_hash = self.get_options_hash(options)
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             cursor = conn.execute(
                 "SELECT output_path FROM build_cache WHERE input_hash = ? AND options_hash = ?",
                 (input_hash, options_hash),
             )
             result = cursor.fetchone()
 
-            if result:
-                output_path = Path(result[0])
-                if output_path.exists():
-                    # Update last accessed time
-                    conn.execute(
-                        "UPDATE build_cache SET last_accessed = ? WHERE input_hash = ?",
-                        (time.time(), input_hash),
-                    )
-                    return True
+        if result and Path(result[0]).exists():
+            # Update last accessed time (deferred while a build batch is open)
+            self.db.write(
+                "UPDATE build_cache SET last_accessed = ? WHERE input_hash = ?",
+                (time.time(), input_hash),
+            )
+            return True
 
         return False
 
@@ -265,7 +424,7 @@ class BuildCache:
         input_hash = self.get_file_hash(input_path)
         options_hash = self.get_options_hash(options)
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             cursor = conn.execute(
                 "SELECT output_path FROM build_cache WHERE input_hash = ? AND options_hash = ?",
                 (input_hash, options_hash),
@@ -285,27 +444,27 @@ class BuildCache:
         options_hash = self.get_options_hash(options)
         current_time = time.time()
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """INSERT OR REPLACE INTO build_cache
-                   (input_hash, input_path, output_path, options_hash, build_time, last_accessed, metadata)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    input_hash,
-                    str(input_path),
-                    str(output_path),
-                    options_hash,
-                    current_time,
-                    current_time,
-                    json.dumps(metadata),
-                ),
-            )
+        self.db.write(
+            """INSERT OR REPLACE INTO build_cache
+               (input_hash, input_path, output_path, options_hash, build_time,
+                last_accessed, metadata)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (
+                input_hash,
+                str(input_path),
+                str(output_path),
+                options_hash,
+                current_time,
+                current_time,
+                json.dumps(metadata),
+            ),
+        )
 
     def cleanup_old_cache(self, max_age_days: int = 30):
         """Remove old cache entries."""
         cutoff_time = time.time() - (max_age_days * 24 * 60 * 60)
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             # Get old entries to remove their files
             cursor = conn.execute(
                 "SELECT output_path FROM build_cache WHERE last_accessed < ?", (cutoff_time,)
@@ -319,91 +478,710 @@ class BuildCache:
 
             # Remove from database
             conn.execute("DELETE FROM build_cache WHERE last_accessed < ?", (cutoff_time,))
-            conn.execute("DELETE FROM image_cache WHERE last_accessed < ?", (cutoff_time,))
+            for image_hash, processed_path in conn.execute(
+                "SELECT image_hash, processed_path FROM image_cache WHERE last_accessed < ?",
+                (cutoff_time,),
+            ).fetchall():
+                self._evict_image(conn, image_hash, processed_path)
+            for (cache_key,) in conn.execute(
+                "SELECT cache_key FROM conversion_cache WHERE last_accessed < ?", (cutoff_time,)
+            ).fetchall():
+                self._evict_conversion(conn, cache_key)
+            conn.execute("DELETE FROM font_subset_cache WHERE last_accessed < ?", (cutoff_time,))
+            self._delete_orphan_chunks(conn)
+
+    def record_event(self, name: str) -> None:
+        """Increment a hit/miss counter (batched with the build's other writes)."""
+        self.db.write(
+            "INSERT INTO cache_stats (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,),
+        )
 
-    def generate_cache_key(self, input_path: Path) -> str:
-        """Generate cache key for input file with dependency tracking."""
-        # Include file modification time and size for dependency tracking
-        stat = input_path.stat()
-        content_hash = hashlib.md5(
-            f"{input_path}:{stat.st_mtime}:{stat.st_size}".encode()
-        ).hexdigest()
-        return content_hash
+    def get_font_subset(self, subset_key: str) -> Optional[bytes]:
+        """Return a cached font subset, or None."""
+        with self.db.connection() as conn:
+            row = conn.execute(
+                "SELECT codec, payload FROM font_subset_cache WHERE subset_key = ?",
+                (subset_key,),
+            ).fetchone()
 
-    def get_cached_conversion(self, cache_key: str) -> Optional[Tuple[List[str], List[Path], str]]:
-        """Get cached conversion result if available."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "SELECT metadata FROM build_cache WHERE input_hash = ?", (cache_key,)
-            )
-            result = cursor.fetchone()
+        try:
+            data = self._decompress(row[0], row[1]) if row else None
+        except Exception:
+            data = None
+        if data is None:
+            self.record_event("font_misses")
+            return None
+        self.db.write(
+            "UPDATE font_subset_cache SET last_accessed = ? WHERE subset_key = ?",
+            (time.time(), subset_key),
+        )
+        self.record_event("font_hits")
+        return data
+
+    def cache_font_subset(self, subset_key: str, font_name: str, data: bytes) -> None:
+        """Store a subsetted font (compressed, like conversion chunks)."""
+        codec, payload = self._compress(data)
+        self.db.write(
+            """INSERT OR REPLACE INTO font_subset_cache
+               (subset_key, font_name, codec, payload, file_size, last_accessed)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (subset_key, font_name, codec, payload, len(payload), time.time()),
+        )
 
-            if result:
-                # Update last accessed time
-                conn.execute(
-                    "UPDATE build_cache SET last_accessed = ? WHERE input_hash = ?",
-                    (time.time(), cache_key),
-                )
+    def stored_bytes(self) -> int:
+        """On-disk bytes held by cached conversions (compressed chunks), images and fonts."""
+        with self.db.connection() as conn:
+            return self._stored_bytes(conn)
 
-                # Parse cached result
+    @staticmethod
+    def _stored_bytes(conn: sqlite3.Connection) -> int:
+        chunks = conn.execute("SELECT COALESCE(SUM(stored_size), 0) FROM content_chunks")
+        images = conn.execute("SELECT COALESCE(SUM(file_size), 0) FROM image_cache")
+        fonts = conn.execute("SELECT COALESCE(SUM(file_size), 0) FROM font_subset_cache")
+        return chunks.fetchone()[0] + images.fetchone()[0] + fonts.fetchone()[0]
+
+    @staticmethod
+    def _exclusive_chunk_bytes(conn: sqlite3.Connection, cache_key: str) -> int:
+        """Bytes freed by evicting one conversion: chunks no other entry shares."""
+        return conn.execute(
+            """SELECT COALESCE(SUM(stored_size), 0) FROM content_chunks
+               WHERE chunk_hash IN (
+                   SELECT chunk_hash FROM conversion_chunks WHERE cache_key = ?
+                   UNION SELECT styles_hash FROM conversion_cache WHERE cache_key = ?
+               )
+               AND chunk_hash NOT IN (
+                   SELECT chunk_hash FROM conversion_chunks WHERE cache_key != ?
+                   UNION SELECT styles_hash FROM conversion_cache WHERE cache_key != ?
+               )""",
+            (cache_key, cache_key, cache_key, cache_key),
+        ).fetchone()[0]
+
+    @staticmethod
+    def _evict_conversion(conn: sqlite3.Connection, cache_key: str) -> None:
+        conn.execute("DELETE FROM conversion_chunks WHERE cache_key = ?", (cache_key,))
+        conn.execute("DELETE FROM conversion_cache WHERE cache_key = ?", (cache_key,))
+
+    @staticmethod
+    def _evict_image(conn: sqlite3.Connection, image_hash: str, processed_path: str) -> None:
+        conn.execute("DELETE FROM image_cache WHERE image_hash = ?", (image_hash,))
+        path = Path(processed_path)
+        try:
+            path.unlink(missing_ok=True)
+            # Remove the per-build docx2shelf_images_ directory once it is empty
+            if path.parent.name.startswith(_IMAGE_DIR_PREFIX):
+                path.parent.rmdir()
+        except OSError:
+            pass
+
+    def prune(
+        self, max_bytes: Optional[int] = None, sweep_image_dirs: bool = False
+    ) -> Dict[str, int]:
+        """Evict least recently used conversions, images and fonts until under budget.
+
+        Conversions, processed images and font subsets share one LRU order and one byte
+        budget (``max_bytes``, defaulting to the cache's configured budget).
+        With ``sweep_image_dirs``, untracked files left in stale
+        ``docx2shelf_images_`` temp directories are removed as well. Only the
+        ``docx2shelf cache prune`` command asks for this: the automatic prune
+        after a conversion must not touch directories of builds still running.
+
+        Returns:
+            Counts of evicted conversions, images and fonts, files swept and bytes freed
+        """
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        result = {"conversions": 0, "images": 0, "fonts": 0, "orphan_files": 0, "bytes_freed": 0}
+
+        # Writes queued by the current build must be visible before measuring
+        self.db.flush()
+        with self.db.connection() as conn:
+            total = self._stored_bytes(conn)
+            if budget is not None and total > budget:
+                candidates = conn.execute(
+                    """SELECT last_accessed, 'conversion', cache_key, NULL, 0
+                         FROM conversion_cache
+                       UNION ALL
+                       SELECT last_accessed, 'image', image_hash, processed_path, file_size
+                         FROM image_cache
+                       UNION ALL
+                       SELECT last_accessed, 'font', subset_key, NULL, file_size
+                         FROM font_subset_cache
+                       ORDER BY 1"""
+                ).fetchall()
+                for _, kind, key, path, size in candidates:
+                    if total <= budget:
+                        break
+                    if kind == "conversion":
+                        freed = self._exclusive_chunk_bytes(conn, key)
+                        self._evict_conversion(conn, key)
+                        result["conversions"] += 1
+                    elif kind == "font":
+                        freed = size
+                        conn.execute("DELETE FROM font_subset_cache WHERE subset_key = ?", (key,))
+                        result["fonts"] += 1
+                    else:
+                        freed = size
+                        self._evict_image(conn, key, path)
+                        result["images"] += 1
+                    total -= freed
+                    result["bytes_freed"] += freed
+                self._delete_orphan_chunks(conn)
+
+            if sweep_image_dirs:
+                swept, swept_bytes = self._sweep_image_dirs(conn)
+                result["orphan_files"] = swept
+                result["bytes_freed"] += swept_bytes
+
+        return result
+
+    def _sweep_image_dirs(
+        self, conn: sqlite3.Connection, grace_seconds: float = 3600
+    ) -> Tuple[int, int]:
+        """Delete untracked files in stale docx2shelf_images_ temp directories.
+
+        Files still referenced by the image cache or a cached conversion are
+        kept; directories touched within ``grace_seconds`` may belong to a
+        build that has not committed its cache rows yet and are skipped.
+        """
+        referenced = {path for (path,) in conn.execute("SELECT processed_path FROM image_cache")}
+        for (resources,) in conn.execute("SELECT resources FROM conversion_cache"):
+            referenced.update(json.loads(resources))
+
+        cutoff = time.time() - grace_seconds
+        swept = swept_bytes = 0
+        for image_dir in Path(tempfile.gettempdir()).glob(f"{_IMAGE_DIR_PREFIX}*"):
+            try:
+                if not image_dir.is_dir() or image_dir.stat().st_mtime > cutoff:
+                    continue
+                for file in image_dir.iterdir():
+                    if str(file) in referenced or not file.is_file():
+                        continue
+                    size = file.stat().st_size
+                    file.unlink()
+                    swept += 1
+                    swept_bytes += size
+                if not any(image_dir.iterdir()):
+                    image_dir.rmdir()
+            except OSError:
+                continue
+        return swept, swept_bytes
+
+    def stats(self) -> Dict[str, Any]:
+        """Summarize entry counts, stored bytes and hit ratios."""
+        self.db.flush()
+        with self.db.connection() as conn:
+            counters = dict(conn.execute("SELECT name, value FROM cache_stats"))
+            conversions = conn.execute("SELECT COUNT(*) FROM conversion_cache").fetchone()[0]
+            chunks, raw, stored = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(stored_size), 0) "
+                "FROM content_chunks"
+            ).fetchone()
+            images, image_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(file_size), 0) FROM image_cache"
+            ).fetchone()
+            fonts, font_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(file_size), 0) FROM font_subset_cache"
+            ).fetchone()
+            builds = conn.execute("SELECT COUNT(*) FROM build_cache").fetchone()[0]
+
+        def ratio(kind: str) -> Optional[float]:
+            hits = counters.get(f"{kind}_hits", 0)
+            lookups = hits + counters.get(f"{kind}_misses", 0)
+            return hits / lookups if lookups else None
+
+        db_bytes = sum(
+            p.stat().st_size for p in self.cache_dir.glob(f"{self.db_path.name}*") if p.is_file()
+        )
+        return {
+            "conversions": conversions,
+            "chunks": chunks,
+            "images": images,
+            "fonts": fonts,
+            "builds": builds,
+            "chunk_bytes": stored,
+            "chunk_raw_bytes": raw,
+            "image_bytes": image_bytes,
+            "font_bytes": font_bytes,
+            "stored_bytes": stored + image_bytes + font_bytes,
+            "database_bytes": db_bytes,
+            "max_bytes": self.max_bytes,
+            "conversion_hits": counters.get("conversion_hits", 0),
+            "conversion_misses": counters.get("conversion_misses", 0),
+            "conversion_hit_ratio": ratio("conversion"),
+            "image_hits": counters.get("image_hits", 0),
+            "image_misses": counters.get("image_misses", 0),
+            "image_hit_ratio": ratio("image"),
+            "font_hits": counters.get("font_hits", 0),
+            "font_misses": counters.get("font_misses", 0),
+            "font_hit_ratio": ratio("font"),
+        }
+
+    def verify(self, repair: bool = False) -> Dict[str, List[str]]:
+        """Check cached payloads and files against their recorded hashes and sizes.
+
+        Args:
+            repair: Drop every broken entry (orphaned chunks are collected too)
+
+        Returns:
+            Problems found, keyed by category
+        """
+        self.db.flush()
+        problems: Dict[str, List[str]] = {
+            "corrupt_chunks": [],
+            "broken_conversions": [],
+            "missing_images": [],
+        }
+        with self.db.connection() as conn:
+            for chunk_hash, codec, payload in conn.execute(
+                "SELECT chunk_hash, codec, payload FROM content_chunks"
+            ):
                 try:
-                    metadata = json.loads(result[0])
-                    return (
-                        metadata.get("chunks", []),
-                        [Path(p) for p in metadata.get("resources", [])],
-                        metadata.get("styles", ""),
+                    data = self._decompress(codec, payload)
+                except Exception:
+                    data = None
+                if data is None or hashlib.sha256(data).hexdigest() != chunk_hash:
+                    problems["corrupt_chunks"].append(chunk_hash)
+
+            corrupt = set(problems["corrupt_chunks"])
+            known = {h for (h,) in conn.execute("SELECT chunk_hash FROM content_chunks")}
+            for cache_key, resources, styles_hash in conn.execute(
+                "SELECT cache_key, resources, styles_hash FROM conversion_cache"
+            ).fetchall():
+                hashes = {styles_hash}
+                hashes.update(
+                    h
+                    for (h,) in conn.execute(
+                        "SELECT chunk_hash FROM conversion_chunks WHERE cache_key = ?",
+                        (cache_key,),
                     )
-                except (json.JSONDecodeError, KeyError):
-                    pass
+                )
+                missing_files = any(not Path(p).exists() for p in json.loads(resources))
+                if missing_files or hashes & corrupt or not hashes <= known:
+                    problems["broken_conversions"].append(cache_key)
+
+            for image_hash, processed_path, file_size in conn.execute(
+                "SELECT image_hash, processed_path, file_size FROM image_cache"
+            ).fetchall():
+                path = Path(processed_path)
+                if not path.is_file() or path.stat().st_size != file_size:
+                    problems["missing_images"].append(image_hash)
+
+            if repair:
+                for cache_key in problems["broken_conversions"]:
+                    self._evict_conversion(conn, cache_key)
+                conn.executemany(
+                    "DELETE FROM content_chunks WHERE chunk_hash = ?",
+                    [(h,) for h in problems["corrupt_chunks"]],
+                )
+                conn.executemany(
+                    "DELETE FROM image_cache WHERE image_hash = ?",
+                    [(h,) for h in problems["missing_images"]],
+                )
+                self._delete_orphan_chunks(conn)
 
-        return None
+        return problems
 
-    def cache_conversion(self, cache_key: str, result: Tuple[List[str], List[Path], str]):
-        """Cache conversion result for future use."""
-        chunks, resources, styles = result
+    def generate_cache_key(self, input_path: Path, options: Optional[Dict[str, Any]] = None) -> str:
+        """Generate a content-addressed cache key for a conversion.
 
-        metadata = {
-            "chunks": chunks,
-            "resources": [str(p) for p in resources],
-            "styles": styles,
-            "cache_version": "1.0",
+        The key covers the SHA-256 of the file contents (so touched or copied
+        files still hit), the converter version and the conversion options.
+        """
+        key_data = {
+            "content": self.get_file_hash(input_path),
+            "converter": __version__,
+            "cache_version": CONVERSION_CACHE_VERSION,
+            "options": options or {},
         }
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO build_cache
-                (input_hash, input_path, output_path, options_hash, build_time, last_accessed, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
+    @staticmethod
+    def _compress(data: bytes) -> Tuple[str, bytes]:
+        if zstandard is not None:
+            return "zstd", zstandard.ZstdCompressor(level=9).compress(data)
+        return "zlib", zlib.compress(data, 6)
+
+    @staticmethod
+    def _decompress(codec: str, payload: bytes) -> Optional[bytes]:
+        if codec == "zlib":
+            return zlib.decompress(payload)
+        if codec == "zstd" and zstandard is not None:
+            return zstandard.ZstdDecompressor().decompress(payload)
+        return None
+
+    def _store_chunk(self, conn: sqlite3.Connection, text: str, stored: set) -> str:
+        """Store a text chunk once, keyed by its SHA-256; return the hash."""
+        data = text.encode("utf-8")
+        chunk_hash = hashlib.sha256(data).hexdigest()
+        if chunk_hash in stored:
+            return chunk_hash
+        stored.add(chunk_hash)
+        exists = conn.execute(
+            "SELECT 1 FROM content_chunks WHERE chunk_hash = ?", (chunk_hash,)
+        ).fetchone()
+        if not exists:
+            codec, payload = self._compress(data)
+            self.db.write(
+                """INSERT OR IGNORE INTO content_chunks
+                   (chunk_hash, codec, payload, raw_size, stored_size)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (chunk_hash, codec, payload, len(data), len(payload)),
+            )
+        return chunk_hash
+
+    def _load_chunks(self, conn: sqlite3.Connection, hashes: List[str]) -> Optional[List[str]]:
+        rows = {}
+        unique = list(dict.fromkeys(hashes))
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(unique), 500):
+            batch = unique[start : start + 500]
+            placeholders = ",".join("?" * len(batch))
+            for chunk_hash, codec, payload in conn.execute(
+                f"SELECT chunk_hash, codec, payload FROM content_chunks "
+                f"WHERE chunk_hash IN ({placeholders})",
+                batch,
+            ):
+                rows[chunk_hash] = (codec, payload)
+
+        texts = {}
+        for chunk_hash in unique:
+            row = rows.get(chunk_hash)
+            try:
+                data = self._decompress(*row) if row else None
+            except Exception:
+                data = None
+            if data is None or hashlib.sha256(data).hexdigest() != chunk_hash:
+                return None
+            texts[chunk_hash] = data.decode("utf-8")
+        return [texts[h] for h in hashes]
+
+    def get_cached_conversion(self, cache_key: str) -> Optional[Tuple[List[str], List[Path], str]]:
+        """Get cached conversion result if available.
+
+        Returns None when any chunk is missing, corrupt or stored with a codec
+        that is not available, or when an extracted resource no longer exists.
+        """
+        result = self._lookup_conversion(cache_key)
+        if result is None:
+            self.record_event("conversion_misses")
+            return None
+
+        now = time.time()
+        self.record_event("conversion_hits")
+        self.db.write(
+            "UPDATE conversion_cache SET last_accessed = ? WHERE cache_key = ?",
+            (now, cache_key),
+        )
+        # The conversion's images are in use too; keep them ahead in the LRU order
+        self.db.write_many(
+            "UPDATE image_cache SET last_accessed = ? WHERE processed_path = ?",
+            [(now, str(p)) for p in result[1]],
+        )
+        return result
+
+    def has_cached_conversion(self, cache_key: str) -> bool:
+        """Check for a cached conversion without loading it or counting a hit or miss.
+
+        Chunks are not verified, so ``get_cached_conversion`` can still miss.
+        """
+        with self.db.connection() as conn:
+            row = conn.execute(
+                "SELECT resources FROM conversion_cache WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+        return row is not None and all(Path(p).exists() for p in json.loads(row[0]))
+
+    def _lookup_conversion(self, cache_key: str) -> Optional[Tuple[List[str], List[Path], str]]:
+        with self.db.connection() as conn:
+            row = conn.execute(
+                "SELECT resources, styles_hash FROM conversion_cache WHERE cache_key = ?",
+                (cache_key,),
+            ).fetchone()
+            if not row:
+                return None
+
+            resources = [Path(p) for p in json.loads(row[0])]
+            if not all(p.exists() for p in resources):
+                return None
+
+            chunk_hashes = [
+                h
+                for (h,) in conn.execute(
+                    "SELECT chunk_hash FROM conversion_chunks WHERE cache_key = ? "
+                    "ORDER BY position",
+                    (cache_key,),
+                )
+            ]
+            texts = self._load_chunks(conn, chunk_hashes + [row[1]])
+        if texts is None:
+            return None
+        return texts[:-1], resources, texts[-1]
+
+    def cache_conversion(
+        self,
+        cache_key: str,
+        result: Tuple[List[str], List[Path], str],
+        source_path: Optional[Path] = None,
+    ):
+        """Cache conversion result for future use.
+
+        Each chunk and the styles CSS are stored once by content hash, so
+        chapters shared between conversions (or repeated boilerplate) cost a
+        single compressed payload.
+        """
+        chunks, resources, styles = result
+        content_hash = self.get_file_hash(source_path) if source_path else ""
+        current_time = time.time()
+
+        # One transaction per conversion unless an outer build batch is open
+        with self.db.batched():
+            conn = self.db.connection()
+            stored: set = set()
+            chunk_hashes = [self._store_chunk(conn, chunk, stored) for chunk in chunks]
+            styles_hash = self._store_chunk(conn, styles or "", stored)
+
+            self.db.write("DELETE FROM conversion_chunks WHERE cache_key = ?", (cache_key,))
+            self.db.write_many(
+                "INSERT INTO conversion_chunks (cache_key, position, chunk_hash) VALUES (?, ?, ?)",
+                [(cache_key, i, h) for i, h in enumerate(chunk_hashes)],
+            )
+            self.db.write(
+                """INSERT OR REPLACE INTO conversion_cache
+                   (cache_key, content_hash, source_path, resources, styles_hash,
+                    created, last_accessed)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
                 (
                     cache_key,
-                    "",  # Will be populated when needed
-                    "",  # Output path not relevant for conversion cache
-                    "",  # Options hash for finer granularity
-                    time.time(),
-                    time.time(),
-                    json.dumps(metadata),
+                    content_hash,
+                    str(source_path or ""),
+                    json.dumps([str(p) for p in resources]),
+                    styles_hash,
+                    current_time,
+                    current_time,
                 ),
             )
 
+    def _delete_orphan_chunks(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """DELETE FROM content_chunks WHERE chunk_hash NOT IN (
+                   SELECT chunk_hash FROM conversion_chunks
+                   UNION SELECT styles_hash FROM conversion_cache
+               )"""
+        )
+
+
+def default_build_cache() -> BuildCache:
+    """Open the per-user build cache (~/.docx2shelf/cache) with the configured budget."""
+    from .settings import get_settings
+
+    advanced = get_settings().advanced_settings
+    cache_dir = Path.home() / ".docx2shelf" / "cache"
+    return BuildCache(cache_dir, max_bytes=advanced.cache_max_bytes)
+
+
+def _encode_image(image_data: bytes, output_path: str, max_width: int, quality: int) -> int:
+    """Decode, flatten, resize and re-encode one image as JPEG.
+
+    Module-level and free of shared state so it can run in a process pool.
+    Returns the size of the written file.
+    """
+    with Image.open(io.BytesIO(image_data)) as img:
+        # Convert to RGB if necessary
+        if img.mode in ("RGBA", "LA"):
+            background = Image.new("RGB", img.size, (255, 255, 255))
+            if img.mode == "RGBA":
+                background.paste(img, mask=img.split()[-1])
+            else:
+                background.paste(img)
+            img = background
+        elif img.mode != "RGB":
+            img = img.convert("RGB")
+
+        # Resize if necessary
+        if img.width > max_width:
+            ratio = max_width / img.width
+            new_height = int(img.height * ratio)
+            img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
+
+        # Save optimized image
+        img.save(output_path, "JPEG", quality=quality, optimize=True)
+
+    return Path(output_path).stat().st_size
+
 
 class ParallelImageProcessor:
-    """Parallel image processing pipeline for faster conversion."""
+    """Parallel image processing pipeline for faster conversion.
+
+    Images are read (from a DOCX zip or a list of byte strings) on the calling
+    thread while workers decode, resize and encode earlier ones, so I/O and
+    CPU work overlap. Results always come back in input order regardless of
+    which worker finishes first, keeping EPUB manifests byte-stable.
+    """
 
-    def __init__(self, max_workers: Optional[int] = None):
+    # Below these totals, process start-up costs more than the GIL does
+    PROCESS_MIN_IMAGES = 16
+    PROCESS_MIN_BYTES = 32 * 1024 * 1024
+
+    def __init__(self, max_workers: Optional[int] = None, executor: str = "auto"):
         """Initialize parallel processor.
 
         Args:
-            max_workers: Maximum number of worker threads (default: CPU count)
+            max_workers: Maximum number of workers (default: CPU count, capped at 8)
+            executor: "thread", "process", or "auto" to use processes only for
+                batches large enough to amortize their start-up cost
         """
+        if executor not in ("auto", "thread", "process"):
+            raise ValueError(f"Unknown executor type: {executor}")
         self.max_workers = max_workers or min(multiprocessing.cpu_count(), 8)
+        self.executor = executor
         self.cache = None
 
     def set_cache(self, cache: BuildCache):
         """Set build cache for image processing."""
         self.cache = cache
 
+    def _choose_executor(self, count: int, total_bytes: int) -> str:
+        if self.executor != "auto":
+            return self.executor
+        if (
+            self.max_workers > 1
+            and count >= self.PROCESS_MIN_IMAGES
+            and total_bytes >= self.PROCESS_MIN_BYTES
+        ):
+            return "process"
+        return "thread"
+
+    def _make_executor(self, kind: str, count: int) -> Executor:
+        workers = max(1, min(self.max_workers, count))
+        if kind == "process" and process_pools_available():
+            return ProcessPoolExecutor(max_workers=workers)
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="docx2shelf-image")
+
+    def _lookup_cached(self, image_hash: str) -> Optional[Path]:
+        if not self.cache:
+            return None
+        with self.cache.db.connection() as conn:
+            result = conn.execute(
+                "SELECT processed_path FROM image_cache WHERE image_hash = ?", (image_hash,)
+            ).fetchone()
+
+        if result:
+            cached_path = Path(result[0])
+            if cached_path.exists():
+                # Update last accessed
+                self.cache.db.write(
+                    "UPDATE image_cache SET last_accessed = ? WHERE image_hash = ?",
+                    (time.time(), image_hash),
+                )
+                self.cache.record_event("image_hits")
+                return cached_path
+        self.cache.record_event("image_misses")
+        return None
+
+    def _record_processed(
+        self,
+        image_hash: str,
+        filename: str,
+        output_path: Path,
+        file_size: int,
+        max_width: int,
+        quality: int,
+    ) -> None:
+        if not self.cache:
+            return
+        self.cache.db.write(
+            """INSERT OR REPLACE INTO image_cache
+               (image_hash, original_path, processed_path, processing_options, file_size,
+                last_accessed)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (
+                image_hash,
+                filename,
+                str(output_path),
+                json.dumps({"max_width": max_width, "quality": quality}),
+                file_size,
+                time.time(),
+            ),
+        )
+
+    def _run_pipeline(
+        self,
+        sources: List[Tuple[str, Callable[[], bytes]]],
+        total_bytes: int,
+        output_dir: Path,
+        max_width: int,
+        quality: int,
+    ) -> List[Optional[Path]]:
+        """Load, cache-check and encode images; return paths in input order.
+
+        ``sources`` pairs each filename with a loader for its bytes. Loaders
+        run on the calling thread (zip members cannot be read concurrently
+        from one handle) while up to twice the worker count of encodes are
+        in flight, which bounds memory for books with hundreds of images.
+        """
+        if not sources:
+            return []
+        if Image is None:
+            print(f"Skipping {len(sources)} images: Pillow not installed")
+            return [None] * len(sources)
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        results: List[Optional[Path]] = [None] * len(sources)
+        pending: Dict[Future, Tuple[str, str, Path]] = {}
+        # Input positions per image hash, so repeated images are encoded once
+        positions: Dict[str, List[int]] = {}
+        max_in_flight = self.max_workers * 2
+
+        def collect(done) -> None:
+            for future in done:
+                filename, image_hash, output_path = pending.pop(future)
+                try:
+                    file_size = future.result()
+                except Exception as e:
+                    print(f"Failed to process image {filename}: {e}")
+                    continue
+                self._record_processed(
+                    image_hash, filename, output_path, file_size, max_width, quality
+                )
+                for index in positions[image_hash]:
+                    results[index] = output_path
+
+        kind = self._choose_executor(len(sources), total_bytes)
+        batch = self.cache.db.batched() if self.cache else nullcontext()
+        with batch, self._make_executor(kind, len(sources)) as executor:
+            for index, (filename, load) in enumerate(sources):
+                try:
+                    image_data = load()
+                except Exception as e:
+                    print(f"Failed to read image {filename}: {e}")
+                    continue
+
+                # Calculate hash for caching
+                image_hash = hashlib.sha256(image_data).hexdigest()
+                if image_hash in positions:
+                    positions[image_hash].append(index)
+                    results[index] = results[positions[image_hash][0]]
+                    continue
+                positions[image_hash] = [index]
+
+                cached_path = self._lookup_cached(image_hash)
+                if cached_path:
+                    results[index] = cached_path
+                    continue
+
+                output_path = output_dir / f"{Path(filename).stem}_{image_hash[:8]}.jpg"
+                future = executor.submit(
+                    _encode_image, image_data, str(output_path), max_width, quality
+                )
+                pending[future] = (filename, image_hash, output_path)
+                if len(pending) >= max_in_flight:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+
+            collect(list(pending))
+
+        return results
+
     def process_images_parallel(
         self,
         images: List[Tuple[str, bytes]],
@@ -420,32 +1198,12 @@ class ParallelImageProcessor:
             quality: JPEG quality (1-100)
 
         Returns:
-            List of (original_filename, processed_path) tuples
+            List of (original_filename, processed_path) tuples, in input order
         """
-        output_dir.mkdir(parents=True, exist_ok=True)
-
-        # Prepare tasks
-        tasks = []
-        for filename, image_data in images:
-            tasks.append((filename, image_data, output_dir, max_width, quality))
-
-        # Process in parallel
-        results = []
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_task = {
-                executor.submit(self._process_single_image, *task): task[0] for task in tasks
-            }
-
-            for future in as_completed(future_to_task):
-                filename = future_to_task[future]
-                try:
-                    result = future.result()
-                    if result:
-                        results.append((filename, result))
-                except Exception as e:
-                    print(f"Error processing image {filename}: {e}")
-
-        return results
+        sources = [(filename, (lambda data=data: data)) for filename, data in images]
+        total_bytes = sum(len(data) for _, data in images)
+        paths = self._run_pipeline(sources, total_bytes, output_dir, max_width, quality)
+        return [(filename, path) for (filename, _), path in zip(images, paths) if path]
 
     def _process_single_image(
         self, filename: str, image_data: bytes, output_dir: Path, max_width: int, quality: int
@@ -457,72 +1215,14 @@ class ParallelImageProcessor:
         try:
             # Calculate hash for caching
             image_hash = hashlib.sha256(image_data).hexdigest()
-
-            # Check cache first
-            if self.cache:
-                with sqlite3.connect(self.cache.db_path) as conn:
-                    cursor = conn.execute(
-                        "SELECT processed_path FROM image_cache WHERE image_hash = ?", (image_hash,)
-                    )
-                    result = cursor.fetchone()
-
-                    if result:
-                        cached_path = Path(result[0])
-                        if cached_path.exists():
-                            # Update last accessed
-                            conn.execute(
-                                "UPDATE image_cache SET last_accessed = ? WHERE image_hash = ?",
-                                (time.time(), image_hash),
-                            )
-                            return cached_path
-
-            # Process image
-            from io import BytesIO
-
-            with Image.open(BytesIO(image_data)) as img:
-                # Convert to RGB if necessary
-                if img.mode in ("RGBA", "LA"):
-                    background = Image.new("RGB", img.size, (255, 255, 255))
-                    if img.mode == "RGBA":
-                        background.paste(img, mask=img.split()[-1])
-                    else:
-                        background.paste(img)
-                    img = background
-                elif img.mode != "RGB":
-                    img = img.convert("RGB")
-
-                # Resize if necessary
-                if img.width > max_width:
-                    ratio = max_width / img.width
-                    new_height = int(img.height * ratio)
-                    img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
-
-                # Generate output filename
-                base_name = Path(filename).stem
-                output_path = output_dir / f"{base_name}_{image_hash[:8]}.jpg"
-
-                # Save optimized image
-                img.save(output_path, "JPEG", quality=quality, optimize=True)
-
-                # Cache result
-                if self.cache:
-                    with sqlite3.connect(self.cache.db_path) as conn:
-                        conn.execute(
-                            """INSERT OR REPLACE INTO image_cache
-                               (image_hash, original_path, processed_path, processing_options, file_size, last_accessed)
-                               VALUES (?, ?, ?, ?, ?, ?)""",
-                            (
-                                image_hash,
-                                filename,
-                                str(output_path),
-                                json.dumps({"max_width": max_width, "quality": quality}),
-                                output_path.stat().st_size,
-                                time.time(),
-                            ),
-                        )
-
-                return output_path
-
+            cached_path = self._lookup_cached(image_hash)
+            if cached_path:
+                return cached_path
+
+            output_path = output_dir / f"{Path(filename).stem}_{image_hash[:8]}.jpg"
+            file_size = _encode_image(image_data, str(output_path), max_width, quality)
+            self._record_processed(image_hash, filename, output_path, file_size, max_width, quality)
+            return output_path
         except Exception as e:
             print(f"Failed to process image {filename}: {e}")
             return None
@@ -536,39 +1236,28 @@ class ParallelImageProcessor:
     ) -> List[Path]:
         """Extract and process images from DOCX file."""
         if output_dir is None:
-            output_dir = Path(tempfile.mkdtemp(prefix="docx2shelf_images_"))
+            output_dir = Path(tempfile.mkdtemp(prefix=_IMAGE_DIR_PREFIX))
         else:
             output_dir.mkdir(parents=True, exist_ok=True)
 
         try:
             with ZipFile(docx_path, "r") as zip_file:
-                image_files = [
-                    name
-                    for name in zip_file.namelist()
-                    if name.startswith("word/media/")
+                image_infos = [
+                    info
+                    for info in zip_file.infolist()
+                    if info.filename.startswith("word/media/")
                     and any(
-                        name.lower().endswith(ext)
+                        info.filename.lower().endswith(ext)
                         for ext in [".jpg", ".jpeg", ".png", ".gif", ".bmp"]
                     )
                 ]
-
-                processed_images = []
-                for image_file in image_files:
-                    try:
-                        image_data = zip_file.read(image_file)
-                        processed_path = self._process_single_image(
-                            Path(image_file).name,
-                            image_data,
-                            output_dir,
-                            max_width,
-                            quality,
-                        )
-                        if processed_path:
-                            processed_images.append(processed_path)
-                    except Exception as e:
-                        print(f"Failed to process image {image_file}: {e}")
-
-                return processed_images
+                sources = [
+                    (Path(info.filename).name, (lambda info=info: zip_file.read(info)))
+                    for info in image_infos
+                ]
+                total_bytes = sum(info.file_size for info in image_infos)
+                paths = self._run_pipeline(sources, total_bytes, output_dir, max_width, quality)
+                return [path for path in paths if path]
         except Exception as e:
             print(f"Failed to extract images from {docx_path}: {e}")
             return []
@@ -582,27 +1271,10 @@ class ParallelImageProcessor:
     ) -> List[Path]:
         """Process a list of image data tuples (filename, data)."""
         if output_dir is None:
-            output_dir = Path(tempfile.mkdtemp(prefix="docx2shelf_images_"))
-        else:
-            output_dir.mkdir(parents=True, exist_ok=True)
-
-        processed_images = []
-
-        for filename, data in image_data_list:
-            try:
-                processed_path = self._process_single_image(
-                    filename, data, output_dir, max_width, quality
-                )
-                if processed_path:
-                    processed_images.append(processed_path)
-            except Exception as e:
-                print(f"Failed to process image {filename}: {e}")
+            output_dir = Path(tempfile.mkdtemp(prefix=_IMAGE_DIR_PREFIX))
 
-        return processed_images
-
-    def set_cache(self, cache: BuildCache):
-        """Set the build cache for image processing optimization."""
-        self.cache = cache
+        results = self.process_images_parallel(image_data_list, output_dir, max_width, quality)
+        return [path for _, path in results]
 
 
 class PerformanceProfiler:
@@ -997,6 +1669,7 @@ class PerformanceMonitor:
         self.metrics = {}
         self.phase_times = {}
         self.memory_snapshots = []
+        self._open_phases: List[str] = []
 
     def start_monitoring(self):
         """Start performance monitoring."""
@@ -1011,17 +1684,27 @@ class PerformanceMonitor:
 
     def record_phase_start(self, phase_name: str):
         """Record start of a processing phase."""
-        self.phase_times[phase_name] = {"start": time.time()}
+        self.phase_times[phase_name] = {"start": time.time(), "peak_memory_mb": 0.0}
+        self._open_phases.append(phase_name)
+        self.record_memory_usage()
 
     def record_phase_end(self, phase_name: str):
         """Record end of a processing phase."""
+        self.record_memory_usage()
+        if phase_name in self._open_phases:
+            self._open_phases.remove(phase_name)
         if phase_name in self.phase_times and "start" in self.phase_times[phase_name]:
             self.phase_times[phase_name]["duration"] = (
                 time.time() - self.phase_times[phase_name]["start"]
             )
 
     def record_memory_usage(self):
-        """Record current memory usage."""
+        """Record current memory usage.
+
+        The sample also raises ``peak_memory_mb`` of every phase that is still
+        open, so long-running phases should call this periodically (e.g. once
+        per emitted chapter) to get a meaningful per-phase peak.
+        """
         try:
             import psutil
 
@@ -1030,7 +1713,10 @@ class PerformanceMonitor:
             self.memory_snapshots.append(
                 {"time": time.time() - (self.start_time or time.time()), "memory_mb": memory_mb}
             )
-            self.metrics["peak_memory"] = max(self.metrics["peak_memory"], memory_mb)
+            self.metrics["peak_memory"] = max(self.metrics.get("peak_memory", 0), memory_mb)
+            for phase_name in self._open_phases:
+                phase = self.phase_times[phase_name]
+                phase["peak_memory_mb"] = max(phase.get("peak_memory_mb", 0.0), memory_mb)
         except ImportError:
             pass
 
@@ -1078,7 +1764,10 @@ class PerformanceMonitor:
             for phase, times in self.phase_times.items():
                 if "duration" in times:
                     percentage = (times["duration"] / total_time) * 100 if total_time > 0 else 0
-                    summary += f"  {phase}: {times['duration']:.2f}s ({percentage:.1f}%)\n"
+                    summary += f"  {phase}: {times['duration']:.2f}s ({percentage:.1f}%)"
+                    if times.get("peak_memory_mb"):
+                        summary += f", peak {times['peak_memory_mb']:.1f}MB"
+                    summary += "\n"
 
         return summary
 
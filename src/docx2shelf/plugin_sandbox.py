@@ -102,23 +102,38 @@ class PluginSandbox:
             self._cleanup_resources()
 
     def _setup_resource_limits(self):
-        """Set up resource limits for the process."""
+        """Set up resource limits for the process.
+
+        Plugins run in this process, so the limits are budgets on top of what
+        the host already uses. Only soft limits are lowered, and
+        ``_cleanup_resources`` restores them.
+        """
         if resource is None:
             print("Warning: Resource limits not available on this platform")
             return
 
-        try:
+        limits = self.context.resource_limits
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        budgets = {
             # Memory limit
-            memory_limit = self.context.resource_limits.max_memory_mb * 1024 * 1024
-            resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
-
+            resource.RLIMIT_AS: psutil.Process().memory_info().vms
+            + limits.max_memory_mb * 1024 * 1024,
             # CPU time limit
-            cpu_limit = self.context.resource_limits.max_execution_time_seconds
-            resource.setrlimit(resource.RLIMIT_CPU, (cpu_limit, cpu_limit))
-
+            resource.RLIMIT_CPU: int(usage.ru_utime + usage.ru_stime)
+            + limits.max_execution_time_seconds,
             # File descriptor limit
-            fd_limit = self.context.resource_limits.max_file_descriptors
-            resource.setrlimit(resource.RLIMIT_NOFILE, (fd_limit, fd_limit))
+            resource.RLIMIT_NOFILE: limits.max_file_descriptors,
+        }
+        self.original_limits = {}
+        try:
+            for limit, budget in budgets.items():
+                soft, hard = resource.getrlimit(limit)
+                if hard != resource.RLIM_INFINITY:
+                    budget = min(budget, hard)
+                if soft != resource.RLIM_INFINITY and soft <= budget:
+                    continue
+                resource.setrlimit(limit, (budget, hard))
+                self.original_limits[limit] = (soft, hard)
 
         except (ValueError, OSError) as e:
             # Resource limits may not be available on all platforms
@@ -171,6 +186,14 @@ class PluginSandbox:
 
     def _cleanup_resources(self):
         """Clean up resources used during execution."""
+        # Restore the host's resource limits
+        for limit, original in getattr(self, "original_limits", {}).items():
+            try:
+                resource.setrlimit(limit, original)
+            except (ValueError, OSError):
+                pass
+        self.original_limits = {}
+
         # Restore original import function
         if hasattr(self, "original_import"):
             if isinstance(__builtins__, dict):
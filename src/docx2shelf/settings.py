@@ -11,7 +11,7 @@ import json
 import logging
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
 try:
     from platformdirs import user_config_dir, user_data_dir
@@ -36,7 +36,9 @@ except ImportError:
         return f".{appname}"
 
 
-from .enterprise import EnterpriseConfig
+if TYPE_CHECKING:
+    # Imported where needed; enterprise pulls in its server dependencies
+    from .enterprise import EnterpriseConfig
 
 logger = logging.getLogger(__name__)
 
@@ -117,6 +119,9 @@ class AdvancedSettings:
     auto_update: bool = False
     enable_telemetry: bool = False
     concurrent_jobs: int = 2
+    # Byte budget for ~/.docx2shelf/cache (cached conversions plus processed images)
+    cache_max_bytes: int = 2 * 1024 * 1024 * 1024
+    cache_auto_prune: bool = True
 
 
 @dataclass
@@ -188,6 +193,8 @@ class SettingsManager:
             try:
                 with open(self.enterprise_file, "r", encoding="utf-8") as f:
                     enterprise_data = json.load(f)
+                from .enterprise import EnterpriseConfig
+
                 settings.enterprise_config = EnterpriseConfig(**enterprise_data)
             except Exception as e:
                 logger.warning(f"Could not load enterprise config: {e}")
@@ -289,6 +296,8 @@ class SettingsManager:
         if "ai_detection" in data:
             settings.ai_detection = AIDetectionSettings(**data["ai_detection"])
         if "enterprise_config" in data and data["enterprise_config"]:
+            from .enterprise import EnterpriseConfig
+
             settings.enterprise_config = EnterpriseConfig(**data["enterprise_config"])
         if "version" in data:
             settings.version = data["version"]
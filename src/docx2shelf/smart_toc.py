@@ -17,6 +17,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Dict, List, Optional, Union
 
+from .epub_chapters import scan_headings
+
 
 class TocLevel(Enum):
     """Table of contents hierarchy levels."""
@@ -169,35 +171,20 @@ class SmartTocGenerator:
         """Extract all headings from HTML content."""
         headings = []
 
-        heading_pattern = r"<(h[1-6])([^>]*)>(.*?)</\1>"
-
         for chunk_idx, chunk in enumerate(html_chunks):
-            matches = re.finditer(heading_pattern, chunk, re.IGNORECASE | re.DOTALL)
-
-            for match in matches:
-                tag = match.group(1).lower()
-                attrs = match.group(2)
-                content = match.group(3)
-
+            for heading in scan_headings(chunk):
                 # Clean up content
-                clean_content = re.sub(r"<[^>]+>", "", content).strip()
-
-                if clean_content and len(clean_content) > 0:
-                    # Extract level from tag
-                    level = int(tag[1])
-
-                    # Extract any existing id
-                    id_match = re.search(r'id\s*=\s*["\']([^"\']+)["\']', attrs)
-                    existing_id = id_match.group(1) if id_match else ""
+                clean_content = heading.title.strip()
 
+                if clean_content:
                     headings.append(
                         {
                             "title": clean_content,
-                            "level": level,
+                            "level": heading.level,
                             "chunk_index": chunk_idx,
-                            "raw_html": match.group(0),
-                            "id": existing_id,
-                            "position": match.start(),
+                            "raw_html": chunk[heading.start : heading.end],
+                            "id": heading.id,
+                            "position": heading.start,
                         }
                     )
 
@@ -0,0 +1,238 @@
+"""Shared text analysis of one document.
+
+Metadata enhancement, genre detection, keyword extraction and content
+validation all need the same basics of a manuscript: its lowercased text,
+sentences, word tokens and syllable counts. ``analyze_document`` returns one
+``DocumentAnalysis`` per document content, memoized by content hash, whose
+parts are computed on first use; consumers take it as an optional argument
+so a build that runs several of them tokenizes the book once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import Counter, OrderedDict
+from functools import cached_property
+from typing import Dict, List, Tuple
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+SENTENCE_SPLIT_RE = re.compile(r"[.!?]+")
+WORD_RE = re.compile(r"\b[a-zA-Z]{3,}\b")
+PROPER_NOUN_RE = re.compile(r"(?<!\.)\s+([A-Z][a-z]{2,})")
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WHITESPACE_RE = re.compile(r"\s+")
+_NON_LETTER_RE = re.compile(r"[^a-zA-Z]")
+_VOWEL_GROUP_RE = re.compile(r"[aeiouy]+")
+_LETTER_RUN_RE = re.compile(r"[a-z]+")
+_ENTITIES = (
+    ("&amp;", "&"),
+    ("&lt;", "<"),
+    ("&gt;", ">"),
+    ("&quot;", '"'),
+    ("&#39;", "'"),
+    ("&nbsp;", " "),
+)
+WORD_PUNCTUATION = '.,!?;:"()[]{}'
+
+
+def count_syllables(word: str) -> int:
+    """Estimate the syllables of a word from its vowel groups; 0 if it has no letters."""
+    letters = _NON_LETTER_RE.sub("", word.lower())
+    if not letters:
+        return 0
+    syllables = len(_VOWEL_GROUP_RE.findall(letters))
+    if letters.endswith("e") and syllables > 1:
+        syllables -= 1  # silent e
+    return max(1, syllables)
+
+
+def _decode_entities(text: str) -> str:
+    for entity, char in _ENTITIES:
+        text = text.replace(entity, char)
+    return text
+
+
+class DocumentAnalysis:
+    """Tokens and counts of one document, each computed on first use."""
+
+    def __init__(self, content: str, content_hash: str = ""):
+        self.content = content
+        self.content_hash = content_hash or _content_hash(content)
+
+    @cached_property
+    def lower(self) -> str:
+        return self.content.lower()
+
+    @cached_property
+    def words(self) -> List[str]:
+        """Whitespace-separated words, punctuation attached."""
+        return self.content.split()
+
+    @property
+    def word_count(self) -> int:
+        return len(self.words)
+
+    @cached_property
+    def normalized_words(self) -> List[str]:
+        """Words lowercased and stripped of surrounding punctuation."""
+        return [word.lower().strip(WORD_PUNCTUATION) for word in self.words]
+
+    @cached_property
+    def sentence_spans(self) -> List[Tuple[int, int]]:
+        """Spans of the text between runs of ``.``, ``!`` and ``?``, empty ones included."""
+        spans = []
+        start = 0
+        for match in SENTENCE_SPLIT_RE.finditer(self.content):
+            spans.append((start, match.start()))
+            start = match.end()
+        spans.append((start, len(self.content)))
+        return spans
+
+    @cached_property
+    def sentences(self) -> List[str]:
+        """The text of each sentence span, as ``re.split`` on the separators gives it."""
+        return [self.content[start:end] for start, end in self.sentence_spans]
+
+    @cached_property
+    def sentence_count(self) -> int:
+        """Number of sentences with any non-whitespace text."""
+        return sum(1 for sentence in self.sentences if sentence.strip())
+
+    @cached_property
+    def paragraphs(self) -> List[str]:
+        return self.content.split("\n\n")
+
+    @cached_property
+    def lower_sentences(self) -> List[str]:
+        return SENTENCE_SPLIT_RE.split(self.lower)
+
+    @cached_property
+    def sentence_tokens(self) -> List[List[str]]:
+        """Lowercase tokens of three or more ASCII letters, per sentence.
+
+        The separators are never word characters, so together these are
+        exactly the tokens of the whole lowercased text.
+        """
+        return [WORD_RE.findall(sentence) for sentence in self.lower_sentences]
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        return [token for tokens in self.sentence_tokens for token in tokens]
+
+    @cached_property
+    def token_counts(self) -> Counter:
+        return Counter(self.tokens)
+
+    @cached_property
+    def terms(self) -> List[str]:
+        """Tokens of four or more letters."""
+        return [token for token in self.tokens if len(token) > 3]
+
+    @cached_property
+    def sentence_terms(self) -> List[List[str]]:
+        return [[token for token in tokens if len(token) > 3] for tokens in self.sentence_tokens]
+
+    @cached_property
+    def syllable_count(self) -> int:
+        """Estimated syllables over all words, counting each distinct word once."""
+        return sum(count_syllables(word) * n for word, n in Counter(self.words).items())
+
+    @cached_property
+    def proper_noun_candidates(self) -> List[str]:
+        """Capitalized words that do not directly follow a full stop."""
+        return PROPER_NOUN_RE.findall(self.content)
+
+    @cached_property
+    def _text_between_tags(self) -> List[str]:
+        return _TAG_RE.split(self.content)
+
+    @cached_property
+    def plain_text(self) -> str:
+        """Text of HTML/XHTML content with tags as spaces and whitespace collapsed."""
+        text = _decode_entities(" ".join(self._text_between_tags))
+        return _WHITESPACE_RE.sub(" ", text).strip()
+
+    @cached_property
+    def raw_text(self) -> str:
+        """Text of HTML/XHTML content with tags removed and spacing preserved."""
+        return _decode_entities("".join(self._text_between_tags)).strip()
+
+    def plain(self) -> DocumentAnalysis:
+        """Analysis of ``plain_text``."""
+        return analyze_document(self.plain_text)
+
+    def sentence_frequency(self, vocabulary: List[str]) -> List[int]:
+        """Count the lowercased sentences containing each vocabulary word.
+
+        A word counts wherever it appears in the sentence, including inside a
+        longer word ("read" in "reader"). Any such match lies within a run of
+        letters, so the sentence-term matrix is filled from the vocabulary words
+        that are substrings of each run; runs repeat throughout a book, so
+        their matches are looked up once.
+        """
+        if not vocabulary:
+            return []
+        index = {word: i for i, word in enumerate(vocabulary)}
+        shortest = min(map(len, vocabulary))
+        longest = max(map(len, vocabulary))
+        run_columns: Dict[str, Tuple[int, ...]] = {}
+
+        # Column indices of the non-zero cells, one sentence row after another
+        columns: List[int] = []
+        for sentence in self.lower_sentences:
+            row = set()
+            for run in _LETTER_RUN_RE.findall(sentence):
+                if len(run) < shortest:
+                    continue
+                found = run_columns.get(run)
+                if found is None:
+                    found = run_columns[run] = tuple(
+                        {
+                            index[run[start : start + size]]
+                            for size in range(shortest, min(longest, len(run)) + 1)
+                            for start in range(len(run) - size + 1)
+                            if run[start : start + size] in index
+                        }
+                    )
+                row.update(found)
+            columns.extend(row)
+
+        if NUMPY_AVAILABLE:
+            return np.bincount(np.asarray(columns, dtype=np.intp), minlength=len(index)).tolist()
+        counts = [0] * len(index)
+        for column in columns:
+            counts[column] += 1
+        return counts
+
+
+def _content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+# Analyses by content hash, most recently used last
+_ANALYSIS_CACHE_SIZE = 8
+_analysis_cache: OrderedDict[str, DocumentAnalysis] = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+
+
+def analyze_document(content: str) -> DocumentAnalysis:
+    """Return the shared analysis of ``content``, creating it on first request."""
+    key = _content_hash(content)
+    with _analysis_cache_lock:
+        analysis = _analysis_cache.get(key)
+        if analysis is not None:
+            _analysis_cache.move_to_end(key)
+            return analysis
+        analysis = _analysis_cache[key] = DocumentAnalysis(content, key)
+        while len(_analysis_cache) > _ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+    return analysis
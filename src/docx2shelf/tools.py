@@ -1,14 +1,17 @@
 from __future__ import annotations
 
 import hashlib
+import importlib.util
+import json
 import os
 import platform
 import shutil
 import tarfile
+import threading
 import time
 import zipfile
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Optional
 from urllib.request import urlopen
 
 DEFAULT_PANDOC_VERSION = "3.1.12"
@@ -28,6 +31,16 @@ VERSION_PIN_SETS = {
 }
 
 
+# Opt-in on-disk probe cache: "1" for the default location or an explicit path
+PROBE_FILE_ENV = "DOCX2SHELF_TOOL_PROBE_FILE"
+
+# Process-wide tool probe results: name -> (key, result). Keys fingerprint the
+# binaries involved (path, mtime, size) so replacing a tool re-probes it.
+_probe_cache: dict[str, tuple[Any, Any]] = {}
+_probe_lock = threading.Lock()
+_probe_file_loaded = False
+
+
 def tools_dir() -> Path:
     """Get the tools directory using platformdirs for cross-platform compatibility."""
     try:
@@ -157,6 +170,100 @@ def _verify_gpg_signature(file_path: Path, signature_url: str, trusted_keys: lis
             # Don't fail the download, just warn
 
 
+def _fingerprint(path: Path | str | None) -> list | None:
+    """Identify a file by path, mtime and size; None if it does not exist."""
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [str(path), st.st_mtime_ns, st.st_size]
+
+
+def tool_probe_file() -> Optional[Path]:
+    """Return the on-disk probe cache location, or None when it is disabled."""
+    value = os.environ.get(PROBE_FILE_ENV, "").strip()
+    if not value or value.lower() in ("0", "false", "no", "off"):
+        return None
+    if value.lower() in ("1", "true", "yes", "on"):
+        return tools_dir().parent / "cache" / "tool_probes.json"
+    return Path(value)
+
+
+def _load_probe_file() -> None:
+    global _probe_file_loaded
+    if _probe_file_loaded:
+        return
+    _probe_file_loaded = True
+    path = tool_probe_file()
+    if path is None or not path.exists():
+        return
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return
+    for name, entry in data.items():
+        if isinstance(entry, dict) and name not in _probe_cache:
+            _probe_cache[name] = (entry.get("key"), entry.get("result"))
+
+
+def _save_probe_file() -> None:
+    path = tool_probe_file()
+    if path is None:
+        return
+    data = {name: {"key": key, "result": result} for name, (key, result) in _probe_cache.items()}
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        tmp.replace(path)
+    except OSError:
+        pass  # The probe file is only an optimisation
+
+
+def _cached_probe(
+    name: str,
+    key: Any,
+    probe: Callable[[], Any],
+    keep: Callable[[Any], bool] | None = None,
+) -> Any:
+    """Return the memoized result of ``probe`` while ``key`` is unchanged.
+
+    Results must be JSON-compatible so they can be persisted to the probe file.
+    ``keep`` can reject results that should be probed again next time (for
+    example a transient failure).
+    """
+    with _probe_lock:
+        _load_probe_file()
+        entry = _probe_cache.get(name)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+
+    result = probe()
+    if keep is not None and not keep(result):
+        return result
+    with _probe_lock:
+        _probe_cache[name] = (key, result)
+        _save_probe_file()
+    return result
+
+
+def invalidate_tool_probes() -> None:
+    """Forget every cached tool probe, in memory and on disk.
+
+    Called whenever tools are installed or uninstalled.
+    """
+    with _probe_lock:
+        _probe_cache.clear()
+        path = tool_probe_file()
+        if path is not None:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+
 def _platform_tag() -> tuple[str, str]:
     sysname = platform.system().lower()
     mach = platform.machine().lower()
@@ -178,11 +285,12 @@ def check_pandoc_availability() -> tuple[bool, str, Optional[str]]:
     """
     Check Pandoc availability and return status, message, and version.
 
+    The ``pandoc --version`` probe runs once per binary (path, mtime, size) and
+    is memoized for the rest of the process, or across runs with the probe file.
+
     Returns:
         (is_available, status_message, version_or_none)
     """
-    import subprocess
-
     # Check if pandoc binary exists
     pandoc_binary = pandoc_path()
     if not pandoc_binary:
@@ -192,6 +300,20 @@ def check_pandoc_availability() -> tuple[bool, str, Optional[str]]:
             None,
         )
 
+    # Failures are not memoized so a fixed installation is picked up right away
+    available, message, version = _cached_probe(
+        "pandoc",
+        _fingerprint(pandoc_binary),
+        lambda: list(_probe_pandoc(pandoc_binary)),
+        keep=lambda result: result[0],
+    )
+    return available, message, version
+
+
+def _probe_pandoc(pandoc_binary: Path) -> tuple[bool, str, Optional[str]]:
+    """Run ``pandoc --version`` and interpret the result."""
+    import subprocess
+
     # Check if binary is executable
     try:
         result = subprocess.run(
@@ -234,18 +356,30 @@ def check_pypandoc_availability() -> tuple[bool, str]:
     """
     Check pypandoc Python library availability.
 
+    Memoized on the installed pypandoc module and the pandoc binary it uses.
+
     Returns:
         (is_available, status_message)
     """
-    try:
-        import os
+    # Point pypandoc at the docx2shelf-managed pandoc binary if present
+    managed = pandoc_path()
+    if managed and not os.environ.get("PYPANDOC_PANDOC"):
+        os.environ["PYPANDOC_PANDOC"] = str(managed)
 
-        import pypandoc
+    spec = importlib.util.find_spec("pypandoc")
+    if spec is None:
+        return False, "pypandoc not installed. Install with 'pip install pypandoc'"
 
-        # Point pypandoc at the docx2shelf-managed pandoc binary if present
-        managed = pandoc_path()
-        if managed and not os.environ.get("PYPANDOC_PANDOC"):
-            os.environ["PYPANDOC_PANDOC"] = str(managed)
+    key = [spec.origin, _fingerprint(os.environ.get("PYPANDOC_PANDOC") or managed)]
+    available, message = _cached_probe(
+        "pypandoc", key, lambda: list(_probe_pypandoc()), keep=lambda result: result[0]
+    )
+    return available, message
+
+
+def _probe_pypandoc() -> tuple[bool, str]:
+    try:
+        import pypandoc
 
         # Check if pypandoc can find pandoc
         try:
@@ -267,13 +401,14 @@ def get_pandoc_status() -> dict[str, any]:
     """
     pandoc_available, pandoc_msg, pandoc_version = check_pandoc_availability()
     pypandoc_available, pypandoc_msg = check_pypandoc_availability()
+    binary = pandoc_path()
 
     return {
         "pandoc_binary": {
             "available": pandoc_available,
             "message": pandoc_msg,
             "version": pandoc_version,
-            "path": str(pandoc_path()) if pandoc_path() else None,
+            "path": str(binary) if binary else None,
         },
         "pypandoc_library": {"available": pypandoc_available, "message": pypandoc_msg},
         "overall_available": pandoc_available and pypandoc_available,
@@ -282,8 +417,28 @@ def get_pandoc_status() -> dict[str, any]:
 
 
 def epubcheck_cmd() -> Optional[list[str]]:
-    # Prefer epubcheck wrapper in tools dir, else locate jar, else PATH
+    """Return the command that runs EPUBCheck, or None if it is not installed.
+
+    Memoized on the tools directory and PATH; a cached command is re-resolved if
+    the wrapper or jar it points at has changed since.
+    """
     td = tools_dir()
+    key = [_fingerprint(td), os.environ.get("PATH", "")]
+    entry = _cached_probe("epubcheck", key, lambda: _probe_epubcheck(td))
+    if entry["cmd"] and _fingerprint(entry["cmd"][-1]) != entry["target"]:
+        with _probe_lock:
+            _probe_cache.pop("epubcheck", None)
+        entry = _cached_probe("epubcheck", key, lambda: _probe_epubcheck(td))
+    return list(entry["cmd"]) if entry["cmd"] else None
+
+
+def _probe_epubcheck(td: Path) -> dict:
+    cmd = _find_epubcheck(td)
+    return {"cmd": cmd, "target": _fingerprint(cmd[-1]) if cmd else None}
+
+
+def _find_epubcheck(td: Path) -> Optional[list[str]]:
+    # Prefer epubcheck wrapper in tools dir, else locate jar, else PATH
     wrapper = td / ("epubcheck.bat" if os.name == "nt" else "epubcheck")
     if wrapper.exists():
         return [str(wrapper)]
@@ -309,6 +464,7 @@ def uninstall_pandoc() -> None:
         (td / exe).unlink(missing_ok=True)
     except Exception:
         pass
+    invalidate_tool_probes()
 
 
 def uninstall_epubcheck() -> None:
@@ -322,6 +478,7 @@ def uninstall_epubcheck() -> None:
         wrapper.unlink(missing_ok=True)
     except Exception:
         pass
+    invalidate_tool_probes()
 
 
 def uninstall_all_tools() -> None:
@@ -396,6 +553,7 @@ def install_pandoc(version: str = DEFAULT_PANDOC_VERSION) -> Path:
     except Exception:
         pass
     tmp.unlink(missing_ok=True)
+    invalidate_tool_probes()
     return out
 
 
@@ -491,6 +649,7 @@ def install_epubcheck(version: str = DEFAULT_EPUBCHECK_VERSION) -> Path:
         except Exception:
             pass
     tmp.unlink(missing_ok=True)
+    invalidate_tool_probes()
     return jar
 
 
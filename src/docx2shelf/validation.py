@@ -7,10 +7,14 @@ validation rules to catch common issues before publication.
 
 from __future__ import annotations
 
+import hashlib
 import json
 import subprocess
+import tempfile
+import threading
 import xml.etree.ElementTree as ET
 import zipfile
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -55,6 +59,20 @@ class ValidationResult:
         return len(self.warnings) > 0
 
 
+# EPUBCheck results by EPUB content hash, most recently used last
+_EPUBCHECK_CACHE_SIZE = 32
+_epubcheck_cache: OrderedDict[str, Dict[str, List[ValidationIssue]]] = OrderedDict()
+_epubcheck_cache_lock = threading.Lock()
+
+
+def _content_key(epub_path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(epub_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
 class EPUBValidator:
     """Comprehensive EPUB validation using EPUBCheck and custom rules."""
 
@@ -118,44 +136,75 @@ class EPUBValidator:
         )
 
     def _run_epubcheck(self, epub_path: Path) -> Dict[str, List[ValidationIssue]]:
-        """Run EPUBCheck validation."""
+        """Run EPUBCheck validation, once per EPUB content.
+
+        Results are shared by every validation of the same bytes in this
+        process, so the build's own check and the final report use one run.
+        """
+        try:
+            key = _content_key(epub_path)
+        except OSError:
+            key = None
+        if key is not None:
+            with _epubcheck_cache_lock:
+                cached = _epubcheck_cache.get(key)
+                if cached is not None:
+                    _epubcheck_cache.move_to_end(key)
+            if cached is not None:
+                return {kind: list(issues) for kind, issues in cached.items()}
+
+        result = self._run_epubcheck_uncached(epub_path)
+        failed = any(
+            issue.rule in ("epubcheck_timeout", "epubcheck_error") for issue in result["errors"]
+        )
+        if key is not None and not failed:
+            with _epubcheck_cache_lock:
+                _epubcheck_cache[key] = result
+                while len(_epubcheck_cache) > _EPUBCHECK_CACHE_SIZE:
+                    _epubcheck_cache.popitem(last=False)
+        return {kind: list(issues) for kind, issues in result.items()}
+
+    def _run_epubcheck_uncached(self, epub_path: Path) -> Dict[str, List[ValidationIssue]]:
+        from .epubcheck_daemon import EpubCheckDaemonError, active_daemon
         from .tools import epubcheck_cmd
 
         errors = []
         warnings = []
         info = []
 
+        # A warm daemon from the batch/watch session avoids a JVM start per book
+        daemon = active_daemon()
+        if daemon is not None:
+            try:
+                _status, report = daemon.check(epub_path)
+                return self._parse_epubcheck_json(report)
+            except EpubCheckDaemonError:
+                pass
+
         try:
             cmd = epubcheck_cmd()
             if not cmd:
                 return {"errors": errors, "warnings": warnings, "info": info}
 
-            # Try to get JSON output first, fall back to text
-            proc = subprocess.run(
-                cmd + ["--json", str(epub_path)],
-                capture_output=True,
-                text=True,
-                timeout=self.timeout,
-            )
-
-            if proc.returncode != 0:
-                # Try text output if JSON failed
+            # One run: the JSON report goes to a file, diagnostics to stdout
+            with tempfile.TemporaryDirectory(prefix="docx2shelf_epubcheck_") as tmp:
+                report_path = Path(tmp) / "report.json"
                 proc = subprocess.run(
-                    cmd + [str(epub_path)], capture_output=True, text=True, timeout=self.timeout
+                    cmd + [str(epub_path), "--json", str(report_path)],
+                    capture_output=True,
+                    text=True,
+                    timeout=self.timeout,
                 )
+                try:
+                    report = json.loads(report_path.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    report = None
 
-            # Parse output
-            output = (proc.stdout or "") + "\n" + (proc.stderr or "")
-
-            # Try to parse as JSON first
-            try:
-                if proc.stdout and proc.stdout.strip().startswith("{"):
-                    json_output = json.loads(proc.stdout)
-                    return self._parse_epubcheck_json(json_output)
-            except json.JSONDecodeError:
-                pass
+            if isinstance(report, dict):
+                return self._parse_epubcheck_json(report)
 
-            # Fall back to text parsing
+            # Fall back to text parsing (older EPUBCheck without --json)
+            output = (proc.stdout or "") + "\n" + (proc.stderr or "")
             return self._parse_epubcheck_text(output)
 
         except subprocess.TimeoutExpired:
@@ -189,13 +238,17 @@ class EPUBValidator:
         for msg in messages:
             severity = msg.get("severity", "").lower()
 
+            # EPUBCheck reports a "locations" list; keep accepting a single "location"
+            locations = msg.get("locations") or [msg.get("location") or {}]
+            location = locations[0] if locations else {}
+
             issue = ValidationIssue(
                 severity=severity,
                 message=msg.get("message", ""),
-                location=msg.get("location", {}).get("path"),
-                line=msg.get("location", {}).get("line"),
-                column=msg.get("location", {}).get("column"),
-                rule=msg.get("id"),
+                location=location.get("path"),
+                line=location.get("line"),
+                column=location.get("column"),
+                rule=msg.get("ID") or msg.get("id"),
             )
 
             if severity == "error" or severity == "fatal":
@@ -0,0 +1,279 @@
+"""Tests for the content-addressed conversion cache."""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+
+import pytest
+
+from docx2shelf import performance
+from docx2shelf.performance import BuildCache
+
+
+@pytest.fixture(autouse=True)
+def isolated_tempdir(tmp_path, monkeypatch):
+    """Keep image-directory sweeps away from the real temp directory."""
+    temp = tmp_path / "tmp"
+    temp.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(temp))
+    return temp
+
+
+def _chunk_rows(cache):
+    with sqlite3.connect(cache.db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM content_chunks").fetchone()[0]
+
+
+def test_key_follows_content_not_path_or_mtime(tmp_path):
+    cache = BuildCache(tmp_path / "cache")
+    source = tmp_path / "book.docx"
+    source.write_bytes(b"content" * 1000)
+    key = cache.generate_cache_key(source)
+
+    # Touching the file keeps the key; so does copying it elsewhere
+    os.utime(source, ns=(0, 1))
+    assert cache.generate_cache_key(source) == key
+    copy = tmp_path / "copy.docx"
+    shutil.copyfile(source, copy)
+    assert cache.generate_cache_key(copy) == key
+
+    source.write_bytes(b"changed" * 1000)
+    assert cache.generate_cache_key(source) != key
+
+
+def test_key_covers_options_and_converter_version(tmp_path, monkeypatch):
+    cache = BuildCache(tmp_path / "cache")
+    source = tmp_path / "book.docx"
+    source.write_bytes(b"content")
+    key = cache.generate_cache_key(source, {"pandoc": "3.1"})
+
+    assert cache.generate_cache_key(source, {"pandoc": "3.2"}) != key
+    monkeypatch.setattr(performance, "CONVERSION_CACHE_VERSION", "test")
+    assert cache.generate_cache_key(source, {"pandoc": "3.1"}) != key
+
+
+def test_conversion_round_trip_deduplicates_chunks(tmp_path):
+    cache = BuildCache(tmp_path / "cache")
+    image = tmp_path / "image1.png"
+    image.write_bytes(b"png")
+    shared = "<section><h1>Copyright</h1>" + "<p>All rights reserved.</p>" * 50 + "</section>"
+
+    cache.cache_conversion("a", ([shared, "<section>one</section>"], [image], "p{}"))
+    cache.cache_conversion("b", ([shared, shared], [], "p{}"))
+
+    assert cache.get_cached_conversion("a") == (
+        [shared, "<section>one</section>"],
+        [image],
+        "p{}",
+    )
+    assert cache.get_cached_conversion("b") == ([shared, shared], [], "p{}")
+    # shared chunk, "one" and the styles are each stored exactly once
+    assert _chunk_rows(cache) == 3
+
+    with sqlite3.connect(cache.db_path) as conn:
+        raw, stored = conn.execute(
+            "SELECT raw_size, stored_size FROM content_chunks ORDER BY raw_size DESC"
+        ).fetchone()
+    assert stored < raw
+
+
+def test_missing_resource_or_corrupt_chunk_is_a_miss(tmp_path):
+    cache = BuildCache(tmp_path / "cache")
+    image = tmp_path / "image1.png"
+    image.write_bytes(b"png")
+    cache.cache_conversion("a", (["<p>x</p>"], [image], ""))
+    cache.cache_conversion("b", (["<p>y</p>"], [], ""))
+
+    image.unlink()
+    assert cache.get_cached_conversion("a") is None
+
+    with sqlite3.connect(cache.db_path) as conn:
+        conn.execute("UPDATE content_chunks SET payload = ?", (b"garbage",))
+    assert cache.get_cached_conversion("b") is None
+
+
+def test_cleanup_drops_orphaned_chunks(tmp_path):
+    cache = BuildCache(tmp_path / "cache")
+    cache.cache_conversion("a", (["<p>x</p>"], [], "css"))
+    assert _chunk_rows(cache) == 2
+
+    cache.cleanup_old_cache(max_age_days=-1)
+
+    assert cache.get_cached_conversion("a") is None
+    assert _chunk_rows(cache) == 0
+
+
+def _add_image(cache, path, accessed, data=b"x" * 100):
+    path.write_bytes(data)
+    with cache.db.connection() as conn:
+        conn.execute(
+            "INSERT INTO image_cache VALUES (?, ?, ?, '{}', ?, ?)",
+            (path.name, path.name, str(path), len(data), accessed),
+        )
+
+
+def _touch(cache, cache_key, accessed):
+    with cache.db.connection() as conn:
+        conn.execute(
+            "UPDATE conversion_cache SET last_accessed = ? WHERE cache_key = ?",
+            (accessed, cache_key),
+        )
+
+
+def test_prune_evicts_least_recently_used_until_under_budget(tmp_path):
+    cache = BuildCache(tmp_path / "cache")
+    cache.cache_conversion("old", ([os.urandom(2000).hex()], [], ""))
+    cache.cache_conversion("new", ([os.urandom(2000).hex()], [], ""))
+    _touch(cache, "old", 1)
+    _touch(cache, "new", 3)
+    old_image = tmp_path / "old.jpg"
+    _add_image(cache, old_image, accessed=2)
+
+    total = cache.stored_bytes()
+    result = cache.prune(max_bytes=total - 1)
+
+    # Only the oldest entry has to go to fit the budget
+    assert result["conversions"] == 1 and result["images"] == 0
+    assert cache.get_cached_conversion("old") is None
+    assert cache.get_cached_conversion("new") is not None
+    assert old_image.exists()
+
+    cache.prune(max_bytes=cache.stored_bytes() - 1)
+    assert not old_image.exists()
+    assert cache.get_cached_conversion("new") is not None
+
+
+def test_shared_chunks_survive_eviction(tmp_path):
+    cache = BuildCache(tmp_path / "cache")
+    shared = os.urandom(2000).hex()
+    cache.cache_conversion("a", ([shared, "<p>a</p>"], [], ""))
+    cache.cache_conversion("b", ([shared], [], ""))
+    _touch(cache, "a", 1)
+
+    cache.prune(max_bytes=cache.stored_bytes() - 1)
+
+    assert cache.get_cached_conversion("a") is None
+    assert cache.get_cached_conversion("b") == ([shared], [], "")
+
+
+def test_stats_report_hit_ratio_and_verify_repairs(tmp_path):
+    cache = BuildCache(tmp_path / "cache", max_bytes=10_000)
+    image = tmp_path / "img.jpg"
+    _add_image(cache, image, accessed=1)
+    cache.cache_conversion("a", (["<p>a</p>"], [image], "css"))
+    cache.get_cached_conversion("a")
+    cache.get_cached_conversion("a")
+    cache.get_cached_conversion("missing")
+
+    stats = cache.stats()
+    assert stats["conversions"] == 1 and stats["images"] == 1
+    assert stats["conversion_hit_ratio"] == 2 / 3
+    assert stats["stored_bytes"] == stats["chunk_bytes"] + 100
+    assert stats["max_bytes"] == 10_000
+
+    assert cache.verify() == {
+        "corrupt_chunks": [],
+        "broken_conversions": [],
+        "missing_images": [],
+    }
+    image.unlink()
+    problems = cache.verify(repair=True)
+    assert problems["broken_conversions"] == ["a"]
+    assert problems["missing_images"] == ["img.jpg"]
+    assert cache.stats()["stored_bytes"] == 0
+
+
+def test_cache_cli_stats_and_prune(tmp_path, capsys):
+    from docx2shelf.cli_args import _arg_parser
+    from docx2shelf.cli_handlers.cache import run_cache
+
+    def main(argv):
+        return run_cache(_arg_parser().parse_args(argv))
+
+    cache = BuildCache(tmp_path / "cache")
+    cache.cache_conversion("a", (["<p>a</p>"], [], ""))
+    cache_dir = str(tmp_path / "cache")
+
+    assert main(["cache", "--cache-dir", cache_dir, "stats", "--json"]) == 0
+    assert '"conversions": 1' in capsys.readouterr().out
+
+    assert main(["cache", "--cache-dir", cache_dir, "prune", "--max-bytes", "0"]) == 0
+    assert "Evicted 1 conversions" in capsys.readouterr().out
+    assert main(["cache", "--cache-dir", cache_dir, "verify"]) == 0
+
+
+def test_prune_sweeps_stale_untracked_image_dirs(tmp_path, isolated_tempdir):
+    cache = BuildCache(tmp_path / "cache")
+    stale = isolated_tempdir / "docx2shelf_images_old"
+    stale.mkdir()
+    (stale / "leftover.jpg").write_bytes(b"x" * 10)
+    kept = stale / "cached.jpg"
+    _add_image(cache, kept, accessed=1)
+    os.utime(stale, (0, 0))
+    fresh = isolated_tempdir / "docx2shelf_images_running"
+    fresh.mkdir()
+    (fresh / "in_progress.jpg").write_bytes(b"x")
+
+    # The automatic prune after a conversion never sweeps temp directories
+    assert cache.prune()["orphan_files"] == 0
+    assert (stale / "leftover.jpg").exists()
+
+    result = cache.prune(sweep_image_dirs=True)
+
+    assert result["orphan_files"] == 1 and result["bytes_freed"] == 10
+    assert kept.exists()
+    assert (fresh / "in_progress.jpg").exists()
+
+
+def test_font_subsets_share_the_lru_budget(tmp_path):
+    cache = BuildCache(tmp_path / "cache")
+    font = os.urandom(3000)
+    cache.cache_font_subset("font-key", "Body.ttf", font)
+    cache.cache_conversion("newer", ([os.urandom(2000).hex()], [], ""))
+    with cache.db.connection() as conn:
+        conn.execute("UPDATE font_subset_cache SET last_accessed = 1")
+
+    assert cache.get_font_subset("font-key") == font
+    assert cache.get_font_subset("other") is None
+    stats = cache.stats()
+    assert stats["fonts"] == 1 and stats["font_hit_ratio"] == 1 / 2
+    assert stats["stored_bytes"] == stats["chunk_bytes"] + stats["font_bytes"]
+
+    # The lookup refreshed the font, so the conversion is now the oldest entry
+    with cache.db.connection() as conn:
+        conn.execute("UPDATE conversion_cache SET last_accessed = 0")
+    result = cache.prune(max_bytes=cache.stored_bytes() - 1)
+    assert result["conversions"] == 1 and result["fonts"] == 0
+
+    result = cache.prune(max_bytes=0)
+    assert result["fonts"] == 1
+    assert cache.get_font_subset("font-key") is None
+
+
+def test_docx_conversion_is_cached_and_pruned(tmp_path, monkeypatch):
+    import zipfile
+
+    from docx2shelf.convert import conversion_cached, convert_file_to_html
+
+    w = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    source = tmp_path / "book.docx"
+    with zipfile.ZipFile(source, "w") as docx:
+        docx.writestr(
+            "word/document.xml",
+            f'<w:document xmlns:w="{w}"><w:body><w:p><w:r><w:t>Hello</w:t></w:r></w:p>'
+            "</w:body></w:document>",
+        )
+
+    cache = BuildCache(tmp_path / "cache")
+    pruned = []
+    monkeypatch.setattr(performance, "default_build_cache", lambda: cache)
+    monkeypatch.setattr(cache, "prune", lambda: pruned.append(True))
+
+    assert not conversion_cached(source)
+    first = convert_file_to_html(source)
+    assert conversion_cached(source)
+    assert convert_file_to_html(source) == first
+    assert "Hello" in "".join(first[0])
+    assert pruned == [True]  # only after the miss
+    assert cache.stats()["conversion_hits"] == 1
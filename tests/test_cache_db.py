@@ -0,0 +1,117 @@
+"""Tests for the pooled WAL-mode SQLite layer."""
+
+import threading
+
+import pytest
+
+from docx2shelf.cache_db import CacheDatabase, close_shared_databases
+from docx2shelf.performance import BuildCache
+
+
+@pytest.fixture(autouse=True)
+def _close_databases():
+    yield
+    close_shared_databases()
+
+
+def _make_table(db):
+    with db.connection() as conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS items (k TEXT PRIMARY KEY, v INTEGER)")
+
+
+def _count(db):
+    with db.connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+
+def test_connections_are_per_thread_and_use_wal(tmp_path):
+    db = CacheDatabase(tmp_path / "t.db")
+    conn = db.connection()
+    assert db.connection() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(db.connection()))
+    thread.start()
+    thread.join()
+    assert other[0] is not conn
+    db.close_all()
+
+
+def test_batched_writes_commit_once_per_thread(tmp_path):
+    db = CacheDatabase(tmp_path / "t.db")
+    _make_table(db)
+
+    with db.batched():
+        db.write("INSERT INTO items VALUES ('a', 1)")
+        # Another thread's write is not queued behind this thread's batch
+        worker = threading.Thread(target=lambda: db.write("INSERT INTO items VALUES ('w', 0)"))
+        worker.start()
+        worker.join()
+        with db.batched():
+            db.write_many("INSERT INTO items VALUES (?, ?)", [("b", 2), ("c", 3)])
+        # Nested block does not flush; queued rows are not visible until the outer exit
+        assert db.pending_writes == 3
+        assert _count(db) == 1
+
+    assert db.pending_writes == 0
+    assert _count(db) == 4
+
+
+def test_failed_batch_keeps_other_threads_writes(tmp_path):
+    db = CacheDatabase(tmp_path / "t.db")
+    _make_table(db)
+    opened = threading.Barrier(2)
+    written = threading.Event()
+
+    def failing():
+        with pytest.raises(RuntimeError):
+            with db.batched():
+                db.write("INSERT INTO items VALUES ('a', 1)")
+                opened.wait(5)
+                written.wait(5)
+                raise RuntimeError("build failed")
+
+    def succeeding():
+        opened.wait(5)
+        with db.batched():
+            db.write("INSERT INTO items VALUES ('b', 2)")
+        db.write("INSERT INTO items VALUES ('c', 3)")
+        written.set()
+
+    threads = [threading.Thread(target=failing), threading.Thread(target=succeeding)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with db.connection() as conn:
+        keys = [row[0] for row in conn.execute("SELECT k FROM items ORDER BY k")]
+    assert keys == ["b", "c"]
+
+
+def test_failed_batch_discards_queued_writes(tmp_path):
+    db = CacheDatabase(tmp_path / "t.db")
+    _make_table(db)
+
+    with pytest.raises(RuntimeError):
+        with db.batched():
+            db.write("INSERT INTO items VALUES ('a', 1)")
+            raise RuntimeError("build failed")
+
+    assert _count(db) == 0
+    db.write("INSERT INTO items VALUES ('b', 2)")
+    assert _count(db) == 1
+
+
+def test_build_caches_share_one_database_per_file(tmp_path):
+    first = BuildCache(tmp_path / "cache")
+    second = BuildCache(tmp_path / "cache")
+    assert first.db is second.db
+
+    # A wiped cache directory gets fresh connections instead of the unlinked file
+    first.db_path.unlink()
+    third = BuildCache(tmp_path / "cache")
+    assert third.db is not first.db
+    third.cache_conversion("k", (["<p>x</p>"], [], ""))
+    assert BuildCache(tmp_path / "cache").get_cached_conversion("k") == (["<p>x</p>"], [], "")
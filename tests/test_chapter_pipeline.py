@@ -0,0 +1,274 @@
+"""Tests for the fused single-parse chapter pipeline."""
+
+import sys
+
+from bs4 import BeautifulSoup
+
+from docx2shelf import chapter_pipeline
+from docx2shelf.chapter_pipeline import (
+    AriaLandmarkPass,
+    ChapterContext,
+    ChapterPipeline,
+    FigurePass,
+    HeadingIdPass,
+    LanguagePass,
+    ReadingOrderPass,
+    SanitizePass,
+)
+from docx2shelf.epub_chapters import (
+    find_chapter_starts,
+    inject_heading_ids,
+    inject_manual_chapter_ids,
+    process_chapters,
+    scan_headings,
+)
+from docx2shelf.figures import FigureProcessor
+from docx2shelf.metadata import BuildOptions, EpubMetadata
+
+CHAPTER = (
+    "<h1>Start</h1><p>intro</p>"
+    '<h2>One <em>&amp; more</em></h2><h3>One.a</h3><h3 id="kept">One.b</h3>'
+    "<h2>Two</h2><h3>Two.a</h3><h4>Deep</h4>"
+)
+
+
+def _normalized(html):
+    return str(BeautifulSoup(html, "html.parser"))
+
+
+def _ctx(number=1, chunk_index=0, manual=False):
+    return ChapterContext(
+        number=number,
+        chunk_index=chunk_index,
+        title=f"Chapter {number}",
+        chapter_id=f"chap_{number:03d}",
+        manual=manual,
+    )
+
+
+def test_heading_ids_match_string_implementation():
+    expected_html, expected_h1, expected_subs = inject_heading_ids(CHAPTER, 4, toc_depth=4)
+
+    ctx = _ctx(number=4)
+    html = ChapterPipeline([HeadingIdPass(toc_depth=4)]).run(CHAPTER, ctx)
+
+    assert html == _normalized(expected_html)
+    assert ctx.h1_id == expected_h1 == "ch004"
+    assert ctx.headings == expected_subs
+
+
+def test_manual_chapter_ids_match_string_implementation():
+    chunk = "<h2>Part A</h2><p>x</p><h2>Part B</h2>"
+    expected_html, expected_h1, expected_subs = inject_manual_chapter_ids(chunk, 2, "Intro")
+
+    ctx = _ctx(number=2, manual=True)
+    html = ChapterPipeline([HeadingIdPass()]).run(chunk, ctx)
+
+    assert html == _normalized(expected_html)
+    assert ctx.h1_id == expected_h1
+    assert [(title, hid) for title, hid, _ in ctx.headings] == expected_subs
+
+
+def test_heading_ids_keep_document_order_and_existing_ids():
+    html, h1_id, subs = inject_heading_ids(CHAPTER, 4, toc_depth=4)
+
+    assert h1_id == "ch004"
+    # Existing ids no longer shift the ids paired with later titles
+    assert subs == [
+        ("One &amp; more", "ch004-s01", 2),
+        ("One.a", "ch004-s02-s01", 3),
+        ("One.b", "kept", 3),
+        ("Two", "ch004-s02", 2),
+        ("Two.a", "ch004-s02-s03", 3),
+        ("Deep", "ch004-s02-s03-s01", 4),
+    ]
+    assert '<h3 id="kept">One.b</h3>' in html
+    assert [h.id for h in scan_headings(html)] == ["ch004"] + [hid for _, hid, _ in subs]
+
+
+def test_manual_chapter_ids_keep_existing_ids_paired():
+    chunk = '<h2 id="a">Part A</h2><p>x</p><h2>Part B</h2>'
+    html, h1_id, subs = inject_manual_chapter_ids(chunk, 2, "Intro")
+
+    assert html.startswith('<div id="ch002"></div>')
+    assert subs == [("Part A", "a"), ("Part B", "ch002-s02")]
+
+
+def test_find_chapter_starts_resolves_literals_and_regexes_in_order():
+    chunks = [
+        "<p>Prologue</p>",
+        "<h2>Chapter 1</h2><p>x</p>",
+        "<h2>Chapter 10</h2><p>the END</p>",
+        "<h2>Part Two</h2>",
+    ]
+    starts = ["chapter 10", "Chapter 1", "The End", r"Part (One|Two)", "Epilogue", "[bad"]
+
+    assert find_chapter_starts(chunks, starts) == [
+        ("chapter 10", 2),
+        ("Chapter 1", 1),  # also a prefix of the longer "chapter 10"
+        ("The End", 2),
+        ("Part Two", 3),
+        ("Chapter 5", 3),  # not found: generic title
+        ("Chapter 6", 3),  # invalid regex, not found
+    ]
+
+
+def test_all_stages_share_one_parse(monkeypatch):
+    parses = []
+    real_soup = chapter_pipeline.BeautifulSoup
+
+    def counting_soup(*args, **kwargs):
+        parses.append(args[0])
+        return real_soup(*args, **kwargs)
+
+    monkeypatch.setattr(chapter_pipeline, "BeautifulSoup", counting_soup)
+    figures = FigureProcessor()
+    reading_order = ReadingOrderPass()
+    sanitize = SanitizePass()
+    pipeline = ChapterPipeline(
+        [
+            AriaLandmarkPass(),
+            reading_order,
+            sanitize,
+            LanguagePass("ar"),
+            FigurePass(figures),
+            HeadingIdPass(),
+        ]
+    )
+    chunk = (
+        "<html><body><h1>Title</h1><h3>Skipped</h3>"
+        '<p onclick="steal()">text<script>alert(1)</script><!-- note --></p>'
+        '<a href="javascript:alert(1)">link</a><img src="images/a.png" alt="A"/>'
+        "</body></html>"
+    )
+
+    ctx = _ctx()
+    soup = BeautifulSoup(pipeline.run(chunk, ctx), "html.parser")
+
+    assert len(parses) == 1
+    assert soup.html["lang"] == "ar" and soup.body["dir"] == "rtl"
+    assert soup.body["role"] == "main"
+    assert soup.h1["aria-level"] == "1" and soup.h1["id"] == "ch001"
+    assert soup.find("script") is None and "note" not in str(soup)
+    assert "onclick" not in soup.p.attrs and soup.a["href"] == ""
+    assert soup.find("figure", id="figure-1").img["src"] == "images/a.png"
+    assert figures.get_figure_count() == 1
+    assert reading_order.issues == ["Chunk 0: Heading hierarchy skip from h1 to h3"]
+    assert sanitize.warnings and sanitize.warnings[0].startswith("Chapter 1:")
+
+    report = pipeline.timing_report()
+    assert report["chapters"] == 1
+    assert set(report["stages"]) == {
+        "parse",
+        "walk",
+        "serialize",
+        "aria_landmarks",
+        "reading_order",
+        "sanitize",
+        "language",
+        "figures",
+        "heading_ids",
+    }
+
+
+def test_existing_language_and_later_chunks_are_left_alone():
+    pipeline = ChapterPipeline([AriaLandmarkPass(), LanguagePass("he")])
+    chunk = '<html><body><p xml:lang="en" dir="ltr">x</p></body></html>'
+
+    soup = BeautifulSoup(pipeline.run(chunk, _ctx(number=2, chunk_index=1)), "html.parser")
+
+    assert "lang" not in soup.html.attrs
+    assert "dir" not in soup.body.attrs
+    assert "role" not in soup.body.attrs
+
+
+def test_process_chapters_builds_items_and_links():
+    from ebooklib import epub
+
+    book = epub.EpubBook()
+    figures = FigureProcessor()
+    style = epub.EpubItem(uid="style", file_name="style/base.css", media_type="text/css")
+    chunks = ["<h1>A</h1><h2>A.1</h2>", '<h1>B</h1><img src="b.png"/>']
+
+    chapters, links, sub_links = process_chapters(
+        book, chunks, EpubMetadata(title="T", author="X"), BuildOptions(), style, figures
+    )
+
+    assert [c.file_name for c in chapters] == ["text/chap_001.xhtml", "text/chap_002.xhtml"]
+    assert [link.href for link in links] == [
+        "text/chap_001.xhtml#ch001",
+        "text/chap_002.xhtml#ch002",
+    ]
+    assert [link.href for link in sub_links[0]] == ["text/chap_001.xhtml#ch001-s01"]
+    assert figures.figures[0].chapter_id == "chap_002"
+    assert b'<figure class="figure" id="figure-1">' in chapters[1].content
+
+
+def _book_jobs(count):
+    jobs = []
+    for n in range(1, count + 1):
+        html = (
+            f"<h1>Chapter {n}</h1><h2>Part</h2>"
+            + '<p><img src="a.png"/></p>' * (n % 3)
+            + '<img src="b.png" alt="Map &amp; key"/>'
+            + "<table><tr><td>x</td></tr></table>" * (n % 2)
+            + '<p onclick="x()">text</p><h4>skip</h4>'
+        )
+        jobs.append((html, _ctx(number=n, chunk_index=n - 1)))
+    return jobs
+
+
+def _book_pipeline():
+    figures = FigureProcessor()
+    passes = [ReadingOrderPass(), SanitizePass(), FigurePass(figures), HeadingIdPass(3)]
+    return ChapterPipeline(passes), figures
+
+
+def test_parallel_chapters_are_byte_identical_to_serial():
+    serial, serial_figures = _book_pipeline()
+    parallel, parallel_figures = _book_pipeline()
+
+    expected = serial.run_all(_book_jobs(12), workers=1)
+    actual = parallel.run_all(_book_jobs(12), workers=2)
+
+    assert parallel.workers == 2
+    assert [html for html, _ in actual] == [html for html, _ in expected]
+    assert [ctx.headings for _, ctx in actual] == [ctx.headings for _, ctx in expected]
+    assert parallel_figures.figures == serial_figures.figures
+    assert parallel_figures.tables == serial_figures.tables
+    assert parallel.passes[0].issues == serial.passes[0].issues
+    assert parallel.passes[1].warnings == serial.passes[1].warnings
+    assert parallel.timing_report()["stages"]["figures"] > 0
+
+
+def test_frozen_builds_transform_in_process(monkeypatch):
+    serial, _ = _book_pipeline()
+    frozen, _ = _book_pipeline()
+    expected = serial.run_all(_book_jobs(4), workers=1)
+
+    monkeypatch.setattr(sys, "frozen", True, raising=False)
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("frozen builds must not start worker processes")
+
+    monkeypatch.setattr(chapter_pipeline, "ProcessPoolExecutor", no_pool)
+    actual = frozen.run_all(_book_jobs(4), workers=2)
+
+    assert frozen.workers == 1
+    assert [html for html, _ in actual] == [html for html, _ in expected]
+
+
+def test_deferred_numbering_matches_sequential_figure_processing():
+    reference = FigureProcessor()
+    expected = [
+        reference.process_content(html, ctx.title, ctx.chapter_id) for html, ctx in _book_jobs(5)
+    ]
+
+    pipeline = ChapterPipeline([FigurePass(FigureProcessor())])
+    actual = [html for html, _ in pipeline.run_all(_book_jobs(5))]
+
+    assert actual == expected
+    assert [f.id for f in pipeline.passes[0].figure_processor.figures] == [
+        f.id for f in reference.figures
+    ]
+    assert "figure-11" in actual[-1] and "Table 3" in actual[-1]
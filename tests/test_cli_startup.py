@@ -0,0 +1,84 @@
+"""Import-time budget for CLI startup."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Modules only specific commands need; loading them at startup slows every
+# invocation, including batch subprocesses
+HEAVY_MODULES = {
+    "torch",
+    "transformers",
+    "cv2",
+    "numpy",
+    "PIL",
+    "ebooklib",
+    "bs4",
+    "lxml",
+    "docx2shelf.ai_integration",
+    "docx2shelf.ai_accessibility",
+    "docx2shelf.ai_genre_detection",
+    "docx2shelf.quality_scoring",
+    "docx2shelf.formats",
+    "docx2shelf.preview",
+    "docx2shelf.update",
+    "docx2shelf.convert",
+}
+
+# Cumulative import time allowed for docx2shelf.cli, in microseconds; far
+# above the ~30ms it takes, so only a regression to eager imports trips it
+IMPORT_BUDGET_US = 1_000_000
+
+
+def _importtime(code):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path), DOCX2SHELF_OFFLINE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=60,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self, cumulative, module = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            timings[module.strip()] = int(cumulative)
+    return result, timings
+
+
+def _imported(timings):
+    return set(timings) | {name.split(".")[0] for name in timings}
+
+
+def test_cli_import_stays_light():
+    _result, timings = _importtime("import docx2shelf.cli")
+
+    assert "docx2shelf.cli" in timings
+    assert not HEAVY_MODULES & _imported(timings)
+    assert timings["docx2shelf.cli"] < IMPORT_BUDGET_US
+
+
+@pytest.mark.parametrize("argv", [["--help"], ["build", "--help"], ["ai", "--help"]])
+def test_help_does_not_import_command_handlers(argv):
+    code = f"import docx2shelf.cli as cli; cli.main({argv!r})"
+    result, timings = _importtime(code)
+
+    assert result.returncode == 0
+    assert "usage: docx2shelf" in result.stdout
+    assert not HEAVY_MODULES & _imported(timings)
+    assert not any(name.startswith("docx2shelf.cli_handlers.") for name in timings)
+
+
+def test_handlers_resolve_lazily():
+    from docx2shelf import cli, cli_handlers
+    from docx2shelf.cli_handlers.build import run_build
+
+    assert cli.run_build is cli_handlers.run_build is run_build
+    assert set(cli._COMMANDS.values()) <= set(cli_handlers.__all__)
+    with pytest.raises(AttributeError):
+        cli_handlers.run_missing
@@ -0,0 +1,234 @@
+"""Equivalence tests for the compiled HTML sanitizer and URL safety of the tree sanitizer."""
+
+import re
+from urllib.parse import urlparse
+
+import pytest
+
+hypothesis = pytest.importorskip("hypothesis")
+from bs4 import BeautifulSoup  # noqa: E402
+from hypothesis import given  # noqa: E402
+from hypothesis import strategies as st  # noqa: E402
+
+from docx2shelf.chapter_pipeline import ChapterContext, ChapterPipeline, SanitizePass  # noqa: E402
+from docx2shelf.content_security import (  # noqa: E402
+    DANGEROUS_HTML_ATTRS,
+    DANGEROUS_HTML_TAGS,
+    ContentSanitizer,
+)
+
+
+class ReferenceSanitizer:
+    """The per-entry ``re.sub`` sanitizer that the compiled policy replaced.
+
+    Kept verbatim apart from iterating the policy sets in sorted order. The old
+    result depended on set iteration order whenever one rule's match swallowed
+    the start of another tag, so the generated documents avoid text that lets
+    the greedy ``data:...javascript`` rule run across tags.
+    """
+
+    def __init__(self):
+        self.removed_elements = []
+        self.modified_attributes = []
+
+    def sanitize_html(self, content):
+        if not content or not content.strip():
+            return content
+        content = re.sub(
+            r"<script\b[^<]*(?:(?!<\/script>)<[^<]*)*<\/script>",
+            "",
+            content,
+            flags=re.IGNORECASE | re.DOTALL,
+        )
+        content = re.sub(r'javascript\s*:[^"\'\s>]*', "", content, flags=re.IGNORECASE)
+        content = re.sub(r'vbscript\s*:[^"\'\s>]*', "", content, flags=re.IGNORECASE)
+        content = re.sub(r'data\s*:[^,]*javascript[^"\'\s>]*', "", content, flags=re.IGNORECASE)
+
+        for attr in sorted(DANGEROUS_HTML_ATTRS):
+            if attr.endswith(":"):
+                pattern = rf'{re.escape(attr)}[^"\'\s>]*'
+            else:
+                pattern = rf'\s{re.escape(attr)}\s*=\s*["\'][^"\']*["\']'
+            old = content
+            content = re.sub(pattern, "", content, flags=re.IGNORECASE)
+            if old != content:
+                self.modified_attributes.append(attr)
+
+        for tag in sorted(DANGEROUS_HTML_TAGS):
+            old = content
+            content = re.sub(rf"<{re.escape(tag)}\b[^>]*>", "", content, flags=re.IGNORECASE)
+            content = re.sub(rf"</{re.escape(tag)}>", "", content, flags=re.IGNORECASE)
+            content = re.sub(rf"<{re.escape(tag)}\b[^>]*/>", "", content, flags=re.IGNORECASE)
+            if old != content:
+                self.removed_elements.append(tag)
+
+        def sanitize_url_match(match):
+            attr_name, quote, url = match.groups()
+            try:
+                scheme = urlparse(url).scheme.lower()
+                if scheme not in {"http", "https", "mailto", "ftp", "ftps", "#", ""}:
+                    self.modified_attributes.append(f"{attr_name}={url}")
+                    return f"{attr_name}={quote}{quote}"
+                return match.group(0)
+            except Exception:
+                self.modified_attributes.append(f"{attr_name}={url}")
+                return f"{attr_name}={quote}{quote}"
+
+        content = re.sub(
+            r"(href|src)\s*=\s*([\"\'])([^\"\']*)\2",
+            sanitize_url_match,
+            content,
+            flags=re.IGNORECASE,
+        )
+        content = re.sub(r"<!--.*?-->", "", content, flags=re.DOTALL)
+        content = re.sub(r"<!\[CDATA\[.*?\]\]>", "", content, flags=re.DOTALL)
+        return re.sub(r"<(?!/?\w+[^>]*>)", "&lt;", content)
+
+
+URLS = [
+    "http://example.com/a?b=1",
+    "https://example.org",
+    "mailto:me@example.com",
+    "#note-1",
+    "images/figure.png",
+    "ftp://files.example.com",
+    "javascript:alert(1)",
+    "JavaScript :void(0)",
+    "vbscript:msgbox",
+    "data:image/png;base64,AAAA",
+    "data:text/html;javascript",
+    "livescript:x",
+    "mocha:data:y",
+    "file:///etc/passwd",
+    "tel:12345",
+    "http://[broken",
+]
+EVENTS = sorted(attr for attr in DANGEROUS_HTML_ATTRS if not attr.endswith(":"))
+TAGS = sorted(DANGEROUS_HTML_TAGS) + ["p", "em", "div", "span", "h1", "section", "formula"]
+WORDS = [
+    "plain text",
+    "a < b",
+    "x > y",
+    "1, 2 and 3",
+    "javascript:alert(1)",
+    "data:text/plain,hello",
+    "mocha:latte",
+    "&amp;",
+    "\n",
+]
+
+
+def _case(draw, text):
+    return text.upper() if draw(st.booleans()) else text
+
+
+@st.composite
+def attributes(draw):
+    kind = draw(st.sampled_from(["event", "url", "plain"]))
+    quote = draw(st.sampled_from(['"', "'"]))
+    if kind == "event":
+        name = _case(draw, draw(st.sampled_from(EVENTS)))
+        value = draw(st.sampled_from(["go()", "data:x,1", "mocha:y livescript:z", ""]))
+        spacing = draw(st.sampled_from(["", " "]))
+        return f" {name}{spacing}={spacing}{quote}{value}{quote}"
+    if kind == "url":
+        name = draw(st.sampled_from(["href", "src", "SRC"]))
+        return f" {name}={quote}{draw(st.sampled_from(URLS))}{quote}"
+    return f" class={quote}{draw(st.sampled_from(['c', 'note', '']))}{quote}"
+
+
+@st.composite
+def tokens(draw):
+    kind = draw(st.sampled_from(["text", "open", "close", "void", "script", "comment"]))
+    if kind == "text":
+        return draw(st.sampled_from(WORDS))
+    if kind == "script":
+        return draw(
+            st.sampled_from(
+                [
+                    "<script>alert(1)</script>",
+                    '<SCRIPT type="text/javascript">if (a < b) {}</SCRIPT>',
+                    "<script src=x.js></script>",
+                ]
+            )
+        )
+    if kind == "comment":
+        return draw(st.sampled_from(["<!-- note -->", "<!--\nmulti\n-->", "<![CDATA[ raw ]]>"]))
+    tag = _case(draw, draw(st.sampled_from(TAGS)))
+    if kind == "close":
+        return f"</{tag}>"
+    attrs = "".join(draw(st.lists(attributes(), max_size=3)))
+    return f"<{tag}{attrs}{'/' if kind == 'void' else ''}>"
+
+
+documents = st.lists(tokens(), max_size=30).map("".join)
+
+
+def _report(sanitizer):
+    return {key: set(values) for key, values in sanitizer.get_sanitization_report().items()}
+
+
+@given(documents)
+def test_compiled_policy_matches_reference(html):
+    reference = ReferenceSanitizer()
+    expected = reference.sanitize_html(html)
+    sanitizer = ContentSanitizer()
+
+    assert sanitizer.sanitize_html(html) == expected
+    assert _report(sanitizer) == {
+        "removed_elements": set(reference.removed_elements),
+        "modified_attributes": set(reference.modified_attributes),
+    }
+
+
+def test_report_names_policy_entries():
+    sanitizer = ContentSanitizer()
+    html = (
+        '<P ONCLICK="x()" class="c">text</P><IFrame src="mocha:x"></IFRAME>'
+        "<a href=\"tel:1\" onmouseover = 'data:a,b'>x</a><!-- gone -->"
+    )
+
+    assert sanitizer.sanitize_html(html) == '<P class="c">text</P><a href="">x</a>'
+    assert _report(sanitizer) == {
+        "removed_elements": {"iframe"},
+        "modified_attributes": {"onclick", "onmouseover", "mocha:", "data:", "href=tel:1"},
+    }
+
+    # The report is reset between documents
+    assert sanitizer.sanitize_html("<p>clean</p>") == "<p>clean</p>"
+    assert _report(sanitizer) == {"removed_elements": set(), "modified_attributes": set()}
+
+
+# Attribute markup built so that cutting out an unsafe scheme, or a browser
+# dropping a tab or newline, can splice a new scheme together
+SPLICE_PREFIXES = ["java", "JaVa", "vb", "", "http://example.com/?q="]
+UNSAFE_PARTS = ["data:", "mocha:", "livescript:x", "vbscript:", "data:text/html,&lt;script&gt;"]
+IGNORED_CHARS = ["&#9;", "&#x0A;", "&Tab;", "&NewLine;", "\r", ""]
+SPLICE_SUFFIXES = ["script:alert(1)", "script:", ":x", "&gt;", ""]
+URL_PIECES = ["java", "script", ":", "&#9;", " ", "&#106;", "#note", "images/a.png", "mailto:a@b"]
+url_values = st.one_of(
+    st.tuples(
+        st.sampled_from(SPLICE_PREFIXES),
+        st.sampled_from(UNSAFE_PARTS),
+        st.sampled_from(IGNORED_CHARS),
+        st.sampled_from(SPLICE_SUFFIXES),
+    ).map("".join),
+    st.lists(st.sampled_from(URL_PIECES), min_size=1, max_size=6).map("".join),
+)
+URL_ATTRS = ["href", "src", "xlink:href", "action", "formaction", "poster", "background"]
+URL_ATTRS += ["data-src", "HREF"]
+ALLOWED_SCHEMES = {"http", "https", "mailto", "ftp", "ftps", ""}
+
+
+@given(st.sampled_from(URL_ATTRS), url_values)
+def test_tree_sanitizer_never_emits_unsafe_url_schemes(name, value):
+    pipeline = ChapterPipeline([SanitizePass()])
+    html = f'<svg><a id="t" {name}="{value}">x</a></svg><img id="i" {name}="{value}"/>'
+
+    soup = BeautifulSoup(pipeline.run(html, ChapterContext(1, 0, "T", "c")), "html.parser")
+
+    for element in (soup.find(id="t"), soup.find(id="i")):
+        url = element.get(name.lower(), "")
+        # What a browser resolves: tab, CR and LF dropped, controls and spaces trimmed
+        url = re.sub(r"[\t\r\n]", "", url).strip("".join(chr(c) for c in range(0x21)))
+        assert urlparse(url).scheme.lower() in ALLOWED_SCHEMES, url
@@ -0,0 +1,125 @@
+"""Tests for chapter-by-chapter book validation."""
+
+import sys
+
+from docx2shelf import chapter_pipeline
+from docx2shelf.content_validation import ContentValidator, ValidationCategory
+
+CHAPTERS = [
+    (
+        "chap_001.xhtml",
+        "<h1>The First Chapter</h1><p>The dragon was seen by the village. "
+        "It flew on 12/03/2020 over the dragon hills.</p>",
+    ),
+    (
+        "chap_002.xhtml",
+        "<h3>a quiet interlude</h3><p>The dragon slept in order to rest. "
+        "Nobody came until 2021-04-05.</p>",
+    ),
+    ("chap_003.xhtml", "<h2>Closing Words Here</h2><p>It was very unique. The end came.</p>"),
+]
+
+
+def _issues(report):
+    return [(i.category, i.title, i.description, i.file_path) for i in report.issues]
+
+
+def _book(n):
+    return [
+        (
+            f"chap_{i:03d}.xhtml",
+            f"<h2>Part {i}</h2><p>Chapter {i} tells of the dragon , again {i}.</p>",
+        )
+        for i in range(n)
+    ]
+
+
+def test_book_merges_chapters_and_runs_cross_chapter_checks():
+    report = ContentValidator().validate_book(CHAPTERS, "book.epub", workers=1)
+    issues = _issues(report)
+
+    # Chapter issues keep their chapter's path; book issues use the book's
+    assert (
+        ValidationCategory.STYLE,
+        "Redundant phrase",
+        "'in order to' is redundant",
+        "chap_002.xhtml",
+    ) in issues
+    titles = {(category, title, path) for category, title, _, path in issues}
+    assert (
+        ValidationCategory.CONSISTENCY,
+        "Inconsistent heading capitalization",
+        "book.epub",
+    ) in titles
+    assert (ValidationCategory.CONSISTENCY, "Inconsistent date formats", "book.epub") in titles
+
+    # The h1 -> h3 jump crosses from chapter one into chapter two
+    assert (
+        ValidationCategory.STRUCTURE,
+        "Skipped heading level",
+        "Heading jumps from h1 to h3",
+        "chap_002.xhtml",
+    ) in issues
+
+    # No chapter has the mixed headings or dates alone
+    for path, content in CHAPTERS:
+        alone = ContentValidator().validate_content(content, path)
+        assert all(i.category != ValidationCategory.CONSISTENCY for i in alone.issues)
+
+    singles = [ContentValidator().validate_content(c, p).stats for p, c in CHAPTERS]
+    assert report.stats.word_count == sum(s.word_count for s in singles)
+    assert report.stats.sentence_count == sum(s.sentence_count for s in singles)
+    assert report.error_count + report.warning_count + report.suggestion_count == len(issues)
+    categories = [i.category for i in report.issues]
+    order = list(ValidationCategory)
+    assert categories == sorted(categories, key=order.index)
+
+
+def test_parallel_validation_matches_serial():
+    chapters = _book(12)
+    serial = ContentValidator().validate_book(chapters, "book.epub", workers=1)
+    validator = ContentValidator()
+    parallel = validator.validate_book(chapters, "book.epub", workers=2)
+
+    assert validator.workers == 2
+    assert _issues(parallel) == _issues(serial)
+    assert parallel.stats == serial.stats
+
+
+def test_frozen_builds_validate_in_process(monkeypatch):
+    chapters = _book(4)
+    serial = ContentValidator().validate_book(chapters, "book.epub", workers=1)
+    monkeypatch.setattr(sys, "frozen", True, raising=False)
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("frozen builds must not start worker processes")
+
+    monkeypatch.setattr(chapter_pipeline, "ProcessPoolExecutor", no_pool)
+    validator = ContentValidator()
+    report = validator.validate_book(chapters, "book.epub", workers=2)
+
+    assert validator.workers == 1
+    assert _issues(report) == _issues(serial)
+
+
+def test_memo_revalidates_only_changed_chapters():
+    chapters = _book(5)
+    validator = ContentValidator(memo={})
+    validator.validate_book(chapters, workers=1)
+    assert validator.reused == 0
+
+    chapters[2] = (chapters[2][0], "<h2>Part 2</h2><p>Rewritten without mistakes.</p>")
+    validated = []
+    original = validator.validate_chapter
+
+    def recording(content, file_path="", analysis=None):
+        validated.append(file_path)
+        return original(content, file_path, analysis)
+
+    validator.validate_chapter = recording
+    report = validator.validate_book(chapters, workers=1)
+
+    assert validated == ["chap_002.xhtml"]
+    assert validator.reused == 4
+    assert len(validator.memo) == 5
+    assert _issues(report) == _issues(ContentValidator().validate_book(chapters, workers=1))
@@ -1,4 +1,9 @@
-from docx2shelf.convert import split_html_by_heading, split_html_by_pagebreak
+from docx2shelf.convert import (
+    split_html_at_boundaries,
+    split_html_by_heading,
+    split_html_by_pagebreak,
+    split_html_mixed,
+)
 
 
 def test_split_html_by_heading_h1():
@@ -15,3 +20,28 @@ def test_split_html_by_pagebreak_hr():
     assert len(parts) == 2
     assert "a" in parts[0]
     assert "b" in parts[1]
+
+
+def test_split_html_mixed_splits_once_at_every_boundary():
+    html = (
+        "<h1>A</h1><p>1</p><!-- PAGEBREAK --><p>2</p>\r\n"
+        '<h2>B</h2><p>3</p><hr class="pagebreak" /><h1>C</h1><p>4</p>'
+    )
+    chunks = split_html_mixed(html, "h1:main,h2,pagebreak:appendix")
+    assert chunks == [
+        "<section><h1>A</h1><p>1</p></section>",
+        "<section><p>2</p>\n</section>",
+        "<section><h2>B</h2><p>3</p></section>",
+        "<section><h1>C</h1><p>4</p></section>",
+    ]
+    assert split_html_at_boundaries(html, ["h1", "h2", "pagebreak"]) == chunks
+
+
+def test_split_html_by_pagebreak_style_and_comment():
+    html = '<p>a</p><div style="page-break-before: always"><p>b</p><!--PAGEBREAK--><p>c</p>'
+    parts = split_html_by_pagebreak(html)
+    assert parts == [
+        "<section><p>a</p></section>",
+        "<section><p>b</p></section>",
+        "<section><p>c</p></section>",
+    ]
@@ -0,0 +1,44 @@
+"""Tests for cross-reference resolution and anchor rewriting."""
+
+from docx2shelf.crossrefs import CrossRefProcessor
+
+FILES = ["text/chap_001.xhtml", "text/chap_002.xhtml"]
+
+
+def test_each_heading_and_link_is_rewritten_in_its_own_chunk():
+    chunks = [
+        '<h2 id="intro">Introduction</h2><h2>Notes <em>one</em></h2>'
+        '<p><a href="#intro">Introduction</a></p>',
+        '<h2>Introduction</h2><p><a class="x" href="#intro">back</a></p>',
+    ]
+    updated, mapping = CrossRefProcessor().process_content(chunks, FILES)
+
+    # Duplicate titles and headings with inline markup get their own ids
+    assert updated[0].startswith(
+        '<h2 id="intro">Introduction</h2><h2 id="ref-heading-notes-one">Notes <em>one</em></h2>'
+    )
+    assert '<h2 id="ref-heading-introduction">Introduction</h2>' in updated[1]
+    # Each link's href is relative to the file it is in
+    assert '<a href="#intro" class="cross-ref">Introduction</a>' in updated[0]
+    assert '<a href="text/chap_001.xhtml#intro" class="cross-ref">back</a>' in updated[1]
+    assert mapping["ref-heading-introduction"] == FILES[1]
+
+
+def test_references_resolve_by_original_id_then_title():
+    chunks = [
+        '<h2 id="1bad">Results and Discussion</h2><h3>Method</h3><a name="bm1">Appendix A</a>',
+        '<p><a href="#bm1">see</a> <a href="#gone">the method</a> '
+        '<a href="#gone2">Discussion</a> <a href="#gone3">nothing like it</a></p>',
+    ]
+    processor = CrossRefProcessor()
+    updated, _mapping = processor.process_content(chunks, FILES)
+
+    hrefs = [ref.href for ref in processor.references]
+    assert hrefs == [
+        "text/chap_001.xhtml#bm1",  # original id of the bookmark
+        "text/chap_001.xhtml#ref-heading-method",  # title contained in the link text
+        "text/chap_001.xhtml#ref-heading-results-and-discussion",  # text within a title
+        "",
+    ]
+    assert processor.get_statistics()["broken_references"] == 1
+    assert '<a href="#gone3">nothing like it</a>' in updated[1]
@@ -0,0 +1,106 @@
+"""Tests for the streaming, reproducible EPUB writer."""
+
+import io
+import zipfile
+
+import pytest
+from ebooklib import epub
+
+from docx2shelf.epub_writer import FileItem, write_epub_streaming
+
+PIL = pytest.importorskip("PIL")
+from PIL import Image  # noqa: E402
+
+
+def _png(path, color=(200, 10, 10)):
+    buffer = io.BytesIO()
+    Image.new("RGB", (40, 30), color).save(buffer, "PNG")
+    path.write_bytes(buffer.getvalue())
+    return path
+
+
+def _book(image_path):
+    book = epub.EpubBook()
+    book.set_identifier("urn:uuid:fixed")
+    book.set_title("Streamed")
+    book.set_language("en")
+    chapter = epub.EpubHtml(title="One", file_name="text/chap_001.xhtml", lang="en")
+    chapter.content = '<h1>One</h1><p><img src="../images/pic.png" alt="pic"/></p>'
+    book.add_item(chapter)
+    book.add_item(
+        FileItem(image_path, uid="img_pic", file_name="images/pic.png", media_type="image/png")
+    )
+    book.toc = [epub.Link("text/chap_001.xhtml", "One", "ch1")]
+    book.spine = ["nav", chapter]
+    book.add_item(epub.EpubNcx())
+    book.add_item(epub.EpubNav())
+    return book
+
+
+def test_archive_is_reproducible_and_stores_media(tmp_path, monkeypatch):
+    monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+    image = _png(tmp_path / "pic.png")
+
+    write_epub_streaming(tmp_path / "a.epub", _book(image))
+    write_epub_streaming(tmp_path / "b.epub", _book(image))
+    assert (tmp_path / "a.epub").read_bytes() == (tmp_path / "b.epub").read_bytes()
+
+    with zipfile.ZipFile(tmp_path / "a.epub") as zf:
+        infos = zf.infolist()
+        assert infos[0].filename == "mimetype"
+        assert infos[0].compress_type == zipfile.ZIP_STORED
+        assert {info.date_time for info in infos} == {(1980, 1, 1, 0, 0, 0)}
+        by_name = {info.filename: info for info in infos}
+        assert by_name["EPUB/images/pic.png"].compress_type == zipfile.ZIP_STORED
+        assert by_name["EPUB/text/chap_001.xhtml"].compress_type == zipfile.ZIP_DEFLATED
+        assert zf.read("EPUB/images/pic.png") == image.read_bytes()
+        assert b"1980-01-01T00:00:00Z" in zf.read("EPUB/content.opf")
+
+
+def test_source_date_epoch_sets_timestamps(tmp_path, monkeypatch):
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    write_epub_streaming(tmp_path / "a.epub", _book(_png(tmp_path / "pic.png")))
+
+    with zipfile.ZipFile(tmp_path / "a.epub") as zf:
+        assert zf.getinfo("EPUB/content.opf").date_time == (2023, 11, 14, 22, 13, 20)
+        assert b"2023-11-14T22:13:20Z" in zf.read("EPUB/content.opf")
+
+
+def test_entries_match_ebooklib_writer(tmp_path):
+    image = _png(tmp_path / "pic.png")
+    write_epub_streaming(tmp_path / "streamed.epub", _book(image))
+    epub.write_epub(str(tmp_path / "reference.epub"), _book(image))
+
+    with zipfile.ZipFile(tmp_path / "streamed.epub") as a:
+        with zipfile.ZipFile(tmp_path / "reference.epub") as b:
+            assert a.namelist() == b.namelist()
+            for name in a.namelist():
+                if name != "EPUB/content.opf":  # differs only in dcterms:modified
+                    assert a.read(name) == b.read(name), name
+
+
+def test_assemble_epub_streaming_backend(tmp_path, monkeypatch):
+    from docx2shelf.assemble import assemble_epub
+    from docx2shelf.metadata import BuildOptions, EpubMetadata
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+    meta = EpubMetadata(
+        title="Streamed", author="A", cover_path=_png(tmp_path / "cover.png"), uuid="fixed"
+    )
+    figure = _png(tmp_path / "figure.png", color=(0, 90, 0))
+    chunks = ['<h1>One</h1><p><img src="images/figure.png" alt="Figure"/></p>', "<h1>Two</h1>"]
+
+    outputs = []
+    for name in ("a.epub", "b.epub"):
+        opts = BuildOptions(
+            epub_writer="streaming", image_format="original", epubcheck=False, quiet=True
+        )
+        assemble_epub(meta, opts, chunks, [figure], tmp_path / name)
+        outputs.append((tmp_path / name).read_bytes())
+
+    assert outputs[0] == outputs[1]
+    with zipfile.ZipFile(tmp_path / "a.epub") as zf:
+        images = [i for i in zf.infolist() if i.filename.startswith("EPUB/images/figure")]
+        assert len(images) == 1 and images[0].compress_type == zipfile.ZIP_STORED
+        assert b"Two" in zf.read("EPUB/text/chap_002.xhtml")
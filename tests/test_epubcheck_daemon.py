@@ -0,0 +1,223 @@
+"""Tests for shared EPUBCheck runs and the warm validator daemon."""
+
+import json
+import os
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from docx2shelf import epubcheck_daemon, tools, validation
+from docx2shelf.epubcheck_daemon import (
+    DAEMON_ENV,
+    EpubCheckDaemon,
+    EpubCheckDaemonError,
+    active_daemon,
+    exported_daemon,
+)
+
+REPORT = {
+    "messages": [
+        {
+            "ID": "RSC-005",
+            "severity": "ERROR",
+            "message": "Error while parsing file",
+            "locations": [{"path": "EPUB/text/chap_001.xhtml", "line": 7, "column": 3}],
+        },
+        {"ID": "ACC-011", "severity": "WARNING", "message": "Missing lang", "locations": []},
+    ]
+}
+
+
+requires_jvm = pytest.mark.skipif(
+    not epubcheck_daemon.daemon_supported(), reason="needs java and the EPUBCheck jar"
+)
+
+_OPF = """<?xml version="1.0" encoding="UTF-8"?>
+<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="id">
+  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">
+    <dc:identifier id="id">urn:uuid:4f0c1f5e-8a7b-4d0e-9a57-2a1c6f3b9d10</dc:identifier>
+    <dc:title>Daemon</dc:title>
+    <dc:language>en</dc:language>
+    <meta property="dcterms:modified">2024-01-01T00:00:00Z</meta>
+  </metadata>
+  <manifest>
+    <item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>
+  </manifest>
+  <spine><itemref idref="nav"/></spine>
+</package>
+"""
+
+_NAV = """<?xml version="1.0" encoding="UTF-8"?>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" lang="en">
+<head><title>Daemon</title></head>
+<body><nav epub:type="toc"><ol><li><a href="nav.xhtml">Start</a></li></ol></nav></body>
+</html>
+"""
+
+_CONTAINER = """<?xml version="1.0" encoding="UTF-8"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+  <rootfiles>
+    <rootfile full-path="EPUB/package.opf" media-type="application/oebps-package+xml"/>
+  </rootfiles>
+</container>
+"""
+
+
+def _minimal_epub(path):
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("mimetype", "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+        zf.writestr("META-INF/container.xml", _CONTAINER)
+        zf.writestr("EPUB/package.opf", _OPF)
+        zf.writestr("EPUB/nav.xhtml", _NAV)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(validation, "_epubcheck_cache", validation.OrderedDict())
+    monkeypatch.delenv(DAEMON_ENV, raising=False)
+    monkeypatch.setattr(epubcheck_daemon, "_attached_daemon", None)
+
+
+class _FakeDaemonHandler(socketserver.StreamRequestHandler):
+    """Speaks the daemon protocol without a JVM."""
+
+    token = "secret"
+    checked: list = []
+
+    def handle(self):
+        if self.rfile.readline().decode().strip() != self.token:
+            return
+        path = self.rfile.readline().decode().strip()
+        if not path:
+            self.wfile.write(b"ok\n")
+            return
+        self.checked.append(path)
+        self.wfile.write(b"1\n" + json.dumps(REPORT).encode())
+
+
+@pytest.fixture
+def fake_daemon():
+    _FakeDaemonHandler.checked = []
+    server = socketserver.TCPServer(("127.0.0.1", 0), _FakeDaemonHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"{server.server_address[1]}:{_FakeDaemonHandler.token}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_daemon_client_checks_and_rejects_bad_token(tmp_path, fake_daemon):
+    epub = tmp_path / "book.epub"
+    epub.write_bytes(b"PK")
+
+    daemon = EpubCheckDaemon(endpoint=fake_daemon)
+    assert daemon.ping()
+    status, report = daemon.check(epub)
+    assert status == 1 and report == REPORT
+    assert _FakeDaemonHandler.checked == [str(epub.resolve())]
+
+    port = fake_daemon.split(":")[0]
+    with pytest.raises(EpubCheckDaemonError):
+        EpubCheckDaemon(endpoint=f"{port}:wrong").check(epub)
+
+
+def test_validation_uses_exported_daemon_once_per_content(tmp_path, fake_daemon, monkeypatch):
+    monkeypatch.setattr(tools, "epubcheck_cmd", lambda: ["epubcheck"])
+    epub = tmp_path / "book.epub"
+    epub.write_bytes(b"PK first")
+
+    with exported_daemon(EpubCheckDaemon(endpoint=fake_daemon)):
+        assert active_daemon().endpoint == fake_daemon
+        first = validation.validate_epub(epub, custom_checks=False)
+        second = validation.validate_epub(epub, custom_checks=False, timeout=60)
+    assert os.environ.get(DAEMON_ENV) is None
+
+    assert len(_FakeDaemonHandler.checked) == 1
+    assert [e.rule for e in first.errors] == ["RSC-005"]
+    assert first.errors[0].location == "EPUB/text/chap_001.xhtml"
+    assert first.errors[0].line == 7
+    assert [w.message for w in second.warnings] == ["Missing lang"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="uses a shell-script fake epubcheck")
+def test_subprocess_epubcheck_runs_once_per_build(tmp_path, monkeypatch):
+    fake = tmp_path / "epubcheck"
+    fake.write_text(
+        f'#!/bin/sh\necho "$1" >> "{fake}.calls"\n'
+        f"cat > \"$3\" <<'EOF'\n{json.dumps(REPORT)}\nEOF\nexit 1\n",
+        encoding="utf-8",
+    )
+    fake.chmod(0o755)
+    monkeypatch.setattr(tools, "epubcheck_cmd", lambda: [str(fake)])
+    epub = tmp_path / "book.epub"
+    epub.write_bytes(b"PK first")
+
+    validation.validate_epub(epub, custom_checks=False)
+    result = validation.validate_epub(epub, custom_checks=False)
+    calls = tmp_path / "epubcheck.calls"
+    assert calls.read_text().splitlines() == [str(epub)]
+    assert len(result.errors) == 1 and len(result.warnings) == 1
+
+    # A rebuilt EPUB with different bytes is checked again
+    epub.write_bytes(b"PK second")
+    validation.validate_epub(epub, custom_checks=False)
+    assert len(calls.read_text().splitlines()) == 2
+
+
+def test_shared_daemon_yields_none_without_jar(monkeypatch):
+    monkeypatch.setattr(tools, "epubcheck_cmd", lambda: ["/usr/bin/epubcheck"])
+    with epubcheck_daemon.shared_daemon() as daemon:
+        assert daemon is None
+        assert active_daemon() is None
+
+
+@requires_jvm
+def test_real_daemon_checks_concurrently(tmp_path):
+    books = [_minimal_epub(tmp_path / f"book{i}.epub") for i in range(2)]
+
+    with EpubCheckDaemon() as daemon:
+        assert daemon.owned and daemon.ping()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(daemon.check, books))
+        assert daemon.checks == 2
+
+    for status, report in results:
+        assert status == 0, report
+        assert isinstance(report["messages"], list)
+    assert not daemon.ping()
+
+
+@requires_jvm
+def test_real_daemon_exits_with_killed_parent():
+    # A parent killed without running shutdown() must not leave its JVM behind
+    code = (
+        "import sys, time\n"
+        "from docx2shelf.epubcheck_daemon import EpubCheckDaemon\n"
+        "print(EpubCheckDaemon().start().endpoint, flush=True)\n"
+        "time.sleep(600)\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    parent = subprocess.Popen(
+        [sys.executable, "-c", code], stdout=subprocess.PIPE, text=True, env=env
+    )
+    try:
+        endpoint = parent.stdout.readline().strip()
+        assert endpoint, "daemon did not start"
+        daemon = EpubCheckDaemon(endpoint=endpoint)
+        assert daemon.ping()
+    finally:
+        parent.kill()
+        parent.wait()
+        parent.stdout.close()
+
+    deadline = time.monotonic() + 15
+    while daemon.ping() and time.monotonic() < deadline:
+        time.sleep(0.2)
+    assert not daemon.ping()
@@ -0,0 +1,103 @@
+"""Tests for embedded font subsetting."""
+
+import sys
+
+import pytest
+
+from docx2shelf import fonts
+from docx2shelf.fonts import collect_characters, get_unique_characters, process_embedded_fonts
+
+
+def test_collect_characters_streams_str_and_bytes_chunks():
+    chunks = [
+        "<p class='x'>Caf&eacute; &amp; tea</p>",
+        "<h1>Naïve fa&#231;ade</h1>\n".encode("utf-8"),
+    ]
+    chars = collect_characters(iter(chunks))
+
+    assert {"é", "&", "ï", "ç", " "} <= chars
+    assert not {"<", ">", "\n", " ", ";"} & chars
+    assert set("Caf teaNvde") <= chars
+    # Plain text gives the same set as the joined-string helpers
+    plain = ["<p>Hello  world</p>", "<p>again\tand again</p>"]
+    assert collect_characters(plain) == get_unique_characters(
+        fonts.extract_text_from_html_chunks(plain)
+    )
+
+
+def _make_font(path, family):
+    from fontTools.fontBuilder import FontBuilder
+    from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+    glyphs = [".notdef", "space", "A", "B", "C"]
+    pen = TTGlyphPen(None)
+    pen.moveTo((0, 0))
+    pen.lineTo((0, 500))
+    pen.lineTo((400, 0))
+    pen.closePath()
+    box = pen.glyph()
+
+    builder = FontBuilder(1000, isTTF=True)
+    builder.setupGlyphOrder(glyphs)
+    builder.setupCharacterMap({32: "space", 65: "A", 66: "B", 67: "C"})
+    builder.setupGlyf({name: box for name in glyphs})
+    builder.setupHorizontalMetrics({name: (500, 0) for name in glyphs})
+    builder.setupHorizontalHeader(ascent=800, descent=-200)
+    builder.setupNameTable({"familyName": family, "styleName": "Regular"})
+    builder.setupOS2()
+    builder.setupPost()
+    builder.save(str(path))
+    return path
+
+
+def test_subsets_are_cached_and_misses_run_together(tmp_path, monkeypatch):
+    pytest.importorskip("fontTools")
+    from fontTools.ttLib import TTFont
+
+    from docx2shelf.performance import BuildCache
+
+    fonts_dir = tmp_path / "fonts"
+    fonts_dir.mkdir()
+    _make_font(fonts_dir / "One.ttf", "One")
+    _make_font(fonts_dir / "Two.ttf", "Two")
+    cache = BuildCache(tmp_path / "cache")
+
+    batches = []
+    subset_fonts = fonts._subset_fonts
+
+    def counting(jobs, workers):
+        batches.append(len(jobs))
+        return subset_fonts(jobs, workers)
+
+    monkeypatch.setattr(fonts, "_subset_fonts", counting)
+
+    def build(chunks, name):
+        out = tmp_path / name
+        out.mkdir()
+        return process_embedded_fonts(fonts_dir, chunks, out, quiet=True, cache=cache)
+
+    first = build(["<p>AB</p>"], "first")
+    assert sorted(p.name for p in first) == ["One_subset.ttf", "Two_subset.ttf"]
+    assert batches == [2]
+    cmap = TTFont(str(first[0])).getBestCmap()
+    assert 65 in cmap and 67 not in cmap
+
+    second = build(["<p>BA</p>"], "second")
+    assert batches == [2, 0]
+    assert [p.read_bytes() for p in second] == [p.read_bytes() for p in first]
+
+    build(["<p>ABC</p>"], "third")
+    assert batches == [2, 0, 2]
+    assert cache.stats()["font_hits"] == 2
+
+
+def test_frozen_builds_subset_in_process(monkeypatch):
+    monkeypatch.setattr(sys, "frozen", True, raising=False)
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("frozen builds must not start worker processes")
+
+    monkeypatch.setattr(fonts, "ProcessPoolExecutor", no_pool)
+    monkeypatch.setattr(fonts, "_subset_font_data", lambda data, text: data + text.encode())
+
+    assert fonts._subset_fonts([(b"a", "1"), (b"b", "2")], max_workers=2) == [b"a1", b"b2"]
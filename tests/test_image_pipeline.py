@@ -0,0 +1,136 @@
+"""Tests for the parallel DOCX image pipeline."""
+
+import io
+import sys
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+PIL = pytest.importorskip("PIL")
+from PIL import Image  # noqa: E402
+
+from docx2shelf.performance import BuildCache, ParallelImageProcessor  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def isolated_tempdir(tmp_path, monkeypatch):
+    temp = tmp_path / "tmp"
+    temp.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(temp))
+
+
+def _png(width, color):
+    buffer = io.BytesIO()
+    Image.new("RGBA", (width, 20), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _images():
+    # Largest first so later images tend to finish before earlier ones
+    return [
+        ("big.png", _png(2400, (255, 0, 0, 255))),
+        ("mid.png", _png(600, (0, 255, 0, 255))),
+        ("small.png", _png(10, (0, 0, 255, 128))),
+    ]
+
+
+def test_results_keep_input_order(tmp_path):
+    processor = ParallelImageProcessor(max_workers=2, executor="thread")
+
+    results = processor.process_images_parallel(_images(), tmp_path / "out", max_width=1200)
+
+    assert [name for name, _ in results] == ["big.png", "mid.png", "small.png"]
+    assert [path.name.split("_")[0] for _, path in results] == ["big", "mid", "small"]
+    with Image.open(results[0][1]) as img:
+        assert img.format == "JPEG" and img.width == 1200
+
+
+def test_docx_images_are_streamed_and_deduplicated(tmp_path):
+    images = _images()
+    docx = tmp_path / "book.docx"
+    with zipfile.ZipFile(docx, "w") as zf:
+        zf.writestr("word/document.xml", "<w:document/>")
+        for name, data in images:
+            zf.writestr(f"word/media/{name}", data)
+        zf.writestr("word/media/copy.png", images[1][1])
+
+    cache = BuildCache(tmp_path / "cache")
+    processor = ParallelImageProcessor(max_workers=2, executor="thread")
+    processor.set_cache(cache)
+    paths = processor.process_images(docx, tmp_path / "out")
+
+    assert [p.name.split("_")[0] for p in paths] == ["big", "mid", "small", "mid"]
+    assert paths[1] == paths[3]
+    stats = cache.stats()
+    assert stats["images"] == 3 and stats["image_misses"] == 3
+
+    # A second build reuses every processed image from the cache
+    assert processor.process_images(docx, tmp_path / "out2") == paths
+    assert cache.stats()["image_hits"] == 3
+
+
+def test_process_pool_matches_thread_output(tmp_path):
+    images = _images()
+    threaded = ParallelImageProcessor(max_workers=1, executor="thread")
+    pooled = ParallelImageProcessor(max_workers=1, executor="process")
+
+    a = threaded.process_image_data(images, tmp_path / "a")
+    b = pooled.process_image_data(images, tmp_path / "b")
+
+    assert [p.name for p in a] == [p.name for p in b]
+    assert [p.read_bytes() for p in a] == [p.read_bytes() for p in b]
+
+
+def test_auto_executor_uses_processes_only_for_large_batches():
+    processor = ParallelImageProcessor(max_workers=4)
+
+    assert processor._choose_executor(3, 10_000) == "thread"
+    assert processor._choose_executor(100, 100 * 1024 * 1024) == "process"
+    assert ParallelImageProcessor(max_workers=1)._choose_executor(100, 1 << 30) == "thread"
+    with pytest.raises(ValueError):
+        ParallelImageProcessor(executor="fibers")
+
+
+def test_frozen_builds_encode_images_on_threads(monkeypatch):
+    monkeypatch.setattr(sys, "frozen", True, raising=False)
+    processor = ParallelImageProcessor(max_workers=2, executor="process")
+
+    with processor._make_executor("process", 4) as executor:
+        assert isinstance(executor, ThreadPoolExecutor)
+
+
+@pytest.mark.parametrize("enhanced", [False, True])
+def test_assembly_image_stage_is_concurrent_and_ordered(tmp_path, enhanced, monkeypatch):
+    from docx2shelf import images as images_module
+    from docx2shelf import json_logger
+
+    sources = []
+    for name, data in _images() + [("mid.jpg", _png(700, (0, 0, 0, 255)))]:
+        path = tmp_path / "src" / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(data)
+        sources.append(path)
+    out = tmp_path / "out"
+    out.mkdir()
+
+    logger = json_logger.JSONLogger()
+    monkeypatch.setattr(json_logger, "_global_logger", logger)
+    processed = images_module.process_images(
+        sources,
+        out,
+        max_width=1000,
+        modern_format="webp",
+        quiet=True,
+        enhanced_processing=enhanced,
+        max_workers=2,
+    )
+
+    # mid.png and mid.jpg share an output name; the later one wins, as serially
+    assert [p.name for p in processed] == ["big.webp", "mid.webp", "small.webp", "mid.webp"]
+    event = [e for e in logger.log_entries if e["event"] == "image_processing"][-1]["data"]
+    assert event["workers"] == 2
+    assert event["mode"] == ("enhanced" if enhanced else "standard")
+    assert [entry["image"] for entry in event["images"]] == [p.name for p in sources]
+    assert all(entry["seconds"] >= 0 for entry in event["images"])
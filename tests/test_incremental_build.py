@@ -0,0 +1,123 @@
+"""Tests for chapter-level incremental (watch-mode) rebuilds."""
+
+import io
+import zipfile
+
+import pytest
+
+from docx2shelf.chapter_pipeline import (
+    ChapterContext,
+    ChapterPipeline,
+    FigurePass,
+    HeadingIdPass,
+    SanitizePass,
+)
+from docx2shelf.figures import FigureProcessor
+
+PIL = pytest.importorskip("PIL")
+from PIL import Image  # noqa: E402
+
+
+def _jobs(chunks):
+    return [
+        (
+            html,
+            ChapterContext(
+                number=n,
+                chunk_index=n - 1,
+                title=f"Chapter {n}",
+                chapter_id=f"chap_{n:03d}",
+            ),
+        )
+        for n, html in enumerate(chunks, start=1)
+    ]
+
+
+def _run(chunks, memo=None):
+    figures = FigureProcessor()
+    pipeline = ChapterPipeline([SanitizePass(), FigurePass(figures), HeadingIdPass(3)], memo=memo)
+    results = pipeline.run_all(_jobs(chunks))
+    return pipeline, [html for html, _ in results], [ctx.headings for _, ctx in results]
+
+
+CHUNKS = [
+    '<h1>One</h1><img src="a.png"/><p onclick="x()">a</p>',
+    "<h1>Two</h1><h2>Part</h2><table><tr><td>1</td></tr></table>",
+    '<h1>Three</h1><img src="b.png"/>',
+]
+
+
+def test_memo_reuses_unchanged_chapters_and_matches_fresh_run():
+    memo = {}
+    _run(CHUNKS, memo)
+    edited = [CHUNKS[0].replace("</p>", " more</p>") + '<img src="c.png"/>'] + CHUNKS[1:]
+
+    pipeline, html, headings = _run(edited, memo)
+    _, fresh_html, fresh_headings = _run(edited)
+
+    assert pipeline.reused == 2
+    assert len(memo) == 3
+    # Figure numbers after the edited chapter shift exactly as in a fresh build
+    assert html == fresh_html and headings == fresh_headings
+    assert 'id="figure-3"' in html[2]
+
+    # The pipeline configuration is part of the key
+    other = ChapterPipeline([SanitizePass(), FigurePass(FigureProcessor()), HeadingIdPass(2)])
+    other.memo = memo
+    other.run_all(_jobs(edited))
+    assert other.reused == 0
+
+
+def _png(path, color):
+    buffer = io.BytesIO()
+    Image.new("RGB", (30, 20), color).save(buffer, "PNG")
+    path.write_bytes(buffer.getvalue())
+    return path
+
+
+def _build(tmp_path, chunks, output, incremental=None):
+    from docx2shelf.assemble import assemble_epub
+    from docx2shelf.metadata import BuildOptions, EpubMetadata
+
+    meta = EpubMetadata(
+        title="Watched", author="A", cover_path=tmp_path / "cover.png", uuid="fixed"
+    )
+    opts = BuildOptions(
+        epub_writer="streaming", image_format="original", epubcheck=False, quiet=True
+    )
+    assemble_epub(meta, opts, chunks, [tmp_path / "figure.png"], output, incremental=incremental)
+
+
+def test_rebuild_patches_only_changed_entries(tmp_path, monkeypatch):
+    from docx2shelf.incremental import IncrementalBuild
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+    _png(tmp_path / "cover.png", (10, 10, 10))
+    _png(tmp_path / "figure.png", (0, 90, 0))
+    chunks = [
+        '<h1>One</h1><p><img src="images/figure.png" alt="F"/></p>',
+        "<h1>Two</h1><p>first draft</p>",
+        "<h1>Three</h1>",
+    ]
+    output = tmp_path / "book.epub"
+    state = IncrementalBuild()
+    try:
+        _build(tmp_path, chunks, output, state)
+        assert not state.patched
+
+        chunks[1] = "<h1>Two</h1><p>second draft</p>"
+        _build(tmp_path, chunks, output, state)
+    finally:
+        state.close()
+
+    report = state.last_report
+    assert state.patched and report["chapters_reused"] == 2
+    assert report["rendered"] == ["EPUB/text/chap_002.xhtml", "EPUB/toc.ncx", "EPUB/nav.xhtml"]
+    assert report["copied"] > 5
+
+    # A patched EPUB is byte-identical to building the edited book from scratch
+    _build(tmp_path, chunks, tmp_path / "fresh.epub")
+    assert output.read_bytes() == (tmp_path / "fresh.epub").read_bytes()
+    with zipfile.ZipFile(output) as zf:
+        assert b"second draft" in zf.read("EPUB/text/chap_002.xhtml")
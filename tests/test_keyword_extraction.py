@@ -0,0 +1,34 @@
+"""Tests for the shared tokenization behind keyword extraction."""
+
+from docx2shelf.ai_genre_detection import IntelligentKeywordExtractor
+from docx2shelf.text_analysis import DocumentAnalysis
+
+TEXT = (
+    "The reader kept reading. A ready reader reads! Was the dragon ready? "
+    "Dragons read the old spell. The spell-reader read it to Paris. "
+    "In Paris the dragon slept; in Paris the reader waited."
+)
+
+
+def test_sentence_frequency_counts_words_inside_longer_words():
+    analysis = DocumentAnalysis(TEXT)
+    vocabulary = ["read", "reader", "dragon", "spell", "paris"]
+    expected = [
+        sum(word in sentence.lower() for sentence in analysis.sentences) for word in vocabulary
+    ]
+
+    assert analysis.sentence_frequency(vocabulary) == expected
+    # "read" also counts where it only occurs inside "reader", "reads" or "ready"
+    assert expected[0] == 6
+
+
+def test_extractors_agree_with_and_without_shared_analysis(monkeypatch):
+    monkeypatch.setattr("docx2shelf.ai_genre_detection.get_ai_manager", lambda: None)
+    extractor = IntelligentKeywordExtractor()
+    analysis = DocumentAnalysis(TEXT * 3)
+
+    for method in ("frequency", "tfidf", "cluster"):
+        extract = getattr(extractor, f"_extract_{method}_keywords")
+        assert extract(TEXT * 3, analysis) == extract(TEXT * 3)
+    assert analysis.sentence_frequency(["zebra"]) == [0]
+    assert analysis.sentence_frequency([]) == []
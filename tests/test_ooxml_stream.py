@@ -0,0 +1,396 @@
+"""Tests for the single-pass streaming OOXML engine."""
+
+import zipfile
+from pathlib import Path
+
+from docx2shelf.convert import _docx_to_html_streaming
+from docx2shelf.notes import NoteCall, NotesProcessor
+from docx2shelf.ooxml_stream import NoteIndex, OOXMLStreamConverter
+from docx2shelf.performance import PerformanceMonitor, StreamingDocxReader
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/"
+
+STYLES_XML = f"""<?xml version="1.0" encoding="UTF-8"?>
+<w:styles xmlns:w="{W_NS}">
+  <w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/></w:style>
+  <w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/></w:style>
+  <w:style w:type="paragraph" w:styleId="Heading2"><w:name w:val="heading 2"/></w:style>
+  <w:style w:type="paragraph" w:styleId="ListBullet"><w:name w:val="List Bullet"/></w:style>
+  <w:style w:type="paragraph" w:styleId="ListNumber"><w:name w:val="List Number"/></w:style>
+  <w:style w:type="paragraph" w:styleId="Caption"><w:name w:val="caption"/></w:style>
+  <w:style w:type="character" w:default="1" w:styleId="DefaultParagraphFont">
+    <w:name w:val="Default Paragraph Font"/>
+  </w:style>
+  <w:style w:type="character" w:styleId="CodeChar"><w:name w:val="Code Char"/></w:style>
+</w:styles>"""
+
+STYLES_DATA = {
+    "paragraph_styles": {
+        "Heading 1": "h1",
+        "Heading 2": "h2",
+        "Normal": "p",
+        "List Bullet": "li",
+        "List Number": "li",
+        "Caption": "figcaption",
+    }
+}
+
+
+def _p(runs: str, style: str | None = None) -> str:
+    ppr = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+    return f"<w:p>{ppr}{runs}</w:p>"
+
+
+def _r(text: str, rpr: str = "") -> str:
+    rpr_xml = f"<w:rPr>{rpr}</w:rPr>" if rpr else ""
+    return f'<w:r>{rpr_xml}<w:t xml:space="preserve">{text}</w:t></w:r>'
+
+
+def _write_docx(path: Path, body: str, rels: str = "", extra_parts: dict | None = None) -> Path:
+    document = (
+        f'<?xml version="1.0" encoding="UTF-8"?>'
+        f'<w:document xmlns:w="{W_NS}" xmlns:r="{R_NS}" '
+        f'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+        f'xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing">'
+        f"<w:body>{body}<w:sectPr/></w:body></w:document>"
+    )
+    relationships = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        f'<Relationship Id="rIdStyles" Type="{REL_TYPE}styles" Target="styles.xml"/>'
+        f"{rels}</Relationships>"
+    )
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("word/document.xml", document)
+        zf.writestr("word/_rels/document.xml.rels", relationships)
+        zf.writestr("word/styles.xml", STYLES_XML)
+        for name, data in (extra_parts or {}).items():
+            zf.writestr(name, data)
+    return path
+
+
+def test_headings_split_sections_with_inline_formatting(tmp_path):
+    body = (
+        _p(_r("Chapter One"), "Heading1")
+        + _p(_r("Hello ") + _r("bold", "<w:b/>") + _r(" and ") + _r("it", "<w:i/>"))
+        + _p(_r("Sub"), "Heading2")
+        + _p(_r("Chapter Two"), "Heading1")
+        + _p(_r("x &amp; y"))
+    )
+    docx = _write_docx(tmp_path / "doc.docx", body)
+
+    chunks, resources, _css = OOXMLStreamConverter(docx, STYLES_DATA, tmp_path).convert()
+
+    assert chunks == [
+        "<section><h1>Chapter One</h1><p>Hello <strong>bold</strong> and <em>it</em></p>"
+        "<h2>Sub</h2></section>",
+        "<section><h1>Chapter Two</h1><p>x &amp; y</p></section>",
+    ]
+    assert resources == []
+
+
+def test_lists_tables_and_character_styles(tmp_path):
+    merged_table = (
+        "<w:tbl>"
+        '<w:tr><w:tc><w:tcPr><w:gridSpan w:val="2"/></w:tcPr>' + _p(_r("Wide")) + "</w:tc></w:tr>"
+        "<w:tr><w:tc>" + _p(_r("A")) + "</w:tc><w:tc><w:p/></w:tc></w:tr>"
+        "</w:tbl>"
+    )
+    body = (
+        _p(_r("one"), "ListBullet")
+        + _p(_r("two"), "ListNumber")
+        + merged_table
+        + _p(_r("print()", '<w:rStyle w:val="CodeChar"/>'))
+    )
+    docx = _write_docx(tmp_path / "doc.docx", body)
+
+    chunks, _resources, _css = OOXMLStreamConverter(docx, STYLES_DATA, tmp_path).convert()
+
+    assert chunks == [
+        "<section><ul><li>one</li></ul><ol><li>two</li></ol>"
+        "<table><tr><td><p>Wide</p></td><td><p>Wide</p></td></tr>"
+        "<tr><td><p>A</p></td><td><p></p></td></tr></table>"
+        "<p><code>print()</code></p></section>"
+    ]
+
+
+def test_table_cells_keep_inline_formatting(tmp_path):
+    footnotes = (
+        f'<w:footnotes xmlns:w="{W_NS}">'
+        '<w:footnote w:id="1"><w:p><w:r><w:t>Cell note.</w:t></w:r></w:p></w:footnote>'
+        "</w:footnotes>"
+    )
+    rels = (
+        f'<Relationship Id="rIdFn" Type="{REL_TYPE}footnotes" Target="footnotes.xml"/>'
+        f'<Relationship Id="rIdLink" Type="{REL_TYPE}hyperlink" '
+        'Target="https://example.com" TargetMode="External"/>'
+        f'<Relationship Id="rIdImg" Type="{REL_TYPE}image" Target="media/image1.png"/>'
+    )
+    drawing = (
+        "<w:r><w:drawing><wp:inline>"
+        '<wp:docPr id="1" name="Picture 1" descr="Icon"/>'
+        '<a:graphic><a:graphicData><a:blip r:embed="rIdImg"/></a:graphicData></a:graphic>'
+        "</wp:inline></w:drawing></w:r>"
+    )
+    table = (
+        "<w:tbl><w:tr>"
+        "<w:tc>"
+        + _p(_r("Bold", "<w:b/>") + _r(" and ") + _r("it", "<w:i/>"))
+        + "</w:tc><w:tc>"
+        + _p('<w:hyperlink r:id="rIdLink">' + _r("link") + "</w:hyperlink>" + drawing)
+        + "</w:tc><w:tc>"
+        + _p(_r("a &lt; b") + '<w:r><w:footnoteReference w:id="1"/></w:r>')
+        + "</w:tc></w:tr></w:tbl>"
+    )
+    docx = _write_docx(
+        tmp_path / "doc.docx",
+        table,
+        rels,
+        {"word/footnotes.xml": footnotes, "word/media/image1.png": b"\x89PNG fake"},
+    )
+
+    chunks, resources, _css = OOXMLStreamConverter(docx, STYLES_DATA, tmp_path).convert()
+
+    assert chunks == [
+        "<section><table><tr>"
+        "<td><p><strong>Bold</strong> and <em>it</em></p></td>"
+        '<td><p><a href="https://example.com">link</a>'
+        '<img src="images/image1.png" alt="Icon" /></p></td>'
+        '<td><p>a &lt; b<sup id="fnref1"><a href="#fn1">1</a></sup></p></td>'
+        "</tr></table>"
+        '<hr/><section class="footnotes"><ol>'
+        '<li id="fn1"><p>Cell note. <a href="#fnref1">↩</a></p></li></ol></section></section>'
+    ]
+    assert resources == [tmp_path / "image1.png"]
+
+
+def test_footnotes_hyperlinks_and_tracked_changes(tmp_path):
+    footnotes = (
+        f'<w:footnotes xmlns:w="{W_NS}">'
+        '<w:footnote w:id="1"><w:p><w:r><w:t>A note.</w:t></w:r></w:p></w:footnote>'
+        "</w:footnotes>"
+    )
+    rels = (
+        f'<Relationship Id="rIdFn" Type="{REL_TYPE}footnotes" Target="footnotes.xml"/>'
+        f'<Relationship Id="rIdLink" Type="{REL_TYPE}hyperlink" '
+        'Target="https://example.com" TargetMode="External"/>'
+    )
+    body = _p(
+        _r("See ")
+        + '<w:hyperlink r:id="rIdLink">'
+        + _r("this")
+        + "</w:hyperlink>"
+        + '<w:r><w:footnoteReference w:id="1"/></w:r>'
+        + "<w:ins>"
+        + _r(" kept")
+        + "</w:ins>"
+        + "<w:del><w:r><w:delText>gone</w:delText></w:r></w:del>"
+    )
+    docx = _write_docx(tmp_path / "doc.docx", body, rels, {"word/footnotes.xml": footnotes})
+
+    chunks, _resources, _css = OOXMLStreamConverter(docx, STYLES_DATA, tmp_path).convert()
+
+    assert chunks == [
+        '<section><p>See <a href="https://example.com">this</a>'
+        '<sup id="fnref1"><a href="#fn1">1</a></sup> kept</p>'
+        '<hr/><section class="footnotes"><ol>'
+        '<li id="fn1"><p>A note. <a href="#fnref1">↩</a></p></li></ol></section></section>'
+    ]
+
+
+def _notes_docx(tmp_path: Path, body: str) -> Path:
+    footnotes = (
+        f'<w:footnotes xmlns:w="{W_NS}">'
+        '<w:footnote w:id="0" w:type="separator"><w:p><w:r><w:separator/></w:r></w:p></w:footnote>'
+        '<w:footnote w:id="1"><w:p><w:r><w:footnoteRef/></w:r>'
+        + _r(" See ")
+        + _r("Ibid.", "<w:i/>")
+        + _r(" p. 4 &amp; 5 ")
+        + "</w:p>"
+        + _p(_r("Second paragraph."))
+        + "</w:footnote></w:footnotes>"
+    )
+    endnotes = (
+        f'<w:endnotes xmlns:w="{W_NS}">'
+        '<w:endnote w:id="2"><w:p><w:r><w:t>Late note.</w:t></w:r></w:p></w:endnote>'
+        "</w:endnotes>"
+    )
+    comments = (
+        f'<w:comments xmlns:w="{W_NS}">'
+        '<w:comment w:id="7"><w:p><w:r><w:t>Check "this"</w:t></w:r></w:p></w:comment>'
+        "</w:comments>"
+    )
+    rels = (
+        f'<Relationship Id="rIdFn" Type="{REL_TYPE}footnotes" Target="footnotes.xml"/>'
+        f'<Relationship Id="rIdEn" Type="{REL_TYPE}endnotes" Target="endnotes.xml"/>'
+        f'<Relationship Id="rIdCm" Type="{REL_TYPE}comments" Target="comments.xml"/>'
+    )
+    return _write_docx(
+        tmp_path / "notes.docx",
+        body,
+        rels,
+        {
+            "word/footnotes.xml": footnotes,
+            "word/endnotes.xml": endnotes,
+            "word/comments.xml": comments,
+        },
+    )
+
+
+def test_note_index_renders_each_note_once(tmp_path):
+    docx = _notes_docx(tmp_path, _p(_r("text")))
+
+    index = NoteIndex.from_docx(docx)
+
+    assert len(index) == 4  # separator, footnote, endnote, comment
+    footnote = index.get("footnote", "1")
+    assert footnote.text == "See Ibid. p. 4 & 5  Second paragraph."
+    assert footnote.html == "See <em>Ibid.</em> p. 4 &amp; 5  Second paragraph."
+    assert index.get("endnote", "2").html == "Late note."
+    assert index.get("comment", "7").text == 'Check "this"'
+    assert index.get("footnote", "99") is None
+    assert index.get("comment", None) is None
+
+
+def test_notes_and_comments_resolved_from_index(tmp_path):
+    body = _p(
+        _r("Claim")
+        + '<w:r><w:footnoteReference w:id="1"/></w:r>'
+        + '<w:r><w:endnoteReference w:id="2"/></w:r>'
+        + '<w:r><w:endnoteReference w:id="3"/></w:r>'
+        + '<w:r><w:commentReference w:id="7"/><w:t>!</w:t></w:r>'
+    )
+    docx = _notes_docx(tmp_path, body)
+
+    chunks, _resources, _css = OOXMLStreamConverter(docx, STYLES_DATA, tmp_path).convert()
+
+    assert chunks == [
+        "<section><p>Claim"
+        '<sup id="fnref1"><a href="#fn1">1</a></sup>'
+        '<sup id="fnref2"><a href="#fn2">2</a></sup>'
+        '<sup id="fnref3"><a href="#fn3">3</a></sup>'
+        '!<span class="comment" title="Check &quot;this&quot;">💬</span></p>'
+        '<hr/><section class="footnotes"><ol>'
+        '<li id="fn1"><p>See <em>Ibid.</em> p. 4 &amp; 5  Second paragraph. '
+        '<a href="#fnref1">↩</a></p></li>'
+        '<li id="fn2"><p>Late note. <a href="#fnref2">↩</a></p></li>'
+        '<li id="fn3"><p>(note) <a href="#fnref3">↩</a></p></li>'
+        "</ol></section></section>"
+    ]
+
+
+def test_notes_processor_gives_repeated_markers_their_own_ids():
+    chunks = [
+        '<p>One<a href="#footnote-1" class="note-call">1</a></p>'
+        '<ol><li id="footnote-1">See Ibid.</li></ol>',
+        '<p>Two<a href="#endnote-2" class="note-call">1</a></p>'
+        '<ol><li id="endnote-2">Late note.</li></ol>',
+    ]
+
+    processor = NotesProcessor()
+    updated, _notes_page = processor.process_content(chunks, ["ch1.xhtml", "ch2.xhtml"])
+
+    assert processor.notes["footnote_1"].plain_text == "See Ibid."
+    assert processor.notes["endnote_2"].content == "Late note." + (
+        ' <span class="note-back-refs"><a href="#call_2" class="note-back-ref" '
+        'title="Return to text">↩</a></span>'
+    )
+    # Each chapter's "1" marker gets the id of its own call
+    assert 'id="call_1"' in updated[0]
+    assert 'id="call_2"' in updated[1]
+    assert processor.chapters[0].footnotes[0].id == "footnote_1"
+    chapter_two = processor.chapters[1]
+    assert [note.id for note in chapter_two.footnotes + chapter_two.endnotes] == ["endnote_2"]
+
+
+def test_note_call_markers_match_call_text_they_contain():
+    processor = NotesProcessor()
+    processor.calls = {
+        call_id: NoteCall(
+            id=call_id, note_id=note_id, file_path="ch1.xhtml", position=0, call_text=text
+        )
+        for call_id, note_id, text in [("call_1", "footnote_1", "1"), ("call_2", "note_a", "a")]
+    }
+    chunk = (
+        '<p>X<sup class="note-call">[1]</sup> Y<span class="note-call">A</span> '
+        'Z<sup class="note-call">*</sup></p>'
+    )
+
+    updated = processor._add_call_ids(chunk, "ch1.xhtml")
+
+    assert updated == (
+        '<p>X<sup class="note-call" id="call_1">[1]</sup> '
+        'Y<span class="note-call" id="call_2">A</span> Z<sup class="note-call">*</sup></p>'
+    )
+
+
+def test_images_are_extracted_once_and_wrapped_with_captions(tmp_path):
+    drawing = (
+        "<w:r><w:drawing><wp:inline>"
+        '<wp:docPr id="1" name="Picture 1" descr="A cat"/>'
+        '<a:graphic><a:graphicData><a:blip r:embed="rIdImg"/></a:graphicData></a:graphic>'
+        "</wp:inline></w:drawing></w:r>"
+    )
+    rels = f'<Relationship Id="rIdImg" Type="{REL_TYPE}image" Target="media/image1.png"/>'
+    body = _p(drawing) + _p(_r("The cat"), "Caption") + _p(drawing)
+    docx = _write_docx(
+        tmp_path / "doc.docx", body, rels, {"word/media/image1.png": b"\x89PNG fake"}
+    )
+    image_dir = tmp_path / "images"
+
+    chunks, resources, _css = OOXMLStreamConverter(docx, STYLES_DATA, image_dir).convert()
+
+    assert chunks == [
+        '<section><figure><img src="images/image1.png" alt="A cat" />'
+        "<figcaption>The cat</figcaption></figure>"
+        '<p><img src="images/image1.png" alt="A cat" /></p></section>'
+    ]
+    assert resources == [image_dir / "image1.png"]
+    assert resources[0].read_bytes() == b"\x89PNG fake"
+
+
+def test_iter_sections_yields_before_document_end(tmp_path):
+    body = "".join(_p(_r(f"Chapter {n}"), "Heading1") + _p(_r("text")) for n in range(3))
+    docx = _write_docx(tmp_path / "doc.docx", body)
+
+    sections = OOXMLStreamConverter(docx, STYLES_DATA, tmp_path).iter_sections()
+
+    assert next(sections) == "<section><h1>Chapter 0</h1><p>text</p></section>"
+    assert len(list(sections)) == 2
+
+
+def test_empty_document_placeholder(tmp_path):
+    docx = _write_docx(tmp_path / "doc.docx", "")
+
+    chunks, _resources, _css = OOXMLStreamConverter(docx, STYLES_DATA, tmp_path).convert()
+
+    assert chunks == ["<section><p>(Empty document)</p></section>"]
+
+
+def test_iter_sections_accepts_small_byte_chunks(tmp_path):
+    body = _p(_r("Chapter"), "Heading1") + _p(_r("Ünïcödé text"))
+    docx = _write_docx(tmp_path / "doc.docx", body)
+
+    with StreamingDocxReader(docx, chunk_size=5) as reader:
+        sections = list(
+            OOXMLStreamConverter(docx, STYLES_DATA, tmp_path).iter_sections(
+                reader.iter_document_xml_bytes()
+            )
+        )
+
+    assert sections == ["<section><h1>Chapter</h1><p>Ünïcödé text</p></section>"]
+
+
+def test_streaming_pipeline_reports_phase_memory(tmp_path):
+    body = "".join(_p(_r(f"Chapter {n}"), "Heading1") + _p(_r("text")) for n in range(2))
+    docx = _write_docx(tmp_path / "doc.docx", body)
+    monitor = PerformanceMonitor()
+    monitor.start_monitoring()
+
+    chunks, resources, _css = _docx_to_html_streaming(docx, monitor)
+
+    assert len(chunks) == 2
+    assert resources == []
+    assert monitor.phase_times["html_conversion"]["peak_memory_mb"] > 0
@@ -0,0 +1,194 @@
+"""Tests for the pooled Pandoc executor."""
+
+import base64
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from docx2shelf import pandoc_pool
+from docx2shelf.convert import pandoc_convert_file
+from docx2shelf.pandoc_pool import SERVERS_ENV, PandocPool, active_pool, shared_pool
+
+
+class _FakePandocServer(BaseHTTPRequestHandler):
+    """Speaks enough of the ``pandoc server`` API to exercise the pool."""
+
+    requests: list = []
+
+    def do_GET(self):
+        self.send_response(200 if self.path == "/version" else 404)
+        self.end_headers()
+        self.wfile.write(b"3.1")
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests.append(payload)
+        text = payload["text"]
+        if payload["from"] == "docx":
+            text = base64.b64decode(text).decode("utf-8")
+        body = json.dumps(
+            {"output": f"<p>{payload['from']}:{text}</p>", "base64": False, "messages": []}
+        )
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body.encode("utf-8"))
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_server():
+    _FakePandocServer.requests = []
+    server = HTTPServer(("127.0.0.1", 0), _FakePandocServer)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def blocking_pypandoc(monkeypatch):
+    """Replace the per-call pandoc subprocess with one the test can hold open."""
+    release = threading.Event()
+    calls = []
+
+    def run(source, to, format, extra_args):
+        calls.append(source.name)
+        release.wait(5)
+        return f"<p>{source.name}</p>"
+
+    monkeypatch.setattr(pandoc_pool, "_run_pypandoc", run)
+    return release, calls
+
+
+def test_server_mode_posts_to_warm_servers(tmp_path, fake_server):
+    docx = tmp_path / "book.docx"
+    docx.write_bytes(b"binary")
+    md = tmp_path / "notes.md"
+    md.write_text("# Hi", encoding="utf-8")
+
+    with PandocPool(max_workers=1, endpoints=[fake_server]) as pool:
+        assert pool.mode == "server"
+        assert pool.convert_file(docx, extra_args=["--wrap=none"]) == "<p>docx:binary</p>"
+        assert pool.convert_file(md, format="markdown") == "<p>markdown:# Hi</p>"
+        assert pool.stats.server_requests == 2
+
+    assert _FakePandocServer.requests[0]["wrap"] == "none"
+    assert _FakePandocServer.requests[0]["text"] == base64.b64encode(b"binary").decode()
+
+
+def test_prefetch_applies_backpressure(tmp_path, blocking_pypandoc):
+    release, calls = blocking_pypandoc
+    files = []
+    for name in ("a.md", "b.md", "c.md"):
+        files.append(tmp_path / name)
+        files[-1].write_text(name, encoding="utf-8")
+
+    with PandocPool(max_workers=1, max_pending=2, mode="subprocess") as pool:
+        assert pool.prefetch(files[0])
+        assert pool.prefetch(files[1])
+        # Queue is full: prefetch declines instead of blocking
+        assert not pool.prefetch(files[2])
+
+        submitted = threading.Event()
+        thread = threading.Thread(target=lambda: (pool.submit(files[2]), submitted.set()))
+        thread.start()
+        assert not submitted.wait(0.2)
+
+        release.set()
+        assert submitted.wait(5)
+        thread.join()
+        assert pool.convert_file(files[0]) == "<p>a.md</p>"
+        assert pool.stats.prefetch_hits == 1
+
+    assert calls[:2] == ["a.md", "b.md"]
+    assert pool.stats.max_queue_depth == 2
+
+
+def test_concurrent_prefetch_dispatches_once(tmp_path, blocking_pypandoc, monkeypatch):
+    release, calls = blocking_pypandoc
+    source = tmp_path / "a.md"
+    source.write_text("a", encoding="utf-8")
+
+    with PandocPool(max_workers=2, max_pending=8, mode="subprocess") as pool:
+        dispatch = pool._dispatch
+
+        def slow_dispatch(*args):
+            time.sleep(0.05)  # widen the check-then-set window
+            return dispatch(*args)
+
+        monkeypatch.setattr(pool, "_dispatch", slow_dispatch)
+        barrier = threading.Barrier(4)
+
+        def prefetch():
+            barrier.wait()
+            pool.prefetch(source)
+
+        threads = [threading.Thread(target=prefetch) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        release.set()
+        assert pool.convert_file(source) == "<p>a.md</p>"
+
+    assert calls == ["a.md"]
+    assert pool.stats.submitted == 1
+
+
+def test_dead_endpoint_falls_back_to_subprocess(tmp_path, fake_server, blocking_pypandoc):
+    release, calls = blocking_pypandoc
+    release.set()
+    source = tmp_path / "a.docx"
+    source.write_bytes(b"x")
+
+    pool = PandocPool(max_workers=1, endpoints=["http://127.0.0.1:9"], health_interval=0).start()
+    try:
+        assert pool.convert_file(source) == "<p>a.docx</p>"
+        report = pool.health_check()
+    finally:
+        pool.shutdown()
+
+    assert calls == ["a.docx"]
+    assert report["healthy"] is False
+    assert report["workers"][0]["owned"] is False
+
+
+def test_shared_pool_is_used_by_convert_and_exported(tmp_path, fake_server, monkeypatch):
+    monkeypatch.delenv(SERVERS_ENV, raising=False)
+    source = tmp_path / "a.md"
+    source.write_text("text", encoding="utf-8")
+
+    assert active_pool() is None
+    with shared_pool(max_workers=1, endpoints=[fake_server]) as pool:
+        with shared_pool() as nested:
+            assert nested is pool
+        assert active_pool() is pool
+        assert pandoc_convert_file(source, format="markdown") == "<p>markdown:text</p>"
+
+        with pool.exported():
+            assert os.environ[SERVERS_ENV] == fake_server
+        assert SERVERS_ENV not in os.environ
+
+    assert pool.mode is None  # shut down with the last user
+    assert active_pool() is None
+
+
+def test_child_process_attaches_to_exported_servers(monkeypatch, fake_server):
+    monkeypatch.setenv(SERVERS_ENV, fake_server)
+
+    pool = active_pool()
+
+    assert pool is not None
+    assert pool.mode == "server"
+    assert pool.endpoints == [fake_server]
+    assert pool.health_check()["healthy"] is True
+    pool.shutdown()
+    monkeypatch.setattr(pandoc_pool, "_attached_pool", None)
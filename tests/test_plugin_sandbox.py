@@ -0,0 +1,35 @@
+"""Tests for plugin sandbox resource limits."""
+
+import threading
+
+import psutil
+import pytest
+
+from docx2shelf import plugin_sandbox
+from docx2shelf.plugin_sandbox import PluginExecutionContext, PluginSandbox, ResourceLimits
+
+resource = plugin_sandbox.resource
+pytestmark = pytest.mark.skipif(resource is None, reason="resource limits are Unix-only")
+
+
+def test_limits_are_budgets_on_host_usage_and_restored(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the sandbox changes into its temp dir
+    limits = (resource.RLIMIT_AS, resource.RLIMIT_CPU, resource.RLIMIT_NOFILE)
+    before = {limit: resource.getrlimit(limit) for limit in limits}
+    context = PluginExecutionContext(
+        plugin_id="budget", temp_dir=tmp_path / "sandbox", resource_limits=ResourceLimits(64)
+    )
+
+    with PluginSandbox(context):
+        soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+        assert hard == before[resource.RLIMIT_AS][1]
+        if soft != resource.RLIM_INFINITY:
+            assert soft > psutil.Process().memory_info().vms
+
+        # The host process can still start threads inside the sandbox
+        thread = threading.Thread(target=lambda: None)
+        thread.start()
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+
+    assert {limit: resource.getrlimit(limit) for limit in limits} == before
@@ -0,0 +1,54 @@
+"""Tests for the shared per-document text analysis."""
+
+from collections import OrderedDict
+
+import pytest
+
+from docx2shelf import text_analysis
+from docx2shelf.ai_integration import MetadataEnhancer
+from docx2shelf.content_validation import validate_content_quality
+from docx2shelf.text_analysis import analyze_document, count_syllables
+
+TEXT = "The cat sat. Was the table stable? Read it, e.g. twice!\n\nAnother Paris day."
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(text_analysis, "_analysis_cache", OrderedDict())
+
+
+def test_analysis_is_memoized_by_content():
+    first = analyze_document(TEXT)
+    assert analyze_document("".join(list(TEXT))) is first
+    assert analyze_document(TEXT + " ") is not first
+
+    for n in range(text_analysis._ANALYSIS_CACHE_SIZE):
+        analyze_document(f"filler {n}")
+    assert analyze_document(TEXT) is not first
+
+
+def test_counts_and_spans():
+    analysis = analyze_document(TEXT)
+
+    assert analysis.word_count == 14
+    assert analysis.sentence_count == 6  # "e.g." splits a sentence twice
+    assert [TEXT[start:end] for start, end in analysis.sentence_spans] == analysis.sentences
+    assert analysis.tokens[:4] == ["the", "cat", "sat", "was"]
+    assert analysis.token_counts["the"] == 2
+    assert analysis.proper_noun_candidates == ["Read", "Another", "Paris"]
+    assert analysis.syllable_count == sum(count_syllables(w) for w in TEXT.split())
+    assert [count_syllables(w) for w in ("table", "stable?", "read", "123")] == [1, 1, 1, 0]
+
+
+def test_validator_and_metadata_share_one_analysis():
+    html = f"<html><body><p>{TEXT}</p></body></html>"
+    report = validate_content_quality(html, "chapter.xhtml")
+
+    plain = analyze_document(html).plain()
+    assert plain.content == TEXT.replace("\n\n", " ")
+    assert "syllable_count" in vars(plain)
+    assert report.stats.word_count == plain.word_count
+
+    data = MetadataEnhancer(None)._analyze_content_for_metadata(plain.content, {})
+    assert analyze_document(plain.content) is plain
+    assert data["word_count"] == plain.word_count
@@ -0,0 +1,105 @@
+"""Tests for memoized tool discovery."""
+
+import os
+
+import pytest
+
+from docx2shelf import tools
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="uses a shell-script fake pandoc")
+
+
+@pytest.fixture(autouse=True)
+def isolated_probes(tmp_path, monkeypatch):
+    """Point the tools dir at a temp dir and start with an empty probe cache."""
+    td = tmp_path / "bin"
+    td.mkdir()
+    monkeypatch.setattr(tools, "tools_dir", lambda: td)
+    monkeypatch.delenv(tools.PROBE_FILE_ENV, raising=False)
+    monkeypatch.setattr(tools, "_probe_cache", {})
+    monkeypatch.setattr(tools, "_probe_file_loaded", False)
+    return td
+
+
+def _fake_pandoc(path, version="3.1.2"):
+    """Write a fake pandoc that records each invocation next to itself."""
+    path.write_text(
+        f'#!/bin/sh\necho run >> "{path}.calls"\necho "pandoc {version}"\n', encoding="utf-8"
+    )
+    path.chmod(0o755)
+    return path
+
+
+def _calls(path):
+    calls = path.with_name(path.name + ".calls")
+    return len(calls.read_text().splitlines()) if calls.exists() else 0
+
+
+def test_pandoc_probe_runs_once_per_binary(isolated_probes, monkeypatch):
+    pandoc = _fake_pandoc(isolated_probes / "pandoc")
+    monkeypatch.setattr(tools, "pandoc_path", lambda: pandoc)
+
+    assert tools.check_pandoc_availability() == (True, "Pandoc 3.1.2 available", "3.1.2")
+    assert tools.check_pandoc_availability()[2] == "3.1.2"
+    assert _calls(pandoc) == 1
+
+    # Replacing the binary changes its fingerprint and triggers a new probe
+    _fake_pandoc(pandoc, version="3.2.10")
+    os.utime(pandoc, ns=(0, 1))
+    assert tools.check_pandoc_availability()[2] == "3.2.10"
+    assert _calls(pandoc) == 2
+
+
+def test_failed_probe_is_not_memoized(isolated_probes, monkeypatch):
+    pandoc = isolated_probes / "pandoc"
+    pandoc.write_text('#!/bin/sh\necho run >> "$0.calls"\nexit 3\n', encoding="utf-8")
+    pandoc.chmod(0o755)
+    monkeypatch.setattr(tools, "pandoc_path", lambda: pandoc)
+
+    assert tools.check_pandoc_availability()[0] is False
+    assert tools.check_pandoc_availability()[0] is False
+    assert _calls(pandoc) == 2
+
+
+def test_install_and_uninstall_invalidate_probes(isolated_probes, monkeypatch):
+    pandoc = _fake_pandoc(isolated_probes / "pandoc")
+    monkeypatch.setattr(tools, "pandoc_path", lambda: pandoc)
+    tools.check_pandoc_availability()
+    assert "pandoc" in tools._probe_cache
+
+    tools.uninstall_epubcheck()
+
+    assert tools._probe_cache == {}
+
+
+def test_probe_file_skips_probe_in_new_process(isolated_probes, tmp_path, monkeypatch):
+    probe_file = tmp_path / "probes.json"
+    monkeypatch.setenv(tools.PROBE_FILE_ENV, str(probe_file))
+    pandoc = _fake_pandoc(isolated_probes / "pandoc")
+    monkeypatch.setattr(tools, "pandoc_path", lambda: pandoc)
+
+    tools.check_pandoc_availability()
+    assert probe_file.exists()
+
+    # Simulate a fresh process: empty memory cache, probe file not yet read
+    monkeypatch.setattr(tools, "_probe_cache", {})
+    monkeypatch.setattr(tools, "_probe_file_loaded", False)
+    assert tools.check_pandoc_availability()[0] is True
+    assert _calls(pandoc) == 1
+
+    tools.invalidate_tool_probes()
+    assert not probe_file.exists()
+
+
+def test_epubcheck_cmd_follows_tools_dir_changes(isolated_probes, monkeypatch):
+    monkeypatch.setenv("PATH", "")
+    assert tools.epubcheck_cmd() is None
+
+    wrapper = isolated_probes / "epubcheck"
+    wrapper.write_text("#!/bin/sh\n", encoding="utf-8")
+    os.utime(isolated_probes, ns=(0, 1))  # Directory mtime granularity can be coarse
+    assert tools.epubcheck_cmd() == [str(wrapper)]
+
+    wrapper.unlink()
+    os.utime(isolated_probes, ns=(0, 2))
+    assert tools.epubcheck_cmd() is None
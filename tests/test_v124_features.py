@@ -373,6 +373,36 @@ class TestPerformanceOptimizations:
             metadata = reader.get_document_metadata()
             assert 'core' in metadata
 
+    def test_streaming_docx_reader_chunk_boundaries(self):
+        """Multi-byte characters split across chunks decode intact."""
+        docx_path = self.temp_dir / "test.docx"
+        xml = '<document>' + 'é' * 50 + '</document>'
+
+        with zipfile.ZipFile(docx_path, 'w') as zf:
+            zf.writestr('word/document.xml', xml)
+
+        with StreamingDocxReader(docx_path, chunk_size=7) as reader:
+            raw = list(reader.iter_document_xml_bytes())
+            assert len(raw) > 1
+            assert b''.join(raw) == xml.encode('utf-8')
+            assert ''.join(reader.stream_document_xml()) == xml
+
+    def test_performance_monitor_phase_peak_memory(self):
+        """Nested phases each report the peak memory sampled while open."""
+        monitor = PerformanceMonitor()
+        monitor.start_monitoring()
+
+        with monitor.phase_timer("outer"):
+            with monitor.phase_timer("inner"):
+                monitor.record_memory_usage()
+
+        report = monitor.finish_monitoring()
+        outer = report["phase_times"]["outer"]
+        inner = report["phase_times"]["inner"]
+        assert inner["peak_memory_mb"] > 0
+        assert outer["peak_memory_mb"] >= inner["peak_memory_mb"]
+        assert "peak" in monitor.get_performance_summary()
+
 
 class TestPluginMarketplace:
     """Test plugin marketplace functionality."""